@@ -92,11 +92,54 @@ class Design(Base):
         super().__setattr__("tag", tag.Tag(options=options.tag))
         return
 
-    def draw_gds(self):
+    def draw_gds(self, workers: int = None):
         """
         Draw GDS graphics.
+
+        Input:
+            workers: int, the number of worker processes drawing the components, see Gds.draw_gds.
         """
-        self.gds.draw_gds()
+        self.gds.draw_gds(workers=workers)
+
+    def set_geometry_backend(self, name: str = "gdspy"):
+        """
+        Select the library the layout is drawn with, "gdspy" or "gdstk", see Gds.set_geometry_backend.
+
+        Input:
+            name: str, the geometry backend.
+
+        Output:
+            None
+        """
+        self.gds.set_geometry_backend(name)
+        return
+
+    def set_geometry_precision(self, precision="default"):
+        """
+        Select the arc tolerance the layout is drawn with, see Gds.set_geometry_precision.
+
+        Input:
+            precision: str or float, "preview", "default", "tapeout", or an arc tolerance in um.
+
+        Output:
+            None
+        """
+        self.gds.set_geometry_precision(precision)
+        return
+
+    def save_oas(self, path: str = "./gds.oas", hierarchical: bool = True, compression_level: int = 6):
+        """
+        Save the layout to a compressed OASIS file, see GdsBase.save_oas.
+
+        Input:
+            path: str, the path of the OASIS file.
+            hierarchical: bool, whether identical components are written once and placed with OASIS repetitions.
+            compression_level: int, 0 (no compression) to 9 (smallest file).
+
+        Output:
+            The path where the OASIS file is saved.
+        """
+        return self.gds.save_oas(path=path, hierarchical=hierarchical, compression_level=compression_level)
 
     def calc_general_ops(self):
         """
@@ -452,6 +495,24 @@ class Design(Base):
         self.topology.generate_random_edges(edges_num)
         return
 
+    def generate_connected_topo_edges(self, edges_num: int = None, seed: int = None, rng=None):
+        """
+        Generate random topology edges keeping all qubits connected, see Topology.generate_connected_edges.
+
+        Input:
+            edges_num: int, the number of edges to generate, between the number of qubits minus one and the number of nearest-neighbour edges, default is None (a random number).
+            seed: int, the seed of a new random generator, default is None (use rng).
+            rng: random.Random, the random generator used when seed is None, default is None (the global random generator).
+        
+        Output:
+            None
+
+        Exception:
+            ValueError: Throws an exception when the qubits can not be connected or edges_num is out of range.
+        """
+        self.topology.generate_connected_edges(edges_num, seed, rng)
+        return
+
     def generate_pins(self, **gene_ops):
         """
         Generate pins.
@@ -4,11 +4,10 @@
 
 from base.base import Base
 from addict import Dict
-import equ_circ.equ_circ_old
+import equ_circ
 import func_modules
 import copy
 import numpy as np
-import qucat
 
 class EquivalentCircuit(Base):
     def __init__(self, **init_ops):
@@ -5,17 +5,22 @@
 
 from addict import Dict
 from base.gds_base import GdsBase
+from base.cmpnts_base import CmpntsBase
+from base import options_tree, parallel_draw, lazy_import, spatial_index, geometry_backend
 import func_modules.cpls
 import func_modules.qubits
 import func_modules.qubits.primitives
-import components, copy, func_modules, gdspy, routing
+import components, contextlib, copy, func_modules, gdspy, routing
 import toolbox
-import simulation as sim
+
+# Simulation backends (win32com, IPython, pandas) are imported on first use
+sim = lazy_import.lazy_module("simulation")
 
 class Gds(GdsBase):
     """
     A GDS layout object that includes comprehensive operation methods for the layout.
     """
+    cache_options = True
 
     def __init__(self, **init_ops):
         """
@@ -46,9 +51,16 @@ class Gds(GdsBase):
         for cmpnts_name in self.cmpnts_name_list:
             cmpnts_class_name = toolbox.convert_to_camel_case(cmpnts_name)
             cmpnts_class = getattr(components, cmpnts_class_name)
-            super().__setattr__(cmpnts_name, cmpnts_class())
+            cmpnts = cmpnts_class()
+            cmpnts.set_options_parent(self, cmpnts_name)
+            super().__setattr__(cmpnts_name, cmpnts)
         # Initialize parameters
-        options = func_modules.gds.generate_gds(**init_ops)
+        if list(init_ops.keys()) == ["options"] and options_tree.unchanged_source(init_ops["options"]) is not None:
+            # Frozen parameters, e.g. of a snapshot (see `base.snapshot.load`), are injected without reading them,
+            # so the components are only built and decoded on first access
+            options = init_ops["options"]
+        else:
+            options = func_modules.gds.generate_gds(**init_ops)
         self.inject_options(options)
         return
     
@@ -73,12 +85,24 @@ class Gds(GdsBase):
             None
 
         Output:
-            options: Dict, containing option parameters for all components.
+            options: Dict, a copy-on-write view of the option parameters for all components.
+        """
+        return options_tree.thaw(self.frozen_options())
+
+    def build_frozen_options(self):
+        """
+        Combines the frozen option parameters of each component collection.
+
+        Input:
+            None
+
+        Output:
+            options: FrozenDict, containing option parameters for all components.
         """
-        options = Dict()
+        options = {}
         for cmpnts_name in self.cmpnts_name_list:
-            options[cmpnts_name] = getattr(self, cmpnts_name).options
-        return copy.deepcopy(options)
+            options[cmpnts_name] = getattr(self, cmpnts_name).frozen_options()
+        return options_tree.new_frozen(options)
 
     def inject_options(self, options):
         """
@@ -91,47 +115,179 @@ class Gds(GdsBase):
             None
         """
         options = copy.deepcopy(options)
-        self.clear()
+        for cmpnts_name in self.cmpnts_name_list:
+            if cmpnts_name not in options.keys():
+                getattr(self, cmpnts_name).clear()
         for cmpnts_name, cmpnts_ops in options.items():
+            cmpnts = self.__dict__.get(cmpnts_name)
+            if cmpnts is not None:
+                # Existing collections keep the instances of unchanged components and build the others lazily
+                cmpnts.inject_options(cmpnts_ops)
+                continue
             cmpnts_class_name = toolbox.convert_to_camel_case(cmpnts_name)
             cmpnts_class = getattr(components, cmpnts_class_name)
-            super().__setattr__(cmpnts_name, cmpnts_class(options=cmpnts_ops))
+            cmpnts = cmpnts_class(options=cmpnts_ops)
+            cmpnts.set_options_parent(self, cmpnts_name)
+            super().__setattr__(cmpnts_name, cmpnts)
+        self.touch_options()
         return
 
-    def draw_gds(self):
+    @contextlib.contextmanager
+    def transaction(self):
         """
-        Generate GDS layout based on component composition.
+        Batches component changes of all component collections, e.g.
+
+            with gds.transaction():
+                gds.qubits.insert_component(qubit_ops)
+                gds.coupling_lines.remove_component("cpl0")
+
+        The changes are validated once when the block exits, the component instances are built on first access.
+        If the block raises, the changes are discarded.
 
         Input:
             None
 
+        Output:
+            self, the Gds object.
+        """
+        cmpnts_list = [getattr(self, cmpnts_name) for cmpnts_name in self.cmpnts_name_list]
+        for cmpnts in cmpnts_list:
+            cmpnts.begin_transaction()
+        try:
+            yield self
+        except BaseException:
+            for cmpnts in cmpnts_list:
+                cmpnts.end_transaction(commit=False)
+            raise
+        # Validate every collection before applying the changes, so a bad component does not leave a partial update
+        try:
+            for cmpnts in cmpnts_list:
+                cmpnts.validate_pending()
+        except BaseException:
+            for cmpnts in cmpnts_list:
+                cmpnts.end_transaction(commit=False)
+            raise
+        for cmpnts in cmpnts_list:
+            cmpnts.end_transaction()
+        return
+
+    def set_geometry_backend(self, name: str = "gdspy"):
+        """
+        Selects the library the components and the lib of this layout are drawn with (see base.geometry_backend).
+        "gdstk" is faster; self.lib and self.cell are then gdstk objects, so tools reading them as gdspy objects
+        (e.g. show_gds, the GUI and the simulation exports) need "gdspy".
+
+        Input:
+            name: str, "gdspy" or "gdstk".
+
+        Output:
+            None
+
+        Exception:
+            ValueError: Throws an exception when the backend is unknown.
+            ImportError: Throws an exception when the library of the backend is not installed.
+        """
+        geometry_backend.get_backend(name)
+        self.geometry_backend = name
+        return
+
+    def set_geometry_precision(self, precision="default"):
+        """
+        Selects the arc tolerance the components of this layout are drawn with (see base.geometry_backend.PRECISIONS):
+        "preview" draws coarse arcs for interactive previews and SVG images, "tapeout" fine arcs for fabrication.
+        The components are redrawn at their next use, see vertex_counts for the resulting point counts.
+
+        Input:
+            precision: str or float, "preview", "default", "tapeout", or an arc tolerance in um.
+
+        Output:
+            None
+
+        Exception:
+            ValueError: Throws an exception when the precision is unknown or the tolerance is not positive.
+        """
+        self.geometry_tolerance = geometry_backend.get_tolerance(precision)
+        return
+
+    @geometry_backend.uses_backend
+    def vertex_counts(self):
+        """
+        Counts the polygons and vertices of the drawn components of all collections per component type,
+        see CmpntsBase.vertex_counts.
+
+        Input:
+            None
+
+        Output:
+            counts: Dict, {type: {"components": int, "polygons": int, "vertices": int}}.
+        """
+        counts = Dict()
+        for cmpnts_name in self.cmpnts_name_list:
+            for type_name, type_counts in getattr(self, cmpnts_name).vertex_counts().items():
+                for count_name, count in type_counts.items():
+                    counts[type_name][count_name] = counts[type_name].get(count_name, 0) + count
+        return counts
+
+    @geometry_backend.uses_backend
+    def draw_gds(self, workers: int = None):
+        """
+        Generate GDS layout based on component composition.
+        Only changed components are redrawn, and only the chips containing them are flattened again.
+
+        Input:
+            workers: int, the number of worker processes drawing the components of all collections, default is CmpntsBase.draw_workers.
+
         Output:
             None
         """
-        gdspy.library.use_current_library = False
-        self.lib = gdspy.GdsLibrary()
-        self.cell_Dict = Dict()
+        if workers is None:
+            workers = CmpntsBase.draw_workers
+        if workers > 1:
+            cmpnt_list = []
+            for cmpnts_name in self.cmpnts_name_list:
+                cmpnts = getattr(self, cmpnts_name)
+                cmpnt_list.extend(getattr(cmpnts, cmpnt_name) for cmpnt_name in cmpnts.cmpnt_name_list)
+            parallel_draw.draw_components(cmpnt_list, workers)
+
         # Draw GDS for each component
+        chip_sources = {}
         for cmpnts_name in self.cmpnts_name_list:
             cmpnts = getattr(self, cmpnts_name)
             cmpnts.draw_gds()
-        # Add each component's cell to the library
+            for cell_name, cell in cmpnts.cell_Dict.items():
+                chip_sources.setdefault(cell_name, []).append(cell)
+        # Reference each component's chip cell in the library, they are already layered by chip name
+        self.assemble_chip_cells(chip_sources, flat_sources=True)
+        return
+
+    @geometry_backend.uses_backend
+    def draw_placements(self):
+        """
+        Draws the changed components of all component collections, and lists the chip of each drawn cell.
+
+        Input:
+            None
+
+        Output:
+            placements: list, (chip_name, cmpnt, cell_name) for each cell, see CmpntsBase.draw_placements.
+        """
+        placements = []
         for cmpnts_name in self.cmpnts_name_list:
-            cmpnts = getattr(self, cmpnts_name)
-            cmpnts_cell_Dict = copy.deepcopy(cmpnts.cell_Dict)
-            for cell_name, cell in cmpnts_cell_Dict.items():
-                if cell_name not in self.cell_Dict.keys():  # If the cell does not exist, create a new one
-                    self.cell_Dict[cell_name] = self.lib.new_cell(cell_name)
-                self.cell_Dict[cell_name].add(cell)
-        # Layer by chip name
-        for chip_name, cell in self.cell_Dict.items():
-            layer_num = toolbox.custom_hash(chip_name)
-            self.cell_Dict[chip_name].flatten(single_layer=layer_num, single_datatype=0)
-        # Create the overall cell
-        module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
-        self.cell = self.lib.new_cell(module_name)
-        for chip_name, chip_cell in self.cell_Dict.items():
-            self.cell.add(chip_cell)
+            placements.extend(getattr(self, cmpnts_name).draw_placements())
+        return placements
+
+    def stream_placements(self):
+        """
+        Draws the components of all component collections one at a time, see CmpntsBase.stream_placements.
+
+        Input:
+            None
+
+        Output:
+            generator: (cmpnt, placements) for each component.
+        """
+        for cmpnts_name in self.cmpnts_name_list:
+            yield from getattr(self, cmpnts_name).stream_placements()
         return
 
     def calc_general_ops(self):
@@ -261,9 +417,8 @@ class Gds(GdsBase):
         Output:
             None
         """
-        ops = self.options
-        q0_ops = copy.deepcopy(ops.qubits[q0_name])
-        q1_ops = copy.deepcopy(ops.qubits[q1_name])
+        q0_ops = copy.deepcopy(self.qubits.options[q0_name])
+        q1_ops = copy.deepcopy(self.qubits.options[q1_name])
 
         cpl_ops = func_modules.cpls.add_cpl(q0_ops=q0_ops,
                                                 q0_pin_num=q0_pin_num,
@@ -273,8 +428,7 @@ class Gds(GdsBase):
                                                 chip=chip,
                                                 geometric_ops=geometric_ops)
 
-        ops.coupling_lines[cpl_ops.name] = copy.deepcopy(cpl_ops)
-        self.inject_options(ops)
+        self.coupling_lines.set_component(cpl_ops.name, cpl_ops)  # Only the new coupling line is built
         return
 
     def routing(self, **routing_ops):
@@ -305,12 +459,10 @@ class Gds(GdsBase):
         Output:
             None
         """
-        ops = self.options
         new_chip_ops = func_modules.chips.generate_chip_ops(chip_name=chip_name, 
                                                             chip_type=chip_type, 
                                                             geometric_ops=geometric_ops)
-        ops.chips[chip_name] = copy.deepcopy(new_chip_ops)  # Add parameters for the new chip
-        self.inject_options(ops)  # Update GDS options
+        self.chips.set_component(chip_name, new_chip_ops)  # Add parameters for the new chip
         return
 
     def copy_chip(self, old_chip_name, new_chip_name):
@@ -324,10 +476,7 @@ class Gds(GdsBase):
         Output:
             None
         """
-        gds_ops = copy.deepcopy(self.options)
-        gds_ops.chips[new_chip_name] = copy.deepcopy(gds_ops.chips[old_chip_name])  # Copy chip parameters
-        gds_ops.chips[new_chip_name].name = new_chip_name  # Update the name of the new chip
-        self.inject_options(gds_ops)  # Update GDS options
+        self.chips.copy_chip(old_chip_name, new_chip_name)  # Only the new chip is built
         return
 
     def generate_readout_lines_from_qubits(self, **gene_ops):
@@ -738,9 +887,48 @@ class Gds(GdsBase):
         self.inject_options(new_gds_ops)
         return
     
+    def spatial_index(self, cell_size: float = None):
+        """
+        Returns the spatial index of the component outlines and line paths (see base.spatial_index), e.g.
+
+            index = design.gds.spatial_index()
+            index.query_bbox((0, 0, 5000, 5000), families="qubits")
+            index.nearest((100, 200), k=4)
+            index.intersect_segment((0, 0), (6000, 0), families="transmission_lines")
+
+        The index is kept between calls, only the components whose parameters changed are indexed again.
+
+        Input:
+            cell_size: float, the size of the grid cells in um, changing it rebuilds the index. Default 1000.
+
+        Output:
+            index: SpatialIndex
+        """
+        index = self.__dict__.get("spatial_idx")
+        if index is None or (cell_size is not None and cell_size != index.cell_size):
+            index = spatial_index.SpatialIndex(cell_size or spatial_index.DEFAULT_CELL_SIZE)
+            self.spatial_idx = index
+        for cmpnts_name in self.cmpnts_name_list:
+            index.update_family(cmpnts_name, getattr(self, cmpnts_name).frozen_options())
+        return index
+
+    @geometry_backend.uses_backend
+    def get_bounding_box(self, chip_name: str = None):
+        """
+        Gets the bounding box of the drawn components, kept up to date per component, collection and chip
+        (see CmpntsBase.get_bounding_box), so repeated calls do not walk the layout.
+
+        Input:
+            chip_name: str, only the cells on this chip, default all chips.
+
+        Output:
+            bbox: tuple, ((x_min, y_min), (x_max, y_max)), or None when there is no polygon.
+        """
+        return toolbox.merge_bounding_boxes([getattr(self, cmpnts_name).get_bounding_box(chip_name)
+                                             for cmpnts_name in self.cmpnts_name_list])
+
     def get_gds_bounding_box(self):
-        min_coor, max_coor = toolbox.get_cell_bounding_box(self.cell)
-        return min_coor, max_coor
+        return self.get_bounding_box()
     
     def custom_function(self, options1, options2):
         gds_ops = self.options
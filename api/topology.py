@@ -3,15 +3,24 @@
 #########################
 
 
-import networkx as nx
-import matplotlib.pyplot as plt
 from addict import Dict
 from base.base import Base
-import equ_circ, copy
+from base import lazy_import, options_tree
+import equ_circ, copy, collections
+import numpy as np
 import func_modules
 import func_modules.topo
 import func_modules.topo.primitives
 
+# Only needed to show topologies
+plt = lazy_import.lazy_module("matplotlib.pyplot")
+mpl_collections = lazy_import.lazy_module("matplotlib.collections")
+mpl_figure = lazy_import.lazy_module("matplotlib.figure")
+mpl_backend_agg = lazy_import.lazy_module("matplotlib.backends.backend_agg")
+
+# Above this number of qubits the images are drawn without qubit names, unless labels is set
+LABEL_MAX_NODES = 256
+
 class Topology(Base):
     """
     Defines and operates on the topology of a quantum chip, including nodes, edges, and visualization features.
@@ -40,13 +49,17 @@ class Topology(Base):
         Output:
             None
         """
-        # Initialize parameters
-        super().__setattr__("positions", Dict())  # Node positions
-        super().__setattr__("edges", [])  # Edge list
+        # Initialize parameters, positions and edges are tracked (see touch_options)
+        super().__setattr__("positions", options_tree.track(Dict(), self))  # Node positions
+        super().__setattr__("edges", options_tree.track([], self))  # Edge list
         super().__setattr__("col_num", 0)  # Number of columns
         super().__setattr__("row_num", 0)  # Number of rows
         # Save the list of parameter names
         super().__setattr__("op_name_list", list(self.__dict__.keys()))
+        # Lookup tables of the positions and edges, see index_topology
+        super().__setattr__("position_index", {})
+        super().__setattr__("edge_index", collections.Counter())
+        super().__setattr__("index_dirty", True)
         # Call the module to generate topology options
         options = func_modules.topo.generate_topology(**init_ops)
         self.inject_options(options)  # Inject the generated options
@@ -79,18 +92,40 @@ class Topology(Base):
         """
         for k, v in options.items():
             if k == "positions":
-                super().__setattr__(k, copy.deepcopy(v))
+                super().__setattr__(k, options_tree.track(copy.deepcopy(v), self))
             elif k == "edges":
-                super().__setattr__(k, copy.deepcopy(v))
+                super().__setattr__(k, options_tree.track(copy.deepcopy(v), self))
             elif k == "col_num":
                 super().__setattr__(k, copy.deepcopy(v))
             elif k == "row_num":
                 super().__setattr__(k, copy.deepcopy(v))
+        self.index_topology()
         return
 
-    def show_image(self):
+    def __setattr__(self, name, value):
         """
-        Draw the topology structure image.
+        Sets an attribute, rebuilding the lookup tables when the positions or the edges are replaced.
+        Positions and edges are stored as tracked copies, which mark the lookup tables as outdated when they are
+        modified in place (see touch_options).
+
+        Input:
+            name: str, the attribute name.
+            value: any type, the attribute value.
+
+        Output:
+            None
+        """
+        if name in ("positions", "edges"):
+            super().__setattr__(name, options_tree.track(value, self))
+            self.index_topology()
+            return
+        super().__setattr__(name, value)
+        return
+
+    def touch_options(self):
+        """
+        Called when the positions or the edges are modified in place, e.g. `topology.positions.q0 = (1, 2)` or
+        `topology.edges[0][1] = "q5"`: the lookup tables are rebuilt on the next lookup.
 
         Input:
             None
@@ -98,76 +133,166 @@ class Topology(Base):
         Output:
             None
         """
-        # Interface
-        positions = copy.deepcopy(self.positions)  # Node positions
-        edges = copy.deepcopy(self.edges)  # Edges
-        nodes = list(self.positions.keys())  # Node list
-        col_num = self.col_num
-        row_num = self.row_num
+        super().__setattr__("index_dirty", True)
+        super().touch_options()
+        return
 
-        # Create graph
-        G = nx.Graph()
-        for node in nodes:
-            G.add_node(node)  # Add node
-        for edge in edges:
-            G.add_edge(edge[0], edge[1])  # Add edge
+    @staticmethod
+    def edge_key(edge):
+        """
+        Returns the key of an undirected edge in the edge index, the same for both orientations.
 
-        plt.figure(figsize=(0.8 * col_num + 5, 0.8 * row_num + 5))  # Set image size
-        pos = {node: (positions[node][0], positions[node][1]) for node in nodes}  # Node position dictionary
+        Input:
+            edge: list or tuple, the two node names of the edge.
 
-        # Draw nodes and edges
-        nx.draw_networkx_nodes(G, pos, node_size=500, node_color="#ccebc5")
-        nx.draw_networkx_edges(G, pos, width=5, edge_color="#80b1d3")
+        Output:
+            key: frozenset, the node names of the edge.
+        """
+        return frozenset((edge[0], edge[1]))
 
-        # Add node labels
-        labels = {node: node for node in nodes}
-        nx.draw_networkx_labels(G, pos, labels, font_size=10, font_color='black')
+    def index_topology(self):
+        """
+        Rebuilds the lookup tables of the topology: the qubit name of each position (the first one when several
+        qubits share a position) and the number of copies of each undirected edge.
+        The tables are kept in sync by inject_options, add_edge, add_edges, remove_edge and the batch methods,
+        and are rebuilt on the next lookup when the positions or the edges were modified directly.
 
-        plt.axis('off')
-        plt.show()
+        Input:
+            None
+
+        Output:
+            None
+        """
+        position_index = {}
+        for q, pos in self.positions.items():
+            position_index.setdefault(tuple(pos), q)
+        edge_index = collections.Counter(self.edge_key(edge) for edge in self.edges)
+        super().__setattr__("position_index", position_index)
+        super().__setattr__("edge_index", edge_index)
+        super().__setattr__("index_dirty", False)
         return
 
-    def save_image(self, path: str = "./topology.png"):
+    def check_index(self):
         """
-        Save the topology image as a PNG file.
+        Rebuilds the lookup tables if positions or edges were modified without the Topology methods.
 
         Input:
-            path: str, the path to save the image, default is "./topology.png".
+            None
 
         Output:
             None
         """
-        # Interface
-        positions = copy.deepcopy(self.positions)
-        edges = copy.deepcopy(self.edges)
-        nodes = list(self.positions.keys())
-        col_num = self.col_num
-        row_num = self.row_num
+        if self.index_dirty:
+            self.index_topology()
+        return
 
-        # Create graph
-        G = nx.Graph()
-        for node in nodes:
-            G.add_node(node)
-        for edge in edges:
-            G.add_edge(edge[0], edge[1])
+    def append_edges(self, edges):
+        """
+        Appends edges to the edge list and to the edge index.
 
-        plt.figure(figsize=(0.8 * col_num, 0.8 * row_num))
-        pos = {node: (positions[node][0], positions[node][1]) for node in nodes}
+        Input:
+            edges: list, the edges to append.
 
-        # Draw nodes and edges
-        nx.draw_networkx_nodes(G, pos, node_size=500, node_color="#ccebc5")
-        nx.draw_networkx_edges(G, pos, width=5, edge_color="#80b1d3")
+        Output:
+            None
+        """
+        self.check_index()
+        list.extend(self.edges, [options_tree.track(edge, self) for edge in edges])  # The index is updated below
+        self.edge_index.update(self.edge_key(edge) for edge in edges)
+        super().touch_options()
+        return
 
-        # Add node labels
-        labels = {node: node for node in nodes}
-        nx.draw_networkx_labels(G, pos, labels, font_size=10, font_color='black')
+    def show_image(self, labels: bool = None):
+        """
+        Draw the topology structure image.
 
-        plt.axis('off')
+        Input:
+            labels: bool, whether to write the qubit names. If None, they are written up to LABEL_MAX_NODES qubits.
+
+        Output:
+            None
+        """
+        col_num, row_num = self.image_grid_size()
+        fig = plt.figure(figsize=(0.8 * col_num + 5, 0.8 * row_num + 5))  # Set image size
+        self.draw_image(fig.add_subplot(), labels)
+        plt.show()
+        return
+
+    def save_image(self, path: str = "./topology.png", labels: bool = None, dpi: float = None):
+        """
+        Save the topology image as a PNG file (or any format matplotlib writes, chosen by the extension).
+        The figure is drawn off-screen without pyplot, so it works headless and does not accumulate open figures in batch jobs.
+
+        Input:
+            path: str, the path to save the image, default is "./topology.png".
+            labels: bool, whether to write the qubit names. If None, they are written up to LABEL_MAX_NODES qubits.
+            dpi: float, the resolution of raster images. If None, the matplotlib default is used.
+
+        Output:
+            None
+        """
+        col_num, row_num = self.image_grid_size()
+        fig = mpl_figure.Figure(figsize=(0.8 * col_num, 0.8 * row_num))
+        mpl_backend_agg.FigureCanvasAgg(fig)
+        self.draw_image(fig.add_subplot(), labels)
 
         # Save image
         import toolbox
         toolbox.jg_and_create_path(path)
-        plt.savefig(path)
+        fig.savefig(path, dpi=dpi)
+        return
+
+    def image_grid_size(self):
+        """
+        Returns the number of columns and rows used to size the topology images,
+        from col_num and row_num or, when they are not set, from the extent of the positions.
+
+        Input:
+            None
+
+        Output:
+            col_num: float, the number of columns.
+            row_num: float, the number of rows.
+        """
+        col_num, row_num = self.col_num, self.row_num
+        if (not col_num or not row_num) and len(self.positions) > 0:
+            xy = np.array([(pos[0], pos[1]) for pos in self.positions.values()], dtype=float)
+            col_num, row_num = xy.max(axis=0) - xy.min(axis=0) + 1
+        return max(col_num, 1), max(row_num, 1)
+
+    def draw_image(self, ax, labels: bool = None):
+        """
+        Draw the topology on matplotlib axes: all edges as one line collection and all qubits as one scatter collection.
+
+        Input:
+            ax: matplotlib Axes, the axes to draw on.
+            labels: bool, whether to write the qubit names. If None, they are written up to LABEL_MAX_NODES qubits.
+
+        Output:
+            None
+        """
+        nodes = list(self.positions.keys())
+        if labels is None:
+            labels = len(nodes) <= LABEL_MAX_NODES
+        xy = np.array([(self.positions[node][0], self.positions[node][1]) for node in nodes], dtype=float).reshape(-1, 2)
+
+        # Draw edges and nodes
+        segments = [((self.positions[q0][0], self.positions[q0][1]), (self.positions[q1][0], self.positions[q1][1]))
+                    for q0, q1 in self.edges]
+        ax.add_collection(mpl_collections.LineCollection(segments, linewidths=5, colors="#80b1d3", zorder=1))
+        ax.scatter(xy[:, 0], xy[:, 1], s=500, c="#ccebc5", zorder=2)
+
+        # Add node labels
+        if labels:
+            for node, (x, y) in zip(nodes, xy):
+                ax.text(x, y, node, fontsize=10, color="black", ha="center", va="center", zorder=3)
+
+        # Pad the limits by 5% of the extent so the outer qubits are not clipped
+        if len(xy) > 0:
+            pad = 0.05 * (xy.max(axis=0) - xy.min(axis=0))
+            ax.update_datalim([xy.min(axis=0) - pad, xy.max(axis=0) + pad])
+        ax.autoscale_view()
+        ax.axis('off')
         return
 
     def change_equ_circ(self, **change_ops):
@@ -208,7 +333,7 @@ class Topology(Base):
         Output:
             None
         """
-        self.edges.append([q0_name, q1_name])
+        self.append_edges([[q0_name, q1_name]])
         return
 
     def remove_edge(self, edge: tuple = None):
@@ -216,14 +341,27 @@ class Topology(Base):
         Remove a specified edge.
 
         Input:
-            edge: tuple, the edge to be removed.
+            edge: tuple, the edge to be removed, in either orientation.
 
         Output:
             None
-        """
-        print(self.edges)
-        print("edge = {}".format(edge))
-        self.edges.remove(edge)
+
+        Exception:
+            ValueError: If the edge is not in the topology.
+        """
+        self.check_index()
+        key = self.edge_key(edge)
+        if self.edge_index[key] == 0:
+            raise ValueError("Edge {} is not in the topology".format(edge))
+        # Remove the first copy with the same orientation, otherwise the first reversed one
+        edge_i = next((i for i, e in enumerate(self.edges) if list(e) == list(edge)), None)
+        if edge_i is None:
+            edge_i = next(i for i, e in enumerate(self.edges) if self.edge_key(e) == key)
+        list.__delitem__(self.edges, edge_i)  # The index is updated below
+        self.edge_index[key] -= 1
+        if self.edge_index[key] == 0:
+            del self.edge_index[key]
+        super().touch_options()
         return
 
     def add_edges(self, edges: list = None):
@@ -236,7 +374,7 @@ class Topology(Base):
         Output:
             None
         """
-        super().__setattr__("edges", self.edges + edges)
+        self.append_edges(list(edges))
         return
 
     def calc_equ_circ(self):
@@ -263,12 +401,11 @@ class Topology(Base):
         Output:
             q: str, the corresponding qubit name. If not found, return None.
         """
-        ops = self.options
-        for q, p in ops.positions.items():
-            if p == pos:
-                return q
-        print("No qubit found for {}".format(pos))
-        return
+        self.check_index()
+        q = self.position_index.get(tuple(pos))
+        if q is None:
+            print("No qubit found for {}".format(pos))
+        return q
 
     def if_edge(self, edge):
         """
@@ -280,15 +417,8 @@ class Topology(Base):
         Output:
             bool: If the edge exists (including both orientations of an undirected edge), return True; otherwise, return False.
         """
-        ops = self.options
-        for e in ops.edges:
-            if edge == e:
-                return True
-            else:
-                eedge = [edge[1], edge[0]]  # Reverse edge
-                if eedge == e:
-                    return True
-        return False
+        self.check_index()
+        return self.edge_index[self.edge_key(edge)] > 0
 
     def generate_random_edges(self, edges_num: int = None):
         """
@@ -305,6 +435,26 @@ class Topology(Base):
         self.inject_options(topo_ops)  
         return
 
+    def generate_connected_edges(self, edges_num: int = None, seed: int = None, rng=None):
+        """
+        Generate random edges keeping the topology connected (a random spanning tree plus random extra edges) and inject them into the topology.
+
+        Input:
+            edges_num: int, the number of edges to generate, between the number of qubits minus one and the number of nearest-neighbour edges. If None, use a random number.
+            seed: int, the seed of a new random generator. If None, rng is used.
+            rng: random.Random, the random generator, used when seed is None. If None as well, the global random generator is used.
+
+        Output:
+            None
+
+        Exception:
+            ValueError: Throws an exception when the qubits can not be connected or edges_num is out of range, see func_modules.topo.primitives.generate_connected_edges.
+        """
+        topo_ops = Dict()
+        topo_ops.edges = func_modules.topo.generate_connected_edges(self.positions, edges_num, seed, rng)
+        self.inject_options(topo_ops)
+        return
+
     def batch_add_edges(self, y=None, x=None):
         """
         Batch add edges based on specified rows or columns.
@@ -319,44 +469,18 @@ class Topology(Base):
         Exception:
             ValueError: If the specified row or column is out of range.
         """
-        max_y = 0  # Maximum row number
-        max_x = 0  # Maximum column number
-        old_ops = self.options
-
-        # Get the maximum row and column numbers of all nodes
-        for q, pos in old_ops.positions.items():
-            max_y = max(max_y, pos[1])
-            max_x = max(max_x, pos[0])
-        
-        # Check if the row or column is out of range
         if y is not None:
-            if y > max_y:
-                raise ValueError("Row overflow, y = {}, max_y = {}".format(y, max_y))
-        if x is not None:
-            if x > max_x:
-                raise ValueError("Column overflow, x = {}, max_x = {}".format(x, max_x))
-
-        new_ops = copy.deepcopy(old_ops)
-
-        # Batch add edges in the row direction
-        if y is not None:
-            for x in range(0, max_x):
-                if not self.if_edge([self.find_qname((x, y)), self.find_qname((x + 1, y))]):
-                    new_ops.edges.append((self.find_qname((x, y)), self.find_qname((x + 1, y))))
-        # Batch add edges in the column direction
+            self.batch_add_edges_list(y=[y])
         elif x is not None:
-            for y in range(0, max_y):
-                if not self.if_edge([self.find_qname((x, y)), self.find_qname((x, y + 1))]):
-                    new_ops.edges.append((self.find_qname((x, y)), self.find_qname((x, y + 1))))
+            self.batch_add_edges_list(x=[x])
         else:
             raise ValueError("Either y or x must be specified!")  # If neither y nor x is specified, throw an exception
-
-        self.inject_options(new_ops)  # Inject the new edges into the options
         return
 
     def batch_add_edges_list(self, y=None, x=None):
         """
-        Batch add edges based on multiple specified rows or columns.
+        Batch add edges based on multiple specified rows or columns, in one pass over the rows or columns.
+        Edges already in the topology and pairs of positions without a qubit are skipped.
 
         Input:
             y: list, a list of specified row numbers. If None, it is ignored.
@@ -364,13 +488,45 @@ class Topology(Base):
 
         Output:
             None
+
+        Exception:
+            ValueError: If a specified row or column is out of range.
         """
+        self.check_index()
+        max_y = 0  # Maximum row number
+        max_x = 0  # Maximum column number
+        for pos in self.position_index.keys():
+            max_y = max(max_y, pos[1])
+            max_x = max(max_x, pos[0])
+
+        # Check if the rows or columns are out of range
+        for r in y if y is not None else []:
+            if r > max_y:
+                raise ValueError("Row overflow, y = {}, max_y = {}".format(r, max_y))
+        for c in x if x is not None else []:
+            if c > max_x:
+                raise ValueError("Column overflow, x = {}, max_x = {}".format(c, max_x))
+
+        # Pairs of neighbouring positions along the rows or the columns
         if y is not None:
-            for r in y:  # Iterate over all rows
-                self.batch_add_edges(y=r)
+            pairs = [((c, r), (c + 1, r)) for r in y for c in range(0, max_x)]
         elif x is not None:
-            for c in x:  # Iterate over all columns
-                self.batch_add_edges(x=c)
+            pairs = [((c, r), (c, r + 1)) for c in x for r in range(0, max_y)]
+        else:
+            return
+
+        new_edges = []
+        new_keys = set()
+        for pos0, pos1 in pairs:
+            edge = (self.position_index.get(pos0), self.position_index.get(pos1))
+            if edge[0] is None or edge[1] is None:
+                continue
+            key = self.edge_key(edge)
+            if self.edge_index[key] > 0 or key in new_keys:
+                continue
+            new_keys.add(key)
+            new_edges.append(edge)
+        self.append_edges(new_edges)
         return
 
     def generate_hex_full_edges(self):
@@ -396,6 +552,23 @@ class Topology(Base):
         self.inject_options(topo_ops)
         return
     
+    def generate_hex_lattice(self, num_rows: int = 4, num_cols: int = 8, shape: str = "hex"):
+        """
+        Generate the positions and edges of a hexagonal or heavy-hex lattice on integer coordinates,
+        see func_modules.topo.primitives.generate_hex_lattice.
+
+        Input:
+            num_rows: int, the number of rows.
+            num_cols: int, the number of qubits in each row.
+            shape: str, "hex" or "heavy_hex".
+
+        Output:
+            None
+        """
+        topo_ops = func_modules.topo.generate_topology(shape=shape, topo_col=num_cols, topo_row=num_rows)
+        self.inject_options(topo_ops)
+        return
+
     def generate_full_edges(self):
         topo_ops = self.options
         edges = func_modules.topo.primitives.generate_full_edges(topo_ops.positions)
@@ -5,12 +5,20 @@
 from addict import Dict
 import copy, gdspy
 import toolbox
+from base import options_tree, snapshot
 
 class Base():
     """
     Base class providing general methods, including displaying parameters and importing/exporting functionalities.
     All subclasses inherit from this class and must implement necessary methods (such as `extract_options` and `inject_options`).
+
+    Subclasses which set `cache_options = True` keep a frozen copy of their options (see `base.options_tree`),
+    so reading `options` only creates a copy-on-write view. They must call `touch_options` whenever an option changes.
+    Components (LibraryBase) do it when a parameter is assigned, and store list and dict parameters as tracked containers
+    which also call it when they are modified in place (see `options_tree.track`).
     """
+    cache_options = False
+
     def __init__(self):
         """
         Initializes the Base class.
@@ -61,6 +69,8 @@ class Base():
         """
         Exports the current object's parameters to a specified path.
 
+        Paths ending with .edaq or .edaqz are saved as binary snapshots (see `base.snapshot`), .edaqz is compressed.
+
         Input:
             path: str, the path to export the file.
 
@@ -68,12 +78,17 @@ class Base():
             None (parameters are saved to the specified path).
         """
         options = self.extract_options()  # Extract all parameters of the current object
+        if snapshot.is_snapshot_path(path):
+            snapshot.save(options, path)
+            print(f"Data exported successfully to {path}")
+            return
         toolbox.export_options(data=options, path=path)  # Call the utility class to save parameters to a file
         return
 
     def import_options(self, path):
         """
         Imports parameters from a specified path and injects them into the current object.
+        Paths ending with .edaq or .edaqz are read as binary snapshots (see `base.snapshot`).
 
         Input:
             path: str, the path to the parameter file.
@@ -81,7 +96,10 @@ class Base():
         Output:
             options: dict, the imported parameters.
         """
-        options = toolbox.import_options(path)  # Import parameters from the path
+        if snapshot.is_snapshot_path(path):
+            options = snapshot.load(path)
+        else:
+            options = toolbox.import_options(path)  # Import parameters from the path
         self.inject_options(options)  # Inject the imported parameters into the current object
         return copy.deepcopy(options)  # Return the imported parameters (deep copy)
 
@@ -94,7 +112,86 @@ class Base():
             None
 
         Output:
-            options: dict, the current object's parameters (deep copy).
+            options: Dict, a copy-on-write view of the current object's parameters, it can be modified freely.
+
+        The view is a snapshot: modifying it does not change the object, and it does not follow later changes.
+        With cached options, in-place edits of component parameters are seen by the next read when the parameter is
+        a list, dict, or a tuple of them, e.g. `qubits.q4.coupling_pins[0] = (0, 0)` or `cmpnt.outline.append(...)`.
+        In-place edits of other mutable values (NumPy arrays, custom objects) are not detected: assign a new value instead.
         """
-        options = self.extract_options()  # Extract all parameters of the current object
-        return copy.deepcopy(options)  # Return a deep copy of the parameters
\ No newline at end of file
+        return options_tree.thaw(self.frozen_options())
+
+    def frozen_options(self):
+        """
+        Returns the frozen (read-only, shared) parameters of the current object.
+
+        Input:
+            None
+
+        Output:
+            options: FrozenDict, the current object's parameters, cached when `cache_options` is True.
+        """
+        frozen = self.__dict__.get("frozen_ops")
+        if frozen is None:
+            frozen = self.build_frozen_options()
+            if self.cache_options:
+                object.__setattr__(self, "frozen_ops", frozen)
+        return frozen
+
+    def build_frozen_options(self):
+        """
+        Builds the frozen parameters of the current object. Containers override it to reuse the frozen parameters of their children.
+
+        Input:
+            None
+
+        Output:
+            options: FrozenDict, the current object's parameters.
+        """
+        return options_tree.freeze(self.extract_options(), copy_leaves=False)  # extract_options returns a private copy
+
+    def touch_options(self):
+        """
+        Drops the cached frozen parameters of the current object and of the objects containing it.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        cached = self.__dict__.get("frozen_ops") is not None
+        object.__setattr__(self, "frozen_ops", None)
+        # A container is only cached while all its children are, so an uncached object has nothing to propagate
+        parent = self.__dict__.get("options_parent")
+        if cached and parent is not None:
+            parent.touch_child_options(self.__dict__.get("options_key"))
+        return
+
+    def touch_child_options(self, key):
+        """
+        Called when the parameters of a contained object changed. By default the whole cache is dropped.
+
+        Input:
+            key: str, the name of the contained object.
+
+        Output:
+            None
+        """
+        self.touch_options()
+        return
+
+    def set_options_parent(self, parent, key: str = None):
+        """
+        Registers the object containing the current object, its cached parameters are dropped together with ours.
+
+        Input:
+            parent: Base, the containing object.
+            key: str, the name of the current object in the parent's parameters.
+
+        Output:
+            None
+        """
+        object.__setattr__(self, "options_parent", parent)
+        object.__setattr__(self, "options_key", key)
+        return
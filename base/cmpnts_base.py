@@ -3,8 +3,11 @@
 ############################
 
 from addict import Dict
-import copy, gdspy, library
+import copy, gdspy, library, contextlib
+import numpy as np
 from base.gds_base import GdsBase
+from base.library_base import LibraryBase
+from base import options_tree, column_store, parallel_draw, geometry_backend
 import toolbox
 
 
@@ -12,6 +15,11 @@ class CmpntsBase(GdsBase):
     """
     The CmpntsBase class, a base class for components, includes common methods for all components.
     """
+    cache_options = True
+    # Library classes of each component collection, {module_name: {type: class}}
+    cmpnt_class_cache = {}
+    # Number of worker processes used by draw_gds, 1 draws in the current process
+    draw_workers = 1
 
     def __init__(self, **init_ops):
         """
@@ -30,9 +38,46 @@ class CmpntsBase(GdsBase):
         Output:
             None
         """
+        lazy_cmpnts = self.__dict__.get("lazy_cmpnts", {})
         for cmpnt_name in self.cmpnt_name_list:
-            delattr(self, cmpnt_name)  # Delete component attributes
+            if cmpnt_name in lazy_cmpnts:
+                del lazy_cmpnts[cmpnt_name]  # Never built
+            else:
+                delattr(self, cmpnt_name)  # Delete component attributes
         self.cmpnt_name_list.clear()  # Clear the component name list
+        self.__dict__.get("lazy_frozen_ops", {}).clear()
+        self.touch_options()
+
+    def __getattr__(self, name):
+        """
+        Builds a lazily injected component the first time it is accessed.
+
+        Input:
+            name: str, the attribute name.
+
+        Output:
+            cmpnt: LibraryBase, the component instance.
+
+        Exception:
+            AttributeError: Throws an exception when the attribute is not a component waiting to be built.
+        """
+        lazy_cmpnts = self.__dict__.get("lazy_cmpnts")
+        if lazy_cmpnts is None or name not in lazy_cmpnts:
+            raise AttributeError("'{}' object has no attribute '{}'".format(self.__class__.__name__, name))
+        entry = lazy_cmpnts[name]
+        cmpnt_class, options = entry
+        cmpnt = cmpnt_class(options=options)  # Calculates the pins and outline
+        del lazy_cmpnts[name]
+        record = self.__dict__.get("lazy_frozen_ops", {}).pop(name, None)
+        if record is not None and record[0] is entry:
+            # The frozen parameters handed out before the component was built stay its frozen parameters
+            lazy_entry, frozen, computed = record
+            if not computed:
+                computed.append(cmpnt.frozen_options())
+            object.__setattr__(cmpnt, "frozen_ops", frozen)
+        cmpnt.set_options_parent(self, name)
+        super().__setattr__(name, cmpnt)
+        return cmpnt
 
     def extract_options(self):
         """
@@ -42,17 +87,158 @@ class CmpntsBase(GdsBase):
             None
 
         Output:
-            options: Dict, a dictionary containing parameters of all components.
+            options: Dict, a copy-on-write view of the parameters of all components.
         """
-        options = Dict()
-        for cmpnt_name in self.cmpnt_name_list:
-            cmpnt_inst = getattr(self, cmpnt_name)  # Get component instance
-            options[cmpnt_name] = copy.deepcopy(getattr(cmpnt_inst, "options"))  # Deep copy parameters
-        return copy.deepcopy(options)
+        return options_tree.thaw(self.frozen_options())
+
+    def build_frozen_options(self):
+        """
+        Combines the frozen parameters of each component, components which did not change are shared with the previous snapshot.
+        Pending components of an open transaction are included.
+
+        Input:
+            None
+
+        Output:
+            options: FrozenDict, the parameters of all components.
+        """
+        pending = self.__dict__.get("pending_cmpnts_ops", {})
+        frozen_base = self.__dict__.get("frozen_ops_base")
+        if frozen_base is None:
+            options = {}
+            for cmpnt_name in self.cmpnt_name_list:
+                options[cmpnt_name] = self.cmpnt_frozen_options(cmpnt_name)
+            stale_names = list(pending.keys())
+        else:
+            # Only the components which changed since the previous snapshot are updated
+            options = dict(dict.items(frozen_base))
+            stale_names = self.stale_cmpnt_names
+
+        for cmpnt_name in stale_names:
+            if cmpnt_name in pending:
+                if pending[cmpnt_name] is None:
+                    options.pop(cmpnt_name, None)
+                else:
+                    options[cmpnt_name] = options_tree.freeze(pending[cmpnt_name], copy_leaves=False)
+            elif self.has_built_component(cmpnt_name):
+                options[cmpnt_name] = self.cmpnt_frozen_options(cmpnt_name)
+            else:
+                options.pop(cmpnt_name, None)
+
+        self.frozen_ops_base = None
+        self.stale_cmpnt_names = set()
+        return options_tree.new_frozen(options)
+
+    def cmpnt_frozen_options(self, name):
+        """
+        Gets the frozen parameters of a component without building it.
+        For a component which is not built yet, they are the default parameters of its class overridden by the
+        injected ones (see LibraryBase.lazy_frozen_options), the parameters calculated by calc_general_ops are only
+        computed when they are read, which builds the component.
+
+        Input:
+            name: str, the name of the component.
+
+        Output:
+            options: FrozenDict, the parameters of the component.
+        """
+        entry = self.__dict__.get("lazy_cmpnts", {}).get(name)
+        if entry is None:
+            return getattr(self, name).frozen_options()
+        if "lazy_frozen_ops" not in self.__dict__:
+            self.lazy_frozen_ops = {}
+        record = self.lazy_frozen_ops.get(name)
+        if record is not None and record[0] is entry:
+            return record[1]
+
+        cmpnt_class, options = entry
+        computed = []
+
+        def calculate():
+            if not computed:
+                if self.__dict__.get("lazy_cmpnts", {}).get(name) is entry:
+                    getattr(self, name)  # Builds the component, which fills computed
+                if not computed:
+                    computed.append(cmpnt_class(options=options).frozen_options())  # Replaced since, built aside
+            return computed[0]
+
+        frozen = cmpnt_class.lazy_frozen_options(options, calculate)
+        self.lazy_frozen_ops[name] = (entry, frozen, computed)
+        return frozen
+
+    def touch_options(self):
+        """
+        Drops the cached parameters of all components.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        self.frozen_ops_base = None
+        self.stale_cmpnt_names = set()
+        self.column_tables = {}
+        self.bbox_records = None  # Components keep their own bounding boxes, see get_bounding_box
+        super().touch_options()
+        return
+
+    def touch_child_options(self, key):
+        """
+        Marks a single component as changed, the next snapshot only updates this component.
+
+        Input:
+            key: str, the name of the component.
+
+        Output:
+            None
+        """
+        self.column_tables = {}
+        if self.__dict__.get("bbox_records") is not None:
+            self.bbox_stale_names.add(key)
+        frozen = self.__dict__.get("frozen_ops")
+        if frozen is not None:
+            self.frozen_ops_base = frozen
+            self.stale_cmpnt_names = set()
+            super().touch_options()
+        if self.__dict__.get("frozen_ops_base") is not None:
+            self.stale_cmpnt_names.add(key)
+        return
+
+    def get_cmpnt_class(self, cmpnt_name, cmpnt_type):
+        """
+        Gets the library class of a component type.
+
+        Input:
+            cmpnt_name: str, the name of the component (used in error messages).
+            cmpnt_type: str, the type of the component.
+
+        Output:
+            cmpnt_class: class, the library class.
+
+        Exception:
+            ValueError: Throws an exception when the component type is empty or not defined in the library.
+        """
+        if cmpnt_type == Dict():
+            raise ValueError(f"{cmpnt_name}'s type is empty!")  # Exception for empty type
+
+        module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
+        cmpnt_class_Dict = CmpntsBase.cmpnt_class_cache.setdefault(module_name, {})
+        cmpnt_class = cmpnt_class_Dict.get(cmpnt_type) if isinstance(cmpnt_type, str) else None
+        if cmpnt_class is None:
+            # Only the module of this type is imported (see `base.lazy_import.class_getter`)
+            module = getattr(library, module_name)
+            type_list = [toolbox.convert_to_camel_case(i) for i in getattr(module, "module_name_list")]
+            if not isinstance(cmpnt_type, str) or cmpnt_type not in type_list or not hasattr(module, cmpnt_type):
+                raise ValueError(f"{cmpnt_type} not in {type_list}")  # Exception for undefined type
+            cmpnt_class = cmpnt_class_Dict[cmpnt_type] = getattr(module, cmpnt_type)
+        return cmpnt_class
 
     def inject_options(self, options):
         """
         Injects component parameters into component instances.
+        The instances are built lazily, on first access. Components whose parameters are an unmodified snapshot of
+        an existing instance (e.g. `options` read from this collection) keep that instance.
 
         Input:
             options: dict, a dictionary containing component parameters.
@@ -64,27 +250,241 @@ class CmpntsBase(GdsBase):
             ValueError: Throws an exception when the component type is empty or not defined in the library.
         """
         options = copy.deepcopy(options)
+        old_cmpnts = {}
+        lazy_cmpnts = self.__dict__.get("lazy_cmpnts", {})
+        old_records = self.__dict__.get("lazy_frozen_ops", {})
+        for cmpnt_name in self.cmpnt_name_list:
+            if self.has_built_component(cmpnt_name, lazy=False):
+                old_cmpnts[cmpnt_name] = self.__dict__[cmpnt_name]
+        old_records = {name: record for name, record in old_records.items() if lazy_cmpnts.get(name) is record[0]}
         self.clear()  # Clear existing components
+        self.lazy_frozen_ops = {}
+        self.pending_cmpnts_ops = {}  # The injected parameters replace the pending components of an open transaction
         for cmpnt_name, cmpnt_ops in options.items():
-            cmpnt_type = cmpnt_ops.type
+            cmpnt = old_cmpnts.get(cmpnt_name)
+            frozen = options_tree.unchanged_source(cmpnt_ops)  # Checked before reading the view
+            if cmpnt is not None and frozen is not None and frozen is cmpnt.__dict__.get("frozen_ops"):
+                self.put_component(cmpnt_name, cmpnt)
+                continue
+            record = old_records.get(cmpnt_name)
+            if record is not None and frozen is not None and frozen is record[1]:
+                # Component which was not built yet, it keeps its injected parameters and frozen parameters
+                self.put_lazy_component(cmpnt_name, *record[0])
+                self.lazy_cmpnts[cmpnt_name] = record[0]
+                self.lazy_frozen_ops[cmpnt_name] = record
+                continue
 
-            ### Error checking ###
-            if cmpnt_type == Dict():
-                raise ValueError(f"{cmpnt_name}'s type is empty!")  # Exception for empty type
+            ### Inject component instances ###
+            cmpnt_class = self.get_cmpnt_class(cmpnt_name, cmpnt_ops.type)
+            self.put_lazy_component(cmpnt_name, cmpnt_class, cmpnt_ops)
+        self.touch_options()
 
-            module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
-            module_name_list = getattr(getattr(library, module_name), "module_name_list")
-            class_name_list = [toolbox.convert_to_camel_case(i) for i in module_name_list]
-            if cmpnt_type not in class_name_list:
-                raise ValueError(f"{cmpnt_type} not in {class_name_list}")  # Exception for undefined type
+    def has_built_component(self, name, lazy: bool = True):
+        """
+        Checks whether a component instance exists, ignoring pending transaction changes.
 
-            ### Inject component instances ###
-            super().__setattr__(cmpnt_name, getattr(getattr(library, module_name), cmpnt_type)(options=cmpnt_ops))
-            self.cmpnt_name_list.append(cmpnt_name)
+        Input:
+            name: str, the name of the component.
+            lazy: bool, whether components which are not built yet (see `inject_options`) are counted.
 
-    def draw_gds(self):
+        Output:
+            bool
         """
-        Draws the GDS layout of the components.
+        if lazy and name in self.__dict__.get("lazy_cmpnts", {}):
+            return True
+        return isinstance(self.__dict__.get(name), LibraryBase)
+
+    def has_component(self, name):
+        """
+        Checks whether a component exists, including pending transaction changes.
+
+        Input:
+            name: str, the name of the component.
+
+        Output:
+            bool
+        """
+        pending = self.__dict__.get("pending_cmpnts_ops", {})
+        if name in pending:
+            return pending[name] is not None
+        return self.has_built_component(name)
+
+    def set_component(self, name, options):
+        """
+        Inserts or replaces a single component, only this component instance is (re)built.
+        Inside a transaction the component is only validated and built when the transaction is committed.
+
+        Input:
+            name: str, the name of the component.
+            options: dict, the parameters of the component.
+
+        Output:
+            None
+
+        Exception:
+            ValueError: Throws an exception when the component type is empty or not defined in the library.
+        """
+        options = copy.deepcopy(options)
+        if not isinstance(options, Dict):
+            options = Dict(options)
+
+        if self.__dict__.get("transaction_depth", 0) > 0:
+            self.pending_cmpnts_ops[name] = options
+            self.touch_child_options(name)
+            return
+
+        cmpnt = self.get_cmpnt_class(name, options.type)(options=options)
+        self.put_component(name, cmpnt)
+        return
+
+    def put_component(self, name, cmpnt):
+        """
+        Stores a built component instance, keeping its position in the component list when it replaces another one.
+
+        Input:
+            name: str, the name of the component.
+            cmpnt: LibraryBase, the component instance.
+
+        Output:
+            None
+        """
+        cmpnt.set_options_parent(self, name)
+        if not self.has_built_component(name):
+            self.cmpnt_name_list.append(name)
+        self.__dict__.get("lazy_cmpnts", {}).pop(name, None)
+        self.__dict__.get("lazy_frozen_ops", {}).pop(name, None)
+        super().__setattr__(name, cmpnt)
+        self.touch_child_options(name)
+        return
+
+    def put_lazy_component(self, name, cmpnt_class, options):
+        """
+        Stores a component which is only built when it is first accessed, keeping its position in the component list when it replaces another one.
+
+        Input:
+            name: str, the name of the component.
+            cmpnt_class: class, the library class.
+            options: Dict, the parameters of the component, owned by the collection.
+
+        Output:
+            None
+        """
+        if not self.has_built_component(name):
+            self.cmpnt_name_list.append(name)
+        elif self.has_built_component(name, lazy=False):
+            delattr(self, name)
+        if "lazy_cmpnts" not in self.__dict__:
+            self.lazy_cmpnts = {}
+        self.lazy_cmpnts[name] = (cmpnt_class, options)
+        self.touch_child_options(name)
+        return
+
+    def insert_component(self, options, name: str = None):
+        """
+        Inserts a new component without rebuilding the other components.
+
+        Input:
+            options: dict, the parameters of the component.
+            name: str, the name of the component, defaults to options.name.
+
+        Output:
+            None
+
+        Exception:
+            ValueError: Throws an exception when the component already exists.
+        """
+        if name is None:
+            name = options["name"]
+        if self.has_component(name):
+            raise ValueError("{} already exists!".format(name))
+        self.set_component(name, options)
+        return
+
+    def replace_component(self, name, options):
+        """
+        Replaces an existing component without rebuilding the other components.
+
+        Input:
+            name: str, the name of the component.
+            options: dict, the new parameters of the component.
+
+        Output:
+            None
+
+        Exception:
+            ValueError: Throws an exception when the component does not exist.
+        """
+        if not self.has_component(name):
+            raise ValueError("There is no component named {}".format(name))
+        self.set_component(name, options)
+        return
+
+    def remove_component(self, name):
+        """
+        Removes a single component.
+
+        Input:
+            name: str, the name of the component.
+
+        Output:
+            None
+
+        Exception:
+            ValueError: Throws an exception when the component does not exist.
+        """
+        if not self.has_component(name):
+            raise ValueError("There is no component named {}".format(name))
+
+        if self.__dict__.get("transaction_depth", 0) > 0:
+            self.pending_cmpnts_ops[name] = None
+        else:
+            self.delete_component(name)
+        self.touch_child_options(name)
+        return
+
+    def delete_component(self, name):
+        """
+        Deletes a component instance (built or not) and its name.
+
+        Input:
+            name: str, the name of the component.
+
+        Output:
+            None
+        """
+        lazy_cmpnts = self.__dict__.get("lazy_cmpnts", {})
+        if name in lazy_cmpnts:
+            del lazy_cmpnts[name]
+            self.__dict__.get("lazy_frozen_ops", {}).pop(name, None)
+        else:
+            delattr(self, name)
+        self.cmpnt_name_list.remove(name)
+        return
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Batches component changes: inside the block, set_component / insert_component / replace_component / remove_component
+        only record the new parameters, they are validated once when the block exits and the component instances are built on first access.
+        If the block raises, the recorded changes are discarded. Nested transactions join the outer one.
+
+        Input:
+            None
+
+        Output:
+            self, the component collection.
+        """
+        self.begin_transaction()
+        try:
+            yield self
+        except BaseException:
+            self.end_transaction(commit=False)
+            raise
+        self.end_transaction()
+
+    def begin_transaction(self):
+        """
+        Opens a transaction, see `transaction`.
 
         Input:
             None
@@ -92,44 +492,250 @@ class CmpntsBase(GdsBase):
         Output:
             None
         """
-        gdspy.library.use_current_library = False
-        self.lib = gdspy.GdsLibrary()
-        self.cell_Dict = Dict()
+        if self.__dict__.get("transaction_depth", 0) == 0:
+            self.pending_cmpnts_ops = {}
+        self.transaction_depth = self.__dict__.get("transaction_depth", 0) + 1
+        return
+
+    def validate_pending(self, pending: dict = None):
+        """
+        Checks the types of the pending components of a transaction.
+
+        Input:
+            pending: dict, the pending components, defaults to the pending components of the open transaction.
+
+        Output:
+            cmpnt_class_Dict: dict, the library class of each pending component which is not removed.
+
+        Exception:
+            ValueError: Throws an exception when a pending component has an invalid type.
+        """
+        if pending is None:
+            pending = self.__dict__.get("pending_cmpnts_ops", {})
+        cmpnt_class_Dict = {}
+        for name, options in pending.items():
+            if options is not None:
+                cmpnt_class_Dict[name] = self.get_cmpnt_class(name, options.type)
+        return cmpnt_class_Dict
+
+    def end_transaction(self, commit: bool = True):
+        """
+        Closes a transaction, the outermost one commits or discards the pending changes.
 
-        # Generate libs for each component
+        Input:
+            commit: bool, whether the pending changes are applied.
+
+        Output:
+            None
+
+        Exception:
+            ValueError: Throws an exception when a pending component has an invalid type, nothing is applied in that case.
+        """
+        if self.__dict__.get("transaction_depth", 0) == 0:
+            return
+        self.transaction_depth -= 1
+        if self.transaction_depth > 0:
+            return
+
+        pending = self.pending_cmpnts_ops
+        self.pending_cmpnts_ops = {}
+        try:
+            if not commit:
+                return
+            cmpnt_class_Dict = self.validate_pending(pending)  # Validate before modifying the collection
+            # Apply the changes
+            for name, options in pending.items():
+                if options is None:
+                    if self.has_built_component(name):
+                        self.delete_component(name)
+                else:
+                    self.put_lazy_component(name, cmpnt_class_Dict[name], options)
+        finally:
+            for name in pending.keys():
+                self.touch_child_options(name)
+        return
+
+    def get_chip_name(self, cmpnt):
+        """
+        Gets the chip a component is drawn on.
+
+        Input:
+            cmpnt: LibraryBase, the component.
+
+        Output:
+            chip_name: str, the chip name, "None" when the component has no chip.
+        """
+        chip_name = cmpnt.chip
+        if chip_name is None or chip_name == Dict():
+            chip_name = "None"
+        return chip_name
+
+    @geometry_backend.uses_backend
+    def draw_placements(self):
+        """
+        Draws the components whose parameters changed since they were last drawn, and lists the chip of each drawn cell.
+
+        Input:
+            None
+
+        Output:
+            placements: list, (chip_name, cmpnt, cell_name) for each cell, cell_name is the attribute of cmpnt holding the cell.
+        """
+        placements = []
         for cmpnt_name in self.cmpnt_name_list:
             cmpnt = getattr(self, cmpnt_name)
-            cmpnt.draw_gds()
+            cmpnt.redraw_gds()
+            for chip_name, cell_name in self.get_cmpnt_placements(cmpnt):
+                placements.append((chip_name, cmpnt, cell_name))
+        return placements
+
+    def stream_placements(self):
+        """
+        Draws the components one at a time for a streaming GDS output (see GdsBase.write_streaming_gds), without keeping
+        new drawings: components which are not built yet are drawn from a temporary instance, and the cells of built
+        components which were not drawn are dropped again once the caller moves on.
+
+        Input:
+            None
+
+        Output:
+            generator: (cmpnt, placements) for each component, placements see get_cmpnt_placements.
+        """
+        lazy_cmpnts = self.__dict__.get("lazy_cmpnts", {})
+        for cmpnt_name in list(self.cmpnt_name_list):
+            if cmpnt_name in lazy_cmpnts:
+                cmpnt_class, options = lazy_cmpnts[cmpnt_name]
+                cmpnt = cmpnt_class(options=options)  # Not stored, the component stays lazy
+                cmpnt.draw_cached_gds()
+                yield cmpnt, self.get_cmpnt_placements(cmpnt)
+                continue
+
+            cmpnt = getattr(self, cmpnt_name)
+            if cmpnt.is_drawn():
+                yield cmpnt, self.get_cmpnt_placements(cmpnt)  # Already drawn
+                continue
+            attr_names = set(cmpnt.__dict__.keys())
+            cmpnt.draw_cached_gds()
+            yield cmpnt, self.get_cmpnt_placements(cmpnt)
+            if "cell" in attr_names:
+                object.__setattr__(cmpnt, "gds_dirty", False)  # The new drawing replaces an outdated one
+            else:
+                for attr_name in set(cmpnt.__dict__.keys()) - attr_names:
+                    del cmpnt.__dict__[attr_name]
+        return
+
+    def get_cmpnt_placements(self, cmpnt):
+        """
+        Lists the cells of a drawn component and the chip of each cell.
+
+        Input:
+            cmpnt: LibraryBase, the drawn component.
+
+        Output:
+            placements: list, (chip_name, cell_name) for each cell, cell_name is the attribute of cmpnt holding the cell.
+        """
+        placements = [(self.get_chip_name(cmpnt), "cell")]
+
+        # Special handling for qubit's jj_chip
+        if hasattr(cmpnt, "jj_cell"):
+            jj_chip_name = cmpnt.jj_chip
+            if jj_chip_name is None or jj_chip_name == Dict():
+                jj_chip_name = "None"
+            placements.append((jj_chip_name, "jj_cell"))
+        return placements
+
+    @geometry_backend.uses_backend
+    def vertex_counts(self):
+        """
+        Counts the polygons and vertices of the drawn components per component type, e.g. to compare the geometry
+        precisions (see Gds.set_geometry_precision). Changed components are drawn first.
 
-        # Traverse components and add component cells by chip
+        Input:
+            None
+
+        Output:
+            counts: Dict, {type: {"components": int, "polygons": int, "vertices": int}}, type is the component class name.
+        """
+        counts = Dict()
         for cmpnt_name in self.cmpnt_name_list:
             cmpnt = getattr(self, cmpnt_name)
-            chip_name = cmpnt.chip
-            if chip_name is None or chip_name == Dict():
-                chip_name = "None"
-            if chip_name not in self.cell_Dict.keys():
-                self.cell_Dict[chip_name] = self.lib.new_cell(chip_name)
-            self.cell_Dict[chip_name].add(cmpnt.cell)
-
-            # Special handling for qubit's jj_chip
-            if hasattr(cmpnt, "jj_cell"):
-                jj_chip_name = cmpnt.jj_chip
-                if jj_chip_name is None or jj_chip_name == Dict():
-                    jj_chip_name = "None"
-                if jj_chip_name not in self.cell_Dict.keys():
-                    self.cell_Dict[jj_chip_name] = self.lib.new_cell(jj_chip_name)
-                self.cell_Dict[jj_chip_name].add(cmpnt.jj_cell)
-
-        # Layer by chip
-        for chip_name, cell in self.cell_Dict.items():
-            layer_num = toolbox.custom_hash(chip_name)
-            self.cell_Dict[chip_name].flatten(single_layer=layer_num, single_datatype=0)
-
-        # Create the overall cell
-        module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
-        self.cell = self.lib.new_cell(module_name)
-        for chip_name, chip_cell in self.cell_Dict.items():
-            self.cell.add(chip_cell)
+            cmpnt.redraw_gds()
+            type_counts = counts[cmpnt.__class__.__name__]
+            type_counts.components = type_counts.get("components", 0) + 1
+            for chip_name, cell_name in self.get_cmpnt_placements(cmpnt):
+                for polygon_list in geometry_backend.active.get_polygons(getattr(cmpnt, cell_name)).values():
+                    type_counts.polygons = type_counts.get("polygons", 0) + len(polygon_list)
+                    type_counts.vertices = type_counts.get("vertices", 0) + sum(len(points) for points in polygon_list)
+        return counts
+
+    @geometry_backend.uses_backend
+    def get_bounding_box(self, chip_name: str = None):
+        """
+        Gets the bounding box of the drawn components, cached per component and per chip.
+        Only the components changed since the last call are drawn (see `LibraryBase.redraw_gds`) and measured, so
+        unchanged collections answer without scanning the components.
+
+        Input:
+            chip_name: str, only the cells on this chip, default all chips.
+
+        Output:
+            bbox: tuple, ((x_min, y_min), (x_max, y_max)), or None when there is no polygon.
+        """
+        records = self.__dict__.get("bbox_records")
+        if records is None or self.__dict__.get("bbox_mode") != geometry_backend.drawing_mode():
+            # First call, or the components are drawn with another backend or arc tolerance
+            self.bbox_mode = geometry_backend.drawing_mode()
+            records = self.bbox_records = {}  # {component name: [(chip_name, bbox)]}
+            self.chip_bboxes = {}
+            self.bbox_dirty_chips = set()
+            stale_names = list(self.cmpnt_name_list)
+        else:
+            stale_names = self.bbox_stale_names
+        self.bbox_stale_names = set()
+
+        for name in stale_names:
+            for chip, bbox in records.pop(name, ()):
+                outer = self.chip_bboxes.get(chip)
+                if bbox is not None and outer is not None and toolbox.bounding_box_on_edge(bbox, outer):
+                    self.bbox_dirty_chips.add(chip)  # May shrink, recomputed below
+            if not self.has_built_component(name):
+                continue  # Removed
+            cmpnt = getattr(self, name)
+            record = [(chip, cmpnt.get_bounding_box(cell_name)) for chip, cell_name in self.get_cmpnt_placements(cmpnt)]
+            records[name] = record
+            for chip, bbox in record:
+                self.chip_bboxes[chip] = toolbox.merge_bounding_boxes([self.chip_bboxes.get(chip), bbox])
+
+        chip_list = list(self.chip_bboxes.keys()) if chip_name is None else [chip_name]
+        for chip in chip_list:
+            if chip in self.bbox_dirty_chips:
+                self.chip_bboxes[chip] = toolbox.merge_bounding_boxes([bbox for record in records.values() for c, bbox in record if c == chip])
+                self.bbox_dirty_chips.discard(chip)
+        return toolbox.merge_bounding_boxes([self.chip_bboxes.get(chip) for chip in chip_list])
+
+    @geometry_backend.uses_backend
+    def draw_gds(self, workers: int = None):
+        """
+        Draws the GDS layout of the components.
+        Only components whose parameters changed since they were last drawn are redrawn, and only the chips containing them are flattened again.
+
+        Input:
+            workers: int, the number of worker processes drawing the components, default is draw_workers.
+
+        Output:
+            None
+        """
+        if workers is None:
+            workers = self.draw_workers
+        if workers > 1:
+            parallel_draw.draw_components([getattr(self, cmpnt_name) for cmpnt_name in self.cmpnt_name_list], workers)
+
+        # Collect component cells by chip
+        chip_sources = {}
+        for chip_name, cmpnt, cell_name in self.draw_placements():
+            chip_sources.setdefault(chip_name, []).append(getattr(cmpnt, cell_name))
+        self.assemble_chip_cells(chip_sources)
+        return
 
     def calc_general_ops(self):
         """
@@ -143,61 +749,275 @@ class CmpntsBase(GdsBase):
         """
         for cmpnt_name in self.cmpnt_name_list:
             getattr(self, cmpnt_name).calc_general_ops()
+            getattr(self, cmpnt_name).touch_options()  # calc_general_ops may modify parameters in place
 
-    def move(self, pos_name, dx: float = 0, dy: float = 0):
+    def column_table(self, type: str = None):
         """
-        Moves components by a specified displacement.
+        Gets a columnar (NumPy) copy of the component parameters, for bulk queries such as all gds_pos or all coupling_pins.
+        The table is built on first use and cached until a component changes. It is a read-only view: writes go
+        through the components, e.g. update_components, and the table is rebuilt on the next read. set_positions and
+        move update the cached table instead.
+
+        Input:
+            type: str, only include components of this type, default is all components.
+
+        Output:
+            table: ColumnTable, one row per component, e.g. table["gds_pos"] is an array of shape (n, 2).
+        """
+        column_tables = self.__dict__.get("column_tables")
+        if column_tables is None:
+            column_tables = self.column_tables = {}
+        if type not in column_tables:
+            frozen = self.frozen_options()
+            name_list = []
+            options_list = []
+            for name, cmpnt_ops in dict.items(frozen):
+                if type is None or options_tree.raw_get(cmpnt_ops, "type") == type:
+                    name_list.append(name)
+                    options_list.append(cmpnt_ops)
+            column_tables[type] = column_store.ColumnTable(name_list, options_list)
+        return column_tables[type]
+
+    def get_column(self, op_name, type: str = None):
+        """
+        Gets one parameter of all components as an array.
+
+        Input:
+            op_name: str, the parameter name.
+            type: str, only include components of this type, default is all components.
+
+        Output:
+            column: np.ndarray or RaggedColumn, see ColumnTable.
+        """
+        return self.column_table(type)[op_name]
+
+    def select_components(self, name_list: list = None, condition=None):
+        """
+        Selects the components affected by a bulk update.
+
+        Input:
+            name_list: list, the names of the components, default is all components.
+            condition: callable, optional filter called with each component instance, only components for which it returns True are kept.
+
+        Output:
+            name_list: list, the names of the selected components.
+
+        Exception:
+            ValueError: Throws an exception when a component does not exist.
+        """
+        if name_list is None:
+            name_list = list(self.cmpnt_name_list)
+        for name in name_list:
+            if not self.has_built_component(name):
+                raise ValueError("There is no component named {}".format(name))
+        if condition is not None:
+            name_list = [name for name in name_list if condition(getattr(self, name))]
+        return list(name_list)
+
+    def recalc_component(self, name):
+        """
+        Recalculates the common parameters of a single component after its parameters were changed.
+
+        Input:
+            name: str, the name of the component.
+
+        Output:
+            None
+        """
+        cmpnt = getattr(self, name)
+        cmpnt.calc_general_ops()
+        cmpnt.touch_options()  # calc_general_ops may modify parameters in place
+        return
+
+    def update_components(self, new_options, name_list: list = None, condition=None):
+        """
+        Applies the same parameter values to many components, the common parameters of each affected component are recalculated exactly once.
+        Components which are not built yet only get the new values, they are calculated when they are built.
+
+        Input:
+            new_options: dict, the names and values of the parameters to modify.
+            name_list: list, the names of the components to update, default is all components.
+            condition: callable, optional filter called with each component instance, only components for which it returns True are updated.
+
+        Output:
+            name_list: list, the names of the updated components.
+
+        Exception:
+            ValueError: Throws an exception when a component does not exist.
+        """
+        new_options = copy.deepcopy(new_options)
+        name_list = self.select_components(name_list, condition)
+        lazy_cmpnts = self.__dict__.get("lazy_cmpnts", {})
+        for name in name_list:
+            if name in lazy_cmpnts:
+                self.update_lazy_component(name, new_options)  # Calculated when it is built
+                continue
+            self.__dict__[name].inject_options(new_options)  # Unknown parameter names are ignored
+            self.recalc_component(name)
+        return name_list
+
+    def update_lazy_component(self, name, new_options):
+        """
+        Modifies the injected parameters of a component which is not built yet, without building it.
+        The injected parameters are shared with the frozen parameters handed out before, they are replaced instead of modified.
+
+        Input:
+            name: str, the name of the component.
+            new_options: dict, the names and values of the parameters to modify, owned by the collection.
+                Parameter names which are not in the default parameters of the component class are ignored.
+
+        Output:
+            None
+        """
+        cmpnt_class, options = self.lazy_cmpnts[name]
+        options = options_tree.thaw(options_tree.freeze(options, copy_leaves=False))
+        for op_name, op_value in new_options.items():
+            if op_name in cmpnt_class.default_options:
+                options[op_name] = op_value
+        self.lazy_cmpnts[name] = (cmpnt_class, options)
+        self.touch_child_options(name)
+        return
+
+    def get_positions(self, pos_name, name_list: list = None):
+        """
+        Collects a position parameter of many components into an array, read from the cached column table.
+
+        Input:
+            pos_name: str, the name of the position parameter, e.g. "gds_pos".
+            name_list: list, the names of the components, default is all components.
+
+        Output:
+            positions: np.ndarray, shape (len(name_list), 2).
+        """
+        if self.__dict__.get("transaction_depth", 0) == 0:
+            table = self.column_table()
+            column = table[pos_name] if pos_name in table else None
+            if isinstance(column, np.ndarray) and column.ndim == 2 and table.name_list == self.cmpnt_name_list:
+                if name_list is None:
+                    return column.copy()
+                name_list = self.select_components(name_list)
+                return column[[table.index[name] for name in name_list]].reshape(len(name_list), 2)
+        name_list = self.select_components(name_list)
+        positions = np.array([getattr(getattr(self, name), pos_name) for name in name_list])
+        return positions.reshape(len(name_list), 2)
+
+    def set_positions(self, pos_name, positions, name_list: list = None):
+        """
+        Sets a position parameter of many components from an array.
+        The displacements are computed as one array. Components which are not built yet only get their new position,
+        their pins are calculated when they are built. Built components which can be translated (see
+        LibraryBase.can_translate) get their pins and outline translated, the others recalculate their common parameters.
+
+        Input:
+            pos_name: str, the name of the position parameter, e.g. "gds_pos".
+            positions: array-like, shape (len(name_list), 2), the new positions.
+            name_list: list, the names of the components, default is all components.
+
+        Output:
+            None
+
+        Exception:
+            ValueError: Throws an exception when the number of positions does not match the number of components,
+            or when a component has no such parameter. Nothing is modified in that case.
+        """
+        name_list = self.select_components(name_list)
+        positions = np.asarray(positions)
+        if positions.shape != (len(name_list), 2):
+            raise ValueError("Expected {} positions, got an array of shape {}".format(len(name_list), positions.shape))
+        lazy_cmpnts = self.__dict__.get("lazy_cmpnts", {})
+        for name in name_list:
+            if name in lazy_cmpnts:
+                op_name_list = lazy_cmpnts[name][0].default_options.keys()
+            else:
+                op_name_list = self.__dict__[name].op_name_list
+            if pos_name not in op_name_list:
+                raise ValueError("{} has no parameter named {}".format(name, pos_name))
+        deltas = positions - self.get_positions(pos_name, name_list)
+        column_tables = self.__dict__.get("column_tables", {})  # Updated below instead of being built again
+
+        translated = {}  # {op_name: names of the components whose points in this parameter were translated}
+        recalculated = set()  # Parameters recalculated by calc_general_ops
+        for name, pos, delta in zip(name_list, positions.tolist(), deltas.tolist()):
+            if name in lazy_cmpnts:
+                recalculated.update(lazy_cmpnts[name][0].calculated_options)
+                self.update_lazy_component(name, {pos_name: tuple(pos)})
+                continue
+            cmpnt = self.__dict__[name]
+            if cmpnt.can_translate(pos_name):
+                cmpnt.translate(pos_name, tuple(pos), tuple(delta))
+                for op_name in cmpnt.calculated_options:
+                    translated.setdefault(op_name, set()).add(name)
+            else:
+                setattr(cmpnt, pos_name, tuple(pos))
+                self.recalc_component(name)
+                recalculated.update(cmpnt.calculated_options)
+
+        for table in column_tables.values():
+            rows = [table.index[name] for name in name_list if name in table.index]
+            row_positions = positions[[i for i, name in enumerate(name_list) if name in table.index]]
+            row_deltas = np.zeros((len(table), 2), dtype=deltas.dtype)
+            row_deltas[rows] = deltas[[i for i, name in enumerate(name_list) if name in table.index]]
+            translations = {}
+            for op_name, names in translated.items():
+                translations[op_name] = (np.array([name in names for name in table.name_list], dtype=bool), row_deltas)
+            table.drop_columns(recalculated)
+            table.translate_rows(rows, [self.cmpnt_frozen_options(table.name_list[row]) for row in rows], pos_name,
+                                 row_positions, translations)
+        self.column_tables = column_tables
+        return
+
+    def move(self, pos_name, dx: float = 0, dy: float = 0, name_list: list = None, condition=None):
+        """
+        Moves components by a specified displacement, see set_positions.
 
         Input:
             pos_name: str, the name of the position parameter to move.
             dx: float, displacement in the x-direction.
             dy: float, displacement in the y-direction.
+            name_list: list, the names of the components to move, default is all components.
+            condition: callable, optional filter called with each component instance, only components for which it returns True are moved.
 
         Output:
             None
         """
-        for cmpnt_name in self.cmpnt_name_list:
-            cmpnt_ops = copy.deepcopy(getattr(self, cmpnt_name).options)
-            pos = copy.deepcopy(cmpnt_ops[pos_name])
-            pos = list(pos)
-            pos = (pos[0] + dx, pos[1] + dy)
-            cmpnt_ops[pos_name] = copy.deepcopy(pos)
-            getattr(self, cmpnt_name).inject_options(cmpnt_ops)
-
-    def change_option(self, op_name, op_value):
+        if condition is not None:
+            name_list = self.select_components(name_list, condition)
+        if len(self.select_components(name_list)) == 0:
+            return
+        positions = self.get_positions(pos_name, name_list) + np.array((dx, dy))
+        self.set_positions(pos_name, positions, name_list)
+        return
+
+    def change_option(self, op_name, op_value, name_list: list = None, condition=None):
         """
         Modifies the value of a single option.
 
         Input:
             op_name: str, the name of the option to modify.
             op_value: any type, the new value.
+            name_list: list, the names of the components to modify, default is all components.
+            condition: callable, optional filter called with each component instance, only components for which it returns True are modified.
 
         Output:
             None
         """
-        for cmpnt_name in self.cmpnt_name_list:
-            cmpnt_ops = copy.deepcopy(getattr(self, cmpnt_name).options)
-            cmpnt_ops[op_name] = copy.deepcopy(op_value)
-            getattr(self, cmpnt_name).inject_options(cmpnt_ops)
-            self.calc_general_ops()  # Recalculate common parameters
+        self.update_components({op_name: op_value}, name_list, condition)
+        return
 
-    def change_options(self, new_options):
+    def change_options(self, new_options, name_list: list = None, condition=None):
         """
         Modifies the values of multiple options.
 
         Input:
             new_options: dict, containing the names and values of options to modify.
+            name_list: list, the names of the components to modify, default is all components.
+            condition: callable, optional filter called with each component instance, only components for which it returns True are modified.
 
         Output:
             None
         """
-        new_options = copy.deepcopy(new_options)
-        for cmpnt_name in self.cmpnt_name_list:
-            cmpnt_ops = copy.deepcopy(getattr(self, cmpnt_name).options)
-            for op_name, op_value in new_options.items():
-                cmpnt_ops[op_name] = copy.deepcopy(op_value)
-            getattr(self, cmpnt_name).inject_options(cmpnt_ops)
-            self.calc_general_ops()  # Recalculate common parameters
+        self.update_components(new_options, name_list, condition)
+        return
 
     def add(self, options):
         """
@@ -221,11 +1041,7 @@ class CmpntsBase(GdsBase):
         if type is None:
             raise ValueError("Please specify a type")
 
-        old_ops = copy.deepcopy(self.options)
-        new_ops = copy.deepcopy(old_ops)
-
-        new_ops[name] = copy.deepcopy(options)
-        self.inject_options(new_ops)
+        self.set_component(name, options)
 
     def copy_component(self, old_name, new_name):
         """
@@ -238,9 +1054,7 @@ class CmpntsBase(GdsBase):
         Output:
             None
         """
-        ops = self.options
-        ops[new_name] = copy.deepcopy(ops[old_name])
-        self.inject_options(ops)
+        self.set_component(new_name, self.options[old_name])
 
     def generate_row(self, start_pos, dist, key, num, pre_name, type, geometric_options: Dict = None):
         """
@@ -258,19 +1072,18 @@ class CmpntsBase(GdsBase):
         Output:
             None
         """
-        ops = self.options
-        for i in range(num):
-            op = Dict()
-            name = pre_name + "_{}".format(i)
-            op.name = name
-            op.type = type
-            pos = (start_pos[0] + i * dist, start_pos[1])
-            op[key] = copy.deepcopy(pos)
-            if geometric_options is not None:
-                for k, v in geometric_options.items():
-                    op[k] = copy.deepcopy(v)
-            ops[name] = copy.deepcopy(op)
-        self.inject_options(ops)
+        with self.transaction():
+            for i in range(num):
+                op = Dict()
+                name = pre_name + "_{}".format(i)
+                op.name = name
+                op.type = type
+                pos = (start_pos[0] + i * dist, start_pos[1])
+                op[key] = copy.deepcopy(pos)
+                if geometric_options is not None:
+                    for k, v in geometric_options.items():
+                        op[k] = copy.deepcopy(v)
+                self.set_component(name, op)
 
     def generate_row_middle(self, mid_pos, dist, key, num, pre_name, type, geometric_options: Dict = None):
         """
@@ -288,7 +1101,6 @@ class CmpntsBase(GdsBase):
         Output:
             None
         """
-        ops = self.options
         # Generate a set of coordinate points
         pos_list = []
         for i in range(num):
@@ -300,18 +1112,18 @@ class CmpntsBase(GdsBase):
             pos_list[i] = (pos[0] - move_dist, pos[1])
 
         # Generate parameters for each component
-        for i in range(num):
-            op = Dict()
-            name = pre_name + "_{}".format(i)
-            op.name = name
-            op.type = type
-            pos = copy.deepcopy(pos_list[i])
-            op[key] = copy.deepcopy(pos)
-            if geometric_options is not None:
-                for k, v in geometric_options.items():
-                    op[k] = copy.deepcopy(v)
-            ops[name] = copy.deepcopy(op)
-        self.inject_options(ops)
+        with self.transaction():
+            for i in range(num):
+                op = Dict()
+                name = pre_name + "_{}".format(i)
+                op.name = name
+                op.type = type
+                pos = copy.deepcopy(pos_list[i])
+                op[key] = copy.deepcopy(pos)
+                if geometric_options is not None:
+                    for k, v in geometric_options.items():
+                        op[k] = copy.deepcopy(v)
+                self.set_component(name, op)
 
     def batch_generate(self, pos_list, key, pre_name, type, geometric_options: Dict = None):
         """
@@ -327,19 +1139,18 @@ class CmpntsBase(GdsBase):
         Output:
             None
         """
-        ops = self.options
-        for i in range(len(pos_list)):
-            pos = copy.deepcopy(pos_list[i])
-            name = pre_name + "_{}".format(i)
-            options = Dict()
-            options.name = name
-            options.type = type
-            options[key] = copy.deepcopy(pos)
-            if geometric_options is not None:
-                for k, v in geometric_options.items():
-                    options[k] = copy.deepcopy(v)
-            ops[name] = copy.deepcopy(options)
-        self.inject_options(ops)
+        with self.transaction():
+            for i in range(len(pos_list)):
+                pos = copy.deepcopy(pos_list[i])
+                name = pre_name + "_{}".format(i)
+                options = Dict()
+                options.name = name
+                options.type = type
+                options[key] = copy.deepcopy(pos)
+                if geometric_options is not None:
+                    for k, v in geometric_options.items():
+                        options[k] = copy.deepcopy(v)
+                self.set_component(name, options)
 
     def batch_change(self, name_list, op_name, op_value):
         """
@@ -353,13 +1164,7 @@ class CmpntsBase(GdsBase):
         Output:
             None
         """
-        ops = self.options
-        for i in range(len(name_list)):
-            name = name_list[i]
-            options = copy.deepcopy(ops[name])
-            options[op_name] = copy.deepcopy(op_value)
-            ops[name] = copy.deepcopy(options)
-        self.inject_options(ops)
+        self.update_components({op_name: op_value}, name_list)
 
     def batch_add(self, options_list):
         """
@@ -374,14 +1179,12 @@ class CmpntsBase(GdsBase):
         Exception:
             ValueError: Throws an exception when the component name or type is not specified.
         """
-        # Bulk operation, avoid multiple copies and injections
-        new_ops = self.options.copy()
-        for options in options_list:
-            name = options.name
-            type = options.type
-            if name is None or type is None:
-                raise ValueError(f"Invalid options: {options}")
-
-            new_ops[name] = options
-        
-        self.inject_options(new_ops)
\ No newline at end of file
+        # Bulk operation, only the new components are built when the transaction is committed
+        with self.transaction():
+            for options in options_list:
+                name = options.name
+                type = options.type
+                if name is None or type is None:
+                    raise ValueError(f"Invalid options: {options}")
+
+                self.set_component(name, options)
\ No newline at end of file
@@ -0,0 +1,315 @@
+##################################################################
+# Columnar (array-backed) views of component parameters
+##################################################################
+
+import numpy as np
+from base import options_tree
+
+# Array kinds stored as dense columns: bool, int, unsigned int, float, str
+DENSE_KINDS = "biufU"
+
+
+class RaggedColumn:
+    """
+    List-valued parameter (pins, outlines...) of many components, stored as one flat array plus row offsets.
+    The values of row i are `values[offsets[i]:offsets[i + 1]]`.
+    """
+
+    def __init__(self, values, offsets):
+        """
+        Input:
+            values: np.ndarray, the items of all rows, concatenated.
+            offsets: np.ndarray, shape (n + 1,), the start of each row in values.
+
+        Output:
+            None
+        """
+        self.values = values
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    @property
+    def lengths(self):
+        """
+        The number of items of each row.
+        """
+        return np.diff(self.offsets)
+
+    def row_ids(self):
+        """
+        The row owning each item of values.
+
+        Input:
+            None
+
+        Output:
+            row_ids: np.ndarray, shape (len(values),).
+        """
+        return np.repeat(np.arange(len(self)), self.lengths)
+
+    def tolist(self):
+        return [self[i].tolist() for i in range(len(self))]
+
+
+class ColumnRow:
+    """
+    Lightweight read-only view of one component in a ColumnTable.
+    """
+    __slots__ = ("table", "row")
+
+    def __init__(self, table, row):
+        object.__setattr__(self, "table", table)
+        object.__setattr__(self, "row", row)
+
+    def __getattr__(self, op_name):
+        if op_name not in self.table:
+            raise AttributeError(op_name)
+        return self.table.get_value(op_name, self.row)
+
+    def __setattr__(self, name, value):
+        raise TypeError("Column rows are read-only, modify the component instead.")
+
+    @property
+    def name(self):
+        return self.table.name_list[self.row]
+
+    def keys(self):
+        return list(self.table.op_name_list)
+
+    def to_dict(self):
+        return {op_name: self.table.get_value(op_name, self.row) for op_name in self.table.op_name_list}
+
+
+class ColumnTable:
+    """
+    Column-wise copy of the parameters of many components: one NumPy array per parameter.
+
+    Numeric and string parameters with the same shape in every row are dense arrays (e.g. gds_pos -> shape (n, 2)),
+    lists of points (pins, outlines) are RaggedColumn objects, even when every row has the same number of points,
+    numeric lists of different lengths too, anything else is an object array.
+
+    The table is a read-only cache: the components stay the source of truth. Modifying them drops the cached table
+    (see CmpntsBase.column_table), except moves, which update the position and point columns as arrays (see
+    translate_rows). Each column is built when it is first read, so reading gds_pos does not compute the pins of
+    components which are not built yet.
+    """
+
+    def __init__(self, name_list, options_list):
+        """
+        Lists the parameter names, the columns are built on first read.
+
+        Input:
+            name_list: list, the names of the components (one row each).
+            options_list: list, the parameter mapping of each component, in the same order.
+
+        Output:
+            None
+        """
+        self.name_list = list(name_list)
+        self.index = {name: i for i, name in enumerate(self.name_list)}
+        op_name_list = []
+        op_name_set = set()
+        for options in options_list:
+            for op_name in options.keys():
+                if op_name not in op_name_set:
+                    op_name_set.add(op_name)
+                    op_name_list.append(op_name)
+        self.op_name_list = op_name_list
+        self.op_name_set = op_name_set
+        self.options_list = list(options_list)
+        self.columns = {}
+        return
+
+    def __len__(self):
+        return len(self.name_list)
+
+    def __contains__(self, op_name):
+        return op_name in self.op_name_set
+
+    def __getitem__(self, op_name):
+        column = self.columns.get(op_name)
+        if column is None:
+            if op_name not in self.op_name_set:
+                raise KeyError(op_name)
+            column = self.columns[op_name] = build_column([options_tree.raw_get(options, op_name) for options in self.options_list])
+        return column
+
+    def translate_rows(self, rows, options_list, pos_name, positions, translations):
+        """
+        Updates the table after components were moved (see CmpntsBase.set_positions), instead of building it again.
+        The position column and the translated point columns are updated as arrays, the other columns which were built
+        are kept, the columns which can not be updated are dropped and built again on the next read.
+
+        Input:
+            rows: list, the rows of the moved components.
+            options_list: list, the new parameter mapping of each moved component, in the same order.
+            pos_name: str, the position parameter, e.g. "gds_pos".
+            positions: np.ndarray, shape (len(rows), 2), the new positions.
+            translations: dict, {op_name: (row mask, deltas)}, the point columns to translate: np.ndarray of bool,
+                shape (n,), the rows whose points moved, and np.ndarray, shape (n, 2), the displacement of each row.
+                Built columns whose rows are moved without a translation, e.g. recalculated pins, must be dropped
+                by the caller.
+
+        Output:
+            None
+        """
+        for row, options in zip(rows, options_list):
+            self.options_list[row] = options
+        column = self.columns.get(pos_name)
+        if isinstance(column, np.ndarray) and column.ndim == 2 and column.dtype.kind in "iuf":
+            column = column.astype(np.result_type(column, positions))
+            column[rows] = positions
+            self.columns[pos_name] = column
+        else:
+            self.columns.pop(pos_name, None)
+        for op_name, (mask, deltas) in translations.items():
+            column = self.columns.get(op_name)
+            if column is None:
+                continue
+            if isinstance(column, RaggedColumn) and column.values.ndim == 2 and column.values.dtype.kind in "iuf":
+                row_ids = column.row_ids()
+                values = column.values.astype(np.result_type(column.values, deltas))
+                values[mask[row_ids]] += deltas[row_ids][mask[row_ids]]
+                self.columns[op_name] = RaggedColumn(values, column.offsets)
+            else:
+                self.columns.pop(op_name)
+        return
+
+    def drop_columns(self, op_name_list):
+        """
+        Drops built columns, they are built again on the next read.
+
+        Input:
+            op_name_list: iterable, the parameter names.
+
+        Output:
+            None
+        """
+        for op_name in op_name_list:
+            self.columns.pop(op_name, None)
+        return
+
+    def get_value(self, op_name, row):
+        """
+        Reads a single value.
+
+        Input:
+            op_name: str, the parameter name.
+            row: int, the row index.
+
+        Output:
+            value: the value of the parameter in this row.
+        """
+        return self[op_name][row]
+
+    def row(self, name):
+        """
+        Gets the row view of a component.
+
+        Input:
+            name: str, the name of the component.
+
+        Output:
+            row: ColumnRow
+        """
+        return ColumnRow(self, self.index[name])
+
+    def rows(self):
+        return [ColumnRow(self, i) for i in range(len(self.name_list))]
+
+    def select(self, mask):
+        """
+        Converts a boolean mask over the rows into component names.
+
+        Input:
+            mask: np.ndarray, shape (n,), bool.
+
+        Output:
+            name_list: list, the names of the selected components.
+        """
+        return [self.name_list[i] for i in np.flatnonzero(mask)]
+
+
+def build_column(values):
+    """
+    Converts the values of one parameter into the most compact column type.
+
+    Input:
+        values: list, one value per row (None for rows without this parameter).
+
+    Output:
+        column: np.ndarray or RaggedColumn.
+    """
+    if all(v is not None for v in values):
+        if all(is_point_list(v) for v in values):
+            ragged = build_ragged_column(values)  # Rows of points keep one column type whatever their lengths
+            if ragged is not None:
+                return ragged
+        dense = try_array(values)
+        if dense is not None and dense.dtype.kind in DENSE_KINDS:
+            if dense.dtype.kind != "U" or all(isinstance(v, str) for v in values):  # NumPy converts mixed values to str
+                return dense
+        if all(isinstance(v, (list, tuple)) for v in values):
+            ragged = build_ragged_column(values)
+            if ragged is not None:
+                return ragged
+    column = np.empty(len(values), dtype=object)
+    for i, v in enumerate(values):
+        column[i] = v  # Item-wise, so that NumPy does not broadcast nested sequences
+    return column
+
+
+def is_point_list(value):
+    """
+    Checks whether a parameter value is a list of points, e.g. pins or an outline.
+
+    Input:
+        value: any type, the parameter value.
+
+    Output:
+        bool, True for a list or tuple whose items are all lists, tuples or arrays.
+    """
+    return isinstance(value, (list, tuple)) and all(isinstance(item, (list, tuple, np.ndarray)) for item in value)
+
+
+def build_ragged_column(values):
+    """
+    Builds a RaggedColumn from lists of numeric items with the same shape.
+
+    Input:
+        values: list, a list (or tuple) of items per row.
+
+    Output:
+        column: RaggedColumn, or None when the items are not numeric or have different shapes.
+    """
+    item_list = [item for v in values for item in v]
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum([len(v) for v in values], out=offsets[1:])
+    flat = try_array(item_list)
+    if flat is None or flat.dtype.kind not in "biuf":
+        return None
+    return RaggedColumn(flat, offsets)
+
+
+def try_array(values):
+    """
+    Converts a list into a regular array.
+
+    Input:
+        values: list
+
+    Output:
+        array: np.ndarray, or None when the values have different shapes.
+    """
+    try:
+        array = np.array(values)
+    except (ValueError, TypeError):
+        return None
+    if array.dtype.kind == "O":
+        return None
+    return array
@@ -1,6 +1,7 @@
 from addict import Dict
-import copy, gdspy
+import copy, datetime, gdspy, io, tempfile
 from base.base import Base
+from base import geometry_backend, geometry_cache
 import toolbox
 
 class GdsBase(Base):
@@ -10,6 +11,46 @@ class GdsBase(Base):
     def __init__(self):
         return
 
+    @geometry_backend.uses_backend
+    def assemble_chip_cells(self, chip_sources, flat_sources: bool = False):
+        """
+        Builds the lib: one flattened cell per chip (one layer per chip) and an overall cell containing all chip cells.
+        The flattened cell of a chip is kept from the previous call when its source cells are the same objects.
+
+        Input:
+            chip_sources: dict, {chip_name: list of the cells drawn on this chip}, in drawing order.
+            flat_sources: bool, whether the source cells are already flattened on the layer of their chip (e.g. the chip cells of
+                component collections). Their elements are then referenced by the chip cell, without copying or flattening again.
+
+        Output:
+            None
+        """
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
+        self.cell_Dict = Dict()
+        chip_cell_cache = self.__dict__.get("chip_cell_cache", {})
+        self.chip_cell_cache = {}
+
+        for chip_name, sources in chip_sources.items():
+            cached = chip_cell_cache.get(chip_name)
+            if cached is not None and len(cached[0]) == len(sources) and all(a is b for a, b in zip(cached[0], sources)) \
+                    and cached[2] == backend.name:
+                chip_cell = cached[1]  # No source cell was redrawn
+                self.lib.add(chip_cell)
+            else:
+                chip_cell = self.lib.new_cell(chip_name)
+                # Layer by chip, flattening copies the polygons so the source cells are not modified
+                backend.merge_cells(chip_cell, sources, layer=None if flat_sources else toolbox.custom_hash(chip_name))
+            self.cell_Dict[chip_name] = chip_cell
+            self.chip_cell_cache[chip_name] = (list(sources), chip_cell, backend.name)
+
+        # Create the overall cell
+        module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
+        self.cell = self.lib.new_cell(module_name)
+        backend.merge_cells(self.cell, list(self.cell_Dict.values()))
+        return
+
+    @geometry_backend.uses_backend
     def show_gds(self):
         """
         Display the GDS layout corresponding to the lib.
@@ -17,9 +58,10 @@ class GdsBase(Base):
         Dependent on the lib, subclasses using this method must include a method for generating the lib.
         """
         self.draw_gds()
-        gdspy.LayoutViewer(library=self.lib)
+        geometry_backend.active.show(self.lib)
         return
 
+    @geometry_backend.uses_backend
     def save_svg(self, width: int = 500, path: str = None):
         """
         Save the GDS layout corresponding to the lib as an SVG image.
@@ -44,6 +86,7 @@ class GdsBase(Base):
 
         return
 
+    @geometry_backend.uses_backend
     def show_svg(self, width: int = 500, path: str = None):
         """
         Display the GDS layout corresponding to the lib as an SVG image.
@@ -68,17 +111,203 @@ class GdsBase(Base):
 
         return
 
-    def save_gds(self, path: str = "./gds.gds"):
+    @geometry_backend.uses_backend
+    def save_gds(self, path: str = "./gds.gds", hierarchical: bool = False, streaming: bool = False):
         """
         Save the GDS layout to a GDS file.
 
         Input:
             path: The path to save the GDS file.
+            hierarchical: Whether identical components are written once and placed by reference, see draw_hierarchical_gds.
+            streaming: Whether the components are written one at a time without building the lib, see write_streaming_gds.
 
         Output:
             The path where the GDS file is saved.
+
+        Exception:
+            ValueError: Throws an exception when both hierarchical and streaming are set.
         """
+        if streaming:
+            if hierarchical:
+                raise ValueError("The streaming GDS output is flat, it can not be hierarchical")
+            toolbox.jg_and_create_path(path)
+            self.write_streaming_gds(path)
+            return path
+        if hierarchical:
+            lib = self.draw_hierarchical_gds()
+            toolbox.jg_and_create_path(path)
+            lib.write_gds(outfile=path)
+            return path
         self.draw_gds()
         toolbox.jg_and_create_path(path)
-        self.lib.write_gds(outfile=path)
-        return path
\ No newline at end of file
+        geometry_backend.active.write_gds(self.lib, path)
+        return path
+
+    def draw_placements(self):
+        """
+        Draws the components and lists the chip of each drawn cell, used by draw_hierarchical_gds.
+
+        Dependent on the components, subclasses containing components must implement it.
+        """
+        raise NotImplementedError("{} does not support hierarchical GDS output".format(self.__class__.__name__))
+
+    def stream_placements(self):
+        """
+        Draws the components one at a time and lists the chip of each drawn cell, used by write_streaming_gds.
+
+        Dependent on the components, subclasses containing components must implement it.
+        """
+        raise NotImplementedError("{} does not support streaming GDS output".format(self.__class__.__name__))
+
+    @geometry_backend.uses_backend
+    def write_streaming_gds(self, path, unit: float = 1.0e-6, precision: float = 1.0e-9):
+        """
+        Writes the layout to a GDS file without building the lib: each component is drawn, its polygons are written
+        on the layer of their chip to a temporary file per chip, and the drawing is dropped (see stream_placements).
+        The output holds a top cell referencing the chips, then the chip structures copied from the temporary files.
+        Memory use does not grow with the number of components, the temporary files take about the size of the output.
+
+        The chip cells hold the same polygons as the flattened lib, the top cell references the chip cells instead of
+        repeating their polygons.
+
+        Input:
+            path: str, the path of the GDS file.
+            unit: float, the user unit in meters, as gdspy.GdsLibrary.
+            precision: float, the database precision in meters, as gdspy.GdsLibrary.
+
+        Output:
+            None
+        """
+        multiplier = unit / precision
+        now = datetime.datetime.today()
+        chip_spool_Dict = {}  # chip_name -> temporary file of the polygon records
+        try:
+            for cmpnt, placements in self.stream_placements():
+                for chip_name, cell_name in placements:
+                    spool = chip_spool_Dict.get(chip_name)
+                    if spool is None:
+                        spool = chip_spool_Dict[chip_name] = tempfile.TemporaryFile()
+                    layer_num = toolbox.custom_hash(chip_name)
+                    for polygon_list in geometry_backend.active.get_polygons(getattr(cmpnt, cell_name)).values():
+                        gdspy.PolygonSet(polygon_list, layer=layer_num, datatype=0).to_gds(spool, multiplier)
+
+            def chip_structures():
+                for chip_name, spool in chip_spool_Dict.items():
+                    header = io.BytesIO()
+                    gdspy.Cell(chip_name).to_gds(header, multiplier, timestamp=now)
+                    structure = header.getvalue()
+                    yield structure[:-4]  # BGNSTR and STRNAME, without ENDSTR
+                    spool.seek(0)
+                    while True:
+                        chunk = spool.read(1 << 20)
+                        if not chunk:
+                            break
+                        yield chunk
+                    yield structure[-4:]
+
+            gdspy.library.use_current_library = False
+            lib = gdspy.GdsLibrary(unit=unit, precision=precision)
+            top_cell = lib.new_cell(toolbox.convert_to_snake_case(self.__class__.__name__))
+            for chip_name in chip_spool_Dict.keys():
+                # Empty placeholder of the chip cell, only the lib cells are written and the chip structures come from the spools
+                top_cell.add(gdspy.CellReference(gdspy.Cell(chip_name)))
+            with open(path, "wb") as outfile:
+                lib.write_gds(outfile, timestamp=now, binary_cells=chip_structures())
+        finally:
+            for spool in chip_spool_Dict.values():
+                spool.close()
+        return
+
+    @geometry_backend.uses_backend
+    def draw_hierarchical_gds(self, backend_name: str = "gdspy"):
+        """
+        Builds a hierarchical lib: components sharing their geometry (see base.geometry_cache) are written once
+        per chip as a master cell and placed by reference, as one array for full regular grids.
+        Each chip keeps its own layer, as in the flattened lib. The components are drawn with the geometry backend
+        of the layout, the lib is built with backend_name.
+
+        Input:
+            backend_name: str, the library of the returned lib, "gdspy" or "gdstk". With "gdstk" the placements of a
+                master cell which do not fill a grid are stored as one reference with an explicit repetition, and the
+                translated copies of a polygon of the unique geometry as one polygon with a repetition.
+
+        Output:
+            lib: the hierarchical lib, its top cell is named after the class.
+        """
+        output = geometry_backend.get_backend(backend_name)
+        lib = output.new_library()
+        chip_cell_Dict = Dict()
+        master_Dict = {}  # (geometry key, layer) -> master cell
+        origin_Dict = {}  # (chip_name, master name) -> origins
+        unique_Dict = {}  # chip_name -> polygons of the unique geometry
+
+        for chip_name, cmpnt, cell_name in self.draw_placements():
+            layer_num = toolbox.custom_hash(chip_name)
+            if chip_name not in chip_cell_Dict.keys():
+                chip_cell_Dict[chip_name] = lib.new_cell(chip_name)
+            chip_cell = chip_cell_Dict[chip_name]
+            cell = getattr(cmpnt, cell_name)
+
+            key, pos = cmpnt.geometry_cache_key() if cell_name == "cell" else (None, None)
+            if key is not None and not geometry_backend.on_database_grid(pos):
+                key = None  # A reference would round the polygons relative to pos, not as in the flat lib
+            if key is None:
+                # Unique geometry, written on the chip layer
+                for polygon_list in geometry_backend.active.get_polygons(cell).values():
+                    unique_Dict.setdefault(chip_name, []).extend(polygon_list)
+                continue
+
+            master = master_Dict.get((key, layer_num))
+            if master is None:
+                entry = geometry_cache.GeometryEntry(cell, cmpnt.name, pos)
+                master = lib.new_cell("{}_master{}".format(cmpnt.__class__.__name__, len(master_Dict)))
+                for polygon_list in entry.polygons.values():
+                    output.add(master, output.polygon_set(polygon_list, layer=layer_num, datatype=0))
+                master_Dict[(key, layer_num)] = master
+            origin_Dict.setdefault((chip_name, master.name), (master, []))[1].append(pos)
+
+        for chip_name, polygon_list in unique_Dict.items():
+            output.add(chip_cell_Dict[chip_name], output.repeated_polygon_set(polygon_list, layer=toolbox.custom_hash(chip_name), datatype=0))
+        for (chip_name, master_name), (master, origins) in origin_Dict.items():
+            output.add(chip_cell_Dict[chip_name], output.place_cell(master, origins))
+
+        # Create the overall cell
+        module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
+        top_cell = lib.new_cell(module_name)
+        for chip_name, chip_cell in chip_cell_Dict.items():
+            output.add(top_cell, output.place_cell(chip_cell, [(0, 0)]))
+        return lib
+
+    @geometry_backend.uses_backend
+    def save_oas(self, path: str = "./gds.oas", hierarchical: bool = True, compression_level: int = 6):
+        """
+        Save the layout to an OASIS file, written with gdstk whatever the geometry backend. The cells are stored in
+        compressed CBLOCK records, and rectangles and trapezoids in their compact OASIS form.
+
+        Input:
+            path: The path to save the OASIS file.
+            hierarchical: Whether identical components are written once and placed with OASIS repetitions (arrays for
+                full regular grids, explicit repetitions otherwise), see draw_hierarchical_gds. Otherwise the chip cells
+                are flat, as in save_gds.
+            compression_level: int, 0 (no compression) to 9 (smallest file).
+
+        Output:
+            The path where the OASIS file is saved.
+
+        Exception:
+            ImportError: Throws an exception when gdstk is not installed.
+        """
+        output = geometry_backend.get_backend("gdstk")
+        if hierarchical:
+            lib = self.draw_hierarchical_gds(backend_name="gdstk")
+        else:
+            self.draw_gds()
+            lib = output.new_library()
+            top_cell = lib.new_cell(toolbox.convert_to_snake_case(self.__class__.__name__))
+            for chip_cell in self.cell_Dict.values():
+                chip_cell = output.native_cell(chip_cell)
+                lib.add(chip_cell)
+                output.add(top_cell, output.place_cell(chip_cell, [(0, 0)]))
+        toolbox.jg_and_create_path(path)
+        output.write_oas(lib, path, compression_level=compression_level)
+        return path
@@ -0,0 +1,842 @@
+##################################################################
+# Geometry backends: the shape, path, boolean, cell and output
+# operations components and layouts are drawn with
+##################################################################
+
+import contextlib, functools
+import gdspy
+import numpy as np
+from base import lazy_import
+
+# gdstk is optional, it is imported when its backend is first used
+gdstk = lazy_import.lazy_module("gdstk")
+
+# gdspy direction and turn names, in radians
+DIRECTIONS = {"+x": 0.0, "+y": np.pi / 2, "-x": np.pi, "-y": -np.pi / 2}
+TURNS = {"l": np.pi / 2, "r": -np.pi / 2, "ll": np.pi, "rr": -np.pi, "lll": 3 * np.pi / 2, "rrr": -3 * np.pi / 2}
+
+# Default arc tolerance of both libraries
+DEFAULT_TOLERANCE = 0.01
+
+# Named arc tolerances in um (see get_tolerance): coarse arcs for interactive previews and SVG images, fine arcs for
+# tapeout. Each halving of the tolerance multiplies the vertices of an arc by about 1.4.
+PRECISIONS = {"preview": 0.5, "default": DEFAULT_TOLERANCE, "tapeout": 0.001}
+
+# Database units per um of the written files, computed as the libraries do from their default unit and precision
+DATABASE_SCALE = 1e-6 / 1e-9
+
+
+class GdspyBackend:
+    """
+    Draws with gdspy, the reference backend. Each operation makes the gdspy calls the components made before the
+    backends were introduced, so the layout is unchanged.
+    """
+    name = "gdspy"
+
+    def new_library(self):
+        """
+        Input:
+            None
+
+        Output:
+            lib: gdspy.GdsLibrary, an empty library, its cells are not added to the current library.
+        """
+        gdspy.library.use_current_library = False
+        return gdspy.GdsLibrary()
+
+    def add(self, cell, element):
+        """
+        Adds a shape, a list of shapes, or the elements of a cell to a cell.
+
+        Input:
+            cell: the cell.
+            element: the shape(s) returned by the backend, None (an empty boolean result) is skipped.
+
+        Output:
+            None
+        """
+        if element is not None:
+            cell.add(element)
+        return
+
+    def rectangle(self, point1, point2, layer: int = 0, datatype: int = 0):
+        return gdspy.Rectangle(point1, point2, layer=layer, datatype=datatype)
+
+    def polygon(self, points, layer: int = 0, datatype: int = 0):
+        """
+        The returned polygon can be rotated in place with `polygon.rotate(angle, center)` on both backends.
+        """
+        return gdspy.Polygon(points, layer=layer, datatype=datatype)
+
+    def round(self, center, radius, inner_radius: float = 0, initial_angle: float = 0, final_angle: float = 0,
+              tolerance: float = None, layer: int = 0, datatype: int = 0):
+        """
+        A circle, a ring or a sector of them.
+
+        Input:
+            center: tuple, the center.
+            radius: float, the outer radius.
+            inner_radius: float, the inner radius, 0 for a disk.
+            initial_angle, final_angle: float, the angles of the sector in radians, both 0 for a full circle.
+            tolerance: float, the arc tolerance, default arc_tolerance.
+
+        Output:
+            polygons: the shape.
+        """
+        if tolerance is None:
+            tolerance = arc_tolerance
+        return gdspy.Round(center, radius, inner_radius=inner_radius, initial_angle=initial_angle, final_angle=final_angle,
+                           tolerance=tolerance, layer=layer, datatype=datatype)
+
+    def polypath(self, points, width):
+        """
+        A path of straight sections with mitered corners.
+        """
+        return gdspy.PolyPath(points, width)
+
+    def flexpath(self, points, width, corners: str = "natural", bend_radius: float = None, tolerance: float = None):
+        """
+        A path through points converted to polygons.
+
+        Input:
+            points: list, the points of the path.
+            width: float, the width of the path.
+            corners: str, the gdspy corner type, "circular bend" uses arcs of bend_radius.
+            bend_radius: float, the radius of the "circular bend" corners.
+            tolerance: float, the arc tolerance, default arc_tolerance.
+
+        Output:
+            polygons: the polygons of the path.
+        """
+        if tolerance is None:
+            tolerance = arc_tolerance
+        return gdspy.FlexPath(points, width, corners=corners, bend_radius=bend_radius, tolerance=tolerance).to_polygonset()
+
+    def path(self, width, initial_point=(0, 0), number_of_paths: int = 1, distance: float = 0):
+        """
+        A path drawn by segments and turns, e.g. `path.segment(100, "+x")`, `path.turn(50, "rr")`, `path.rotate(angle, center)`.
+        The turns are drawn with arc_tolerance.
+
+        Input:
+            width: float, the width of each parallel path.
+            initial_point: tuple, the start of the center line.
+            number_of_paths: int, the number of parallel paths.
+            distance: float, the distance between the centers of adjacent parallel paths.
+
+        Output:
+            path: the path.
+        """
+        return GdspyPath(width, initial_point, number_of_paths, distance, tolerance=arc_tolerance)
+
+    def boolean(self, operand1, operand2, operation, layer: int = 0, datatype: int = 0):
+        """
+        Input:
+            operand1: cell, shape or list of shapes.
+            operand2: cell, shape or list of shapes.
+            operation: str, "or", "and", "xor" or "not".
+
+        Output:
+            polygons: the result, None when it is empty.
+        """
+        return gdspy.boolean(operand1, operand2, operation, layer=layer, datatype=datatype)
+
+    def polygon_set(self, polygon_list, layer: int = 0, datatype: int = 0):
+        return gdspy.PolygonSet(polygon_list, layer=layer, datatype=datatype)
+
+    def rotate(self, element, angle, center=(0, 0)):
+        """
+        Rotates shapes in place.
+
+        Input:
+            element: the shape(s) returned by the backend, None (an empty boolean result) is skipped.
+            angle: float, the angle in radians.
+            center: tuple, the center of the rotation.
+
+        Output:
+            element: the rotated shape(s).
+        """
+        if isinstance(element, (list, tuple)):
+            for item in element:
+                self.rotate(item, angle, center)
+        elif element is not None:
+            element.rotate(angle, center)
+        return element
+
+    def translate(self, element, dx, dy):
+        """
+        Translates shapes in place.
+
+        Input:
+            element: the shape(s) returned by the backend, None (an empty boolean result) is skipped.
+            dx, dy: float, the translation.
+
+        Output:
+            element: the translated shape(s).
+        """
+        if isinstance(element, (list, tuple)):
+            for item in element:
+                self.translate(item, dx, dy)
+        elif element is not None:
+            element.translate(dx, dy)
+        return element
+
+    def shapes_bounding_box(self, element):
+        """
+        Input:
+            element: the shape(s) returned by the backend.
+
+        Output:
+            bbox: ((x_min, y_min), (x_max, y_max)) array, or None when there is no shape.
+        """
+        if isinstance(element, (list, tuple)):
+            bbox_list = [bbox for bbox in (self.shapes_bounding_box(item) for item in element) if bbox is not None]
+            if len(bbox_list) == 0:
+                return None
+            return np.array([np.min([bbox[0] for bbox in bbox_list], axis=0), np.max([bbox[1] for bbox in bbox_list], axis=0)])
+        if element is None:
+            return None
+        return element.get_bounding_box()
+
+    def get_polygons(self, cell):
+        """
+        Input:
+            cell: the cell.
+
+        Output:
+            polygons: dict, {(layer, datatype): list of point arrays}, paths and references included.
+        """
+        return cell.get_polygons(by_spec=True)
+
+    def bounding_box(self, cell):
+        """
+        Input:
+            cell: the cell.
+
+        Output:
+            bbox: ((x_min, y_min), (x_max, y_max)) array, or None when the cell is empty.
+        """
+        return cell.get_bounding_box()
+
+    def merge_cells(self, target, cells, layer: int = None):
+        """
+        Adds the elements of cells to a target cell.
+
+        Input:
+            target: the cell receiving the elements.
+            cells: list, the source cells, they are not modified.
+            layer: int, when given the target is flattened on this layer (datatype 0), copying the polygons.
+
+        Output:
+            None
+        """
+        for cell in cells:
+            target.add(cell)  # Adds the elements of the cell, not a copy
+        if layer is not None:
+            target.flatten(single_layer=layer, single_datatype=0)
+        return
+
+    def native_cell(self, cell):
+        """
+        Converts a cell drawn with another library, e.g. by a component drawing with gdspy directly.
+
+        Input:
+            cell: a gdspy or gdstk cell.
+
+        Output:
+            cell: gdspy.Cell
+        """
+        if isinstance(cell, gdspy.Cell):
+            return cell
+        gdspy.library.use_current_library = False
+        native = gdspy.Cell(cell.name)
+        for (layer, datatype), polygon_list in GdstkBackend.get_polygons(self, cell).items():
+            native.add(gdspy.PolygonSet(polygon_list, layer=layer, datatype=datatype))
+        return native
+
+    def repeated_polygon_set(self, polygon_list, layer: int = 0, datatype: int = 0):
+        """
+        Polygons stored once with the offsets of their translated copies, when the library supports repetitions.
+        gdspy does not, the polygons are kept as they are.
+        """
+        return self.polygon_set(polygon_list, layer=layer, datatype=datatype)
+
+    def place_cell(self, master, origins):
+        """
+        Places a master cell at several origins, as one CellArray when the origins fill a regular grid.
+
+        Input:
+            master: the cell to place.
+            origins: list, the (x, y) origins.
+
+        Output:
+            references: list, gdspy.CellArray or gdspy.CellReference objects.
+        """
+        grid = regular_grid(origins)
+        if grid is not None:
+            origin, columns, rows, spacing = grid
+            return [gdspy.CellArray(master, columns, rows, spacing, origin=origin)]
+        return [gdspy.CellReference(master, origin=origin) for origin in origins]
+
+    def write_gds(self, lib, path):
+        lib.write_gds(outfile=path)
+        return
+
+    def write_oas(self, lib, path, compression_level: int = 6):
+        raise NotImplementedError("gdspy can not write OASIS files, use the gdstk backend")
+
+    def show(self, lib):
+        gdspy.LayoutViewer(library=lib)
+        return
+
+
+class GdspyPath(gdspy.Path):
+    """
+    gdspy.Path whose turns and arcs default to the arc tolerance the path was created with.
+    """
+
+    def __init__(self, width, initial_point=(0, 0), number_of_paths: int = 1, distance: float = 0, tolerance: float = None):
+        super().__init__(width, initial_point, number_of_paths, distance)
+        self.arc_tolerance = arc_tolerance if tolerance is None else tolerance
+
+    def turn(self, radius, angle, tolerance: float = None, *args, **kwargs):
+        return super().turn(radius, angle, self.arc_tolerance if tolerance is None else tolerance, *args, **kwargs)
+
+    def arc(self, radius, initial_angle, final_angle, tolerance: float = None, *args, **kwargs):
+        return super().arc(radius, initial_angle, final_angle, self.arc_tolerance if tolerance is None else tolerance, *args, **kwargs)
+
+
+class GdstkTurtlePath:
+    """
+    gdspy.Path for the gdstk backend: for each parallel path, each segment is a rectangle (a trapezoid when its width
+    changes) and each turn an annular sector, as gdspy draws them.
+    """
+
+    def __init__(self, width, initial_point=(0, 0), number_of_paths: int = 1, distance: float = 0, tolerance: float = None):
+        self.width = width
+        # Offsets of the parallel paths from the center line, to the left
+        self.offsets = [(i - (number_of_paths - 1) / 2) * distance for i in range(number_of_paths)]
+        self.x, self.y = float(initial_point[0]), float(initial_point[1])
+        self.direction = 0.0
+        self.tolerance = arc_tolerance if tolerance is None else tolerance
+        self.polygons = []
+
+    def segment(self, length, direction=None, final_width: float = None, layer: int = 0, datatype: int = 0):
+        """
+        Input:
+            length: float, the length of the segment.
+            direction: str or float, "+x", "-x", "+y", "-y" or an angle in radians, default the current direction.
+            final_width: float, the width at the end of the segment, which tapers linearly, default the current width.
+            layer, datatype: int, of the segment polygon.
+
+        Output:
+            self
+        """
+        if direction is not None:
+            self.direction = DIRECTIONS[direction] if isinstance(direction, str) else float(direction)
+        if final_width is None:
+            final_width = self.width
+        ux, uy = np.cos(self.direction), np.sin(self.direction)
+        nx, ny = -uy * self.width / 2, ux * self.width / 2
+        fx, fy = -uy * final_width / 2, ux * final_width / 2
+        x1, y1 = self.x + ux * length, self.y + uy * length
+        for offset in self.offsets:
+            ox, oy = -uy * offset, ux * offset
+            self.polygons.append(gdstk.Polygon([(self.x + ox + nx, self.y + oy + ny), (self.x + ox - nx, self.y + oy - ny),
+                                                (x1 + ox - fx, y1 + oy - fy), (x1 + ox + fx, y1 + oy + fy)],
+                                               layer=layer, datatype=datatype))
+        self.x, self.y = x1, y1
+        self.width = final_width
+        return self
+
+    def turn(self, radius, angle, tolerance: float = None, layer: int = 0, datatype: int = 0):
+        """
+        Input:
+            radius: float, the radius of the turn.
+            angle: str or float, "l", "r", "ll", "rr", "lll", "rrr" or an angle in radians, positive to the left.
+            tolerance: float, the arc tolerance, default the tolerance of the path.
+            layer, datatype: int, of the turn polygon.
+
+        Output:
+            self
+        """
+        angle = TURNS[angle] if isinstance(angle, str) else float(angle)
+        side = np.pi / 2 if angle > 0 else -np.pi / 2
+        cx, cy = self.x + radius * np.cos(self.direction + side), self.y + radius * np.sin(self.direction + side)
+        initial_angle = self.direction - side
+        final_angle = initial_angle + angle
+        tolerance = self.tolerance if tolerance is None else tolerance
+        # Vertices as gdspy.Path.arc places them: an even number, split in pieces of at most 199
+        half_width = self.width / 2
+        outer_radius = radius + max(abs(offset) for offset in self.offsets) + half_width
+        num = max(6, 2 + 2 * int(0.5 * abs(angle) / np.arccos(1 - tolerance / outer_radius) + 0.5))
+        pieces = int(np.ceil(num / 199))
+        num = num // pieces
+        angles = np.linspace(initial_angle, final_angle, pieces + 1)
+        for start, end in zip(angles[:-1], angles[1:]):
+            outer_angles = np.linspace(start, end, num - num // 2)
+            inner_angles = np.linspace(end, start, num // 2)
+            for offset in self.offsets:
+                path_radius = radius - offset if angle > 0 else radius + offset
+                points = np.concatenate((
+                    (path_radius + half_width) * np.column_stack((np.cos(outer_angles), np.sin(outer_angles))),
+                    (path_radius - half_width) * np.column_stack((np.cos(inner_angles), np.sin(inner_angles)))))
+                self.polygons.append(gdstk.Polygon(points + (cx, cy), layer=layer, datatype=datatype))
+        self.x, self.y = cx + radius * np.cos(final_angle), cy + radius * np.sin(final_angle)
+        self.direction += angle
+        return self
+
+    def translate(self, dx, dy):
+        for polygon in self.polygons:
+            polygon.translate(dx, dy)
+        self.x, self.y = self.x + dx, self.y + dy
+        return self
+
+    def rotate(self, angle, center=(0, 0)):
+        for polygon in self.polygons:
+            polygon.rotate(angle, center)
+        dx, dy = self.x - center[0], self.y - center[1]
+        self.x = center[0] + dx * np.cos(angle) - dy * np.sin(angle)
+        self.y = center[1] + dx * np.sin(angle) + dy * np.cos(angle)
+        self.direction += angle
+        return self
+
+
+class GdstkBackend(GdspyBackend):
+    """
+    Draws with gdstk, a C++ successor of gdspy with the same geometry model. Arcs are approximated within the same
+    tolerance, so layouts match the gdspy backend up to the arc discretization (see test/test_geometry_backend.py).
+    """
+    name = "gdstk"
+
+    def new_library(self):
+        return gdstk.Library()
+
+    def add(self, cell, element):
+        if element is None:
+            return
+        if isinstance(element, GdstkTurtlePath):
+            cell.add(*element.polygons)
+        elif isinstance(element, (list, tuple)):
+            cell.add(*element)
+        else:
+            cell.add(element)
+        return
+
+    def rectangle(self, point1, point2, layer: int = 0, datatype: int = 0):
+        return gdstk.rectangle(point1, point2, layer=layer, datatype=datatype)
+
+    def polygon(self, points, layer: int = 0, datatype: int = 0):
+        return gdstk.Polygon(points, layer=layer, datatype=datatype)
+
+    def round(self, center, radius, inner_radius: float = 0, initial_angle: float = 0, final_angle: float = 0,
+              tolerance: float = None, layer: int = 0, datatype: int = 0):
+        if tolerance is None:
+            tolerance = arc_tolerance
+        return gdstk.ellipse(center, radius, inner_radius=inner_radius if inner_radius > 0 else None,
+                             initial_angle=initial_angle, final_angle=final_angle, tolerance=tolerance,
+                             layer=layer, datatype=datatype)
+
+    def polypath(self, points, width):
+        return gdstk.FlexPath(points, width, joins="miter").to_polygons()
+
+    def flexpath(self, points, width, corners: str = "natural", bend_radius: float = None, tolerance: float = None):
+        if tolerance is None:
+            tolerance = arc_tolerance
+        if corners == "circular bend":
+            outline = circular_bend_outline(points, width, bend_radius, tolerance)
+            return [gdstk.Polygon(outline)] if len(outline) > 0 else []
+        return gdstk.FlexPath(points, width, joins=corners, tolerance=tolerance).to_polygons()
+
+    def path(self, width, initial_point=(0, 0), number_of_paths: int = 1, distance: float = 0):
+        return GdstkTurtlePath(width, initial_point, number_of_paths, distance)
+
+    def operand(self, operand):
+        """
+        Input:
+            operand: cell, shape or list of them, None (an empty boolean result) is empty.
+
+        Output:
+            polygons: list, the gdstk polygons of the operand.
+        """
+        if operand is None:
+            return []
+        if isinstance(operand, gdstk.Cell):
+            return operand.get_polygons()
+        if isinstance(operand, GdstkTurtlePath):
+            return operand.polygons
+        if isinstance(operand, (list, tuple)):
+            return [polygon for item in operand for polygon in self.operand(item)]
+        return [operand]
+
+    def boolean(self, operand1, operand2, operation, layer: int = 0, datatype: int = 0):
+        polygons = gdstk.boolean(self.operand(operand1), self.operand(operand2), operation, layer=layer, datatype=datatype)
+        return polygons if len(polygons) > 0 else None
+
+    def polygon_set(self, polygon_list, layer: int = 0, datatype: int = 0):
+        return [gdstk.Polygon(points, layer=layer, datatype=datatype) for points in polygon_list]
+
+    def rotate(self, element, angle, center=(0, 0)):
+        if isinstance(element, GdstkTurtlePath):
+            return element.rotate(angle, center)
+        for polygon in self.operand(element):
+            polygon.rotate(angle, center)
+        return element
+
+    def translate(self, element, dx, dy):
+        if isinstance(element, GdstkTurtlePath):
+            return element.translate(dx, dy)
+        for polygon in self.operand(element):
+            polygon.translate(dx, dy)
+        return element
+
+    def shapes_bounding_box(self, element):
+        polygon_list = self.operand(element)
+        if len(polygon_list) == 0:
+            return None
+        points = np.concatenate([polygon.points for polygon in polygon_list])
+        return np.array([points.min(axis=0), points.max(axis=0)])
+
+    def get_polygons(self, cell):
+        polygons = {}
+        for polygon in cell.get_polygons():
+            polygons.setdefault((polygon.layer, polygon.datatype), []).append(polygon.points)
+        return polygons
+
+    def bounding_box(self, cell):
+        return cell.bounding_box()
+
+    def merge_cells(self, target, cells, layer: int = None):
+        for cell in cells:
+            if layer is None:
+                target.add(*cell.polygons, *cell.paths, *cell.references)
+                continue
+            polygon_list = cell.get_polygons()  # Copies
+            for polygon in polygon_list:
+                polygon.layer = layer
+                polygon.datatype = 0
+            target.add(*polygon_list)
+        return
+
+    def native_cell(self, cell):
+        if isinstance(cell, gdstk.Cell):
+            return cell
+        native = gdstk.Cell(cell.name)
+        for (layer, datatype), polygon_list in cell.get_polygons(by_spec=True).items():
+            native.add(*[gdstk.Polygon(points, layer=layer, datatype=datatype) for points in polygon_list])
+        return native
+
+    def write_gds(self, lib, path):
+        lib.write_gds(path)
+        return
+
+    def repetition(self, origins):
+        """
+        Input:
+            origins: list, the (x, y) origins of an element.
+
+        Output:
+            origin: tuple, the origin of the element.
+            repetition: gdstk.Repetition placing it at all origins, a grid or explicit offsets, or None for one origin.
+        """
+        grid = regular_grid(origins)
+        if grid is not None:
+            origin, columns, rows, spacing = grid
+            return origin, gdstk.Repetition(columns, rows, spacing=spacing)
+        if len(origins) == 1:
+            return origins[0], None
+        x0, y0 = origins[0]
+        return origins[0], gdstk.Repetition(offsets=[(x - x0, y - y0) for x, y in origins[1:]])
+
+    def place_cell(self, master, origins):
+        """
+        Places a master cell at several origins with one Reference: a regular grid is stored as an array, other
+        origins as an explicit repetition (written as an OASIS repetition, or one SREF per origin in GDSII).
+        """
+        origin, repetition = self.repetition(origins)
+        reference = gdstk.Reference(master, origin)
+        if repetition is not None:
+            reference.repetition = repetition
+        return [reference]
+
+    def repeated_polygon_set(self, polygon_list, layer: int = 0, datatype: int = 0):
+        """
+        Polygons which are translated copies of each other in database units are stored as one polygon with a
+        repetition, e.g. the air bridges of a straight line or the indium bumps of a chip. The vertices are rounded
+        first as gdstk rounds them when writing (half away from zero), so the file holds the same vertices as without
+        repetitions.
+        """
+        origin_Dict = {}  # shape -> (vertices relative to the first one, origins), in database units
+        for points in polygon_list:
+            points = np.asarray(points, dtype=float) * DATABASE_SCALE
+            points = np.trunc(points + np.copysign(0.5, points)).astype(np.int64)
+            shape = points - points[0]
+            key = (len(shape), shape.tobytes())
+            origin_Dict.setdefault(key, (shape, []))[1].append((points[0][0] / DATABASE_SCALE, points[0][1] / DATABASE_SCALE))
+        polygons = []
+        for shape, origins in origin_Dict.values():
+            origin, repetition = self.repetition(origins)
+            polygon = gdstk.Polygon(shape / DATABASE_SCALE + origin, layer=layer, datatype=datatype)
+            if repetition is not None:
+                polygon.repetition = repetition
+            polygons.append(polygon)
+        return polygons
+
+    def write_oas(self, lib, path, compression_level: int = 6):
+        """
+        Input:
+            lib: gdstk.Library
+            path: str, the path of the OASIS file.
+            compression_level: int, 0 (no CBLOCK compression) to 9 (smallest file), as gdstk.Library.write_oas.
+
+        Output:
+            None
+        """
+        lib.write_oas(path, compression_level=compression_level)
+        return
+
+    def show(self, lib):
+        raise NotImplementedError("The layout viewer needs the gdspy backend, use save_svg with gdstk")
+
+
+def regular_grid(origins):
+    """
+    Checks whether origins fill a regular grid, so that they can be placed as one array.
+
+    Input:
+        origins: list, the (x, y) origins.
+
+    Output:
+        grid: tuple, (origin, columns, rows, spacing), or None when the origins are not a full regular grid of
+            more than one point.
+    """
+    if len(origins) < 2 or len(set(origins)) != len(origins):
+        return None
+    xs = sorted(set(x for x, y in origins))
+    ys = sorted(set(y for x, y in origins))
+    if len(xs) * len(ys) != len(origins):
+        return None
+    dx = xs[1] - xs[0] if len(xs) > 1 else 0
+    dy = ys[1] - ys[0] if len(ys) > 1 else 0
+    if not (np.allclose(np.diff(xs), dx, rtol=0, atol=1e-9) and np.allclose(np.diff(ys), dy, rtol=0, atol=1e-9)):
+        return None
+    return ((xs[0], ys[0]), len(xs), len(ys), (dx, dy))
+
+
+def circular_bend_outline(points, width, bend_radius, tolerance):
+    """
+    The outline of a path whose corners are arcs, computed as gdspy.FlexPath draws "circular bend" corners. Each arc
+    is drawn even when it does not fit between its neighbouring corners (gdstk drops such bends), so both backends
+    give the same outline.
+
+    Input:
+        points: list, the points of the path.
+        width: float, the width of the path.
+        bend_radius: float, the radius of the corners, on the center line.
+        tolerance: float, the arc tolerance.
+
+    Output:
+        outline: np.ndarray, the (x, y) points of the outline, empty when the path has no length.
+    """
+    points = np.array(points, dtype=float)
+    points = points[np.concatenate(([True], np.any(points[1:] != points[:-1], axis=1)))]
+    if len(points) < 2:
+        return np.zeros((0, 2))
+    half_w = 0.5 * width
+    edges = points[1:] - points[:-1]
+    normals = edges[:, ::-1] * (-1.0, 1.0) / np.hypot(edges[:, 0], edges[:, 1]).reshape((-1, 1))
+    arms = []
+    for sign in (-1, 1):
+        starts = points[:-1] + sign * half_w * normals
+        ends = points[1:] + sign * half_w * normals
+        vectors = ends - starts
+        arm = [starts[0]]
+        for i in range(1, len(points) - 1):
+            p0, v0, p1, v1 = ends[i - 1], vectors[i - 1], starts[i], vectors[i]
+            direction = v0[0] * v1[1] - v0[1] * v1[0]
+            if direction == 0:
+                arm.append(0.5 * (p0 + p1))
+                continue
+            if direction > 0:
+                a0, a1 = np.arctan2(-v0[0], v0[1]), np.arctan2(-v1[0], v1[1])
+            else:
+                a0, a1 = np.arctan2(v0[0], -v0[1]), np.arctan2(v1[0], -v1[1])
+            if abs(a1 - a0) > np.pi:
+                if a1 > a0:
+                    a0 += 2 * np.pi
+                else:
+                    a1 += 2 * np.pi
+            # The edge inside the turn has the smaller radius
+            v2 = p0 - points[i]
+            inside = direction * (v0[0] * v2[1] - v0[1] * v2[0]) > 0
+            radius = bend_radius - half_w if inside else bend_radius + half_w
+            half_angle = 0.5 * abs(a1 - a0)
+            num = max(2, 1 + int(half_angle / np.arccos(1 - tolerance / radius) + 0.5))
+            angles = np.linspace(a0, a1, num)
+            arc = radius * np.column_stack((np.cos(angles), np.sin(angles)))
+            arm.extend(arc - arc[0] + p0 - bend_radius * np.tan(half_angle) * v0 / np.hypot(v0[0], v0[1]))
+        arm.append(ends[-1])
+        arms.append(arm)
+    return np.array(arms[0] + arms[1][::-1])
+
+
+BACKENDS = {"gdspy": GdspyBackend(), "gdstk": GdstkBackend()}
+
+# The backend components are drawn with
+active = BACKENDS["gdspy"]
+
+# The arc tolerance components are drawn with, in um
+arc_tolerance = DEFAULT_TOLERANCE
+
+
+# Component classes which drew with another library than the active backend, see report_conversion
+converted_classes = set()
+
+
+def report_conversion(cmpnt_class):
+    """
+    Reports, once per class, a component class drawing with gdspy directly: its cells are converted to the active
+    backend after drawing (see LibraryBase.draw_native_gds), so its booleans and offsets are still computed by gdspy.
+
+    Input:
+        cmpnt_class: class, the component class.
+
+    Output:
+        None
+    """
+    if cmpnt_class in converted_classes:
+        return
+    converted_classes.add(cmpnt_class)
+    print("{} draws with gdspy, its cells are converted to the {} backend".format(cmpnt_class.__name__, active.name))
+    return
+
+
+def on_database_grid(pos):
+    """
+    Checks that a position is a whole number of database units (see DATABASE_SCALE), so that polygons placed there
+    by a reference are rounded as the translated polygons would be.
+
+    Input:
+        pos: tuple, (x, y) in um.
+
+    Output:
+        bool
+    """
+    scaled = np.asarray(pos, dtype=float) * DATABASE_SCALE
+    return bool(np.all(np.abs(scaled - np.round(scaled)) < 1e-6))
+
+
+def get_backend(name):
+    """
+    Input:
+        name: str, "gdspy" or "gdstk".
+
+    Output:
+        backend: GdspyBackend or GdstkBackend
+
+    Exception:
+        ValueError: Throws an exception when the backend is unknown.
+        ImportError: Throws an exception when the library of the backend is not installed.
+    """
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError("Unknown geometry backend {}, expected one of {}".format(name, list(BACKENDS.keys())))
+    if name == "gdstk":
+        gdstk.Cell  # Imports gdstk
+    return backend
+
+
+def get_tolerance(precision):
+    """
+    Input:
+        precision: str or float, a name of PRECISIONS ("preview", "default" or "tapeout") or an arc tolerance in um.
+
+    Output:
+        tolerance: float, the arc tolerance.
+
+    Exception:
+        ValueError: Throws an exception when the name is unknown or the tolerance is not positive.
+    """
+    if isinstance(precision, str):
+        if precision not in PRECISIONS:
+            raise ValueError("Unknown geometry precision {}, expected one of {} or a tolerance".format(precision, list(PRECISIONS.keys())))
+        return PRECISIONS[precision]
+    tolerance = float(precision)
+    if not tolerance > 0:
+        raise ValueError("The arc tolerance must be positive, got {}".format(precision))
+    return tolerance
+
+
+def drawing_mode():
+    """
+    What a drawn cell depends on besides the component parameters: the active backend and arc tolerance.
+
+    Input:
+        None
+
+    Output:
+        mode: tuple, (backend name, arc tolerance).
+    """
+    return (active.name, arc_tolerance)
+
+
+@contextlib.contextmanager
+def use(name: str = None, tolerance: float = None):
+    """
+    Draws with a backend and an arc tolerance inside the block, e.g.
+
+        with geometry_backend.use("gdstk", tolerance=0.5):
+            gds.draw_gds()
+
+    Input:
+        name: str, see get_backend, default the active backend.
+        tolerance: float, the arc tolerance, default the active one.
+
+    Output:
+        backend: the backend.
+    """
+    global active, arc_tolerance
+    previous = active, arc_tolerance
+    if name is not None:
+        active = get_backend(name)
+    if tolerance is not None:
+        arc_tolerance = tolerance
+    try:
+        yield active
+    finally:
+        active, arc_tolerance = previous
+
+
+def owner_setting(obj, attr_name):
+    """
+    Finds a drawing setting of a layout object or the objects containing it, e.g. the backend selected with
+    Gds.set_geometry_backend ("geometry_backend") or the arc tolerance selected with Gds.set_geometry_precision
+    ("geometry_tolerance").
+
+    Input:
+        obj: Base, e.g. a component collection.
+        attr_name: str, the attribute holding the setting.
+
+    Output:
+        value: the setting, or None when it was not selected.
+    """
+    while obj is not None:
+        value = obj.__dict__.get(attr_name)
+        if value is not None:
+            return value
+        obj = obj.__dict__.get("options_parent")
+    return None
+
+
+def uses_backend(func):
+    """
+    Decorates a method of a layout object so that it draws with the backend and arc tolerance selected for the object.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        name = owner_setting(self, "geometry_backend")
+        tolerance = owner_setting(self, "geometry_tolerance")
+        if (name is None or name == active.name) and (tolerance is None or tolerance == arc_tolerance):
+            return func(self, *args, **kwargs)
+        with use(name, tolerance):
+            return func(self, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,301 @@
+##################################################################
+# Process-wide cache of drawn component geometry
+##################################################################
+
+from collections import OrderedDict
+from addict import Dict
+import numpy as np
+from base import geometry_backend, options_tree
+
+# Parameters which do not change the shape of a component drawn around gds_pos: the name only names the cells,
+# the position only translates the polygons, pins and outline are calculated from the other parameters.
+# Components placed by another parameter list their own (see LibraryBase.geometry_cache_position).
+TRANSLATION_OPTIONS = ("name", "gds_pos", "topo_pos", "chip", "readout_pins", "control_pins", "coupling_pins", "outline")
+
+
+class CellGeometry:
+    """
+    Polygons of one cell, stored relative to a position.
+    """
+
+    def __init__(self, cell, name, offset):
+        """
+        Input:
+            cell: gdspy or gdstk cell (see base.geometry_backend).
+            name: str, the name of the component.
+            offset: np.ndarray, the position the polygons are stored relative to.
+
+        Output:
+            None
+        """
+        # Cell names are stored relative to the component name, e.g. "q0_cell" -> "_cell"
+        self.cell_suffix = cell.name[len(name):] if cell.name.startswith(name) else None
+        self.cell_name = cell.name
+        self.polygons = {}
+        for spec, polygon_list in geometry_backend.active.get_polygons(cell).items():
+            self.polygons[spec] = [np.array(polygon, dtype=float) - offset for polygon in polygon_list]
+        return
+
+    def build(self, lib, name, offset):
+        """
+        Input:
+            lib: the library receiving the cell, of the active geometry backend.
+            name: str, the name of the component.
+            offset: np.ndarray, the position the polygons are translated to.
+
+        Output:
+            cell: the cell, in lib.
+        """
+        backend = geometry_backend.active
+        cell = lib.new_cell(self.cell_name if self.cell_suffix is None else name + self.cell_suffix)
+        for (layer, datatype), polygon_list in self.polygons.items():
+            backend.add(cell, backend.polygon_set([polygon + offset for polygon in polygon_list], layer=layer, datatype=datatype))
+        return cell
+
+
+class GeometryEntry(CellGeometry):
+    """
+    Polygons of one drawn component, stored relative to its position, with the attributes set while drawing it.
+    """
+
+    def __init__(self, cell, name, pos, attributes=None):
+        """
+        Extracts the polygons of a drawn cell.
+
+        Input:
+            cell: the drawn cell of the component, gdspy or gdstk (see base.geometry_backend).
+            name: str, the name of the component.
+            pos: tuple, the position of the component (see LibraryBase.geometry_cache_position).
+            attributes: dict, other attributes set by draw_gds (see LibraryBase.geometry_cache_attributes), cells or
+                lists of points, stored relative to pos as well. Default None.
+
+        Output:
+            None
+
+        Exception:
+            TypeError: Throws an exception when an attribute is neither a cell nor a list of points.
+        """
+        offset = np.array(pos, dtype=float)
+        super().__init__(cell, name, offset)
+        self.attributes = {}
+        for attr_name, value in (attributes or {}).items():
+            if hasattr(value, "name") and hasattr(value, "get_polygons"):
+                self.attributes[attr_name] = CellGeometry(value, name, offset)
+            else:
+                points = np.array(value, dtype=float)
+                if points.ndim == 0 or points.shape[-1] != 2:
+                    raise TypeError("Attribute {} is neither a cell nor a list of points.".format(attr_name))
+                self.attributes[attr_name] = points - offset
+        return
+
+    def build_cell(self, name, pos):
+        """
+        Builds a copy of the geometry translated to a position.
+
+        Input:
+            name: str, the name of the component.
+            pos: tuple, the position of the component.
+
+        Output:
+            lib: the library containing the cell, of the active geometry backend.
+            cell: the cell of the component.
+        """
+        lib = geometry_backend.active.new_library()
+        return lib, self.build(lib, name, np.array(pos, dtype=float))
+
+    def build_attributes(self, lib, name, pos):
+        """
+        Builds copies of the stored attributes translated to a position.
+
+        Input:
+            lib: the library receiving the cells, see build_cell.
+            name: str, the name of the component.
+            pos: tuple, the position of the component.
+
+        Output:
+            attributes: dict, {attribute name: cell in lib, or list of points}.
+        """
+        offset = np.array(pos, dtype=float)
+        attributes = {}
+        for attr_name, value in self.attributes.items():
+            if isinstance(value, CellGeometry):
+                attributes[attr_name] = value.build(lib, name, offset)
+            else:
+                attributes[attr_name] = (value + offset).tolist()
+        return attributes
+
+
+class GeometryCache:
+    """
+    LRU cache of GeometryEntry objects, keyed by the component class and its shape parameters.
+    """
+
+    def __init__(self, max_size: int = 256):
+        """
+        Input:
+            max_size: int, the maximum number of entries, the least recently used entries are evicted first.
+
+        Output:
+            None
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Looks up an entry and counts the hit or miss.
+
+        Input:
+            key: tuple, see `geometry_key`.
+
+        Output:
+            entry: GeometryEntry, or None when the key is not cached.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        """
+        Stores an entry, evicting the least recently used entries above max_size.
+
+        Input:
+            key: tuple, see `geometry_key`.
+            entry: GeometryEntry
+
+        Output:
+            None
+        """
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return
+
+    def clear(self):
+        """
+        Drops all entries and resets the counters.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        return
+
+    def stats(self):
+        """
+        Input:
+            None
+
+        Output:
+            stats: dict, the number of hits, misses and entries, and max_size.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "max_size": self.max_size}
+
+
+def hashable(value):
+    """
+    Converts a parameter value into a hashable value, lists and tuples compare equal.
+
+    Input:
+        value: any type, the parameter value.
+
+    Output:
+        value: a hashable value.
+
+    Exception:
+        TypeError: Throws an exception when the value can not be converted.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, hashable(v)) for k, v in options_tree.raw_items(value)))
+    if isinstance(value, (list, tuple)):
+        return tuple(hashable(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return hashable(value.tolist())
+    hash(value)
+    return value
+
+
+def geometry_key(cmpnt):
+    """
+    Builds the cache key of a component: the active geometry backend and arc tolerance, its class and every parameter
+    except those in `geometry_cache_ignore`.
+
+    Input:
+        cmpnt: LibraryBase, the component.
+
+    Output:
+        key: tuple, or None when a parameter can not be hashed.
+    """
+    ignore = cmpnt.geometry_cache_ignore
+    frozen = cmpnt.frozen_options()
+    try:
+        ops = tuple(sorted((k, hashable(v)) for k, v in options_tree.raw_items(frozen) if k not in ignore))
+    except TypeError:
+        return None
+    return (geometry_backend.drawing_mode(), cmpnt.__class__, ops)
+
+
+def translation(pos):
+    """
+    Checks that a position can be used as a translation.
+
+    Input:
+        pos: any type, the position of a component, e.g. its gds_pos.
+
+    Output:
+        pos: tuple, (x, y), or None when pos is not two numbers.
+    """
+    try:
+        x, y = pos
+        return (float(x), float(y))
+    except (TypeError, ValueError):
+        return None
+
+
+def translate_points(value, delta):
+    """
+    Translates the points of a parameter such as pins or an outline: every pair of numbers, in nested lists, tuples
+    and dicts, is moved by the displacement.
+
+    Input:
+        value: any type, the parameter value, e.g. [(x0, y0), (x1, y1)] or {"top": [x, y]}.
+        delta: tuple, (dx, dy).
+
+    Output:
+        value: the translated copy, with the same container types (tracked containers become plain ones).
+    """
+    if isinstance(value, dict):
+        node = Dict()
+        for k, v in value.items():
+            node[k] = translate_points(v, delta)
+        return node
+    if isinstance(value, (list, tuple)):
+        if len(value) == 2 and is_number(value[0]) and is_number(value[1]):
+            point = (value[0] + delta[0], value[1] + delta[1])
+            return point if isinstance(value, tuple) else list(point)
+        points = [translate_points(v, delta) for v in value]
+        return tuple(points) if isinstance(value, tuple) else points
+    return value
+
+
+def is_number(value):
+    """
+    Checks whether a value is a coordinate: a Python or NumPy number, but not a bool.
+    """
+    return type(value) is float or type(value) is int or isinstance(value, (np.integer, np.floating))
+
+
+# Shared by all components of the process
+cache = GeometryCache()
@@ -0,0 +1,89 @@
+##################################################################
+# Deferred imports of heavy modules and library classes
+##################################################################
+
+import importlib, types
+import toolbox
+
+
+class LazyModule(types.ModuleType):
+    """
+    Placeholder for a module which is imported on first attribute access.
+    """
+
+    def __init__(self, name):
+        """
+        Input:
+            name: str, the full name of the module, e.g. "matplotlib.pyplot".
+
+        Output:
+            None
+        """
+        super().__init__(name)
+        self.__dict__["_lazy_module"] = None
+        return
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return "<lazy module '{}' ({})>".format(self.__name__, state)
+
+
+def lazy_module(name):
+    """
+    Returns a module which is only imported on first use. Modules which are already imported are returned directly.
+
+    Input:
+        name: str, the full name of the module.
+
+    Output:
+        module: module or LazyModule
+    """
+    module = importlib.sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def class_getter(package_name, module_name_list):
+    """
+    Builds a module-level `__getattr__` (PEP 562) for a library package, so each class is imported from its module
+    the first time it is requested, e.g. `library.qubits.Transmon` imports library/qubits/transmon.py.
+    The class of module `xxx_yyy` is `XxxYyy` (see `toolbox.convert_to_camel_case`).
+
+    Input:
+        package_name: str, the name of the package, `__name__`.
+        module_name_list: list, the module names of the package, modules appended later are also found.
+
+    Output:
+        getter: function, the `__getattr__` of the package.
+    """
+    def getter(name):
+        package = importlib.sys.modules[package_name]
+        for module_name in module_name_list:
+            if toolbox.convert_to_camel_case(module_name) != name:
+                continue
+            full_name = package_name + "." + module_name
+            try:
+                module = importlib.import_module(full_name)
+            except ModuleNotFoundError as e:
+                if e.name != full_name:
+                    raise
+                break  # Listed without a module
+            cls = getattr(module, name)
+            setattr(package, name, cls)  # The next lookups do not go through __getattr__
+            return cls
+        raise AttributeError("module '{}' has no attribute '{}'".format(package_name, name))
+    return getter
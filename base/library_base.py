@@ -1,4 +1,5 @@
 from base.gds_base import GdsBase
+from base import geometry_backend, geometry_cache, options_tree
 from addict import Dict
 import copy
 
@@ -6,6 +7,17 @@ class LibraryBase(GdsBase):
     """
     LibraryBase serves as the base class for each component, providing common methods including parameter extraction, injection, and modification.
     """
+    cache_options = True
+    # Parameters ignored by the geometry cache (see base.geometry_cache), None disables the cache.
+    # Only set it when draw_gds depends on the other parameters alone, up to a translation by geometry_cache_position.
+    geometry_cache_ignore = None
+    # Parameter the component is drawn around, moving it translates the geometry
+    geometry_cache_position = "gds_pos"
+    # Attributes set by draw_gds besides lib and cell, cells or lists of points, restored with the cached geometry
+    geometry_cache_attributes = ()
+    # Parameters written by calc_general_ops, the other parameters of a component which is not built yet are read
+    # from default_options and the injected parameters (see lazy_frozen_options)
+    calculated_options = ()
 
     def __init__(self, options=Dict()):
         """
@@ -30,16 +42,289 @@ class LibraryBase(GdsBase):
         Output:
             None
         """
-        # Set default parameters
+        # Set default parameters, lists and dicts are tracked copies (see options_tree.track)
         for op_name, op in self.default_options.items():
-            super().__setattr__(op_name, op)
+            super().__setattr__(op_name, options_tree.track(op, self))
 
         # Save the list of parameter names
         self.op_name_list = list(self.__dict__.keys())
 
         # Inject parameters and calculate common parameters
-        self.inject_options(Dict(options))
+        if not isinstance(options, Dict):
+            options = Dict(options)
+        self.inject_options(options)
         self.calc_general_ops()  # Calculate common parameters
+        self.touch_options()  # calc_general_ops may modify parameters in place
+        return
+
+    @classmethod
+    def lazy_frozen_options(cls, options, calculate):
+        """
+        Builds the frozen parameters of a component which is not built yet, as `initialization` would set them:
+        the default parameters overridden by the injected ones. The parameters in calculated_options are only
+        computed when they are first read.
+
+        Input:
+            options: dict, the injected parameters, never modified afterwards since the frozen parameters share their values.
+            calculate: callable, calculate() returns the frozen parameters of the built component.
+
+        Output:
+            options: FrozenDict, the parameters of the component.
+        """
+        node = {}
+        for op_name in cls.default_options.keys():
+            if op_name in cls.calculated_options:
+                node[op_name] = options_tree.Deferred(lambda op_name=op_name: dict.__getitem__(calculate(), op_name))
+            elif op_name in options:
+                value = dict.__getitem__(options, op_name)
+                if type(value) is not options_tree.Deferred:  # E.g. parameters of a snapshot, decoded when read
+                    value = options_tree.freeze(value, copy_leaves=False)
+                node[op_name] = value
+            else:
+                node[op_name] = options_tree.freeze(cls.default_options[op_name])
+        return options_tree.new_frozen(node)
+
+    def can_translate(self, pos_name):
+        """
+        Checks whether moving the component by its position parameter only translates it, so that translate can
+        replace calc_general_ops: either calc_general_ops sets no parameter, or the component is drawn around this
+        parameter (see geometry_cache_ignore) and its calculated parameters are points which follow it.
+
+        Input:
+            pos_name: str, the position parameter, e.g. "gds_pos".
+
+        Output:
+            bool
+        """
+        if not self.calculated_options:
+            return True
+        return self.geometry_cache_ignore is not None and pos_name == self.geometry_cache_position
+
+    def translate(self, pos_name, pos, delta):
+        """
+        Moves the component without recalculating its parameters: the position is set and the parameters in
+        calculated_options are translated by the same displacement. Only for components where can_translate is True.
+
+        Input:
+            pos_name: str, the position parameter, e.g. "gds_pos".
+            pos: tuple, the new position.
+            delta: tuple, (dx, dy), the displacement from the current position.
+
+        Output:
+            None
+        """
+        # The frozen parameters and the bounding boxes are translated too, instead of being extracted or drawn again
+        bbox_Dict = self.translated_bounding_box(pos_name, pos)
+        node = dict(options_tree.raw_items(self.frozen_options()))
+        super().__setattr__(pos_name, options_tree.track(pos, self))
+        node[pos_name] = options_tree.freeze(pos)
+        for op_name in self.calculated_options:
+            value = geometry_cache.translate_points(node[op_name], delta)
+            super().__setattr__(op_name, options_tree.track(value, self))  # Tracked copy
+            node[op_name] = options_tree.freeze(value, copy_leaves=False)
+        self.touch_options()
+        if self.cache_options:
+            object.__setattr__(self, "frozen_ops", options_tree.new_frozen(node))
+        if bbox_Dict is not None:
+            object.__setattr__(self, "gds_bbox", bbox_Dict)
+        return
+
+    def translated_bounding_box(self, op_name, value):
+        """
+        Gets the cached bounding boxes the component will have once a parameter is set, when setting it only
+        translates the drawing: the parameter is the position the component is drawn around (see geometry_cache_ignore).
+
+        Input:
+            op_name: str, the parameter name.
+            value: any type, the new value.
+
+        Output:
+            bbox_Dict: dict, {cell_name: bbox} translated by the displacement, or None when the bounding boxes must be
+            measured again.
+        """
+        bbox_Dict = self.__dict__.get("gds_bbox")
+        if bbox_Dict is None or self.geometry_cache_ignore is None or op_name != self.geometry_cache_position:
+            return None
+        old_pos, pos = geometry_cache.translation(self.__dict__.get(op_name)), geometry_cache.translation(value)
+        if old_pos is None or pos is None:
+            return None
+        dx, dy = pos[0] - old_pos[0], pos[1] - old_pos[1]
+        return {cell_name: None if bbox is None else ((bbox[0][0] + dx, bbox[0][1] + dy), (bbox[1][0] + dx, bbox[1][1] + dy))
+                for cell_name, bbox in bbox_Dict.items()}
+
+    def __setattr__(self, name, value):
+        """
+        Sets an attribute, dropping the cached parameters when the attribute is a parameter.
+        Parameter lists and dicts are stored as tracked copies, which drop the cached parameters when they are modified
+        in place (see options_tree.track).
+
+        Input:
+            name: str, the attribute name.
+            value: any type, the attribute value.
+
+        Output:
+            None
+        """
+        if name in self.__dict__.get("op_name_list", ()):
+            bbox_Dict = self.translated_bounding_box(name, value)
+            super().__setattr__(name, options_tree.track(value, self))
+            self.touch_options()
+            if bbox_Dict is not None:
+                object.__setattr__(self, "gds_bbox", bbox_Dict)  # Moved, not redrawn
+            return
+        super().__setattr__(name, value)
+        return
+
+    def touch_options(self):
+        """
+        Drops the cached parameters and marks the drawn cell as outdated.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        object.__setattr__(self, "gds_dirty", True)
+        self.__dict__.pop("gds_bbox", None)
+        super().touch_options()
+        return
+
+    def get_bounding_box(self, cell_name: str = "cell"):
+        """
+        Gets the bounding box of a drawn cell of the component, cached until a parameter changes. Moving the component
+        by its position (see translated_bounding_box) translates the cached bounding box, it is not drawn again.
+        Otherwise the component is drawn first when it changed since it was last drawn.
+
+        Input:
+            cell_name: str, the attribute holding the cell, e.g. "jj_cell" for the junctions of some qubits.
+
+        Output:
+            bbox: tuple, ((x_min, y_min), (x_max, y_max)), or None when the cell has no polygon.
+        """
+        bbox_Dict = self.__dict__.get("gds_bbox")
+        if bbox_Dict is None or self.__dict__.get("gds_bbox_mode") != geometry_backend.drawing_mode():
+            self.redraw_gds()
+            bbox_Dict = {}
+            object.__setattr__(self, "gds_bbox", bbox_Dict)
+            object.__setattr__(self, "gds_bbox_mode", geometry_backend.drawing_mode())
+            # With cached parameters, the next change is reported to the containing collection
+            self.frozen_options()
+        elif cell_name not in bbox_Dict and self.redraw_gds():
+            object.__setattr__(self, "gds_bbox", bbox_Dict)  # Kept when drawing sets parameters, e.g. an outline
+            self.frozen_options()
+        if cell_name not in bbox_Dict:
+            box = geometry_backend.active.bounding_box(getattr(self, cell_name))
+            bbox_Dict[cell_name] = None if box is None else ((float(box[0][0]), float(box[0][1])), (float(box[1][0]), float(box[1][1])))
+        return bbox_Dict[cell_name]
+
+    def redraw_gds(self):
+        """
+        Draws the component unless it was already drawn with its current parameters.
+
+        Input:
+            None
+
+        Output:
+            drawn: bool, whether the component was drawn.
+        """
+        if self.is_drawn():
+            return False
+        self.draw_cached_gds()
+        object.__setattr__(self, "gds_dirty", False)
+        return True
+
+    def is_drawn(self):
+        """
+        Checks whether the component was drawn with its current parameters, the active geometry backend and arc tolerance.
+
+        Input:
+            None
+
+        Output:
+            bool
+        """
+        return (not self.__dict__.get("gds_dirty", True) and "cell" in self.__dict__ and
+                self.__dict__.get("gds_mode") == geometry_backend.drawing_mode())
+
+    def geometry_cache_key(self):
+        """
+        Gets the key of the component in the geometry cache, see base.geometry_cache.
+
+        Input:
+            None
+
+        Output:
+            key: tuple, or None when the component can not share its geometry.
+            pos: tuple, the position the geometry is drawn around (see geometry_cache_position), or None.
+        """
+        if self.geometry_cache_ignore is None:
+            return None, None
+        pos = geometry_cache.translation(getattr(self, self.geometry_cache_position))
+        if pos is None:
+            return None, None
+        return geometry_cache.geometry_key(self), pos
+
+    def draw_cached_gds(self):
+        """
+        Draws the component, reusing the polygons of an identical component drawn before at another position.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        key, pos = self.geometry_cache_key()
+        if key is None:
+            self.draw_native_gds()
+            return
+
+        entry = geometry_cache.cache.get(key)
+        if entry is None:
+            self.draw_native_gds()
+            geometry_cache.cache.put(key, geometry_cache.GeometryEntry(self.cell, self.name, pos, self.geometry_attributes()))
+        else:
+            self.lib, self.cell = entry.build_cell(self.name, pos)
+            for attr_name, value in entry.build_attributes(self.lib, self.name, pos).items():
+                setattr(self, attr_name, value)
+            object.__setattr__(self, "gds_mode", geometry_backend.drawing_mode())
+        return
+
+    def geometry_attributes(self):
+        """
+        Gets the attributes set by draw_gds which are stored in the geometry cache, see geometry_cache_attributes.
+
+        Input:
+            None
+
+        Output:
+            attributes: dict, {attribute name: value} of the attributes set by the last drawing.
+        """
+        return {attr_name: self.__dict__[attr_name] for attr_name in self.geometry_cache_attributes if attr_name in self.__dict__}
+
+    def draw_native_gds(self):
+        """
+        Draws the component with the active geometry backend (see base.geometry_backend).
+        The cells of components drawing with gdspy directly are converted to the backend, with the cells listed in
+        geometry_cache_attributes, and their class is reported once (see geometry_backend.report_conversion).
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        self.draw_gds()
+        backend = geometry_backend.active
+        for cell_name in ("cell", "jj_cell") + tuple(self.geometry_cache_attributes):
+            cell = self.__dict__.get(cell_name)
+            if cell is not None and hasattr(cell, "get_polygons"):
+                native = backend.native_cell(cell)
+                if native is not cell:
+                    geometry_backend.report_conversion(type(self))
+                self.__dict__[cell_name] = native
+        object.__setattr__(self, "gds_mode", geometry_backend.drawing_mode())
         return
 
     def extract_options(self):
@@ -57,7 +342,7 @@ class LibraryBase(GdsBase):
         for op_name in self.op_name_list:
             op = getattr(self, op_name)
             options[op_name] = copy.deepcopy(op)  # Deep copy parameter values
-        return copy.deepcopy(options)  # Return a deep copy of the parameter dictionary
+        return options
 
     def inject_options(self, options):
         """
@@ -71,7 +356,8 @@ class LibraryBase(GdsBase):
         """
         for k, v in options.items():
             if k in self.op_name_list:  # If the parameter name is in the defined parameter list
-                super().__setattr__(k, copy.deepcopy(v))  # Set parameter value
+                super().__setattr__(k, options_tree.track(copy.deepcopy(v), self))  # Set parameter value
+        self.touch_options()
         return
 
     def change_option(self, op_name, op_value):
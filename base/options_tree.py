@@ -0,0 +1,614 @@
+##################################################################
+# Copy-on-write options tree shared between objects and snapshots,
+# and tracked containers reporting in-place edits of parameters
+##################################################################
+
+from addict import Dict
+import copy
+
+# Values of these types are immutable and can be shared between trees without copying
+ATOMIC_TYPES = (str, int, float, bool, complex, type(None))
+
+
+class FrozenDict(Dict):
+    """
+    Immutable options node. Frozen nodes are shared freely between the cached options of an object
+    and every snapshot handed out from it, so they must never be modified in place.
+
+    Reading a child node returns a mutable CowDict view, and reading a mutable leaf (list, tuple...) returns a copy.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Builds a frozen node, freezing every value.
+
+        Input:
+            args, kwargs: same as dict.
+
+        Output:
+            None
+        """
+        init_node(self)
+        for k, v in dict(*args, **kwargs).items():
+            dict.__setitem__(self, k, freeze(v))
+        object.__setattr__(self, "__frozen", True)
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Frozen options can not be modified, modify a snapshot obtained through `thaw` instead.")
+
+    __setitem__ = __delitem__ = __setattr__ = __delattr__ = _read_only
+    update = pop = popitem = clear = setdefault = __ior__ = _read_only
+
+    def __getitem__(self, key):
+        value = resolve(self, key, dict.__getitem__(self, key))
+        if type(value) is FrozenDict:
+            return thaw(value)
+        return copy_leaf(value)
+
+    def __missing__(self, key):
+        return Dict()
+
+    def __iter__(self):
+        # Overridden so that dict(node) / {**node} read the values through __getitem__
+        return dict.__iter__(self)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def items(self):
+        return [(k, self[k]) for k in dict.keys(self)]
+
+    def values(self):
+        return [self[k] for k in dict.keys(self)]
+
+    def __eq__(self, other):
+        return dict(raw_items(self)) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def to_dict(self):
+        return thaw(self).to_dict()
+
+    def __copy__(self):
+        return thaw(self)
+
+    def copy(self):
+        return thaw(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return (freeze, (self.to_dict(),))
+
+
+class CowDict(Dict):
+    """
+    Mutable copy-on-write view of a frozen options node.
+
+    The view holds references to the frozen children of its source node. A child node (or a mutable leaf) is only
+    copied the first time it is read from the view, so modifying one entry copies only the path leading to it.
+    Deep copying a view freezes the modified path and returns a new view, which shares everything else.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Builds a view which owns all its values (no source node).
+
+        Input:
+            args, kwargs: same as addict.Dict.
+
+        Output:
+            None
+        """
+        object.__setattr__(self, "__shared", set())
+        object.__setattr__(self, "__source", None)
+        super().__init__(*args, **kwargs)
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)  # Calls __missing__ for missing keys
+        shared = object.__getattribute__(self, "__shared")
+        if key in shared:
+            shared.discard(key)
+            if type(value) is Deferred:
+                value = value.value()
+            if type(value) is FrozenDict:
+                value = thaw(value)
+            else:
+                value = copy_leaf(value)
+            dict.__setitem__(self, key, value)
+        return value
+
+    def __setitem__(self, name, value):
+        super().__setitem__(name, value)
+        object.__getattribute__(self, "__shared").discard(name)
+
+    def __delitem__(self, key):
+        dict.__delitem__(self, key)
+        object.__getattribute__(self, "__shared").discard(key)
+        object.__setattr__(self, "__source", None)
+
+    def __iter__(self):
+        # Overridden so that dict(view) / {**view} read the values through __getitem__
+        return dict.__iter__(self)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def items(self):
+        for k in list(object.__getattribute__(self, "__shared")):
+            self[k]
+        return dict.items(self)
+
+    def values(self):
+        for k in list(object.__getattribute__(self, "__shared")):
+            self[k]
+        return dict.values(self)
+
+    def __eq__(self, other):
+        return dict(raw_items(self)) == other  # Compares the shared values without copying them
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def pop(self, key, *default):
+        if key in self:
+            self[key]
+        object.__setattr__(self, "__source", None)
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        object.__getattribute__(self, "__shared").clear()
+        object.__setattr__(self, "__source", None)
+        key, value = dict.popitem(self)
+        if type(value) is Deferred:
+            value = value.value()
+        if type(value) is FrozenDict:
+            value = thaw(value)
+        return key, copy_leaf(value)
+
+    def clear(self):
+        dict.clear(self)
+        object.__getattribute__(self, "__shared").clear()
+        object.__setattr__(self, "__source", None)
+
+    def __copy__(self):
+        return thaw(freeze(self))
+
+    def copy(self):
+        return thaw(freeze(self))
+
+    def __deepcopy__(self, memo):
+        return thaw(freeze(self))
+
+    def __reduce__(self):
+        return (Dict, (self.to_dict(),))
+
+
+class Deferred:
+    """
+    Value of a frozen node computed when it is first read, e.g. the pins of a component which is not built yet
+    (see CmpntsBase.lazy_frozen_options). Nodes and views hold it like any frozen value, reading it through
+    `__getitem__`, `items`, `values` or `raw_get` computes it. The computed value must be frozen and must not depend
+    on when it is read.
+    """
+    __slots__ = ("compute", "computed")
+
+    def __init__(self, compute):
+        """
+        Input:
+            compute: callable, compute() returns the frozen value, it is called once.
+
+        Output:
+            None
+        """
+        self.compute = compute
+        self.computed = []
+
+    def value(self):
+        """
+        Computes the value on first call.
+
+        Input:
+            None
+
+        Output:
+            value: the frozen value.
+        """
+        if not self.computed:
+            self.computed.append(self.compute())
+            self.compute = None
+        return self.computed[0]
+
+
+def resolve(node, key, value):
+    """
+    Computes a deferred value read from a frozen node, and stores it in the node for the next reads.
+
+    Input:
+        node: FrozenDict, the node holding the value.
+        key: str, the key of the value.
+        value: any type, the raw value of the key.
+
+    Output:
+        value: the value, computed when it was deferred.
+    """
+    if type(value) is Deferred:
+        value = value.value()
+        dict.__setitem__(node, key, value)
+    return value
+
+
+def raw_get(node, key, default=None):
+    """
+    Reads a frozen value of a node without copying it, computing it when it is deferred.
+
+    Input:
+        node: dict, a FrozenDict, or a view whose unmodified values are frozen.
+        key: str, the key.
+        default: any type, returned when the key is missing.
+
+    Output:
+        value: the frozen value.
+    """
+    if key not in node:
+        return default
+    value = dict.__getitem__(node, key)
+    if type(value) is Deferred:
+        value = value.value()
+        if type(node) is FrozenDict:
+            dict.__setitem__(node, key, value)
+    return value
+
+
+def raw_items(node):
+    """
+    Lists the frozen values of a node without copying them, computing the deferred ones (see raw_get).
+
+    Input:
+        node: dict, a FrozenDict, or a view whose unmodified values are frozen.
+
+    Output:
+        items: list, the (key, value) pairs.
+    """
+    return [(k, raw_get(node, k)) for k in dict.keys(node)]
+
+
+def init_node(node):
+    """
+    Sets the internal attributes of addict.Dict on a node created without calling its __init__.
+
+    Input:
+        node: Dict, the node.
+
+    Output:
+        None
+    """
+    object.__setattr__(node, "__parent", None)
+    object.__setattr__(node, "__key", None)
+    object.__setattr__(node, "__frozen", False)
+    return
+
+
+def copy_leaf(value):
+    """
+    Copies a leaf value unless it is immutable.
+
+    Input:
+        value: any type, the leaf value.
+
+    Output:
+        value: the value itself if it is immutable, otherwise a deep copy.
+    """
+    if type(value) in ATOMIC_TYPES:
+        return value
+    return copy.deepcopy(value)
+
+
+def freeze(options, copy_leaves: bool = True):
+    """
+    Converts an options tree into frozen nodes, sharing every node which is already frozen.
+
+    Input:
+        options: dict / Dict / CowDict / FrozenDict, the options tree.
+        copy_leaves: bool, whether mutable leaves are copied. Only pass False when nobody else holds the tree.
+
+    Output:
+        frozen: FrozenDict, the frozen tree. Non-dict inputs are returned as leaves.
+    """
+    if type(options) is FrozenDict:
+        return options
+    if type(options) is CowDict:
+        source = unchanged_source(options)
+        if source is not None:
+            return source  # Nothing was read or written since the view was created
+        shared = object.__getattribute__(options, "__shared")
+        node = {}
+        for k, v in dict.items(options):
+            # Shared values still belong to the source node, everything else may be modified by the view owner
+            node[k] = v if k in shared else freeze(v, copy_leaves=True)
+        return new_frozen(node)
+    if isinstance(options, dict):
+        return new_frozen({k: freeze(v, copy_leaves) for k, v in options.items()})
+    if copy_leaves:
+        return copy_leaf(options)
+    return options
+
+
+def unchanged_source(options):
+    """
+    Gets the frozen node an options tree was created from, if it was not modified since.
+
+    Input:
+        options: any type, the options tree.
+
+    Output:
+        frozen: FrozenDict, the source node, or None when the tree is not an unmodified view of a frozen node.
+    """
+    if type(options) is FrozenDict:
+        return options
+    if type(options) is CowDict:
+        shared = object.__getattribute__(options, "__shared")
+        source = object.__getattribute__(options, "__source")
+        if source is not None and len(shared) == len(options):
+            return source
+    return None
+
+
+def new_frozen(node):
+    """
+    Wraps a dict whose values are already frozen without copying them again.
+
+    Input:
+        node: dict, the frozen values.
+
+    Output:
+        frozen: FrozenDict
+    """
+    frozen = FrozenDict.__new__(FrozenDict)
+    init_node(frozen)
+    dict.update(frozen, node)
+    object.__setattr__(frozen, "__frozen", True)
+    return frozen
+
+
+def thaw(frozen):
+    """
+    Creates a mutable view of a frozen node. The cost only depends on the number of direct children.
+
+    Input:
+        frozen: FrozenDict, the frozen node.
+
+    Output:
+        view: CowDict, a copy-on-write view of the node.
+    """
+    view = CowDict.__new__(CowDict)
+    init_node(view)
+    dict.update(view, dict.items(frozen))
+    object.__setattr__(view, "__shared", set(dict.keys(frozen)))
+    object.__setattr__(view, "__source", frozen)
+    return view
+
+
+class TrackedList(list):
+    """
+    List parameter of an object with cached options (see `track`). Modifying it in place calls `touch_options` on its owner,
+    so the cached options, the drawn cell and the bounding box of the owner are dropped.
+
+    Copies, deep copies and pickles are plain lists.
+    """
+    __slots__ = ("owner",)
+
+    def __init__(self, owner, values=()):
+        """
+        Input:
+            owner: Base, the object whose parameter the list is, or None.
+            values: iterable, the items, tracked for the same owner.
+
+        Output:
+            None
+        """
+        self.owner = owner
+        super().__init__(track(v, owner) for v in values)
+
+    def touch(self):
+        if self.owner is not None:
+            self.owner.touch_options()
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            value = [track(v, self.owner) for v in value]
+        else:
+            value = track(value, self.owner)
+        super().__setitem__(key, value)
+        self.touch()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.touch()
+
+    def __iadd__(self, values):
+        super().extend(track(v, self.owner) for v in values)
+        self.touch()
+        return self
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        self.touch()
+        return self
+
+    def append(self, value):
+        super().append(track(value, self.owner))
+        self.touch()
+
+    def extend(self, values):
+        super().extend(track(v, self.owner) for v in values)
+        self.touch()
+
+    def insert(self, index, value):
+        super().insert(index, track(value, self.owner))
+        self.touch()
+
+    def pop(self, *index):
+        value = super().pop(*index)
+        self.touch()
+        return value
+
+    def remove(self, value):
+        super().remove(value)
+        self.touch()
+
+    def clear(self):
+        super().clear()
+        self.touch()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self.touch()
+
+    def reverse(self):
+        super().reverse()
+        self.touch()
+
+    def __copy__(self):
+        return list(self)
+
+    def copy(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return untrack(self, memo)
+
+    def __reduce__(self):
+        return (list, (untrack(self),))
+
+
+class TrackedDict(Dict):
+    """
+    Dict parameter of an object with cached options (see `track`). Modifying it in place calls `touch_options` on its owner,
+    so the cached options, the drawn cell and the bounding box of the owner are dropped.
+
+    Copies, deep copies and pickles are plain addict.Dict.
+    """
+
+    def touch(self):
+        owner = self.__dict__.get("__owner")
+        if owner is not None:
+            owner.touch_options()
+
+    def __setitem__(self, name, value):
+        super().__setitem__(name, track(value, self.__dict__.get("__owner")))
+        self.touch()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.touch()
+
+    def pop(self, key, *default):
+        value = dict.pop(self, key, *default)
+        self.touch()
+        return value
+
+    def popitem(self):
+        item = dict.popitem(self)
+        self.touch()
+        return item
+
+    def clear(self):
+        dict.clear(self)
+        self.touch()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return dict.__getitem__(self, key)
+
+    def to_dict(self):
+        return untrack(self).to_dict()
+
+    def __copy__(self):
+        return Dict(dict.items(self))
+
+    def copy(self):
+        return self.__copy__()
+
+    def __deepcopy__(self, memo):
+        return untrack(self, memo)
+
+    def __reduce__(self):
+        return (Dict, (untrack(self),))
+
+
+def track(value, owner):
+    """
+    Converts a parameter value into tracked containers reporting in-place edits to their owner, see TrackedList and TrackedDict.
+    Lists and dicts are copied into tracked containers, tuples are rebuilt when they hold lists or dicts, other values are kept.
+    Modifying numpy arrays or other objects in place is not tracked.
+
+    Input:
+        value: any type, the parameter value.
+        owner: Base, the object whose parameter the value is, or None.
+
+    Output:
+        value: the tracked value.
+    """
+    if type(value) in ATOMIC_TYPES:
+        return value
+    if type(value) is TrackedList or type(value) is TrackedDict:
+        current = value.owner if type(value) is TrackedList else value.__dict__.get("__owner")
+        if current is owner:
+            return value
+        if current is None:
+            # Adopt a container created without owner, e.g. the missing child of a TrackedDict on first assignment
+            if type(value) is TrackedList:
+                value.owner = owner
+                list.__init__(value, [track(v, owner) for v in value])
+            else:
+                object.__setattr__(value, "__owner", owner)
+                for k, v in dict.items(value):
+                    dict.__setitem__(value, k, track(v, owner))
+            return value
+    if isinstance(value, list):
+        return TrackedList(owner, value)
+    if isinstance(value, dict):
+        node = TrackedDict()
+        object.__setattr__(node, "__owner", owner)
+        for k, v in value.items():
+            dict.__setitem__(node, k, track(v, owner))
+        return node
+    if type(value) is tuple and any(isinstance(v, (list, dict)) for v in value):
+        return tuple(track(v, owner) for v in value)
+    return value
+
+
+def untrack(value, memo=None):
+    """
+    Deep copies a value, converting tracked containers into plain lists and addict.Dict.
+
+    Input:
+        value: any type, the value.
+        memo: dict, the memo of copy.deepcopy.
+
+    Output:
+        value: the copy.
+    """
+    memo = {} if memo is None else memo
+    if type(value) is TrackedList:
+        return [untrack(v, memo) for v in value]
+    if type(value) is TrackedDict:
+        node = Dict()
+        for k, v in dict.items(value):
+            dict.__setitem__(node, k, untrack(v, memo))
+        return node
+    if type(value) is tuple:
+        return tuple(untrack(v, memo) for v in value)
+    return copy.deepcopy(value, memo)
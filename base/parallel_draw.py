@@ -0,0 +1,161 @@
+##################################################################
+# Drawing components in a process pool
+##################################################################
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import copy
+from base import geometry_backend, geometry_cache
+import gdspy
+import numpy as np
+
+
+def draw_job(cmpnt_class, options, backend_name: str = "gdspy", tolerance: float = None):
+    """
+    Draws one component in a worker process.
+
+    Input:
+        cmpnt_class: class, the library class.
+        options: dict, the parameters of the component.
+        backend_name: str, the geometry backend, see base.geometry_backend.
+        tolerance: float, the arc tolerance, default geometry_backend.DEFAULT_TOLERANCE.
+
+    Output:
+        cell_name: str, the name of the drawn cell.
+        elements: list, (polygons, layers, datatypes) for each polygon set of the cell, paths converted to polygons.
+        attributes: dict, the attributes set while drawing (see LibraryBase.geometry_cache_attributes),
+            {attribute name: (cell name, elements) for cells, (None, value) otherwise}.
+    """
+    with geometry_backend.use(backend_name, geometry_backend.DEFAULT_TOLERANCE if tolerance is None else tolerance):
+        cmpnt = cmpnt_class(options=options)
+        cmpnt.draw_native_gds()
+        attributes = {}
+        for attr_name, value in cmpnt.geometry_attributes().items():
+            if hasattr(value, "get_polygons"):
+                attributes[attr_name] = (value.name, cell_elements(value))
+            else:
+                attributes[attr_name] = (None, copy.deepcopy(value))  # Tracked containers are copied as plain ones
+        return cmpnt.cell.name, cell_elements(cmpnt.cell), attributes
+
+
+def cell_elements(cell):
+    """
+    Converts the elements of a cell into arrays, in the order they are written to a GDS file.
+
+    Input:
+        cell: gdspy.Cell or gdstk.Cell
+
+    Output:
+        elements: list, (polygons, layers, datatypes) for each polygon set.
+    """
+    if not isinstance(cell, gdspy.Cell):
+        polygon_list = cell.get_polygons()
+        return [([p.points for p in polygon_list], [p.layer for p in polygon_list], [p.datatype for p in polygon_list])]
+    elements = []
+    for polygon_set in cell.get_polygonsets():
+        elements.append(([np.asarray(p) for p in polygon_set.polygons], list(polygon_set.layers), list(polygon_set.datatypes)))
+    for path in cell.get_paths():
+        polygon_set = path.to_polygonset()
+        if polygon_set is not None:
+            elements.append(([np.asarray(p) for p in polygon_set.polygons], list(polygon_set.layers), list(polygon_set.datatypes)))
+    return elements
+
+
+def build_cell(cell_name, elements, lib=None):
+    """
+    Rebuilds a cell from the arrays returned by a worker.
+
+    Input:
+        cell_name: str, the name of the cell.
+        elements: list, see cell_elements.
+        lib: the library receiving the cell, default a new library.
+
+    Output:
+        lib: the library containing the cell, of the active geometry backend.
+        cell: the cell.
+    """
+    backend = geometry_backend.active
+    lib = backend.new_library() if lib is None else lib
+    cell = lib.new_cell(cell_name)
+    if backend.name != "gdspy":
+        for polygons, layers, datatypes in elements:
+            for points, layer, datatype in zip(polygons, layers, datatypes):
+                backend.add(cell, backend.polygon_set([points], layer=layer, datatype=datatype))
+        return lib, cell
+    for polygons, layers, datatypes in elements:
+        polygon_set = gdspy.PolygonSet(polygons)
+        polygon_set.layers = layers
+        polygon_set.datatypes = datatypes
+        cell.add(polygon_set)
+    return lib, cell
+
+
+def run_jobs(job_list, workers: int):
+    """
+    Draws components in a pool of worker processes.
+
+    Input:
+        job_list: list, (cmpnt, key, pos) of the components to draw.
+        workers: int, the number of worker processes.
+
+    Output:
+        result_list: list, the results of draw_job in the order of job_list, or None when the workers could not start.
+    """
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(draw_job,
+                                     [cmpnt.__class__ for cmpnt, key, pos in job_list],
+                                     [cmpnt.frozen_options().to_dict() for cmpnt, key, pos in job_list],
+                                     [geometry_backend.active.name] * len(job_list),
+                                     [geometry_backend.arc_tolerance] * len(job_list),
+                                     chunksize=max(1, len(job_list) // (workers * 4))))
+    except (BrokenProcessPool, OSError, NotImplementedError) as e:
+        # Errors of the components are raised again when they are drawn serially
+        print("Drawing serially, the worker processes could not start: {}".format(e))
+        return None
+
+
+def draw_components(cmpnt_list, workers: int):
+    """
+    Draws the components whose parameters changed since they were last drawn, using a pool of worker processes.
+    Components sharing their geometry are drawn once (see base.geometry_cache), the results are assembled in the
+    order of cmpnt_list, so the cells are the same as when drawing serially.
+
+    When the worker processes can not start, e.g. on platforms starting them with "spawn" (Windows) from a script
+    without an `if __name__ == "__main__":` guard, the components are drawn serially.
+
+    Input:
+        cmpnt_list: list, the components (LibraryBase).
+        workers: int, the number of worker processes.
+
+    Output:
+        None
+    """
+    job_list = []  # (cmpnt, key, pos) of the components drawn by a worker
+    job_key_set = set()
+    for cmpnt in cmpnt_list:
+        if cmpnt.is_drawn():
+            continue
+        key, pos = cmpnt.geometry_cache_key()
+        if key is not None and (key in job_key_set or key in geometry_cache.cache.entries):
+            continue  # Drawn from the cache below
+        if key is not None:
+            job_key_set.add(key)
+        job_list.append((cmpnt, key, pos))
+
+    result_list = run_jobs(job_list, workers) if len(job_list) > 0 else []
+    if result_list is not None:
+        for (cmpnt, key, pos), (cell_name, elements, attributes) in zip(job_list, result_list):
+            cmpnt.lib, cmpnt.cell = build_cell(cell_name, elements)
+            for attr_name, (attr_cell_name, value) in attributes.items():
+                setattr(cmpnt, attr_name, value if attr_cell_name is None else build_cell(attr_cell_name, value, cmpnt.lib)[1])
+            object.__setattr__(cmpnt, "gds_dirty", False)
+            object.__setattr__(cmpnt, "gds_mode", geometry_backend.drawing_mode())
+            if key is not None:
+                geometry_cache.cache.misses += 1
+                geometry_cache.cache.put(key, geometry_cache.GeometryEntry(cmpnt.cell, cmpnt.name, pos, cmpnt.geometry_attributes()))
+
+    # The components sharing a cached geometry, or all of them when the workers did not start
+    for cmpnt in cmpnt_list:
+        cmpnt.redraw_gds()
+    return
@@ -0,0 +1,429 @@
+##################################################################
+# Opt-in instrumentation of Design / Gds / component API calls
+##################################################################
+
+import copy, functools, inspect, json, os, threading, time, tracemalloc
+
+# The enabled Profiler, None when profiling is off
+active = None
+
+
+def instrumented_methods():
+    """
+    Lists the methods recorded as spans.
+
+    Input:
+        None
+
+    Output:
+        method_list: list, (class, method names), None for every public function defined in the class.
+    """
+    from base.base import Base
+    from base.branch_base import BranchBase
+    from base.cmpnts_base import CmpntsBase
+    from base.gds_base import GdsBase
+    from base.library_base import LibraryBase
+    from api.design import Design
+    from api.gds import Gds
+    import components  # Defines the component collections
+
+    method_list = [(Design, None), (Gds, None), (GdsBase, None),
+                   (Base, ["export_options", "import_options"]),
+                   (BranchBase, ["branch_process"]),
+                   (LibraryBase, ["draw_cached_gds"])]  # Draws one component (LibraryBase.draw_gds)
+    cls_list = [CmpntsBase]
+    while cls_list:
+        cls = cls_list.pop()
+        method_list.append((cls, None))
+        cls_list.extend(cls.__subclasses__())
+    return method_list
+
+
+def instrument(func):
+    """
+    Wraps a method so that each call is recorded as a span while a profiler is enabled.
+
+    Input:
+        func: function, the method.
+
+    Output:
+        wrapper: function
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        profiler = active
+        if profiler is None:
+            return func(self, *args, **kwargs)
+        name = type(self).__name__ + "." + func.__name__
+        span = profiler.start_span(name, id(self))
+        if span is None:  # An override calling super(), recorded once
+            return func(self, *args, **kwargs)
+        result = None
+        try:
+            result = func(self, *args, **kwargs)
+        finally:
+            # Creating a context manager (e.g. transaction()) is not recorded, its with block is
+            is_context = hasattr(type(result), "__enter__") and hasattr(type(result), "__exit__")
+            profiler.end_span(span, record=not is_context)
+        if is_context:
+            return ContextSpan(result, name, id(self))
+        return result
+    return wrapper
+
+
+class ContextSpan:
+    """
+    Context manager returned by an instrumented method, recorded as a span from __enter__ to __exit__, so that the span
+    covers the whole with block.
+    """
+
+    def __init__(self, context, name, owner):
+        """
+        Input:
+            context: the context manager returned by the method.
+            name: str, the span name.
+            owner: int, the id of the object the method was called on.
+
+        Output:
+            None
+        """
+        self.context = context
+        self.name = name
+        self.owner = owner
+        self.profiler = None
+        self.span = None
+
+    def __getattr__(self, name):
+        return getattr(self.context, name)
+
+    def __enter__(self):
+        self.profiler = active
+        if self.profiler is not None:
+            self.span = self.profiler.start_span(self.name, self.owner)
+        try:
+            return self.context.__enter__()
+        except BaseException:
+            self.end()
+            raise
+
+    def __exit__(self, *exc):
+        try:
+            return self.context.__exit__(*exc)
+        finally:
+            self.end()
+
+    def end(self):
+        if self.span is not None:
+            self.profiler.end_span(self.span)
+            self.span = None
+        return
+
+
+class Span:
+    """
+    One recorded call.
+    """
+    __slots__ = ("name", "owner", "start", "end", "child_time", "deepcopy_calls", "deepcopy_objects",
+                 "memory_start", "memory_max", "peak_memory", "depth", "tid")
+
+    def __init__(self, name, owner, depth, tid):
+        self.name = name
+        self.owner = owner
+        self.depth = depth
+        self.tid = tid
+        self.child_time = 0.0
+        self.deepcopy_calls = 0
+        self.deepcopy_objects = 0
+        self.peak_memory = None
+
+
+class Profiler:
+    """
+    Records wall time, deepcopy volume and optionally peak memory of the public Design, Gds, component collection,
+    branch processing and component drawing calls, nested as spans. Usage:
+
+        with profiler.Profiler() as prof:
+            design.generate_qubits_from_topo()
+            design.draw_gds()
+        print(prof.summary())
+        prof.export_chrome_trace("trace.json")  # Open in chrome://tracing or https://ui.perfetto.dev
+
+    The methods are only wrapped while the profiler is enabled, so there is no overhead when it is disabled.
+    Methods returning a context manager, e.g. transaction(), are recorded around the with block (see ContextSpan).
+    """
+
+    def __init__(self, memory: bool = False):
+        """
+        Input:
+            memory: bool, whether to record the peak memory of each span with tracemalloc (slows the calls down).
+
+        Output:
+            None
+        """
+        self.memory = memory
+        self.span_list = []
+        self.patched = []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.t0 = None
+        return
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.disable()
+
+    def enable(self):
+        """
+        Wraps the instrumented methods and starts recording.
+
+        Input:
+            None
+
+        Output:
+            None
+
+        Exception:
+            RuntimeError: Throws an exception when another profiler is enabled.
+        """
+        global active
+        if active is not None:
+            raise RuntimeError("A profiler is already enabled")
+        try:
+            for cls, name_list in instrumented_methods():
+                if name_list is None:
+                    name_list = [name for name, attr in cls.__dict__.items()
+                                 if not name.startswith("_") and inspect.isfunction(attr)]
+                for name in name_list:
+                    func = cls.__dict__[name]
+                    self.patched.append((cls, name, func))
+                    setattr(cls, name, instrument(func))
+            self.original_deepcopy = copy.deepcopy
+            copy.deepcopy = self.counting_deepcopy
+            if self.memory:
+                self.started_tracemalloc = not tracemalloc.is_tracing()
+                if self.started_tracemalloc:
+                    tracemalloc.start()
+        except BaseException:
+            self.restore()
+            raise
+        if self.t0 is None:
+            self.t0 = time.perf_counter()
+        active = self
+        return
+
+    def disable(self):
+        """
+        Stops recording and restores the original methods. Recorded spans are kept.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        global active
+        if active is not self:
+            return
+        active = None
+        self.restore()
+        return
+
+    def restore(self):
+        """
+        Restores the original methods, copy.deepcopy and tracemalloc, whatever fails on the way.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        try:
+            while self.patched:
+                cls, name, func = self.patched.pop()
+                setattr(cls, name, func)
+        finally:
+            try:
+                if copy.deepcopy == self.counting_deepcopy:
+                    copy.deepcopy = self.original_deepcopy
+            finally:
+                if self.memory and getattr(self, "started_tracemalloc", False):
+                    self.started_tracemalloc = False
+                    tracemalloc.stop()
+        return
+
+    def stack(self):
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def start_span(self, name, owner):
+        stack = self.stack()
+        if stack and stack[-1].name == name and stack[-1].owner == owner:
+            return None
+        span = Span(name, owner, len(stack), threading.get_ident())
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].memory_max = max(stack[-1].memory_max, peak)
+            tracemalloc.reset_peak()
+            span.memory_start = span.memory_max = current
+        stack.append(span)
+        span.start = time.perf_counter()
+        return span
+
+    def end_span(self, span, record: bool = True):
+        """
+        Ends the innermost span.
+
+        Input:
+            span: Span, returned by start_span.
+            record: bool, whether to record the span, otherwise its time and deepcopies are counted in its parent.
+
+        Output:
+            None
+        """
+        span.end = time.perf_counter()
+        stack = self.stack()
+        stack.pop()
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            span.memory_max = max(span.memory_max, peak)
+            span.peak_memory = span.memory_max - span.memory_start
+            tracemalloc.reset_peak()
+        if stack:
+            parent = stack[-1]
+            if record:
+                parent.child_time += span.end - span.start
+            parent.deepcopy_calls += span.deepcopy_calls
+            parent.deepcopy_objects += span.deepcopy_objects
+            if self.memory:
+                parent.memory_max = max(parent.memory_max, span.memory_max)
+        if record:
+            with self.lock:
+                self.span_list.append(span)
+        return
+
+    def counting_deepcopy(self, x, memo=None, _nil=[]):
+        """
+        Replaces copy.deepcopy while enabled, counting the top-level calls and the objects they copy.
+        """
+        if memo is not None:  # Recursive call of deepcopy
+            return self.original_deepcopy(x, memo, _nil)
+        memo = {}
+        result = self.original_deepcopy(x, memo)
+        stack = self.stack()
+        if stack:
+            stack[-1].deepcopy_calls += 1
+            stack[-1].deepcopy_objects += len(memo) - (1 if id(memo) in memo else 0)  # Without the keep-alive list
+        return result
+
+    def stats(self):
+        """
+        Aggregates the spans by name.
+
+        Input:
+            None
+
+        Output:
+            stats: dict, {name: {"calls", "total", "self", "deepcopy_calls", "deepcopy_objects", "peak_memory"}},
+                times in seconds, peak_memory in bytes (None without memory recording).
+        """
+        stats = {}
+        for span in self.span_list:
+            s = stats.get(span.name)
+            if s is None:
+                s = stats[span.name] = {"calls": 0, "total": 0.0, "self": 0.0, "deepcopy_calls": 0,
+                                        "deepcopy_objects": 0, "peak_memory": None}
+            duration = span.end - span.start
+            s["calls"] += 1
+            s["total"] += duration
+            s["self"] += duration - span.child_time
+            s["deepcopy_calls"] += span.deepcopy_calls
+            s["deepcopy_objects"] += span.deepcopy_objects
+            if span.peak_memory is not None:
+                s["peak_memory"] = max(s["peak_memory"] or 0, span.peak_memory)
+        return stats
+
+    def summary(self, limit: int = None, sort: str = "total"):
+        """
+        Formats the aggregated spans as a text table.
+
+        Input:
+            limit: int, the maximum number of rows, default all.
+            sort: str, the column to sort by, "total", "self" or "calls".
+
+        Output:
+            text: str
+        """
+        stats = sorted(self.stats().items(), key=lambda item: item[1][sort], reverse=True)
+        if limit is not None:
+            stats = stats[:limit]
+        width = max([len("name")] + [len(name) for name, s in stats])
+        lines = [f"{'name':<{width}}  {'calls':>7}  {'total s':>9}  {'self s':>9}  {'mean ms':>9}  "
+                 f"{'deepcopies':>10}  {'copied objs':>11}  {'peak MB':>8}"]
+        for name, s in stats:
+            peak = "-" if s["peak_memory"] is None else f"{s['peak_memory'] / 2**20:.2f}"
+            lines.append(f"{name:<{width}}  {s['calls']:>7}  {s['total']:>9.4f}  {s['self']:>9.4f}  "
+                         f"{1000 * s['total'] / s['calls']:>9.3f}  {s['deepcopy_calls']:>10}  "
+                         f"{s['deepcopy_objects']:>11}  {peak:>8}")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """
+        Converts the spans to the Chrome trace-event format.
+
+        Input:
+            None
+
+        Output:
+            trace: dict, {"traceEvents": [...]}.
+        """
+        pid = os.getpid()
+        event_list = []
+        for span in sorted(self.span_list, key=lambda span: (span.start, span.depth)):
+            args = {"deepcopy_calls": span.deepcopy_calls, "deepcopy_objects": span.deepcopy_objects}
+            if span.peak_memory is not None:
+                args["peak_memory"] = span.peak_memory
+            event_list.append({"name": span.name,
+                               "cat": span.name.split(".")[0],
+                               "ph": "X",
+                               "ts": (span.start - self.t0) * 1e6,
+                               "dur": (span.end - span.start) * 1e6,
+                               "pid": pid,
+                               "tid": span.tid,
+                               "args": args})
+        return {"traceEvents": event_list, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path):
+        """
+        Writes the spans as a Chrome trace-event JSON file.
+
+        Input:
+            path: str, the file path.
+
+        Output:
+            None
+        """
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        return
+
+    def clear(self):
+        """
+        Drops the recorded spans.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        with self.lock:
+            self.span_list = []
+        self.t0 = time.perf_counter() if active is self else None
+        return
@@ -0,0 +1,789 @@
+##################################################################
+# Binary design snapshots
+#
+# Each component family is stored column by column. Parameters with the
+# same value in every component are stored once, the arrays of the other
+# columns with the smallest dtype holding their values exactly.
+# .edaq files are memory-mapped and decoded family by family, about the
+# size of the text export for small designs and smaller for large ones.
+# `load` decodes the parameters of each component from the columns when
+# they are first read, e.g. when the component is built.
+# .edaqz files are several times smaller and read whole families from
+# the archive, use them to store or send designs.
+##################################################################
+
+from addict import Dict
+import ast, copy, functools, json, os, struct, zipfile
+import numpy as np
+from base import options_tree
+
+# Uncompressed snapshots, memory-mapped when loaded
+SNAPSHOT_EXTENSION = ".edaq"
+# Compressed snapshots, a zip archive with one member per family
+COMPRESSED_SNAPSHOT_EXTENSION = ".edaqz"
+
+MAGIC = b"EDAQSNAP"
+# Version 2 adds constant columns and compact dtypes, version 1 files can still be read
+VERSION = 2
+# Alignment of the family data blocks, the arrays inside a block are aligned to their item size
+ALIGNMENT = 64
+# Marks the position of a family in the options tree stored in the header
+FAMILY_PLACEHOLDER = "\x00snapshot_family:"
+LEAF_DTYPES = {"b": np.bool_, "i": np.int64, "f": np.float64}
+
+
+def is_snapshot_path(path):
+    """
+    Checks whether a path uses a snapshot extension.
+
+    Input:
+        path: str, the file path.
+
+    Output:
+        bool
+    """
+    return os.path.splitext(str(path))[1].lower() in (SNAPSHOT_EXTENSION, COMPRESSED_SNAPSHOT_EXTENSION)
+
+
+def to_plain(value):
+    """
+    Converts an options tree into plain Python containers (dict, list, tuple and literals).
+
+    Input:
+        value: any type, the options tree.
+
+    Output:
+        value: the plain tree.
+    """
+    if isinstance(value, dict):
+        return {k: to_plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [to_plain(v) for v in value]
+    if isinstance(value, tuple):
+        return tuple(to_plain(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def is_family(value):
+    """
+    Checks whether a node of the options tree is a component family: a non-empty dict of component parameter dicts.
+
+    Input:
+        value: any type, the node.
+
+    Output:
+        bool
+    """
+    if not isinstance(value, dict) or len(value) == 0:
+        return False
+    return all(isinstance(v, dict) and isinstance(v.get("type"), str) for v in value.values())
+
+
+########################################
+# Encoding
+########################################
+
+def value_form(value):
+    """
+    Gets the form of a nested numeric sequence, e.g. "t2(f)" for a tuple of two floats.
+
+    Input:
+        value: any type, the value.
+
+    Output:
+        form: str, or None when the value is not a numeric scalar or a regular nested sequence of one scalar type.
+    """
+    t = type(value)
+    if t is bool:
+        return "b"
+    if t is int:
+        return "i" if -2**63 <= value < 2**63 else None
+    if t is float:
+        return "f"
+    if t is list or t is tuple:
+        child = common_form(value)
+        if child is None or child == "":
+            return None
+        return ("l" if t is list else "t") + str(len(value)) + "(" + child + ")"
+    return None
+
+
+def common_form(values):
+    """
+    Gets the form shared by all values.
+
+    Input:
+        values: list, the values.
+
+    Output:
+        form: str, "" when values is empty, None when the values have different forms.
+    """
+    form = ""
+    for v in values:
+        f = value_form(v)
+        if f is None or (form != "" and f != form):
+            return None
+        form = f
+    return form
+
+
+def form_leaf_count(form):
+    """
+    Input:
+        form: str, see value_form.
+
+    Output:
+        count: int, the number of scalars in a value of this form.
+        leaf: str, the scalar type, "b", "i" or "f".
+    """
+    count = 1
+    while form[0] in "lt":
+        i = form.index("(")
+        count *= int(form[1:i])
+        form = form[i + 1:-1]
+    return count, form
+
+
+def iter_leaves(value):
+    if type(value) is list or type(value) is tuple:
+        for v in value:
+            yield from iter_leaves(v)
+    else:
+        yield value
+
+
+def compact_array(array):
+    """
+    Converts an array to the smallest dtype of the same kind holding its values exactly, e.g. int64 indices to uint8.
+
+    Input:
+        array: np.ndarray
+
+    Output:
+        array: np.ndarray, the same values.
+    """
+    if array.size == 0:
+        return array
+    kind = array.dtype.kind
+    if kind in "iu":
+        low, high = int(array.min()), int(array.max())
+        for dtype in ((np.uint8, np.uint16, np.uint32) if low >= 0 else (np.int8, np.int16, np.int32)):
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return array.astype(dtype)
+    elif kind == "f" and array.dtype.itemsize > 4:
+        with np.errstate(over="ignore"):
+            single = array.astype(np.float32)
+        if np.array_equal(single.astype(array.dtype), array, equal_nan=True):
+            return single
+    return array
+
+
+class BlockWriter:
+    """
+    Collects the arrays of one family into a single data block.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def add(self, array):
+        """
+        Appends an array, converted with compact_array.
+
+        Input:
+            array: np.ndarray
+
+        Output:
+            ref: dict, the dtype, shape and offset of the array in the block.
+        """
+        array = np.ascontiguousarray(compact_array(array))
+        padding = (-self.size) % array.dtype.itemsize
+        if padding:
+            self.chunks.append(b"\0" * padding)
+            self.size += padding
+        ref = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": self.size}
+        data = array.tobytes()
+        self.chunks.append(data)
+        self.size += len(data)
+        return ref
+
+    def tobytes(self):
+        return b"".join(self.chunks)
+
+
+class StringTable:
+    """
+    Unique strings of one family, referenced by index.
+    """
+
+    def __init__(self):
+        self.index = {}
+
+    def add(self, s):
+        i = self.index.get(s)
+        if i is None:
+            i = self.index[s] = len(self.index)
+        return i
+
+    def write(self, block):
+        data = [s.encode("utf-8") for s in self.index.keys()]
+        offsets = np.zeros(len(data) + 1, dtype=np.int64)
+        np.cumsum([len(d) for d in data], out=offsets[1:])
+        return {"data": block.add(np.frombuffer(b"".join(data), dtype=np.uint8)), "offsets": block.add(offsets)}
+
+
+def is_constant(values):
+    """
+    Checks whether all values are the same, with the same types, e.g. (1, 2) and [1, 2.0] are different.
+
+    Input:
+        values: list, the plain values, at least one.
+
+    Output:
+        bool
+    """
+    first = values[0]
+    if any(type(v) is not type(first) or v != first for v in values):
+        return False
+    if type(first) in (str, bool, int, float):
+        return True
+    first_repr = repr(first)
+    return all(repr(v) == first_repr for v in values)
+
+
+def encode_column(values, strings, block):
+    """
+    Encodes the values of one parameter in the rows which have it.
+
+    Input:
+        values: list, the plain values.
+        strings: StringTable, the string table of the family.
+        block: BlockWriter, the data block of the family.
+
+    Output:
+        column: dict, the description of the column in the header.
+    """
+    if is_constant(values):
+        value_repr = repr(values[0])
+        try:
+            ast.literal_eval(value_repr)
+            return {"kind": "const", "value": value_repr}
+        except (ValueError, SyntaxError):
+            pass  # E.g. inf, stored in a column
+
+    if all(type(v) is str for v in values):
+        return {"kind": "str", "index": block.add(np.array([strings.add(v) for v in values], dtype=np.int64))}
+
+    form = common_form(values)
+    if form is not None and form != "" and form[0] in "bif":
+        return {"kind": "num", "values": block.add(np.array(values, dtype=LEAF_DTYPES[form]))}
+
+    container = {type(v) for v in values}
+    if len(container) == 1 and container <= {list, tuple}:
+        child = common_form([item for v in values for item in v])
+        if child is not None:
+            child = child or "f"  # All rows are empty
+            count, leaf = form_leaf_count(child)
+            lengths = [len(v) for v in values]
+            offsets = np.zeros(len(values) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            leaves = np.fromiter((x for v in values for x in iter_leaves(v)), dtype=LEAF_DTYPES[leaf], count=int(offsets[-1]) * count)
+            return {"kind": "seq", "container": "l" if list in container else "t", "form": child,
+                    "values": block.add(leaves), "offsets": block.add(offsets)}
+
+    # Anything else is stored as a Python literal
+    return {"kind": "obj", "index": block.add(np.array([strings.add(repr(v)) for v in values], dtype=np.int64))}
+
+
+def encode_family(family):
+    """
+    Encodes a component family column by column.
+
+    Input:
+        family: dict, {component name: plain parameter dict}.
+
+    Output:
+        header: dict, the description of the family.
+        data: bytes, the data block of the family.
+    """
+    block = BlockWriter()
+    strings = StringTable()
+    key_list_index = {}
+    row_key_lists = []
+    for cmpnt_ops in family.values():
+        keys = tuple(cmpnt_ops.keys())
+        row_key_lists.append(key_list_index.setdefault(keys, len(key_list_index)))
+
+    field_list = []
+    for keys in key_list_index.keys():
+        for k in keys:
+            if k not in field_list:
+                field_list.append(k)
+    columns = []
+    for field in field_list:
+        values = [cmpnt_ops[field] for cmpnt_ops in family.values() if field in cmpnt_ops]
+        column = encode_column(values, strings, block)
+        column["name"] = field
+        columns.append(column)
+
+    header = {
+        "names": block.add(np.array([strings.add(str(name)) for name in family.keys()], dtype=np.int64)),
+        "key_lists": [list(keys) for keys in key_list_index.keys()],
+        "row_key_lists": block.add(np.array(row_key_lists, dtype=np.int64)),
+        "columns": columns,
+    }
+    header["strings"] = strings.write(block)  # After every string was added
+    return header, block.tobytes()
+
+
+def split_families(options, family_list):
+    """
+    Replaces the families of an options tree by placeholders.
+
+    Input:
+        options: the plain options tree.
+        family_list: list, receives the families, in order.
+
+    Output:
+        tree: the options tree without families.
+    """
+    if is_family(options):
+        family_list.append(options)
+        return FAMILY_PLACEHOLDER + str(len(family_list) - 1)
+    if isinstance(options, dict):
+        return {k: split_families(v, family_list) for k, v in options.items()}
+    return options
+
+
+def save(options, path, compress: bool = None):
+    """
+    Saves an options tree as a binary snapshot.
+
+    Input:
+        options: dict, the options tree, e.g. Design.options.
+        path: str, the file path.
+        compress: bool, whether to write a compressed snapshot, default depends on the extension (.edaqz is compressed).
+
+    Output:
+        None
+    """
+    if compress is None:
+        compress = os.path.splitext(str(path))[1].lower() == COMPRESSED_SNAPSHOT_EXTENSION
+    # Written aside then renamed: components loaded lazily from the previous file at this path still read it
+    temp_path = str(path) + ".tmp"
+    family_list = []
+    tree = split_families(to_plain(options), family_list)
+    family_header_list = []
+    data_list = []
+    for family in family_list:
+        family_header, data = encode_family(family)
+        family_header_list.append(family_header)
+        data_list.append(data)
+
+    header = {"version": VERSION, "tree": repr(tree), "families": family_header_list}
+    if compress:
+        with zipfile.ZipFile(temp_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("header.json", json.dumps(header, separators=(",", ":")))
+            for i, data in enumerate(data_list):
+                archive.writestr("family_{}.bin".format(i), data)
+        os.replace(temp_path, path)
+        return
+
+    offset = 0
+    for family_header, data in zip(family_header_list, data_list):
+        offset += (-offset) % ALIGNMENT
+        family_header["offset"] = offset
+        offset += len(data)
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    start = len(MAGIC) + 12 + len(header_bytes)
+    start += (-start) % ALIGNMENT
+    with open(temp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<IQ", VERSION, start))
+        f.write(header_bytes)
+        for family_header, data in zip(family_header_list, data_list):
+            f.write(b"\0" * (start + family_header["offset"] - f.tell()))
+            f.write(data)
+    os.replace(temp_path, path)
+    return
+
+
+########################################
+# Decoding
+########################################
+
+def build_values(flat, form, container):
+    """
+    Rebuilds the nested sequences of a "seq" column from its leaves.
+
+    Input:
+        flat: np.ndarray, shape (n_items, leaf_count), the leaves of each top-level item.
+        form: str, the form of the items.
+        container: str, "l" or "t", the type of the top-level sequences.
+
+    Output:
+        items: list, one Python value per item.
+    """
+    shape = []
+    tuple_levels = []
+    f = form
+    while f[0] in "lt":
+        i = f.index("(")
+        shape.append(int(f[1:i]))
+        tuple_levels.append(f[0] == "t")
+        f = f[i + 1:-1]
+    items = flat.reshape([len(flat)] + shape).tolist()
+    if any(tuple_levels):
+        def convert(v, level):
+            if level == len(tuple_levels):
+                return v
+            v = [convert(x, level + 1) for x in v]
+            return tuple(v) if tuple_levels[level] else v
+        items = [convert(v, 0) for v in items]
+    return items
+
+
+def block_array(block, ref):
+    """
+    Reads an array of a family data block without copying it.
+
+    Input:
+        block: np.ndarray, the data block (uint8).
+        ref: dict, the dtype, shape and offset of the array, see BlockWriter.add.
+
+    Output:
+        array: np.ndarray
+    """
+    dtype = np.dtype(ref["dtype"])
+    count = int(np.prod(ref["shape"], dtype=np.int64))
+    return np.frombuffer(block, dtype=dtype, count=count, offset=ref["offset"]).reshape(ref["shape"])
+
+
+class FamilyColumns:
+    """
+    Decodes single parameters of a family from its columns, using the offsets stored in the header to find the
+    value of a component without decoding the rest of the column (see Snapshot.lazy_family).
+    """
+
+    def __init__(self, header, block):
+        """
+        Input:
+            header: dict, the description of the family.
+            block: np.ndarray, the data block of the family, kept until every parameter was read.
+
+        Output:
+            None
+        """
+        self.header = header
+        self.block = block
+        self.string_data = block_array(block, header["strings"]["data"])
+        self.string_offsets = block_array(block, header["strings"]["offsets"])
+        self.key_lists = header["key_lists"]
+        self.row_key_lists = block_array(block, header["row_key_lists"]).tolist()
+        self.columns = {column["name"]: column for column in header["columns"]}
+        self.column_rows = {}  # {name: {row: index in the column}}, for the columns missing from some rows
+        self.constants = {}
+        return
+
+    def string(self, j):
+        start, end = int(self.string_offsets[j]), int(self.string_offsets[j + 1])
+        return self.string_data[start:end].tobytes().decode("utf-8")
+
+    def names(self):
+        """
+        Output:
+            names: list, the component names, in order.
+        """
+        return [self.string(j) for j in block_array(self.block, self.header["names"]).tolist()]
+
+    def column_index(self, name, row):
+        """
+        Input:
+            name: str, the parameter name.
+            row: int, the index of the component.
+
+        Output:
+            index: int, the index of the value of the component in the column.
+        """
+        if len(self.key_lists) == 1:
+            return row
+        rows = self.column_rows.get(name)
+        if rows is None:
+            key_sets = [set(keys) for keys in self.key_lists]
+            field_rows = [r for r, k in enumerate(self.row_key_lists) if name in key_sets[k]]
+            rows = self.column_rows[name] = {r: i for i, r in enumerate(field_rows)}
+        return rows[row]
+
+    def value(self, name, row):
+        """
+        Decodes the value of a parameter of a component.
+
+        Input:
+            name: str, the parameter name.
+            row: int, the index of the component.
+
+        Output:
+            value: the frozen value, see options_tree.freeze.
+        """
+        column = self.columns[name]
+        kind = column["kind"]
+        if kind == "const":
+            if name not in self.constants:
+                self.constants[name] = options_tree.freeze(ast.literal_eval(column["value"]), copy_leaves=False)
+            return self.constants[name]
+        i = self.column_index(name, row)
+        if kind == "str":
+            return self.string(int(block_array(self.block, column["index"])[i]))
+        if kind == "obj":
+            value = ast.literal_eval(self.string(int(block_array(self.block, column["index"])[i])))
+            return options_tree.freeze(value, copy_leaves=False)
+        if kind == "num":
+            return block_array(self.block, column["values"])[i].item()
+        count, leaf = form_leaf_count(column["form"])
+        col_offsets = block_array(self.block, column["offsets"])
+        flat = block_array(self.block, column["values"]).reshape(-1, count)[int(col_offsets[i]):int(col_offsets[i + 1])]
+        items = build_values(flat, column["form"], column["container"])
+        return items if column["container"] == "l" else tuple(items)
+
+    def family(self):
+        """
+        Builds the frozen parameters of every component, each parameter is decoded when it is first read.
+
+        Input:
+            None
+
+        Output:
+            family: FrozenDict, {component name: FrozenDict of the parameters}.
+        """
+        family = {}
+        for row, (name, k) in enumerate(zip(self.names(), self.row_key_lists)):
+            family[name] = options_tree.new_frozen({field: options_tree.Deferred(functools.partial(self.value, field, row))
+                                                    for field in self.key_lists[k]})
+        return options_tree.new_frozen(family)
+
+
+class Snapshot:
+    """
+    An opened snapshot. Families are only read and decoded when they are accessed, e.g.
+
+        with Snapshot("design.edaq") as snapshot:
+            qubits_ops = snapshot.get("gds", "qubits")
+    """
+
+    def __init__(self, path):
+        """
+        Reads the header of a snapshot.
+
+        Input:
+            path: str, the file path.
+
+        Output:
+            None
+
+        Exception:
+            ValueError: Throws an exception when the file is not a snapshot.
+        """
+        self.path = path
+        self.archive = None
+        self.buffer = None
+        with open(path, "rb") as f:
+            magic = f.read(len(MAGIC))
+        if magic[:2] == b"PK":
+            self.archive = zipfile.ZipFile(path, "r")
+            header = json.loads(self.archive.read("header.json"))
+        elif magic == MAGIC:
+            with open(path, "rb") as f:
+                f.seek(len(MAGIC))
+                version, start = struct.unpack("<IQ", f.read(12))
+                header = json.loads(f.read(start - len(MAGIC) - 12).rstrip(b"\0"))
+            self.buffer = np.memmap(path, dtype=np.uint8, mode="r")
+            self.start = start
+        else:
+            raise ValueError("{} is not a snapshot".format(path))
+        if header["version"] > VERSION:
+            raise ValueError("Unsupported snapshot version {}".format(header["version"]))
+        self.family_headers = header["families"]
+        self.tree = ast.literal_eval(header["tree"])
+        self.family_cache = {}
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Closes the file, families which were not loaded can not be read anymore.
+
+        Input:
+            None
+
+        Output:
+            None
+        """
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+        self.buffer = None
+        return
+
+    def family_block(self, i):
+        if self.archive is not None:
+            return np.frombuffer(self.archive.read("family_{}.bin".format(i)), dtype=np.uint8)
+        return self.buffer[self.start + self.family_headers[i]["offset"]:]
+
+    def load_family(self, i):
+        """
+        Decodes a family.
+
+        Input:
+            i: int, the index of the family.
+
+        Output:
+            family: dict, {component name: parameter dict}, plain containers.
+        """
+        if i in self.family_cache:
+            return self.family_cache[i]
+        header = self.family_headers[i]
+        block = self.family_block(i)
+        array = functools.partial(block_array, block)
+
+        data = array(header["strings"]["data"]).tobytes()
+        offsets = array(header["strings"]["offsets"]).tolist()
+        strings = [data[offsets[j]:offsets[j + 1]].decode("utf-8") for j in range(len(offsets) - 1)]
+
+        names = [strings[j] for j in array(header["names"]).tolist()]
+        key_lists = header["key_lists"]
+        row_key_lists = array(header["row_key_lists"]).tolist()
+        field_rows = {}
+        for row, k in enumerate(row_key_lists):
+            for field in key_lists[k]:
+                field_rows.setdefault(field, []).append(row)
+
+        rows = [{} for _ in names]
+        for column in header["columns"]:
+            kind = column["kind"]
+            if kind == "const":
+                value = ast.literal_eval(column["value"])
+                row_count = len(field_rows[column["name"]])
+                if type(value) in (str, bool, int, float):
+                    values = [value] * row_count
+                else:
+                    values = [copy.deepcopy(value) for _ in range(row_count)]
+            elif kind == "str":
+                values = [strings[j] for j in array(column["index"]).tolist()]
+            elif kind == "obj":
+                values = [ast.literal_eval(strings[j]) for j in array(column["index"]).tolist()]
+            elif kind == "num":
+                values = array(column["values"]).tolist()
+            else:
+                count, leaf = form_leaf_count(column["form"])
+                col_offsets = array(column["offsets"]).tolist()
+                flat = array(column["values"]).reshape(-1, count)
+                items = build_values(flat, column["form"], column["container"])
+                seq = list if column["container"] == "l" else tuple
+                values = [seq(items[col_offsets[j]:col_offsets[j + 1]]) for j in range(len(col_offsets) - 1)]
+            for row, value in zip(field_rows[column["name"]], values):
+                rows[row][column["name"]] = value
+
+        # Restore the parameter order of each component
+        family = {}
+        for name, row, k in zip(names, rows, row_key_lists):
+            family[name] = {field: row[field] for field in key_lists[k]}
+        self.family_cache[i] = family
+        return family
+
+    def lazy_family(self, i):
+        """
+        Gets a family without decoding it, see FamilyColumns.family. It stays readable after the snapshot is closed.
+
+        Input:
+            i: int, the index of the family.
+
+        Output:
+            family: FrozenDict, {component name: FrozenDict of the parameters}.
+        """
+        return FamilyColumns(self.family_headers[i], self.family_block(i)).family()
+
+    def frozen(self):
+        """
+        Builds the frozen options tree, the parameters of the components are decoded when they are first read.
+
+        Input:
+            None
+
+        Output:
+            options: FrozenDict, the options tree.
+        """
+        def freeze_node(node):
+            if isinstance(node, str) and node.startswith(FAMILY_PLACEHOLDER):
+                return self.lazy_family(int(node[len(FAMILY_PLACEHOLDER):]))
+            if isinstance(node, dict):
+                return options_tree.new_frozen({k: freeze_node(v) for k, v in node.items()})
+            return options_tree.freeze(node, copy_leaves=False)
+        return freeze_node(self.tree)
+
+    def resolve(self, node):
+        """
+        Replaces the family placeholders of a node of the tree by the families.
+
+        Input:
+            node: any type, a node of the tree.
+
+        Output:
+            node: the node, with every family below it loaded.
+        """
+        if isinstance(node, str) and node.startswith(FAMILY_PLACEHOLDER):
+            return self.load_family(int(node[len(FAMILY_PLACEHOLDER):]))
+        if isinstance(node, dict):
+            return {k: self.resolve(v) for k, v in node.items()}
+        return node
+
+    def get(self, *keys):
+        """
+        Gets a node of the options tree, only the families below it are loaded.
+
+        Input:
+            keys: str, the path of the node, e.g. "gds", "qubits". No key returns the whole tree.
+
+        Output:
+            options: Dict, the node (or its value when it is not a dict).
+
+        Exception:
+            KeyError: Throws an exception when the path does not exist.
+        """
+        node = self.tree
+        for key in keys:
+            if isinstance(node, str) and node.startswith(FAMILY_PLACEHOLDER):
+                node = self.load_family(int(node[len(FAMILY_PLACEHOLDER):]))
+            node = node[key]
+        node = self.resolve(node)
+        if isinstance(node, dict):
+            return Dict(node)
+        return node
+
+
+def load(path, lazy: bool = True):
+    """
+    Loads a whole snapshot.
+
+    Input:
+        path: str, the file path.
+        lazy: bool, whether the parameters of the components are decoded when they are first read. Injected into a
+            design, the components are then built and decoded on first access (see CmpntsBase.inject_options).
+
+    Output:
+        options: Dict, the options tree, a copy-on-write view of the frozen tree when lazy (see `base.options_tree`).
+    """
+    with Snapshot(path) as snapshot:
+        if lazy:
+            return options_tree.thaw(snapshot.frozen())
+        return snapshot.get()
@@ -0,0 +1,401 @@
+##################################################################
+# Uniform-grid spatial index of component outlines and line paths
+##################################################################
+
+import math
+import toolbox
+from base import options_tree
+
+# Families whose start_pos and end_pos are the corners of a rectangle instead of the ends of a line
+RECTANGLE_FAMILIES = ("chips",)
+# Entries covering more grid cells are kept in a separate list, checked by every query
+MAX_ENTRY_CELLS = 1024
+DEFAULT_CELL_SIZE = 1000
+
+
+def point(value):
+    """
+    Input:
+        value: any type, a parameter value.
+
+    Output:
+        point: tuple, (x, y), or None when the value is not two numbers.
+    """
+    try:
+        x, y = value
+        return (float(x), float(y))
+    except (TypeError, ValueError):
+        return None
+
+
+def point_list(value):
+    """
+    Input:
+        value: any type, a parameter value.
+
+    Output:
+        points: list, the (x, y) points, or None when the value is not a list of at least two points.
+    """
+    if not isinstance(value, (list, tuple)) or len(value) < 2:
+        return None
+    points = [point(p) for p in value]
+    if any(p is None for p in points):
+        return None
+    return points
+
+
+def component_geometry(family, options):
+    """
+    Gets the indexed geometry of a component from its parameters: the outline polygon, else the line path (pos,
+    or start_pos to end_pos), else the position.
+
+    Input:
+        family: str, the name of the component collection, e.g. "qubits".
+        options: dict, the parameters of the component.
+
+    Output:
+        points: list, the (x, y) points, or None when the component has no geometry.
+        closed: bool, whether the points are a polygon.
+    """
+    get = lambda name: options_tree.raw_get(options, name)  # Frozen parameters are read without copies
+    outline = point_list(get("outline"))
+    if outline is not None and len(outline) >= 3:
+        return outline, True
+    start, end = point(get("start_pos")), point(get("end_pos"))
+    if family in RECTANGLE_FAMILIES and start is not None and end is not None:
+        return [start, (end[0], start[1]), end, (start[0], end[1])], True
+    path = point_list(get("pos"))
+    if path is not None:
+        return path, False
+    if start is not None and end is not None:
+        return [start, end], False
+    for name in ("pos", "gds_pos"):
+        p = point(get(name))
+        if p is not None:
+            return [p], False
+    return None, False
+
+
+def segment_distance(p, a, b):
+    """
+    Input:
+        p, a, b: tuple, (x, y) points.
+
+    Output:
+        distance: float, the distance from p to the segment a-b.
+    """
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length2 = dx * dx + dy * dy
+    t = 0.0 if length2 == 0 else max(0.0, min(1.0, ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / length2))
+    return math.hypot(p[0] - a[0] - t * dx, p[1] - a[1] - t * dy)
+
+
+class Entry:
+    """
+    Geometry of one indexed component.
+    """
+    __slots__ = ("key", "points", "closed", "bbox", "cells")
+
+    def __init__(self, key, points, closed):
+        self.key = key
+        self.points = points
+        self.closed = closed
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        self.cells = None
+
+    def segments(self):
+        """
+        Output:
+            segments: list, ((x1, y1), (x2, y2)) for each edge of the polygon or segment of the path.
+        """
+        points = self.points
+        segments = [(points[i], points[i + 1]) for i in range(len(points) - 1)]
+        if self.closed and points[0] != points[-1]:
+            segments.append((points[-1], points[0]))
+        return segments
+
+    def contains(self, p):
+        """
+        Checks whether a point is inside the polygon (even-odd rule), always False for paths.
+        """
+        if not self.closed:
+            return False
+        inside = False
+        points = self.points
+        j = len(points) - 1
+        for i in range(len(points)):
+            (xi, yi), (xj, yj) = points[i], points[j]
+            if (yi > p[1]) != (yj > p[1]) and p[0] < (xj - xi) * (p[1] - yi) / (yj - yi) + xi:
+                inside = not inside
+            j = i
+        return inside
+
+    def distance(self, p):
+        """
+        Output:
+            distance: float, the distance from a point to the geometry, 0 inside a polygon.
+        """
+        if len(self.points) == 1:
+            return math.hypot(p[0] - self.points[0][0], p[1] - self.points[0][1])
+        if self.contains(p):
+            return 0.0
+        return min(segment_distance(p, a, b) for a, b in self.segments())
+
+
+class SpatialIndex:
+    """
+    Uniform-grid index of component geometry, keyed by (family, component name).
+    Entries are added, moved and removed one at a time, see `Gds.spatial_index` for the index kept in sync
+    with the layout.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        """
+        Input:
+            cell_size: float, the size of the grid cells, in the layout unit (um).
+
+        Output:
+            None
+        """
+        self.cell_size = float(cell_size)
+        self.entries = {}
+        self.grid = {}
+        self.large_keys = set()  # Keys of the entries covering more than MAX_ENTRY_CELLS cells
+        self.extent = None  # Cell range of the grid, computed when needed
+        self.family_sources = {}  # {family: the frozen parameters indexed by update_family}
+        return
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def cell_range(self, bbox):
+        size = self.cell_size
+        return (math.floor(bbox[0] / size), math.floor(bbox[1] / size),
+                math.floor(bbox[2] / size), math.floor(bbox[3] / size))
+
+    def insert(self, key, points, closed: bool = False):
+        """
+        Adds or replaces an entry.
+
+        Input:
+            key: tuple, (family, component name).
+            points: list, the (x, y) points of the geometry.
+            closed: bool, whether the points are a polygon.
+
+        Output:
+            None
+        """
+        self.remove(key)
+        entry = Entry(key, points, closed)
+        self.entries[key] = entry
+        if closed or len(points) == 1:
+            box_list = [entry.bbox]
+        else:  # Only the cells along the path
+            box_list = [(min(a[0], b[0]), min(a[1], b[1]), max(a[0], b[0]), max(a[1], b[1])) for a, b in entry.segments()]
+        cells = set()
+        for box in box_list:
+            ix0, iy0, ix1, iy1 = self.cell_range(box)
+            if len(cells) + (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > MAX_ENTRY_CELLS:
+                self.large_keys.add(key)
+                return
+            for ix in range(ix0, ix1 + 1):
+                for iy in range(iy0, iy1 + 1):
+                    cells.add((ix, iy))
+        for cell in cells:
+            self.grid.setdefault(cell, set()).add(key)
+        entry.cells = cells
+        self.extent = None
+        return
+
+    def update_family(self, family, options):
+        """
+        Re-indexes the components of a family whose parameters changed since the last update.
+        Unchanged components are recognised by the identity of their frozen parameters (see base.options_tree),
+        so an unchanged family costs one comparison.
+
+        Input:
+            family: str, the name of the component collection.
+            options: FrozenDict, the frozen parameters of the collection, `CmpntsBase.frozen_options()`.
+
+        Output:
+            None
+        """
+        source = self.family_sources.get(family)
+        if source is options:
+            return
+        source = source or {}
+        for name, cmpnt_ops in dict.items(options):
+            if dict.get(source, name) is cmpnt_ops:
+                continue
+            points, closed = component_geometry(family, cmpnt_ops) if isinstance(cmpnt_ops, dict) else (None, False)
+            if points is None:
+                self.remove((family, name))
+            else:
+                self.insert((family, name), points, closed)
+        for name in dict.keys(source):
+            if name not in options:
+                self.remove((family, name))
+        self.family_sources[family] = options
+        return
+
+    def remove(self, key):
+        """
+        Removes an entry, nothing happens when the key is not indexed.
+
+        Input:
+            key: tuple, (family, component name).
+
+        Output:
+            None
+        """
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        if entry.cells is None:
+            self.large_keys.discard(key)
+            return
+        for cell in entry.cells:
+            keys = self.grid[cell]
+            keys.discard(key)
+            if not keys:
+                del self.grid[cell]
+        self.extent = None
+        return
+
+    def candidates(self, bbox):
+        ix0, iy0, ix1, iy1 = self.cell_range(bbox)
+        keys = set(self.large_keys)
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > len(self.grid):
+            for cell, cell_keys in self.grid.items():
+                if ix0 <= cell[0] <= ix1 and iy0 <= cell[1] <= iy1:
+                    keys.update(cell_keys)
+        else:
+            for ix in range(ix0, ix1 + 1):
+                for iy in range(iy0, iy1 + 1):
+                    cell_keys = self.grid.get((ix, iy))
+                    if cell_keys:
+                        keys.update(cell_keys)
+        return keys
+
+    @staticmethod
+    def family_filter(families):
+        if families is None:
+            return lambda key: True
+        if isinstance(families, str):
+            families = (families,)
+        families = set(families)
+        return lambda key: key[0] in families
+
+    def query_bbox(self, bbox, families=None):
+        """
+        Finds the entries whose bounding box intersects a box.
+
+        Input:
+            bbox: tuple, (x_min, y_min, x_max, y_max) or ((x_min, y_min), (x_max, y_max)).
+            families: str or list, only return these families, default all.
+
+        Output:
+            keys: list, the (family, component name) keys, sorted.
+        """
+        if len(bbox) == 2:
+            bbox = (bbox[0][0], bbox[0][1], bbox[1][0], bbox[1][1])
+        accept = self.family_filter(families)
+        result = []
+        for key in self.candidates(bbox):
+            b = self.entries[key].bbox
+            if accept(key) and b[0] <= bbox[2] and bbox[0] <= b[2] and b[1] <= bbox[3] and bbox[1] <= b[3]:
+                result.append(key)
+        return sorted(result)
+
+    def intersect_segment(self, start, end, families=None):
+        """
+        Finds the entries crossed by a segment, with the intersection points (see `toolbox.find_itsct`).
+
+        Input:
+            start: tuple, (x, y) start of the segment.
+            end: tuple, (x, y) end of the segment.
+            families: str or list, only return these families, default all.
+
+        Output:
+            itscts: list, (key, points) for each crossed entry, sorted by key.
+        """
+        bbox = (min(start[0], end[0]), min(start[1], end[1]), max(start[0], end[0]), max(start[1], end[1]))
+        accept = self.family_filter(families)
+        result = []
+        for key in sorted(self.candidates(bbox)):
+            entry = self.entries[key]
+            b = entry.bbox
+            if not accept(key) or b[0] > bbox[2] or bbox[0] > b[2] or b[1] > bbox[3] or bbox[1] > b[3]:
+                continue
+            points = []
+            for segment in entry.segments():
+                itsct = toolbox.find_itsct([start, end], segment)
+                if itsct is not None:
+                    points.append(itsct)
+            if points:
+                result.append((key, points))
+        return result
+
+    def nearest(self, p, k: int = 1, families=None, exclude=()):
+        """
+        Finds the entries closest to a point.
+
+        Input:
+            p: tuple, (x, y) the point.
+            k: int, the number of entries.
+            families: str or list, only return these families, default all.
+            exclude: list, keys to skip, e.g. the component the point belongs to.
+
+        Output:
+            neighbours: list, (distance, key) sorted by distance, distance 0 inside an outline.
+        """
+        p = (float(p[0]), float(p[1]))
+        accept = self.family_filter(families)
+        exclude = set(exclude)
+        best = {}
+
+        def consider(key):
+            if key in best or key in exclude or not accept(key):
+                return
+            best[key] = self.entries[key].distance(p)
+
+        for key in self.large_keys:
+            consider(key)
+        if self.grid:
+            ix, iy = math.floor(p[0] / self.cell_size), math.floor(p[1] / self.cell_size)
+            if self.extent is None:
+                xs = [cell[0] for cell in self.grid]
+                ys = [cell[1] for cell in self.grid]
+                self.extent = (min(xs), min(ys), max(xs), max(ys))
+            x0, y0, x1, y1 = self.extent
+            max_ring = max(abs(ix - x0), abs(ix - x1), abs(iy - y0), abs(iy - y1))
+            ring = 0
+            while ring <= max_ring:
+                for cx in range(ix - ring, ix + ring + 1):
+                    for cy in (range(iy - ring, iy + ring + 1) if cx in (ix - ring, ix + ring) else (iy - ring, iy + ring)):
+                        for key in self.grid.get((cx, cy), ()):
+                            consider(key)
+                # Entries not seen yet are at least `ring` cells away
+                if len(best) >= k and sorted(best.values())[k - 1] <= ring * self.cell_size:
+                    break
+                ring += 1
+        return sorted((d, key) for key, d in best.items())[:k]
+
+    def bounding_box(self, families=None):
+        """
+        Input:
+            families: str or list, only these families, default all.
+
+        Output:
+            bbox: tuple, ((x_min, y_min), (x_max, y_max)) of the indexed geometry, or None when nothing is indexed.
+        """
+        accept = self.family_filter(families)
+        boxes = [entry.bbox for key, entry in self.entries.items() if accept(key)]
+        if not boxes:
+            return None
+        return ((min(b[0] for b in boxes), min(b[1] for b in boxes)), (max(b[2] for b in boxes), max(b[3] for b in boxes)))
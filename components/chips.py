@@ -41,44 +41,17 @@ class Chips(CmpntsBase):
         self.inject_options(options)  # Inject parameters
         return
     
-    def draw_gds(self):
+    def get_chip_name(self, cmpnt):
         """
-        Draw GDS layout for multiple chip components.
+        Get the chip a chip component is drawn on: each chip component is drawn on its own chip.
 
         Input:
-            None
+            cmpnt: LibraryBase, the chip component.
 
         Output:
-            None
+            chip_name: str, the chip name.
         """
-        gdspy.library.use_current_library = False
-        self.lib = gdspy.GdsLibrary()  # Create a new GDS library
-        self.cell_Dict = Dict()
-
-        # Generate lib for each component
-        for cmpnt_name in self.cmpnt_name_list:
-            cmpnt = getattr(self, cmpnt_name)
-            cmpnt.draw_gds()
-
-        # Traverse components, add each component to the corresponding chip cell center
-        for cmpnt_name in self.cmpnt_name_list:
-            cmpnt = getattr(self, cmpnt_name)
-            chip_name = cmpnt.name
-            if chip_name not in self.cell_Dict.keys():
-                self.cell_Dict[chip_name] = self.lib.new_cell(chip_name)
-            self.cell_Dict[chip_name].add(cmpnt.cell)
-
-        # Layer by chip name (set layer number)
-        for chip_name, cell in self.cell_Dict.items():
-            layer_num = toolbox.custom_hash(chip_name)
-            self.cell_Dict[chip_name].flatten(single_layer=layer_num, single_datatype=0)
-
-        # Create an overall cell, and integrate all chip cells into the total cell center
-        module_name = toolbox.convert_to_snake_case(self.__class__.__name__)
-        self.cell = self.lib.new_cell(module_name)
-        for chip_name, chip_cell in self.cell_Dict.items():
-            self.cell.add(chip_cell)
-        return
+        return cmpnt.name
     
     def change_size_from_Flipichip_routing(self, chip_name, qubits_ops, rdls_ops):
         """
@@ -129,9 +102,7 @@ class Chips(CmpntsBase):
         """
         chip_ops = func_modules.chips.generate_chip(**gene_ops)  # Call the function module to generate chip options
         chip_name = chip_ops.name  # Get chip name
-        chips_ops = copy.deepcopy(self.options)  # Get options for the current chip set
-        chips_ops[chip_name] = copy.deepcopy(chip_ops)  # Add the new chip to the option dictionary
-        self.inject_options(chips_ops)  # Inject updated options
+        self.set_component(chip_name, chip_ops)  # Add the new chip, the other chips are kept as they are
         return
     
     def copy_chip(self, old_chip_name, new_chip_name):
@@ -145,8 +116,7 @@ class Chips(CmpntsBase):
         Output:
             None
         """
-        chips_ops = self.extract_options()  # Extract parameters of the current chip set
-        chips_ops[new_chip_name] = copy.deepcopy(chips_ops[old_chip_name])  # Copy the original chip parameters
-        chips_ops[new_chip_name].name = new_chip_name  # Update the name of the new chip
-        self.inject_options(chips_ops)  # Inject updated parameters
+        chip_ops = self.options[old_chip_name]  # Copy the original chip parameters
+        chip_ops.name = new_chip_name  # Update the name of the new chip
+        self.set_component(new_chip_name, chip_ops)  # Add the new chip
         return
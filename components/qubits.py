@@ -28,6 +28,7 @@ class Qubits(CmpntsBase):
     def calc_general_ops(self):
         for cmpnt_name in self.cmpnt_name_list:
             getattr(self, cmpnt_name).calc_general_ops()
+            getattr(self, cmpnt_name).touch_options()
         return
     
     def change_qubits_type(self, qubits_type):
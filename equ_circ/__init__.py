@@ -4,8 +4,10 @@
 #              function interfaces related to plasma circuits (equ_circ).
 ############################################################################################
 
-from equ_circ import primitives
-from equ_circ import equ_circ_old
+from base import lazy_import
+# Loads qucat, scipy and sympy, imported on first use
+primitives = lazy_import.lazy_module("equ_circ.primitives")
+equ_circ_old = lazy_import.lazy_module("equ_circ.equ_circ_old")
 from addict import Dict
 import copy
 
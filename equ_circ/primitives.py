@@ -44,43 +44,34 @@ def generate_equ_circ_files(topo_ops, txt_path, qcsv_path, rcsv_path):
 
     for key in q_pos:
         Qubit_circuit(q_pos[key][0] * 4, -q_pos[key][1] * 4, 65e-15, 14e-9, key, txt_path, qcsv_path)
-    # Create a 2D list of appropriate size
-    length = len(q_pos)
-    adjacency_matrix = [[0 for _ in range(length)] for _ in range(length)]
-
     # Get the mapping from node names to indices
     node_to_index = {node: index for index, node in enumerate(q_pos.keys())}
 
-    # Fill the adjacency matrix based on connection relationships
+    # Connected index pairs, in the row-major order of an adjacency matrix
+    adjacency_pairs = set()
     for edge in edge:
         node1, node2 = edge
-        index1, index2 = node_to_index[node1], node_to_index[node2]
-        adjacency_matrix[index1][index2] = 1
-    rows = len(adjacency_matrix)
-    cols = len(adjacency_matrix[0])
-    for j in range(rows):
-        for k in range(cols):
-            # if j > k:
-            if adjacency_matrix[j][k] == 1:
-                # print(f"({j}, {k})")
-                if q_pos[str('q') + str(j)][1] == q_pos[str('q') + str(k)][1]:
-                    if q_pos[str('q') + str(j)][0] < q_pos[str('q') + str(k)][0]:
-                        link_circuit_Parallel_positive(q_pos[str('q') + str(j)][0] * 4,
-                                                       -q_pos[str('q') + str(j)][1] * 4, str(k) + str(j), txt_path,
-                                                       rcsv_path)
-                    else:
-                        link_circuit_Parallel_negative(q_pos[str('q') + str(j)][0] * 4,
-                                                       -q_pos[str('q') + str(j)][1] * 4, str(k) + str(j), txt_path,
-                                                       rcsv_path)
-                if q_pos[str('q') + str(j)][0] == q_pos[str('q') + str(k)][0]:
-                    if q_pos[str('q') + str(j)][1] > q_pos[str('q') + str(k)][1]:
-                        link_circuit_Vertical_positive(q_pos[str('q') + str(j)][0] * 4,
-                                                       -q_pos[str('q') + str(j)][1] * 4, str(k) + str(j), txt_path,
-                                                       rcsv_path)
-                    else:
-                        link_circuit_Vertical_negative(q_pos[str('q') + str(j)][0] * 4,
-                                                       -q_pos[str('q') + str(j)][1] * 4, str(k) + str(j), txt_path,
-                                                       rcsv_path)
+        adjacency_pairs.add((node_to_index[node1], node_to_index[node2]))
+    for j, k in sorted(adjacency_pairs):
+        # print(f"({j}, {k})")
+        if q_pos[str('q') + str(j)][1] == q_pos[str('q') + str(k)][1]:
+            if q_pos[str('q') + str(j)][0] < q_pos[str('q') + str(k)][0]:
+                link_circuit_Parallel_positive(q_pos[str('q') + str(j)][0] * 4,
+                                               -q_pos[str('q') + str(j)][1] * 4, str(k) + str(j), txt_path,
+                                               rcsv_path)
+            else:
+                link_circuit_Parallel_negative(q_pos[str('q') + str(j)][0] * 4,
+                                               -q_pos[str('q') + str(j)][1] * 4, str(k) + str(j), txt_path,
+                                               rcsv_path)
+        if q_pos[str('q') + str(j)][0] == q_pos[str('q') + str(k)][0]:
+            if q_pos[str('q') + str(j)][1] > q_pos[str('q') + str(k)][1]:
+                link_circuit_Vertical_positive(q_pos[str('q') + str(j)][0] * 4,
+                                               -q_pos[str('q') + str(j)][1] * 4, str(k) + str(j), txt_path,
+                                               rcsv_path)
+            else:
+                link_circuit_Vertical_negative(q_pos[str('q') + str(j)][0] * 4,
+                                               -q_pos[str('q') + str(j)][1] * 4, str(k) + str(j), txt_path,
+                                               rcsv_path)
 
     return
 
@@ -5,8 +5,44 @@
 from addict import Dict
 import toolbox
 import copy
+from base import spatial_index
 from components import cross_overs
 
+def index_tmls(tmls_ops):
+    """Build a spatial index of the transmission line paths
+
+    input：
+        tmls_ops: Transmission line parameters
+
+    output：
+        index: SpatialIndex keyed by ("transmission_lines", name)
+        order: The position of each key in tmls_ops
+    """
+    index = spatial_index.SpatialIndex()
+    order = {}
+    for tml_name, tml_ops in tmls_ops.items():
+        key = ("transmission_lines", tml_name)
+        order[key] = len(order)
+        points = [tuple(p) for p in tml_ops.pos]
+        if len(points) > 0:
+            index.insert(key, points)
+    return index, order
+
+def find_tml_itscts(index, order, path1):
+    """Find the intersections of a straight line with the indexed transmission lines
+
+    input：
+        index, order: See index_tmls
+        path1: [start_pos, end_pos]
+
+    output：
+        itscts: Intersection points, in the order of the transmission lines and their segments
+    """
+    itscts = []
+    for key, points in sorted(index.intersect_segment(path1[0], path1[1]), key=lambda item: order[item[0]]):
+        itscts.extend(points)
+    return itscts
+
 def generate_ins_sheets(cpls_ops, tmls_ops):
     """Generate insulation pads based on coupling lines and transmission lines
 
@@ -27,16 +63,16 @@ def generate_ins_sheets(cpls_ops, tmls_ops):
     ins_sheets = Dict()
     idx = 0
 
+    # Only the transmission lines near each coupling line are checked
+    index, order = index_tmls(tmls_ops)
     for cpl_name, cpl_ops in cpls_ops.items():
-        for tml_name, tml_ops in tmls_ops.items():
-            path1 = [cpl_ops.start_pos, cpl_ops.end_pos]
-            path2 = tml_ops.pos
-            itscts = toolbox.calc_itscts(path1, path2)
-            for itsct in itscts:
-                ins_sheets["ins_sheet{}".format(idx)].name = "ins_sheet{}".format(idx)
-                ins_sheets["ins_sheet{}".format(idx)].pos = itsct
-                ins_sheets["ins_sheet{}".format(idx)].type = "InsulatingSheet"
-                idx += 1
+        path1 = [cpl_ops.start_pos, cpl_ops.end_pos]
+        itscts = find_tml_itscts(index, order, path1)
+        for itsct in itscts:
+            ins_sheets["ins_sheet{}".format(idx)].name = "ins_sheet{}".format(idx)
+            ins_sheets["ins_sheet{}".format(idx)].pos = itsct
+            ins_sheets["ins_sheet{}".format(idx)].type = "InsulatingSheet"
+            idx += 1
 
     return copy.deepcopy(ins_sheets)
 
@@ -104,19 +140,19 @@ def generate_crosvs_ops_from_cpls_ops_and_tmls_ops(cpls_ops, tmls_ops, crosvs_ty
     ins_sheets = Dict()
     idx = 0
 
+    # Only the transmission lines near each coupling line are checked
+    index, order = index_tmls(tmls_ops)
     for cpl_name, cpl_ops in cpls_ops.items():
-        for tml_name, tml_ops in tmls_ops.items():
-            if cpl_ops.type != "CouplingLineStraight":
-                raise ValueError("The automatic generation of crossover currently only supports the coupling type of CouplingLineStraight, and the type of {} is {}!".format(cpl_name, cpl_ops.type))
-            
-            path1 = [cpl_ops.start_pos, cpl_ops.end_pos]
-            path2 = tml_ops.pos
-            itscts = toolbox.calc_itscts(path1, path2)
-            for itsct in itscts:
-                ins_sheets["ins_sheet{}".format(idx)].name = "ins_sheet{}".format(idx)
-                ins_sheets["ins_sheet{}".format(idx)].chip = chip_name
-                ins_sheets["ins_sheet{}".format(idx)].pos = itsct
-                ins_sheets["ins_sheet{}".format(idx)].type = crosvs_type
-                idx += 1
+        if len(tmls_ops) > 0 and cpl_ops.type != "CouplingLineStraight":
+            raise ValueError("The automatic generation of crossover currently only supports the coupling type of CouplingLineStraight, and the type of {} is {}!".format(cpl_name, cpl_ops.type))
+
+        path1 = [cpl_ops.start_pos, cpl_ops.end_pos]
+        itscts = find_tml_itscts(index, order, path1)
+        for itsct in itscts:
+            ins_sheets["ins_sheet{}".format(idx)].name = "ins_sheet{}".format(idx)
+            ins_sheets["ins_sheet{}".format(idx)].chip = chip_name
+            ins_sheets["ins_sheet{}".format(idx)].pos = itsct
+            ins_sheets["ins_sheet{}".format(idx)].type = crosvs_type
+            idx += 1
 
     return copy.deepcopy(ins_sheets)
\ No newline at end of file
@@ -18,6 +18,10 @@ def generate_random_edges(positions, edges_num):
     topo_edges = primitives.generate_random_edges(positions=positions, edges_num=edges_num)
     return copy.deepcopy(topo_edges)
 
+def generate_connected_edges(positions, edges_num, seed=None, rng=None):
+    topo_edges = primitives.generate_connected_edges(positions=positions, edges_num=edges_num, seed=seed, rng=rng)
+    return copy.deepcopy(topo_edges)
+
 def generate_topology(**gene_ops):
     return copy.deepcopy(gene_topo_ops.gene_topo_ops(**gene_ops))
 
@@ -2,7 +2,10 @@ from addict import Dict
 import copy
 from base.branch_base import BranchBase
 from func_modules.topo import primitives
-from func_modules.topo.gene_topo_ops import qasm
+from base import lazy_import
+
+# The QASM / genetic algorithm stack (qiskit, pandas, seaborn) is imported on first use
+qasm = lazy_import.lazy_module("func_modules.topo.gene_topo_ops.qasm")
 
 def gene_topo_ops(**gene_ops):
     gto = GeneTopoOps(**gene_ops)
@@ -50,6 +53,26 @@ class GeneTopoOps(BranchBase):
         options.positions, options.col_num, options.row_num = primitives.generate_topo_positions_col_row(qubits_num, topo_col, topo_row)
 
         return copy.deepcopy(options)
+
+    def shape__topo_col__topo_row(self, gene_ops):
+        """
+        shape ("hex" or "heavy_hex"), topo_col, topo_row, see primitives.generate_hex_lattice
+        """
+        # interface
+        shape = gene_ops.shape
+        topo_col = gene_ops.topo_col
+        topo_row = gene_ops.topo_row
+
+        if shape not in ("hex", "heavy_hex"):
+            raise ValueError("Unknown lattice shape {}, expected hex or heavy_hex".format(shape))
+
+        # Generate coordinates and edges
+        options = Dict()
+        options.positions, options.edges = primitives.generate_hex_lattice(topo_row, topo_col, heavy=(shape == "heavy_hex"))
+        options.col_num = topo_col
+        options.row_num = max(pos[1] for pos in options.positions.values()) + 1
+
+        return copy.deepcopy(options)
     
     # qasmhave sth. to do with
     def qasm_path(self, gene_ops):
@@ -96,17 +96,44 @@ def generate_full_edges(positions):
     Output:
         edges: A list of lists, where each inner list contains two qubit names representing an edge between them.
     """
-    positions = Dict(positions)
-    edges = []
+    def is_neighbour(topo_pos_i, topo_pos_j):
+        return (abs(topo_pos_i[0] - topo_pos_j[0]) + abs(topo_pos_i[1] - topo_pos_j[1])) == 1
+
+    return find_neighbour_edges(positions, 1, is_neighbour)
+
+# Offsets of the 3 x 3 cells searched by find_neighbour_edges
+NEIGHBOUR_CELLS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+def find_neighbour_edges(positions, max_dist, is_neighbour):
+    """
+    Find the edges between the qubits satisfying a neighbour condition, in linear time.
+    The positions are hashed into square cells slightly larger than max_dist, so each qubit is only compared with the
+    qubits of the 3 x 3 cells around it instead of all qubits.
+
+    Input:
+        positions: A dictionary of qubit positions with qubit names as keys and (x, y) tuples as values.
+        max_dist: The largest distance between two neighbours.
+        is_neighbour: function, (pos1, pos2) -> bool, whether two positions closer than max_dist are neighbours.
+
+    Output:
+        edges: A list of [qubit, neighbour] lists, in the order of a comparison of every pair:
+            the qubit comes before the neighbour in positions, sorted by qubit, then by neighbour.
+    """
+    cell_size = max_dist * (1 + 1e-6)  # Neighbours at max_dist within rounding are in adjacent cells
     qubits = list(positions.keys())
-    for i in range(0, len(qubits)):
-        for j in range(i + 1, len(qubits)):
-            topo_pos_i = positions[qubits[i]]
-            topo_pos_j = positions[qubits[j]]
-            if (abs(topo_pos_i[0] - topo_pos_j[0]) + abs(topo_pos_i[1] - topo_pos_j[1])) == 1:
-                edges.append([qubits[i], qubits[j]])
-    
-    return copy.deepcopy(edges)
+    poss = [positions[q] for q in qubits]
+    cells = [(math.floor(pos[0] / cell_size), math.floor(pos[1] / cell_size)) for pos in poss]
+    cell_Dict = {}
+    for i, cell in enumerate(cells):
+        cell_Dict.setdefault(cell, []).append(i)
+
+    edges = []
+    for i, (cx, cy) in enumerate(cells):
+        neighbours = [j for dx, dy in NEIGHBOUR_CELLS for j in cell_Dict.get((cx + dx, cy + dy), ())
+                      if j > i and is_neighbour(poss[i], poss[j])]
+        neighbours.sort()
+        edges.extend([qubits[i], qubits[j]] for j in neighbours)
+    return edges
 
 def generate_random_edges(positions, edges_num: int = None):
     """
@@ -132,22 +159,96 @@ def generate_random_edges(positions, edges_num: int = None):
     edges = random.sample(full_edges, edges_num)
     return copy.deepcopy(edges)
 
-def to_random_edges_full_connected(topo_poss):
+def find_root(parents, i):
+    """
+    Find the root of an element in a union-find forest, halving the path on the way.
+
+    Input:
+        parents: list, the parent of each element, roots are their own parent.
+        i: int, the element.
+
+    Output:
+        root: int, the root of the set containing i.
+    """
+    while parents[i] != i:
+        parents[i] = parents[parents[i]]
+        i = parents[i]
+    return i
+
+def generate_connected_edges(positions, edges_num: int = None, seed: int = None, rng: random.Random = None):
+    """
+    Randomly generate a specified number of edges for the given topology coordinates, such that the topology is connected.
+    A random spanning tree of the nearest-neighbour edges is built first (randomized Kruskal with union-find),
+    then random extra edges are added up to edges_num.
+
+    Input:
+        positions: A dictionary of qubit positions with qubit names as keys and (x, y) tuples as values.
+        edges_num: The number of edges to generate, between the number of qubits minus one and the number of nearest-neighbour edges. If None, a random number in this range will be chosen.
+        seed: The seed of a new random generator. If None, rng is used.
+        rng: random.Random, the random generator, used when seed is None. If None as well, the global random generator is used.
+
+    Output:
+        edges: A list of edges in the order of generate_full_edges, where each edge is a list containing two qubit names.
+
+    Exception:
+        ValueError: Throws an exception when both seed and rng are given, when the qubits can not be connected by
+            nearest-neighbour edges, or when edges_num is out of range.
+    """
+    if seed is not None and rng is not None:
+        raise ValueError("Give either a seed or a random generator, not both.")
+    if seed is not None:
+        rng = random.Random(seed)
+    elif rng is None:
+        rng = random
+    full_edges = generate_full_edges(positions)
+    max_edges_num = len(full_edges)
+    index = {q: i for i, q in enumerate(positions.keys())}
+    min_edges_num = max(len(index) - 1, 0)
+    if edges_num is not None and not min_edges_num <= edges_num <= max_edges_num:
+        raise ValueError(f"The number of edges {edges_num} is out of range: {len(index)} connected qubits need "
+                         f"between {min_edges_num} and {max_edges_num} nearest-neighbour edges.")
+
+    # Random spanning tree: the shuffled edges joining two components
+    order = list(range(max_edges_num))
+    rng.shuffle(order)
+    parents = list(range(len(index)))
+    sizes = [1] * len(index)
+    tree = []
+    extra = []
+    for e in order:
+        root0 = find_root(parents, index[full_edges[e][0]])
+        root1 = find_root(parents, index[full_edges[e][1]])
+        if root0 == root1:
+            extra.append(e)
+            continue
+        if sizes[root0] < sizes[root1]:
+            root0, root1 = root1, root0
+        parents[root1] = root0
+        sizes[root0] += sizes[root1]
+        tree.append(e)
+    if len(tree) < min_edges_num:
+        raise ValueError(f"The qubits cannot be connected by nearest-neighbour edges, they form {len(index) - len(tree)} separate groups.")
+
+    if edges_num is None:
+        edges_num = rng.randint(len(tree), max_edges_num)
+    # The remaining edges are already in a random order
+    chosen = sorted(tree + extra[:edges_num - len(tree)])
+    return [list(full_edges[e]) for e in chosen]
+
+def to_random_edges_full_connected(topo_poss, rng: random.Random = None):
     """
     Randomly generate topology edges based on the given topology coordinates to ensure the final topology is a connected graph.
 
     Input:
         topo_poss: Topology coordinates
+        rng: random.Random, the random generator. If None, the global random generator is used.
 
     Output:
         topo_edges: Topology edges
     """
 
-    # Reminder information
-    print("Randomly generating topology edges (connected graph)...")
-
     # Call method to generate connected topological edges
-    topo_edges = toolbox.generate_connected_edges(topo_poss)
+    topo_edges = generate_connected_edges(topo_poss, rng=rng)
 
     return copy.deepcopy(topo_edges)
 
@@ -184,7 +285,8 @@ import math
 def generate_hex_pos(num):
     """
     Generate a set of hexagonal coordinates and return them in dictionary format.
-    Each hexagon's coordinates form a regular hexagon shape, with multiple hexagons joined together.
+    Each hexagon's coordinates form a regular hexagon shape, with multiple hexagons joined together,
+    the hexagons are added ring by ring around the first one.
 
     Input:
     num: The number of hexagons
@@ -204,35 +306,85 @@ def generate_hex_pos(num):
     if num < 0:
         raise ValueError("num must be greater than 0")
     
-    if num > 7:
-        raise ValueError("num cannot be greater than 7 for now")
-    
-    # The center point of a hexagon
-    base_poses = [(0, 0)]
-    base_poses += list(
-            (1*math.sqrt(3)*math.cos(angle*math.pi/180), 1*math.sqrt(3)*math.sin(angle*math.pi/180)) for angle in range(0, 361, 60))
     # Relative to the center point，Node perspective
     angles = [(i*60+30)*math.pi/180 for i in range(6)]
     
     qubits_idx = 0    # Node number
-    base_pos_idx = 0    # Center point number
-    while 1:
-        if num == 0:
-            break
-
-        base_pos = copy.deepcopy(base_poses[base_pos_idx])
-        
+    seen = set()    # Rounded coordinates of the nodes
+    for base_pos in generate_hex_centers(num, math.sqrt(3)*length):
         for angle in angles:
             pos = (base_pos[0]+length*math.cos(angle), base_pos[1]+length*math.sin(angle))
-            if not panduan_shifou_yijingyou_zhege_dian(positions, pos):
-                positions[f"q{qubits_idx}"] = copy.deepcopy(pos)
+            key = (round(pos[0], 6), round(pos[1], 6))
+            if key not in seen:
+                seen.add(key)
+                positions[f"q{qubits_idx}"] = pos
                 qubits_idx += 1
 
-        num -= 1
-        base_pos_idx += 1
-
     return positions
 
+def generate_hex_centers(num, dist):
+    """
+    Generate the center points of num hexagons in rings around (0, 0): the first ring starts at angle 0 and turns by 60 degrees.
+
+    Input:
+        num: The number of hexagons
+        dist: The distance between the centers of neighbouring hexagons
+
+    Output:
+        centers: A list of (x, y) tuples
+    """
+    directions = [(dist*math.cos(i*60*math.pi/180), dist*math.sin(i*60*math.pi/180)) for i in range(6)]
+    centers = [(0, 0)]
+    ring = 1
+    while len(centers) < num:
+        for i in range(6):
+            corner, next_corner = directions[i], directions[(i + 1) % 6]
+            for j in range(ring):
+                centers.append((ring*corner[0] + j*(next_corner[0] - corner[0]),
+                                ring*corner[1] + j*(next_corner[1] - corner[1])))
+        ring += 1
+    return centers[:num]
+
+def generate_hex_lattice(topo_row, topo_col, heavy: bool = False):
+    """
+    Generate the positions and edges of a hexagonal (heavy False) or heavy-hex (heavy True) lattice,
+    on integer coordinates so that all edges have length 1 and are horizontal or vertical ("brick wall" layout).
+
+    The lattice has topo_row rows of topo_col qubits, joined by horizontal edges.
+    Hexagonal: rows y and y + 1 are joined by vertical edges at the columns x where x + y is even.
+    Heavy-hex: the rows are at even y, and rows 2r and 2r + 2 are joined through a qubit at (x, 2r + 1)
+    every 4 columns, starting at column 0 for even r and 2 for odd r.
+
+    Input:
+        topo_row: The number of rows
+        topo_col: The number of qubits in each row
+        heavy: Whether to generate a heavy-hex lattice
+
+    Output:
+        positions: A dictionary of qubit positions, 'q' followed by the index in (y, x) order, with (x, y) tuples as values
+        edges: A list of edges in the order of generate_full_edges, where each edge is a list containing two qubit names
+    """
+    if topo_row < 1 or topo_col < 1:
+        raise ValueError(f"The lattice needs at least one row and one column: topo_row = {topo_row}, topo_col = {topo_col}")
+
+    positions = Dict()
+    for r in range(topo_row):
+        y = 2*r if heavy else r
+        for x in range(topo_col):
+            positions[f"q{len(positions)}"] = (x, y)
+        if heavy and r < topo_row - 1:
+            for x in range(2*(r % 2), topo_col, 4):
+                positions[f"q{len(positions)}"] = (x, y + 1)
+
+    def is_neighbour(pos1, pos2):
+        if pos1[1] == pos2[1]:
+            return abs(pos1[0] - pos2[0]) == 1
+        # Heavy-hex rows only touch their bridge qubits, all vertical neighbours are edges
+        return pos1[0] == pos2[0] and abs(pos1[1] - pos2[1]) == 1 and (heavy or (pos1[0] + min(pos1[1], pos2[1])) % 2 == 0)
+
+    edges = find_neighbour_edges(positions, 1, is_neighbour)
+    return positions, edges
+
 def panduan_shifou_yijingyou_zhege_dian(positions, pos):
     for qname, qpos in positions.items():
         if are_coordinates_coincident(pos, qpos):
@@ -261,23 +413,11 @@ def generate_hex_full_edges(positions):
     Output:
         edges: List of edges connecting the hexagonal coordinates
     """
-    positions = copy.deepcopy(positions)
-    
-    edges = []
-    for q in positions.keys():
-        for qq in positions.keys():
-            # Determine if they are the same point
-            if q == qq:
-                continue
-            # Determine if the distance is 1
-            dist = calculate_distance(positions[q], positions[qq])
-            if not are_floats_equal(1, dist):
-                continue
-            # Determine if this edge already exists
-            if panduan_shifou_you_zhege_bian(edges, [q, qq]):
-                continue
-            edges.append([q, qq])
-    return edges
+    def is_neighbour(pos1, pos2):
+        # Determine if the distance is 1
+        return are_floats_equal(1, calculate_distance(pos1, pos2))
+
+    return find_neighbour_edges(positions, 1, is_neighbour)
 
 def panduan_shifou_you_zhege_bian(edges, edge):
     """
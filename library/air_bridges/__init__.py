@@ -3,7 +3,9 @@
 # Description: Dynamically loads the air_bridges module and maintains module information.
 #########################################################################
 
-from library.air_bridges.air_bridge import AirBridge
-from library.air_bridges.airbridge_nb import AirbridgeNb
+from base import lazy_import
 
-module_name_list = ["air_bridge", "airbridge_nb"]
\ No newline at end of file
+module_name_list = ["air_bridge", "airbridge_nb"]
+
+# Classes are imported from their module on first access
+__getattr__ = lazy_import.class_getter(__name__, module_name_list)
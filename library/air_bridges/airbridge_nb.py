@@ -2,10 +2,11 @@
 # File Name: airbridge_nb.py
 # Description: This file primarily contains the construction code for the AirbridgeNb (air bridge without base).
 ############################################################################################
-import gdspy, copy
+import copy
 from addict import Dict
 import math as mt
 from base.library_base import LibraryBase
+from base import geometry_backend, geometry_cache
 
 class AirbridgeNb(LibraryBase):
     """
@@ -14,6 +15,9 @@ class AirbridgeNb(LibraryBase):
     Attributes:
         default_options: Dict, containing default parameters for air bridges without a base.
     """
+    geometry_cache_ignore = geometry_cache.TRANSLATION_OPTIONS  # Centered on gds_pos, rotated by rotation
+    geometry_cache_attributes = ("outline",)  # Calculated while drawing
+    calculated_options = ("outline",)  # Set by calc_general_ops
     default_options = Dict(
         name="AirbridgeNb0",
         type="AirbridgeNb",
@@ -52,10 +56,11 @@ class AirbridgeNb(LibraryBase):
             ([[-26.0, -65.0], [26.0, -65.0], [26.0, -14.0], [-26.0, -14.0]], 4),
         ]
 
+        backend = geometry_backend.active
         for points in polygon_data:
             layer = points[-1]
             polygon_points = points[0]
-            self.cell.add(gdspy.Polygon(polygon_points, layer=layer))
+            backend.add(self.cell, backend.polygon(polygon_points, layer=layer))
 
     def _calculate_bounding_box(self):
         """
@@ -64,21 +69,11 @@ class AirbridgeNb(LibraryBase):
         Output:
             Coordinates of the bounding box (min_x, min_y, max_x, max_y).
         """
-        min_x, min_y = float("inf"), float("inf")
-        max_x, max_y = float("-inf"), float("-inf")
-
-        for polygon in self.cell.polygons:
-            bbox = polygon.get_bounding_box()
-            if bbox is not None:
-                min_x = min(min_x, bbox[0][0])
-                min_y = min(min_y, bbox[0][1])
-                max_x = max(max_x, bbox[1][0])
-                max_y = max(max_y, bbox[1][1])
-
-        if min_x == float("inf") or min_y == float("inf"):
+        bbox = geometry_backend.active.shapes_bounding_box(self.cell.polygons)
+        if bbox is None:
             raise ValueError("No valid polygons found in the cell.")
 
-        return min_x, min_y, max_x, max_y
+        return bbox[0][0], bbox[0][1], bbox[1][0], bbox[1][1]
 
     def _transform_polygons(self, dx, dy, rotation, center):
         """
@@ -93,9 +88,9 @@ class AirbridgeNb(LibraryBase):
         Output:
             None.
         """
-        for polygon in self.cell.polygons:
-            polygon.translate(dx, dy)
-            polygon.rotate(rotation, center=center)
+        backend = geometry_backend.active
+        backend.translate(self.cell.polygons, dx, dy)
+        backend.rotate(self.cell.polygons, rotation, center=center)
 
     def calc_general_ops(self):
         """
@@ -104,8 +99,8 @@ class AirbridgeNb(LibraryBase):
         Output:
             None.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         self._add_polygons_to_cell()
@@ -126,7 +121,7 @@ class AirbridgeNb(LibraryBase):
         # Apply transformations
         self._transform_polygons(dx, dy, self.rotation, center=(target_center_x, target_center_y))
         self.outline = [
-            points for polygon in self.cell.polygons for points in polygon.get_bounding_box().tolist()
+            points for polygon in self.cell.polygons for points in backend.shapes_bounding_box(polygon).tolist()
         ]
         return
 
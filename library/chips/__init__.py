@@ -3,7 +3,9 @@
 # Description: Dynamically loads the chips module and maintains module information.
 #########################################################################
 
-from library.chips.rec_chip import RecChip
-from library.chips.rec_chip_two import RecChipTwo
+from base import lazy_import
 
-module_name_list = ["rec_chip", "rec_chip_two"]
\ No newline at end of file
+module_name_list = ["rec_chip", "rec_chip_two"]
+
+# Classes are imported from their module on first access
+__getattr__ = lazy_import.class_getter(__name__, module_name_list)
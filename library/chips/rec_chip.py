@@ -3,8 +3,9 @@
 # Description: This file primarily contains the construction code for the RecChip (single rectangular chip).
 ############################################################################################
 from addict import Dict
-import gdspy, copy
+import copy
 from base.library_base import LibraryBase
+from base import geometry_backend
 import toolbox
 
 class RecChip(LibraryBase):
@@ -52,15 +53,15 @@ class RecChip(LibraryBase):
         Output:
             None.
         """
-        gdspy.library.use_current_library = False
-        self.lib = gdspy.GdsLibrary()
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name)
         # Create four segments to form a rectangle
-        path = gdspy.Path(1, self.start_pos)
+        path = backend.path(1, self.start_pos)
         path.segment(self.end_pos[0] - self.start_pos[0], "+x")
         path.segment(self.end_pos[1] - self.start_pos[1], "+y")
         path.segment(self.end_pos[0] - self.start_pos[0], "-x")
         path.segment(self.end_pos[1] - self.start_pos[1], "-y")
 
-        self.cell.add(path)
+        backend.add(self.cell, path)
         return
\ No newline at end of file
@@ -3,8 +3,9 @@
 # Description: This file primarily contains the construction code for the RecChipTwo (two rectangular chips).
 ############################################################################################
 from addict import Dict
-import gdspy, copy
+import copy
 from base.library_base import LibraryBase
+from base import geometry_backend
 import toolbox
 
 class RecChipTwo(LibraryBase):
@@ -54,8 +55,8 @@ class RecChipTwo(LibraryBase):
         Output:
             None.
         """
-        gdspy.library.use_current_library = False
-        self.lib = gdspy.GdsLibrary()
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name)
 
         # Interface
@@ -64,18 +65,18 @@ class RecChipTwo(LibraryBase):
         start_pos1 = copy.deepcopy(self.start_pos1)
         end_pos1 = copy.deepcopy(self.end_pos1)
         # Create four segments to form a rectangle
-        path0 = gdspy.Path(1, start_pos0)
+        path0 = backend.path(1, start_pos0)
         path0.segment(end_pos0[0] - start_pos0[0], "+x")
         path0.segment(end_pos0[1] - start_pos0[1], "+y")
         path0.segment(end_pos0[0] - start_pos0[0], "-x")
         path0.segment(end_pos0[1] - start_pos0[1], "-y")
 
-        path1 = gdspy.Path(1, start_pos1)
+        path1 = backend.path(1, start_pos1)
         path1.segment(end_pos1[0] - start_pos1[0], "+x")
         path1.segment(end_pos1[1] - start_pos1[1], "+y")
         path1.segment(end_pos1[0] - start_pos1[0], "-x")
         path1.segment(end_pos1[1] - start_pos1[1], "-y")
 
-        self.cell.add(path0)
-        self.cell.add(path1)
+        backend.add(self.cell, path0)
+        backend.add(self.cell, path1)
         return
\ No newline at end of file
@@ -3,14 +3,7 @@
 # Description: Dynamically loads the control_lines module and maintains module information.
 #########################################################################
 
-from library.control_lines.charge_line import ChargeLine
-from library.control_lines.charge_line1 import ChargeLine1
-from library.control_lines.control_line_circle import ControlLineCircle
-from library.control_lines.control_line_circle1 import ControlLineCircle1
-from library.control_lines.control_line_circle2408 import ControlLineCircle2408
-from library.control_lines.control_line_circle2412 import ControlLineCircle2412
-from library.control_lines.control_line_width_diff import ControlLineWidthDiff
-from library.control_lines.control_line_width_diff1 import ControlLineWidthDiff1
+from base import lazy_import
 
 module_name_list = ["charge_line", 
                     "charge_line1", 
@@ -19,4 +12,7 @@ module_name_list = ["charge_line",
                     "control_line_circle2408", 
                     "control_line_circle2412", 
                     "control_line_width_diff", 
-                    "control_line_width_diff1"]
\ No newline at end of file
+                    "control_line_width_diff1"]
+
+# Classes are imported from their module on first access
+__getattr__ = lazy_import.class_getter(__name__, module_name_list)
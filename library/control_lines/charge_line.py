@@ -2,9 +2,9 @@
 # File Name: charge_line.py
 # Description: This file primarily contains the construction code for the ChargeLine.
 ############################################################################################
-import gdspy
 import math
 from base.library_base import LibraryBase
+from base import geometry_backend
 from addict import Dict
 
 class ChargeLine(LibraryBase):
@@ -60,24 +60,25 @@ class ChargeLine(LibraryBase):
         Output:
             None.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         corner_radius = self.corner_radius
+        pos = list(self.pos)  # The end is shortened below, the parameter is kept
 
         self.cell_extract = self.lib.new_cell(self.name + "_extract")
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
 
-        control_L_out = gdspy.FlexPath(self.pos, self.width + self.gap * 2, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        self.cell_extract.add(control_L_out)
+        control_L_out = backend.flexpath(pos, self.width + self.gap * 2, corners="circular bend", bend_radius=corner_radius)
+        backend.add(self.cell_extract, control_L_out)
 
-        d = math.sqrt((self.pos[-1][1] - self.pos[-2][1])**2 + (self.pos[-1][0] - self.pos[-2][0])**2)
-        self.pos[-1] = (self.pos[-1][0] - (self.pad_height / d) * (self.pos[-1][0] - self.pos[-2][0]), self.pos[-1][1] - (self.pad_height / d) * (self.pos[-1][1] - self.pos[-2][1]))
+        d = math.sqrt((pos[-1][1] - pos[-2][1])**2 + (pos[-1][0] - pos[-2][0])**2)
+        pos[-1] = (pos[-1][0] - (self.pad_height / d) * (pos[-1][0] - pos[-2][0]), pos[-1][1] - (self.pad_height / d) * (pos[-1][1] - pos[-2][1]))
 
-        control_L_inner = gdspy.FlexPath(self.pos, self.width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        self.cell_subtract.add(control_L_inner)
+        control_L_inner = backend.flexpath(pos, self.width, corners="circular bend", bend_radius=corner_radius)
+        backend.add(self.cell_subtract, control_L_inner)
 
-        pad = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        pad = backend.boolean(self.cell_extract, self.cell_subtract, "not")
         self.cell = self.lib.new_cell(self.name + "_cell")
-        self.cell.add(pad)
+        backend.add(self.cell, pad)
 
         return
\ No newline at end of file
@@ -2,10 +2,10 @@
 # File Name: charge_line1.py
 # Description: This file primarily contains the construction code for the ChargeLine1.
 ############################################################################################
-import gdspy
 import math
 from base.library_base import LibraryBase
 from addict import Dict
+from base import geometry_backend
 
 class ChargeLine1(LibraryBase):
     """
@@ -66,15 +66,15 @@ class ChargeLine1(LibraryBase):
         Returns:
             List[gdspy.Polygon]: List containing the polygons representing the readout line and pad.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         corner_radius = self.corner_radius
 
         self.cell_extract = self.lib.new_cell(self.name + "_extract")
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
 
-        control_L_out = gdspy.FlexPath(self.path, self.width + self.gap * 2, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        self.cell_extract.add(control_L_out)
+        control_L_out = backend.flexpath(self.path, self.width + self.gap * 2, corners="circular bend", bend_radius=corner_radius)
+        backend.add(self.cell_extract, control_L_out)
 
         pad_height = self.pad_height
         pos = self.path
@@ -83,11 +83,11 @@ class ChargeLine1(LibraryBase):
         d = math.sqrt((pos[-1][1] - pos[-2][1])**2 + (pos[-1][0] - pos[-2][0])**2)
         pos[-1] = (pos[-1][0] - (pad_height / d) * (pos[-1][0] - pos[-2][0]), pos[-1][1] - (pad_height / d) * (pos[-1][1] - pos[-2][1]))
 
-        control_L_inner = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        self.cell_subtract.add(control_L_inner)
+        control_L_inner = backend.flexpath(pos, width, corners="circular bend", bend_radius=corner_radius)
+        backend.add(self.cell_subtract, control_L_inner)
 
-        pad = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        pad = backend.boolean(self.cell_extract, self.cell_subtract, "not")
         self.cell = self.lib.new_cell(self.name + "_cell")
-        self.cell.add(pad)
+        backend.add(self.cell, pad)
 
         return
\ No newline at end of file
@@ -2,12 +2,12 @@
 # File Name: control_line_circle1.py
 # Description: This file primarily contains the construction code for the ControlLineCircle1.
 ############################################################################################
-import gdspy
 import math
 import numpy as np
 from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 class ControlLineCircle1(LibraryBase):
     """
@@ -61,8 +61,8 @@ class ControlLineCircle1(LibraryBase):
         Output:
             None.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
 
         pos = self.path
 
@@ -71,20 +71,20 @@ class ControlLineCircle1(LibraryBase):
         self.cell_extract = self.lib.new_cell(self.name + "_extract")
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
 
-        control_L_out = gdspy.FlexPath(pos, self.width + self.gap * 2,
-                                        corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        circle = gdspy.Round(pos[-1], self.radius + self.gap, tolerance=0.01)
-        self.cell_extract.add(control_L_out)
-        self.cell_extract.add(circle)
+        control_L_out = backend.flexpath(pos, self.width + self.gap * 2,
+                                        corners="circular bend", bend_radius=corner_radius)
+        circle = backend.round(pos[-1], self.radius + self.gap)
+        backend.add(self.cell_extract, control_L_out)
+        backend.add(self.cell_extract, circle)
 
-        control_L_inner = gdspy.FlexPath(pos, self.width,
-                                         corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        circle = gdspy.Round(pos[-1], self.radius, tolerance=0.01)
-        self.cell_subtract.add(control_L_inner)
-        self.cell_subtract.add(circle)
+        control_L_inner = backend.flexpath(pos, self.width,
+                                         corners="circular bend", bend_radius=corner_radius)
+        circle = backend.round(pos[-1], self.radius)
+        backend.add(self.cell_subtract, control_L_inner)
+        backend.add(self.cell_subtract, circle)
 
-        pad = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        pad = backend.boolean(self.cell_extract, self.cell_subtract, "not")
         self.cell = self.lib.new_cell(self.name + "_cell")
-        self.cell.add(pad)
+        backend.add(self.cell, pad)
 
         return
\ No newline at end of file
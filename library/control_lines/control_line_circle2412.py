@@ -3,7 +3,6 @@
 # Description: This file primarily contains the construction code for the ControlLineCircle2412.
 ############################################################################################
 
-import gdspy
 import math
 import numpy as np
 from addict import Dict
@@ -12,6 +11,7 @@ import toolbox
 from base.library_base import LibraryBase
 
 import math
+from base import geometry_backend
 
 
 def add_points(pos):
@@ -145,8 +145,8 @@ class ControlLineCircle2412(LibraryBase):
         """
         Draws the GDS file.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
 
         corner_radius = self.corner_radius
         end_radius = self.end_radius
@@ -164,20 +164,20 @@ class ControlLineCircle2412(LibraryBase):
         pos_2.insert(0, ((pos[-7][0] + pos[-6][0]) / 2, (pos[-7][1] + pos[-6][1]) / 2))
 
         # Points before the split form a path, using corner_radius
-        control_L_out_part1 = gdspy.FlexPath(pos_1, self.width + self.gap * 2,
-                                             corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        control_L_inner_part1 = gdspy.FlexPath(pos_1, self.width,
-                                               corners="circular bend", bend_radius=corner_radius).to_polygonset()
+        control_L_out_part1 = backend.flexpath(pos_1, self.width + self.gap * 2,
+                                             corners="circular bend", bend_radius=corner_radius)
+        control_L_inner_part1 = backend.flexpath(pos_1, self.width,
+                                               corners="circular bend", bend_radius=corner_radius)
 
         # The last five points form a path, using end_radius
-        control_L_out_part2 = gdspy.FlexPath(pos_2, self.width + self.gap * 2,
-                                             corners="circular bend", bend_radius=end_radius).to_polygonset()
-        control_L_inner_part2 = gdspy.FlexPath(pos_2, self.width,
-                                               corners="circular bend", bend_radius=end_radius).to_polygonset()
+        control_L_out_part2 = backend.flexpath(pos_2, self.width + self.gap * 2,
+                                             corners="circular bend", bend_radius=end_radius)
+        control_L_inner_part2 = backend.flexpath(pos_2, self.width,
+                                               corners="circular bend", bend_radius=end_radius)
 
         # Merge the paths
-        control_L_out = gdspy.boolean(control_L_out_part1, control_L_out_part2, "or")
-        control_L_inner = gdspy.boolean(control_L_inner_part1, control_L_inner_part2, "or")
+        control_L_out = backend.boolean(control_L_out_part1, control_L_out_part2, "or")
+        control_L_inner = backend.boolean(control_L_inner_part1, control_L_inner_part2, "or")
 
         (x1, y1), (x2, y2) = calculate_intermediate_points(pos)
         cx = (x1 + x2) / 2
@@ -197,17 +197,17 @@ class ControlLineCircle2412(LibraryBase):
         point4 = (cx + side_half_vector[0], cy + side_half_vector[1])
         point1 = (x1, y1)
         point2 = (x2, y2)
-        square = gdspy.Polygon([point1, point4, point2, point3])
-        control_L_out = gdspy.boolean(control_L_out, square, "or")
-        self.cell_extract.add(control_L_out)
-        # self.cell_extract.add(circle)
+        square = backend.polygon([point1, point4, point2, point3])
+        control_L_out = backend.boolean(control_L_out, square, "or")
+        backend.add(self.cell_extract, control_L_out)
+        # backend.add(self.cell_extract, circle)
 
-        self.cell_subtract.add(control_L_inner)
-        # self.cell_subtract.add(circle)
+        backend.add(self.cell_subtract, control_L_inner)
+        # backend.add(self.cell_subtract, circle)
 
-        pad = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
-        # pad = gdspy.boolean(pad, square, "or")
+        pad = backend.boolean(self.cell_extract, self.cell_subtract, "not")
+        # pad = backend.boolean(pad, square, "or")
         self.cell = self.lib.new_cell(self.name + "_cell")
-        self.cell.add(pad)
+        backend.add(self.cell, pad)
 
         return
\ No newline at end of file
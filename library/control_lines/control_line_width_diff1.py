@@ -3,12 +3,12 @@
 # Description: This file primarily contains the construction code for the ControlLineWidthDiff1.
 ############################################################################################
 
-import gdspy
 import math
 import copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 
 class ControlLineWidthDiff1(LibraryBase):
@@ -59,9 +59,9 @@ class ControlLineWidthDiff1(LibraryBase):
 
         Draws control lines with different widths and adds buffers.
         """
-        ################################ gdspy variables ################################
-        gdspy.library.use_current_library = False
-        self.lib = gdspy.GdsLibrary()
+        ########################## Geometry backend variables ##########################
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name)
 
         ################################ Interface ################################
@@ -79,30 +79,30 @@ class ControlLineWidthDiff1(LibraryBase):
         # It can convert user-friendly parameter sets into developer-friendly parameter sets.
 
         ################################ Drawing ##################################
-        control_L_out = gdspy.FlexPath(pos[:-1], width[0] + gap[0] * 2, corners="circular bend",
-                                       bend_radius=corner_radius).to_polygonset()
-        buffer_L_out = gdspy.Path(width[0] + gap[0] * 2, pos[-2])
+        control_L_out = backend.flexpath(pos[:-1], width[0] + gap[0] * 2, corners="circular bend",
+                                       bend_radius=corner_radius)
+        buffer_L_out = backend.path(width[0] + gap[0] * 2, pos[-2])
         buffer_L_out.segment(buffer_length, direction=np.arctan2(pos[-1][1] - pos[-2][1], pos[-1][0] - pos[-2][0]),
                              final_width=(width[1] + gap[1] * 2))
         buffer_L_out.segment(
             length=(math.sqrt((pos[-1][0] - pos[-2][0]) ** 2 + (pos[-1][1] - pos[-2][1]) ** 2) - buffer_length),
             direction=np.arctan2(pos[-1][1] - pos[-2][1], pos[-1][0] - pos[-2][0]))
 
-        control_L_out = gdspy.boolean(control_L_out, buffer_L_out, 'or')
+        control_L_out = backend.boolean(control_L_out, buffer_L_out, 'or')
 
-        control_L_in = gdspy.FlexPath(pos[:-1], width[0], corners="circular bend",
-                                      bend_radius=corner_radius).to_polygonset()
-        buffer_L_in = gdspy.Path(width[0], pos[-2])
+        control_L_in = backend.flexpath(pos[:-1], width[0], corners="circular bend",
+                                      bend_radius=corner_radius)
+        buffer_L_in = backend.path(width[0], pos[-2])
         buffer_L_in.segment(buffer_length, direction=np.arctan2(pos[-1][1] - pos[-2][1], pos[-1][0] - pos[-2][0]),
                             final_width=width[1])
         buffer_L_in.segment(length=(
                     math.sqrt((pos[-1][0] - pos[-2][0]) ** 2 + (pos[-1][1] - pos[-2][1]) ** 2) - buffer_length - gap[
                 1]), direction=np.arctan2(pos[-1][1] - pos[-2][1], pos[-1][0] - pos[-2][0]))
 
-        control_L_in = gdspy.boolean(control_L_in, buffer_L_in, 'or')
+        control_L_in = backend.boolean(control_L_in, buffer_L_in, 'or')
 
-        control_L = gdspy.boolean(control_L_out, control_L_in, 'not')
+        control_L = backend.boolean(control_L_out, control_L_in, 'not')
 
         # Add your code
-        self.cell.add(control_L)
+        backend.add(self.cell, control_L)
         return
\ No newline at end of file
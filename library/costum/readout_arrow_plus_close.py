@@ -3,7 +3,6 @@
 # Description: This file primarily contains the construction code for the ReadoutArrowPlusClose.
 ############################################################################################
 
-import gdspy
 import copy
 import math
 import numpy as np
@@ -11,6 +10,7 @@ from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
 from library.readout_lines.readout_cavity_plus import ReadoutCavityPlus
+from base import geometry_backend
 
 
 class ReadoutArrowPlusClose(LibraryBase):
@@ -74,8 +74,8 @@ class ReadoutArrowPlusClose(LibraryBase):
         Output:
             None.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         # Draw the initial shape of the cavity, starting at (0, 0), direction to the right
@@ -149,9 +149,9 @@ class ReadoutArrowPlusClose(LibraryBase):
 
         # Merge and translate
         start_pos = self.start_pos
-        pattern = gdspy.boolean(arrow_finger.cell, rd.cell, "or")
-        pattern.translate(start_pos[0], start_pos[1])
-        self.cell.add(pattern)
+        pattern = backend.boolean(arrow_finger.cell, rd.cell, "or")
+        backend.translate(pattern, start_pos[0], start_pos[1])
+        backend.add(self.cell, pattern)
 
         return
 
@@ -208,8 +208,8 @@ class ArrowFinger(LibraryBase):
         Output:
             None.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         # Interface
@@ -234,13 +234,13 @@ class ArrowFinger(LibraryBase):
         pos.append(now_p)
 
         # Draw finger
-        finger = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend",
-                                bend_radius=corner_radius).to_polygonset()
-        sub_finger = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
+        finger = backend.flexpath(pos, width + gap * 2, corners="circular bend",
+                                bend_radius=corner_radius)
+        sub_finger = backend.flexpath(pos, width, corners="circular bend", bend_radius=corner_radius)
 
         # Rotate finger
-        finger.rotate(math.radians(finger_orientation), (0, 0))
-        sub_finger.rotate(math.radians(finger_orientation), (0, 0))
+        backend.rotate(finger, math.radians(finger_orientation), (0, 0))
+        backend.rotate(sub_finger, math.radians(finger_orientation), (0, 0))
 
         # Arrow base position, starting at (0, 0), direction to the right
         angle1 = arrow_orientation + 135
@@ -265,19 +265,19 @@ class ArrowFinger(LibraryBase):
         arrow_pos1.append(now_p1)
 
         # Draw arrow
-        arrow = gdspy.FlexPath(arrow_pos, width + gap * 2, corners="natural").to_polygonset()
-        sub_arrow = gdspy.FlexPath(arrow_pos1, width, corners="natural").to_polygonset()
+        arrow = backend.flexpath(arrow_pos, width + gap * 2, corners="natural")
+        sub_arrow = backend.flexpath(arrow_pos1, width, corners="natural")
 
         # Get the total shape
-        arrow_finger = gdspy.boolean(finger, arrow, "or")
-        sub_arrow_finger = gdspy.boolean(sub_finger, sub_arrow, "or")
-        arrow_finger = gdspy.boolean(arrow_finger, sub_arrow_finger, "not")
+        arrow_finger = backend.boolean(finger, arrow, "or")
+        sub_arrow_finger = backend.boolean(sub_finger, sub_arrow, "or")
+        arrow_finger = backend.boolean(arrow_finger, sub_arrow_finger, "not")
 
         # Translate
-        arrow_finger.translate(start_pos[0], start_pos[1])
+        backend.translate(arrow_finger, start_pos[0], start_pos[1])
 
         # Add to cell
-        self.cell.add(arrow_finger)
+        backend.add(self.cell, arrow_finger)
 
         return
 
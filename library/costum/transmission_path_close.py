@@ -2,11 +2,11 @@
 # File Name: transmission_path_close.py
 # Description: This file primarily contains the code for constructing transmission lines.
 ############################################################################################
-import gdspy
 import math, copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 class TransmissionPathClose(LibraryBase):
     """
@@ -68,18 +68,18 @@ class TransmissionPathClose(LibraryBase):
         # Coordinates are filled in from small to large
         pos_inner = [(pos[0][0], pos[0][1] + gap), (pos[1][0], pos[1][1] - gap)]
 
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
 
-        transmission_L_inner = gdspy.FlexPath(pos_inner, width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        self.cell_subtract.add(transmission_L_inner)
+        transmission_L_inner = backend.flexpath(pos_inner, width, corners="circular bend", bend_radius=corner_radius)
+        backend.add(self.cell_subtract, transmission_L_inner)
 
         self.cell_extract = self.lib.new_cell(name + "_extract")
-        control_L_out = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        self.cell_extract.add(control_L_out)
+        control_L_out = backend.flexpath(pos, width + gap * 2, corners="circular bend", bend_radius=corner_radius)
+        backend.add(self.cell_extract, control_L_out)
 
-        pad = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        pad = backend.boolean(self.cell_extract, self.cell_subtract, "not")
         self.cell = self.lib.new_cell(name + "_cell")
-        self.cell.add(pad)
+        backend.add(self.cell, pad)
         return
\ No newline at end of file
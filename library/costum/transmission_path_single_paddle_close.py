@@ -3,11 +3,11 @@
 # Description: This file primarily contains the code for constructing transmission lines
 #              with a single paddle.
 ############################################################################################
-import gdspy
 import math, copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 class TransmissionPathSinglePaddleClose(LibraryBase):
     """
@@ -78,31 +78,31 @@ class TransmissionPathSinglePaddleClose(LibraryBase):
         else:
             pos_inner = [(pos[0][0], pos[0][1]), (pos[1][0] - gap, pos[1][1])]
 
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
 
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
-        transmission_L_inner = gdspy.FlexPath(pos_inner, width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        self.cell_subtract.add(transmission_L_inner)
+        transmission_L_inner = backend.flexpath(pos_inner, width, corners="circular bend", bend_radius=corner_radius)
+        backend.add(self.cell_subtract, transmission_L_inner)
 
         self.cell_extract = self.lib.new_cell(name + "_extract")
-        control_L_out = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        self.cell_extract.add(control_L_out)
+        control_L_out = backend.flexpath(pos, width + gap * 2, corners="circular bend", bend_radius=corner_radius)
+        backend.add(self.cell_extract, control_L_out)
 
         """
         Draws the geometric shape of the Paddle and adds it to the GDS cell.
         """
         # External rectangle
-        rect1 = gdspy.Rectangle((pos[0][0] - (pad_height / 2 + gap), pos[0][1] - (pad_width / 2 + gap)), (pos[0][0] + pad_height / 2 + gap, pos[0][1] + pad_width / 2 + gap))
-        self.cell_extract.add(rect1)
+        rect1 = backend.rectangle((pos[0][0] - (pad_height / 2 + gap), pos[0][1] - (pad_width / 2 + gap)), (pos[0][0] + pad_height / 2 + gap, pos[0][1] + pad_width / 2 + gap))
+        backend.add(self.cell_extract, rect1)
 
         # Internal rectangle
-        rect2 = gdspy.Rectangle((pos[0][0] - (pad_height / 2), pos[0][1] - (pad_width / 2)), (pos[0][0] + pad_height / 2, pos[0][1] + pad_width / 2))
-        self.cell_subtract.add(rect2)
+        rect2 = backend.rectangle((pos[0][0] - (pad_height / 2), pos[0][1] - (pad_width / 2)), (pos[0][0] + pad_height / 2, pos[0][1] + pad_width / 2))
+        backend.add(self.cell_subtract, rect2)
 
         # Perform boolean operations to construct the desired component
-        paddle = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        paddle = backend.boolean(self.cell_extract, self.cell_subtract, "not")
 
         self.cell = self.lib.new_cell(name + "_cell")
-        self.cell.add(paddle)
+        backend.add(self.cell, paddle)
         return
\ No newline at end of file
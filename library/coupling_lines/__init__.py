@@ -4,9 +4,9 @@
 #              Includes functionality for dynamically importing classes.
 #########################################################################
 
-from library.coupling_lines.air_bridge import AirBridge
-from library.coupling_lines.coupler_base import CouplerBase
-from library.coupling_lines.coupling_cavity import CouplingCavity
-from library.coupling_lines.coupling_line_straight import CouplingLineStraight
+from base import lazy_import
 
-module_name_list = ["air_bridge", "coupler_base", "coupling_cavity", "coupling_line_straight"]
\ No newline at end of file
+module_name_list = ["air_bridge", "coupler_base", "coupling_cavity", "coupling_line_straight"]
+
+# Classes are imported from their module on first access
+__getattr__ = lazy_import.class_getter(__name__, module_name_list)
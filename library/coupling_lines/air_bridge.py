@@ -8,7 +8,8 @@
 from addict import Dict
 from base.library_base import LibraryBase
 import toolbox
-import copy, gdspy
+from base import geometry_backend
+import copy
 import numpy as np
 
 class AirBridge(LibraryBase):
@@ -62,7 +63,7 @@ class AirBridge(LibraryBase):
         Output:
             None.
         """
-        self.__gds_library = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
-        self.__cell = self.__gds_library.new_cell(self.default_options.name + "_cell")
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
+        self.cell = self.lib.new_cell(self.name + "_cell")
         return
\ No newline at end of file
@@ -5,11 +5,11 @@
 #              and drawing GDSII files.
 #########################################################################
 
-import gdspy
 import math, copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 
 class CouplerBase(LibraryBase):
@@ -73,9 +73,9 @@ class CouplerBase(LibraryBase):
         Output:
             None.
         """
-        ################################ gdspy Variables #################################
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        ########################## Geometry backend variables ###########################
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         ################################ Interface #################################
@@ -108,37 +108,37 @@ class CouplerBase(LibraryBase):
         else:
             rotate = 0
 
-        upper_rec_out = gdspy.Rectangle((pos[0] - width / 2, pos[1] + upper_height + gap / 2),
-                                        (pos[0] + width / 2, pos[1] + gap / 2))
-        upper_rec_in = gdspy.Rectangle(
+        upper_rec_out = backend.rectangle((pos[0] - width / 2, pos[1] + upper_height + gap / 2),
+                                          (pos[0] + width / 2, pos[1] + gap / 2))
+        upper_rec_in = backend.rectangle(
             (pos[0] - width / 2 + metal_width, pos[1] + upper_height - metal_width + gap / 2),
             (pos[0] + width / 2 - metal_width, pos[1] + gap / 2))
-        upper_rec = gdspy.boolean(upper_rec_out, upper_rec_in, "not")
+        upper_rec = backend.boolean(upper_rec_out, upper_rec_in, "not")
 
-        lower_rec_out = gdspy.Rectangle((pos[0] - width / 2, pos[1] - gap / 2),
-                                        (pos[0] + width / 2, pos[1] - lower_height - gap / 2))
-        lower_rec_in = gdspy.Rectangle((pos[0] - width / 2 + metal_width, pos[1] - gap / 2), (
+        lower_rec_out = backend.rectangle((pos[0] - width / 2, pos[1] - gap / 2),
+                                          (pos[0] + width / 2, pos[1] - lower_height - gap / 2))
+        lower_rec_in = backend.rectangle((pos[0] - width / 2 + metal_width, pos[1] - gap / 2), (
         pos[0] + width / 2 - metal_width, pos[1] - lower_height + metal_width - gap / 2))
-        lower_rec = gdspy.boolean(lower_rec_out, lower_rec_in, "not")
+        lower_rec = backend.boolean(lower_rec_out, lower_rec_in, "not")
 
-        rec = gdspy.boolean(upper_rec, lower_rec, "or")
+        rec = backend.boolean(upper_rec, lower_rec, "or")
 
-        claw1 = gdspy.Rectangle((pos[0] - width / 2 - claw_width, pos[1] + gap / 2 + claw_height),
-                                (pos[0] - width / 2, pos[1] + gap / 2))
-        claw2 = gdspy.Rectangle((pos[0] - width / 2 - claw_width, pos[1] - claw_height - gap / 2),
-                                (pos[0] - width / 2, pos[1] - gap / 2))
-        claw_left = gdspy.boolean(claw1, claw2, "or")
+        claw1 = backend.rectangle((pos[0] - width / 2 - claw_width, pos[1] + gap / 2 + claw_height),
+                                  (pos[0] - width / 2, pos[1] + gap / 2))
+        claw2 = backend.rectangle((pos[0] - width / 2 - claw_width, pos[1] - claw_height - gap / 2),
+                                  (pos[0] - width / 2, pos[1] - gap / 2))
+        claw_left = backend.boolean(claw1, claw2, "or")
 
-        claw3 = gdspy.Rectangle((pos[0] + width / 2, pos[1] + gap / 2 + claw_height),
-                                (pos[0] + width / 2 + claw_width, pos[1] + gap / 2))
-        claw4 = gdspy.Rectangle((pos[0] + width / 2, pos[1] - claw_height - gap / 2),
-                                (pos[0] + width / 2 + claw_width, pos[1] - gap / 2))
-        claw_right = gdspy.boolean(claw3, claw4, "or")
-        claw = gdspy.boolean(claw_left, claw_right, "or")
+        claw3 = backend.rectangle((pos[0] + width / 2, pos[1] + gap / 2 + claw_height),
+                                  (pos[0] + width / 2 + claw_width, pos[1] + gap / 2))
+        claw4 = backend.rectangle((pos[0] + width / 2, pos[1] - claw_height - gap / 2),
+                                  (pos[0] + width / 2 + claw_width, pos[1] - gap / 2))
+        claw_right = backend.boolean(claw3, claw4, "or")
+        claw = backend.boolean(claw_left, claw_right, "or")
 
-        coupler = gdspy.boolean(rec, claw, "or")
-        coupler.rotate(rotate, center=pos)
+        coupler = backend.boolean(rec, claw, "or")
+        backend.rotate(coupler, rotate, center=pos)
 
-        self.cell.add(coupler)
+        backend.add(self.cell, coupler)
 
         return
\ No newline at end of file
@@ -6,8 +6,9 @@
 from addict import Dict
 from base.library_base import LibraryBase
 import toolbox
-import copy, gdspy, math
+import copy, math
 import numpy as np
+from base import geometry_backend
 
 
 class CouplingCavity(LibraryBase):
@@ -64,8 +65,8 @@ class CouplingCavity(LibraryBase):
         Output:
             None.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
 
         options = self.extract_options()
@@ -78,8 +79,8 @@ class CouplingCavity(LibraryBase):
         if options.length <= distance:
             raise ValueError(
                 "Parameter error: The length of the coupling line is less than or equal to the distance between qubits.")
-        # Create the gdspy Path with a width of width
-        readout_l = gdspy.Path(self.width, (self.start_pos[0], self.start_pos[1]), number_of_paths=1)
+        # Create the path with a width of width
+        readout_l = backend.path(self.width, (self.start_pos[0], self.start_pos[1]))
         readout_l.segment(options.start_straight, '+y')
 
         # Calculate the number of segments and their lengths
@@ -107,9 +108,9 @@ class CouplingCavity(LibraryBase):
         readout_l.segment(options.end_straight, '+y')
 
         # Rotate the entire shape based on the calculated angle
-        readout_l.rotate(angle, self.start_pos)
+        backend.rotate(readout_l, angle, self.start_pos)
 
-        self.cell_subtract.add(readout_l)
+        backend.add(self.cell_subtract, readout_l)
 
         self.cell_extract = self.lib.new_cell(self.name + "_extract")
 
@@ -121,8 +122,8 @@ class CouplingCavity(LibraryBase):
         if options.length <= distance:
             raise ValueError(
                 "Parameter error: The length of the coupling line is less than or equal to the distance between qubits.")
-        # Create the gdspy Path with a width of width
-        readout_l = gdspy.Path(self.width + self.gap * 2, (self.start_pos[0], self.start_pos[1]), number_of_paths=1)
+        # Create the path with a width of width
+        readout_l = backend.path(self.width + self.gap * 2, (self.start_pos[0], self.start_pos[1]))
         readout_l.segment(options.start_straight, '+y')
 
         # Calculate the number of segments and their lengths
@@ -150,13 +151,13 @@ class CouplingCavity(LibraryBase):
         readout_l.segment(options.end_straight, '+y')
 
         # Rotate the entire shape based on the calculated angle
-        readout_l.rotate(angle, self.start_pos)
+        backend.rotate(readout_l, angle, self.start_pos)
 
-        self.cell_extract.add(readout_l)
+        backend.add(self.cell_extract, readout_l)
 
         # Temporary use
-        sub_poly = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        sub_poly = backend.boolean(self.cell_extract, self.cell_subtract, "not")
         self.cell = self.lib.new_cell(self.name + "_cell")
-        self.cell.add(sub_poly)
+        backend.add(self.cell, sub_poly)
 
         return
\ No newline at end of file
@@ -5,15 +5,18 @@
 
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend
 import toolbox
-import copy, gdspy
+import copy
 import numpy as np
 import os, sys
 POJECT_ROOT =os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../")
 if POJECT_ROOT not in sys.path:
     sys.path.append(POJECT_ROOT)
-import gdsocc 
-from OCC.Core import BRepAlgoAPI 
+from base import lazy_import
+# OpenCASCADE is imported when the component is drawn
+gdsocc = lazy_import.lazy_module("gdsocc")
+BRepAlgoAPI = lazy_import.lazy_module("OCC.Core.BRepAlgoAPI")
 
 class CouplingLineStraight(LibraryBase):
     """
@@ -65,23 +68,23 @@ class CouplingLineStraight(LibraryBase):
         Output:
             None.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
 
-        path = gdspy.PolyPath([self.start_pos, self.end_pos], self.width)
+        path = backend.polypath([self.start_pos, self.end_pos], self.width)
 
-        self.cell_subtract.add(path)
+        backend.add(self.cell_subtract, path)
 
         self.cell_extract = self.lib.new_cell(self.name + "_extract")
 
-        path = gdspy.PolyPath([self.start_pos, self.end_pos], self.width + self.gap*2)
+        path = backend.polypath([self.start_pos, self.end_pos], self.width + self.gap*2)
 
-        self.cell_extract.add(path)
+        backend.add(self.cell_extract, path)
 
-        sub_poly = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        sub_poly = backend.boolean(self.cell_extract, self.cell_subtract, "not")
         self.cell = self.lib.new_cell(self.name + "_cell")
-        self.cell.add(sub_poly)
+        backend.add(self.cell, sub_poly)
         return
     
     def draw_shape(self):
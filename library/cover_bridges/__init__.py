@@ -3,7 +3,10 @@
 # Description: Dynamically loads the air_bridges module and maintains module information.
 #########################################################################
 
-from library.cover_bridges.cover_bridge import CoverBridge
+from base import lazy_import
 
 
-module_name_list = ["cover_bridge"]
\ No newline at end of file
+module_name_list = ["cover_bridge"]
+
+# Classes are imported from their module on first access
+__getattr__ = lazy_import.class_getter(__name__, module_name_list)
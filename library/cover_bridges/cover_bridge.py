@@ -1,8 +1,8 @@
-import gdspy
 import math, copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 # We still need to add a coverage bridge for straight line segments now, then improve the algorithm for adding coverage bridges
 # Let's do it next week. This week is too tiring
@@ -14,7 +14,7 @@ def draw_isosceles_trapezoid(vertices):
     :param vertices: The coordinates of the four vertices of a trapezoid, in the format [(x1, y1), (x2, y2), (x3, y3), (x4, y4)]
     """
     # Create a trapezoid
-    trapezoid = gdspy.Polygon(vertices, layer=1)
+    trapezoid = geometry_backend.active.polygon(vertices, layer=1)
     return trapezoid
 
 class CoverBridge(LibraryBase):
@@ -50,8 +50,8 @@ class CoverBridge(LibraryBase):
         if options is None:
             options = self.default_options  # If no options are provided, then use default options
         
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
         return
     
@@ -111,7 +111,7 @@ class CoverBridge(LibraryBase):
         return tuple(new_point)
 
     def add_bg(self, path):
-        self.cell.add(path)
+        geometry_backend.active.add(self.cell, path)
 
     def create_clockwise_perpendicular_line(self, point1, point2, flag):
         """
@@ -153,10 +153,11 @@ class CoverBridge(LibraryBase):
         triangle_points = [point1, point2, point3]
 
         # Create a triangle polygon
-        triangle = gdspy.Polygon(triangle_points, layer=2, datatype=0)
+        backend = geometry_backend.active
+        triangle = backend.polygon(triangle_points, layer=2, datatype=0)
 
         # Add the polygon to the cell
-        self.cell.add(triangle)
+        backend.add(self.cell, triangle)
 
     def draw_gds(self):
         # Calculate the points of straight lines and arcs
@@ -180,14 +181,14 @@ class CoverBridge(LibraryBase):
         self.angle = self.options.angle
 
         #draw main part
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         corner_radius = self.corner_radius
 
         self.cell = self.lib.new_cell(self.name)
 
-        control_L_out = gdspy.FlexPath(self.path, self.width*2 + self.gap * 2, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        self.cell.add(control_L_out)
+        control_L_out = backend.flexpath(self.path, self.width*2 + self.gap * 2, corners="circular bend", bend_radius=corner_radius)
+        backend.add(self.cell, control_L_out)
 
 
         # Calculate the coordinates of the extension point
@@ -272,20 +273,20 @@ class CoverBridge(LibraryBase):
 
             # Camber line
             if self.direction == 1:
-                path2.turn(self.bg_inner_r, self.corner_radius, layer=2)
+                path2.turn(self.bg_inner_r, self.corner_radius, tolerance=geometry_backend.arc_tolerance, layer=2)
 
                 # Outer arc
-                path.turn(self.width/2 + self.bg_inner_r + self.bg_width/2, self.corner_radius, layer=2)
+                path.turn(self.width/2 + self.bg_inner_r + self.bg_width/2, self.corner_radius, tolerance=geometry_backend.arc_tolerance, layer=2)
                 # Inner arc
-                path1.turn(-self.width/2 + self.bg_inner_r - self.bg_width/2, self.corner_radius, layer=2)
+                path1.turn(-self.width/2 + self.bg_inner_r - self.bg_width/2, self.corner_radius, tolerance=geometry_backend.arc_tolerance, layer=2)
 
             elif self.direction == 0:
-                path2.turn(self.bg_inner_r, -self.corner_radius, layer=2)
+                path2.turn(self.bg_inner_r, -self.corner_radius, tolerance=geometry_backend.arc_tolerance, layer=2)
 
                 # Outer arc
-                path.turn(self.width/2 + self.bg_inner_r + self.bg_width/2, -self.corner_radius, layer=2)
+                path.turn(self.width/2 + self.bg_inner_r + self.bg_width/2, -self.corner_radius, tolerance=geometry_backend.arc_tolerance, layer=2)
                 # Inner arc
-                path1.turn(-self.width/2 + self.bg_inner_r - self.bg_width/2, -self.corner_radius, layer=2)
+                path1.turn(-self.width/2 + self.bg_inner_r - self.bg_width/2, -self.corner_radius, tolerance=geometry_backend.arc_tolerance, layer=2)
 
         
         self.cell.add(path)
@@ -3,6 +3,9 @@
 # Description: This file is used to maintain module information and dynamically import classes.
 ############################################################################################
 
-from library.cross_overs.insulating_sheet import InsulatingSheet
+from base import lazy_import
 
-module_name_list = ["insulating_sheet"]
\ No newline at end of file
+module_name_list = ["insulating_sheet"]
+
+# Classes are imported from their module on first access
+__getattr__ = lazy_import.class_getter(__name__, module_name_list)
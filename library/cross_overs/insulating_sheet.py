@@ -3,11 +3,11 @@
 # Description: This file defines the InsulatingSheet class for generating the geometric shape
 #              of an insulating sheet.
 ############################################################################################
-import gdspy
 import math
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 
 class InsulatingSheet(LibraryBase):
@@ -47,16 +47,16 @@ class InsulatingSheet(LibraryBase):
         Returns:
             None: This method directly adds the polygon to the GDS cell.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name)
         x = self.pos[0]
         y = self.pos[1]
 
-        sheet = gdspy.Rectangle((-self.width / 2 + x, self.height / 2 + y),
-                                (self.width / 2 + x, -self.height / 2 + y))
-        sheet.rotate(math.radians(self.options.orientation), self.options.pos)
+        sheet = backend.rectangle((-self.width / 2 + x, self.height / 2 + y),
+                                  (self.width / 2 + x, -self.height / 2 + y))
+        backend.rotate(sheet, math.radians(self.options.orientation), self.options.pos)
 
-        self.cell.add(sheet)
+        backend.add(self.cell, sheet)
 
         return
\ No newline at end of file
@@ -3,6 +3,9 @@
 # Description: This file is used to maintain module information and dynamically import classes.
 ############################################################################################
 
-from library.indium_bumps.indium_bump import IndiumBump
+from base import lazy_import
 
-module_name_list = ["indium_bump"]
\ No newline at end of file
+module_name_list = ["indium_bump"]
+
+# Classes are imported from their module on first access
+__getattr__ = lazy_import.class_getter(__name__, module_name_list)
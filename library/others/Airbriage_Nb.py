@@ -4,12 +4,14 @@
 #              air bridges, generating GDS-format geometric shapes.
 ############################################################################################
 
-import gdspy, copy
+import copy
 from addict import Dict
 import math as mt
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 class AirbriageNb(LibraryBase):
+    calculated_options = ("outline",)  # Set by calc_general_ops
     default_options = Dict(
         name="AirbriageNb0",
         type="AirbriageNb",
@@ -41,36 +43,27 @@ class AirbriageNb(LibraryBase):
             ([[-26.0, -65.0], [26.0, -65.0], [26.0, -14.0], [-26.0, -14.0]], 4),
         ]
 
+        backend = geometry_backend.active
         for points in polygon_data:
             layer = points[-1]
             polygon_points = points[0]
-            self.cell.add(gdspy.Polygon(polygon_points, layer=layer))
+            backend.add(self.cell, backend.polygon(polygon_points, layer=layer))
 
     def _calculate_bounding_box(self):
-        min_x, min_y = float("inf"), float("inf")
-        max_x, max_y = float("-inf"), float("-inf")
-
-        for polygon in self.cell.polygons:
-            bbox = polygon.get_bounding_box()
-            if bbox is not None:
-                min_x = min(min_x, bbox[0][0])
-                min_y = min(min_y, bbox[0][1])
-                max_x = max(max_x, bbox[1][0])
-                max_y = max(max_y, bbox[1][1])
-
-        if min_x == float("inf") or min_y == float("inf"):
+        bbox = geometry_backend.active.shapes_bounding_box(self.cell.polygons)
+        if bbox is None:
             raise ValueError("No valid polygon found.")
 
-        return min_x, min_y, max_x, max_y
+        return bbox[0][0], bbox[0][1], bbox[1][0], bbox[1][1]
 
     def _transform_polygons(self, dx, dy, rotation, center):
-        for polygon in self.cell.polygons:
-            polygon.translate(dx, dy)
-            polygon.rotate(rotation, center=center)
+        backend = geometry_backend.active
+        backend.translate(self.cell.polygons, dx, dy)
+        backend.rotate(self.cell.polygons, rotation, center=center)
 
     def calc_general_ops(self):
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         self._add_polygons_to_cell()
@@ -91,7 +84,7 @@ class AirbriageNb(LibraryBase):
         # Apply transformation
         self._transform_polygons(dx, dy, self.rotation, center=(target_center_x, target_center_y))
         self.outline = [
-            points for polygon in self.cell.polygons for points in polygon.get_bounding_box().tolist()
+            points for polygon in self.cell.polygons for points in backend.shapes_bounding_box(polygon).tolist()
         ]
         return
 
@@ -4,14 +4,7 @@
 #              quantum simulation library and supports dynamically importing classes from these modules.
 #########################################################################
 
-from library.others.air_bridge import AirBridge
-from library.others.Airbriage_Nb import AirbriageNb
-from library.others.arrow import Arrow
-from library.others.finger import Finger
-from library.others.indium_bump import IndiumBump
-from library.others.zline_flipchip import ZlineFlipchip
-from library.others.zline import Zline
-from library.others.cover_bridge import CoverBridge
+from base import lazy_import
 
 module_name_list = ["air_bridge",
                     "Airbriage_Nb",
@@ -20,4 +13,7 @@ module_name_list = ["air_bridge",
                     "indium_bump",
                     "zline_flipchip",
                     "zline",
-                    "cover_bridge"]
\ No newline at end of file
+                    "cover_bridge"]
+
+# Classes are imported from their module on first access
+__getattr__ = lazy_import.class_getter(__name__, module_name_list)
@@ -4,10 +4,11 @@
 #              structures, generating GDS-format geometric shapes for air bridges.
 ############################################################################################
 
-import gdspy, copy
+import copy
 from addict import Dict
 import math as mt
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 
 class AirBridge(LibraryBase):
@@ -41,11 +42,11 @@ class AirBridge(LibraryBase):
         height = self.height
 
         # Drawing
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
-        air = gdspy.Rectangle((center_pos[0] - width / 2, center_pos[1] - height / 2),
-                              (center_pos[0] + width / 2, center_pos[1] + height / 2), layer=1)
-        air.rotate(rotation, center_pos)
-        self.cell.add(air)
\ No newline at end of file
+        air = backend.rectangle((center_pos[0] - width / 2, center_pos[1] - height / 2),
+                                (center_pos[0] + width / 2, center_pos[1] + height / 2), layer=1)
+        backend.rotate(air, rotation, center_pos)
+        backend.add(self.cell, air)
\ No newline at end of file
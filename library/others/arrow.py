@@ -4,10 +4,11 @@
 #              generating GDS-format geometric shapes.
 ############################################################################################
 
-import gdspy, copy
+import copy
 from addict import Dict
 import math as mt
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 
 class Arrow(LibraryBase):
@@ -44,26 +45,26 @@ class Arrow(LibraryBase):
         orientation = self.orientation
 
         # Drawing
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         outer_left_rec_right = [start_pos[0] + gap + width * 2, start_pos[1] + height + width * 2]
         inner_left_rec_right = [start_pos[0] + gap + width, start_pos[1] + height + width]
         inner_left_rec_left = [start_pos[0] + width, start_pos[1] + width]
 
-        left_outer_rec = gdspy.Rectangle(start_pos, outer_left_rec_right)
-        left_inner_rec = gdspy.Rectangle(inner_left_rec_left, inner_left_rec_right)
+        left_outer_rec = backend.rectangle(start_pos, outer_left_rec_right)
+        left_inner_rec = backend.rectangle(inner_left_rec_left, inner_left_rec_right)
 
         outer_bottom_rec_right = [start_pos[0] + height + width * 2, start_pos[1] + gap + width * 2]
         inner_bottom_rec_left = [start_pos[0] + width, start_pos[1] + width]
         inner_bottom_rec_right = [start_pos[0] + height + width, start_pos[1] + gap + width]
 
-        bottom_outer_rec = gdspy.Rectangle(start_pos, outer_bottom_rec_right)
-        bottom_inner_rec = gdspy.Rectangle(inner_bottom_rec_left, inner_bottom_rec_right)
+        bottom_outer_rec = backend.rectangle(start_pos, outer_bottom_rec_right)
+        bottom_inner_rec = backend.rectangle(inner_bottom_rec_left, inner_bottom_rec_right)
 
-        inner_rec = gdspy.boolean(left_inner_rec, bottom_inner_rec, 'or')
-        outer_rec = gdspy.boolean(left_outer_rec, bottom_outer_rec, 'or')
+        inner_rec = backend.boolean(left_inner_rec, bottom_inner_rec, 'or')
+        outer_rec = backend.boolean(left_outer_rec, bottom_outer_rec, 'or')
 
         inner_points = [
             (start_pos[0] + gap + width - inclined_gap * mt.cos(mt.pi / 180 * 45) / 2,
@@ -76,7 +77,7 @@ class Arrow(LibraryBase):
              start_pos[1] + gap + width - inclined_gap * mt.sin(mt.pi / 180 * 45) / 2)
         ]
 
-        inner_inclined_rec = gdspy.Polygon(inner_points)
+        inner_inclined_rec = backend.polygon(inner_points)
 
         outer_points = [
             (start_pos[0] + gap + width * 2 - (inclined_gap + width * 2) * mt.cos(mt.pi / 180 * 45) / 2,
@@ -93,23 +94,23 @@ class Arrow(LibraryBase):
              start_pos[1] + gap + width * 2 - (inclined_gap + width * 2) * mt.sin(mt.pi / 180 * 45) / 2)
         ]
 
-        outer_inclined_rec = gdspy.Polygon(outer_points)
+        outer_inclined_rec = backend.polygon(outer_points)
 
-        inner_rec = gdspy.boolean(inner_rec, inner_inclined_rec, 'or')
-        outer_rec = gdspy.boolean(outer_rec, outer_inclined_rec, 'or')
-        rec = gdspy.boolean(outer_rec, inner_rec, 'not')
+        inner_rec = backend.boolean(inner_rec, inner_inclined_rec, 'or')
+        outer_rec = backend.boolean(outer_rec, outer_inclined_rec, 'or')
+        rec = backend.boolean(outer_rec, inner_rec, 'not')
 
-        path = gdspy.Path(width, (start_pos[0] + gap + width + l1 * mt.cos(mt.pi / 180 * 45),
-                                  start_pos[1] + gap + width + l1 * mt.sin(mt.pi / 180 * 45)), 2, gap + width)
+        path = backend.path(width, (start_pos[0] + gap + width + l1 * mt.cos(mt.pi / 180 * 45),
+                                    start_pos[1] + gap + width + l1 * mt.sin(mt.pi / 180 * 45)), 2, gap + width)
         path.segment(0, mt.pi / 180 * (45))
         path.turn(50, mt.pi / 180 * 45)
 
-        rec = gdspy.boolean(rec, path, 'or')
+        rec = backend.boolean(rec, path, 'or')
 
         self.end_pos = (
             start_pos[0] + gap + width + l1 * mt.cos(mt.pi / 180 * 45) + 50 - 50 * mt.cos(45 / 180 * mt.pi),
             start_pos[1] + gap + width + l1 * mt.sin(mt.pi / 180 * 45) + 50 * mt.sin(45 / 180 * mt.pi)
         )
 
-        rec.rotate(orientation, start_pos)
-        self.cell.add(rec)
\ No newline at end of file
+        backend.rotate(rec, orientation, start_pos)
+        backend.add(self.cell, rec)
\ No newline at end of file
@@ -1,8 +1,8 @@
-import gdspy
 import math, copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 # We still need to add a coverage bridge for straight line segments now, then improve the algorithm for adding coverage bridges
 # Let's do it next week. This week is too tiring
@@ -14,7 +14,7 @@ def draw_isosceles_trapezoid(vertices):
     :param vertices: The coordinates of the four vertices of a trapezoid, in the format [(x1, y1), (x2, y2), (x3, y3), (x4, y4)]
     """
     # Create a trapezoid
-    trapezoid = gdspy.Polygon(vertices, layer=1)
+    trapezoid = geometry_backend.active.polygon(vertices, layer=1)
     return trapezoid
 
 class CoverBridge(LibraryBase):
@@ -42,8 +42,8 @@ class CoverBridge(LibraryBase):
         if options is None:
             options = self.default_options  # If no options are provided, then use default options
         
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
         return
     
@@ -103,7 +103,7 @@ class CoverBridge(LibraryBase):
         return tuple(new_point)
 
     def add_bg(self, path):
-        self.cell.add(path)
+        geometry_backend.active.add(self.cell, path)
 
     def create_clockwise_perpendicular_line(self, point1, point2, flag):
         """
@@ -145,10 +145,11 @@ class CoverBridge(LibraryBase):
         triangle_points = [point1, point2, point3]
 
         # Create a triangle polygon
-        triangle = gdspy.Polygon(triangle_points, layer=2, datatype=0)
+        backend = geometry_backend.active
+        triangle = backend.polygon(triangle_points, layer=2, datatype=0)
 
         # Add the polygon to the cell
-        self.cell.add(triangle)
+        backend.add(self.cell, triangle)
 
     def draw_gds(self):
         # Calculate the points of straight lines and arcs
@@ -164,6 +165,10 @@ class CoverBridge(LibraryBase):
         self.angle = self.options.angle
         self.direction = self.options.direction
 
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
+        self.cell = self.lib.new_cell(self.name + "_cell")
+
         # Calculate the coordinates of the extension point
         line1_extern_p = self.get_extern_point(self.line1_out, self.line1_in)
         print(line1_extern_p)
@@ -176,10 +181,10 @@ class CoverBridge(LibraryBase):
         print(self.line1_out)
         
         # Create a key line segment, prepare for drawing arcs
-        path = gdspy.Path(self.width, line1_extern_p)
-        path1 = gdspy.Path(self.width, line1_inner_p)
+        path = backend.path(self.width, line1_extern_p)
+        path1 = backend.path(self.width, line1_inner_p)
 
-        path2 = gdspy.Path(self.bg_width, middle_p)
+        path2 = backend.path(self.bg_width, middle_p)
 
         angle = self.calculate_angle(self.line1_out, self.line1_in)
        
@@ -219,9 +224,9 @@ class CoverBridge(LibraryBase):
                 # Inner arc
                 path1.turn(-self.width/2 + self.bg_inner_r - self.bg_width/2, -self.corner_radius, layer=2)
 
-        self.cell.add(path)
-        self.cell.add(path1)
-        self.cell.add(path2)
+        backend.add(self.cell, path)
+        backend.add(self.cell, path1)
+        backend.add(self.cell, path2)
 
         # Triangle part
 
@@ -3,13 +3,13 @@
 # Description: This file primarily contains the code for constructing readout cavities.
 ############################################################################################
 
-import gdspy
 import copy
 import math
 import numpy as np
 from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 
 class Finger(LibraryBase):
@@ -47,8 +47,8 @@ class Finger(LibraryBase):
         """
         Draws the geometric shape of the ReadoutLine and adds it to the GDS cell.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         # Interface
@@ -71,17 +71,17 @@ class Finger(LibraryBase):
         pos.append(now_p)
 
         # Drawing
-        finger = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend",
-                                bend_radius=corner_radius).to_polygonset()
-        sub_finger = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        finger = gdspy.boolean(finger, sub_finger, "not")
+        finger = backend.flexpath(pos, width + gap * 2, corners="circular bend",
+                                bend_radius=corner_radius)
+        sub_finger = backend.flexpath(pos, width, corners="circular bend", bend_radius=corner_radius)
+        finger = backend.boolean(finger, sub_finger, "not")
 
         # Translate and rotate
-        finger.rotate(math.radians(orientation), (0, 0))
-        finger.translate(start_pos[0], start_pos[1])
+        backend.rotate(finger, math.radians(orientation), (0, 0))
+        backend.translate(finger, start_pos[0], start_pos[1])
 
         # Add to cell
-        self.cell.add(finger)
+        backend.add(self.cell, finger)
 
         return
 
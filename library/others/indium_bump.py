@@ -3,10 +3,11 @@
 # Description: This file primarily contains the code for constructing indium bumps.
 ############################################################################################
 
-import gdspy, copy
+import copy
 from addict import Dict
 import math as mt
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 
 class IndiumBump(LibraryBase):
@@ -48,8 +49,8 @@ class IndiumBump(LibraryBase):
         radius = self.radius
 
         # Drawing
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
-        self.cell.add(gdspy.Round(center=center_pos, radius=radius))
\ No newline at end of file
+        backend.add(self.cell, backend.round(center=center_pos, radius=radius))
\ No newline at end of file
@@ -3,10 +3,11 @@
 # Description: This file primarily contains the code for constructing Z-lines.
 ############################################################################################
 
-import gdspy, copy
+import copy
 from addict import Dict
 import math
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 
 class Zline(LibraryBase):
@@ -46,8 +47,8 @@ class Zline(LibraryBase):
         Draws the geometric shape of the Z-line and adds it to the GDS cell.
         """
         # Drawing
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         pos = self.pos
@@ -62,31 +63,31 @@ class Zline(LibraryBase):
         length4 = length + width + gap
 
         # Create rectangles
-        rect1 = gdspy.Rectangle(
+        rect1 = backend.rectangle(
             [-(length2 - gap / 2) + pos[0], length4 + pos[1]],
             [gap / 2 + width + length3 + pos[0], length4 + width + pos[1]]
         )
 
-        rect2 = gdspy.Rectangle(
+        rect2 = backend.rectangle(
             [gap / 2 + width + pos[0], length4 + width + pos[1]],
             [gap / 2 + pos[0], pos[1]]
         )
 
-        rect_large = gdspy.boolean(rect1, rect2, 'or')
+        rect_large = backend.boolean(rect1, rect2, 'or')
 
-        rect3 = gdspy.Rectangle(
+        rect3 = backend.rectangle(
             [-(gap / 2 + length1) + pos[0], length + pos[1]],
             [-gap / 2 + pos[0], length + width + pos[1]]
         )
 
-        rect4 = gdspy.Rectangle(
+        rect4 = backend.rectangle(
             [-(gap / 2 + width) + pos[0], pos[1]],
             [-gap / 2 + pos[0], length + width + pos[1]]
         )
 
-        rect_little = gdspy.boolean(rect3, rect4, 'or')
-        rect = gdspy.boolean(rect_large, rect_little, 'or')
+        rect_little = backend.boolean(rect3, rect4, 'or')
+        rect = backend.boolean(rect_large, rect_little, 'or')
 
-        rect.rotate(math.pi * orientation / 180, pos)
+        backend.rotate(rect, math.pi * orientation / 180, pos)
 
-        self.cell.add(rect)
\ No newline at end of file
+        backend.add(self.cell, rect)
\ No newline at end of file
@@ -3,10 +3,11 @@
 # Description: This file primarily contains the code for constructing Z-line flip-chip structures.
 ############################################################################################
 
-import gdspy, copy
+import copy
 from addict import Dict
 import math
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 
 class ZlineFlipchip(LibraryBase):
@@ -51,8 +52,8 @@ class ZlineFlipchip(LibraryBase):
         Draws the geometric shape of the Z-line flip-chip and adds it to the GDS cell.
         """
         # Drawing
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         pad_pos = self.pad_pos
@@ -87,7 +88,7 @@ class ZlineFlipchip(LibraryBase):
         modify_points_inner = [(x * 2.5, y * 2.5) for x, y in points_inner]
         modify_points_inner = [(x + pad_pos[0], y + pad_pos[1]) for x, y in modify_points_inner]
 
-        poly_inner = gdspy.Polygon(modify_points_inner)
+        poly_inner = backend.polygon(modify_points_inner)
 
         points_outer = [(16.336, -78.761), (17.377, -78.644), (18.405, -78.449), (19.417, -78.178), (20.405, -77.832),
                         (21.364, -77.414), (22.290, -76.924), (23.176, -76.367), (24.019, -75.746), (24.812, -75.063),
@@ -136,10 +137,10 @@ class ZlineFlipchip(LibraryBase):
         modify_points_outer = [(x * 2.5, y * 2.5) for x, y in points_outer]
         modify_points_outer = [(x + pad_pos[0], y + pad_pos[1]) for x, y in modify_points_outer]
 
-        poly_outer = gdspy.Polygon(modify_points_outer)
+        poly_outer = backend.polygon(modify_points_outer)
 
-        poly = gdspy.boolean(poly_inner, poly_outer, 'or')
+        poly = backend.boolean(poly_inner, poly_outer, 'or')
 
-        poly.rotate(math.pi * orientation / 180, pad_pos)
+        backend.rotate(poly, math.pi * orientation / 180, pad_pos)
 
-        self.cell.add(poly)
\ No newline at end of file
+        backend.add(self.cell, poly)
\ No newline at end of file
@@ -4,6 +4,9 @@
 #              supporting dynamic loading and calling of modules.
 #########################################################################
 
-from library.pins.launch_pad import LaunchPad
+from base import lazy_import
 
-module_name_list = ["launch_pad"]
\ No newline at end of file
+module_name_list = ["launch_pad"]
+
+# Classes are imported from their module on first access
+__getattr__ = lazy_import.class_getter(__name__, module_name_list)
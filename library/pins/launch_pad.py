@@ -4,13 +4,17 @@
 #              supporting the generation of pin geometric shapes in GDS format.
 ############################################################################################
 
-import gdspy
 import math
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 class LaunchPad(LibraryBase):
+    geometry_cache_ignore = ("name", "pos", "chip", "outline")  # Drawn around pos, rotated by orientation
+    geometry_cache_position = "pos"
+    geometry_cache_attributes = ("cell_subtract", "cell_extract")
+
     default_options = Dict(
         # Framework
         name = "pin0",
@@ -66,8 +70,8 @@ class LaunchPad(LibraryBase):
         distance_to_qubits = self.distance_to_qubits
 
         # Drawing
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell_subtract = self.lib.new_cell(name + "_subtract")
 
         points = [(pos[0] - trace_width/2, pos[1]), 
@@ -78,9 +82,9 @@ class LaunchPad(LibraryBase):
                     (pos[0] - pad_width/2, pos[1] + taper_height)
                 ]
 
-        polygon = gdspy.Polygon(points)
+        polygon = backend.polygon(points)
         polygon.rotate(math.radians(orientation), pos)
-        self.cell_subtract.add(polygon)
+        backend.add(self.cell_subtract, polygon)
 
         self.cell_extract = self.lib.new_cell(name + "_extract")
         points = [(pos[0] + trace_width/2 + trace_gap, pos[1]),
@@ -91,11 +95,11 @@ class LaunchPad(LibraryBase):
                     (pos[0] - trace_width/2 - trace_gap, pos[1])
                 ]
         
-        path = gdspy.Polygon(points,0.1)
+        path = backend.polygon(points)
         path.rotate(math.radians(orientation), pos)
-        self.cell_extract.add(path)
+        backend.add(self.cell_extract, path)
 
-        sub_ploy = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        sub_ploy = backend.boolean(self.cell_extract, self.cell_subtract, "not")
         self.cell = self.lib.new_cell(name + "_cell")
-        self.cell.add(sub_ploy)
+        backend.add(self.cell, sub_ploy)
         return
\ No newline at end of file
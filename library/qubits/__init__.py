@@ -5,15 +5,7 @@
 #              and maintaining module information.
 #########################################################################
 
-from library.qubits.circlemon import Circlemon
-from library.qubits.custom_qubit import CustomQubit
-from library.qubits.transmon_interdigitated import TransmonInterdigitated
-from library.qubits.transmon_rotate import TransmonRotate
-from library.qubits.transmon_teeth import TransmonTeeth
-from library.qubits.transmon import Transmon
-from library.qubits.xmon import Xmon
-from library.qubits.xmon_rotate import XmonRotate
-from library.qubits.transmon_benzheng import TransmonBenzheng
+from base import lazy_import
 
 module_name_list = ["circlemon", 
                     "custom_qubit",  
@@ -23,4 +15,7 @@ module_name_list = ["circlemon",
                     "transmon", 
                     "xmon",
                     "xmon_rotate",
-                    "transmon_benzheng"]
\ No newline at end of file
+                    "transmon_benzheng"]
+
+# Classes are imported from their module on first access
+__getattr__ = lazy_import.class_getter(__name__, module_name_list)
@@ -6,13 +6,16 @@
 
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend, geometry_cache
 import toolbox
 import copy
-import gdspy
 import math
 import numpy as np
 
 class Circlemon(LibraryBase):
+    geometry_cache_ignore = geometry_cache.TRANSLATION_OPTIONS  # Drawn around gds_pos
+    calculated_options = ("readout_pins", "control_pins", "coupling_pins", "outline")  # Set by calc_general_ops
+
     default_options = Dict(
         # Component framework
         name = "q0",  # Component name
@@ -126,41 +129,40 @@ class Circlemon(LibraryBase):
         right_readout_line = (gds_pos[0] + circle6_rad, gds_pos[1] + readout_width / 2)
 
         # Drawing
-        gdspy.library.use_current_library = False
-        self.lib = gdspy.GdsLibrary()
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name)
 
         # Create circles and arcs
-        circle1 = gdspy.Round((gds_pos[0], gds_pos[1]), circle1_rad, tolerance=0.01)
-        circle2 = gdspy.Round((gds_pos[0], gds_pos[1]), circle2_rad, tolerance=0.01)
-        circle3 = gdspy.Round((gds_pos[0], gds_pos[1]), circle3_rad, tolerance=0.01)
-        circle6 = gdspy.Round((gds_pos[0], gds_pos[1]), circle6_rad, tolerance=0.01)
-        circle_arc = gdspy.Round((gds_pos[0], gds_pos[1]), circle5_rad,
-                                 inner_radius=circle4_rad,
-                                 initial_angle=np.pi / 180 * initial_angle,
-                                 final_angle=np.pi / 180 * final_angle,
-                                 tolerance=0.01)
+        circle1 = backend.round((gds_pos[0], gds_pos[1]), circle1_rad)
+        circle2 = backend.round((gds_pos[0], gds_pos[1]), circle2_rad)
+        circle3 = backend.round((gds_pos[0], gds_pos[1]), circle3_rad)
+        circle6 = backend.round((gds_pos[0], gds_pos[1]), circle6_rad)
+        circle_arc = backend.round((gds_pos[0], gds_pos[1]), circle5_rad,
+                                   inner_radius=circle4_rad,
+                                   initial_angle=np.pi / 180 * initial_angle,
+                                   final_angle=np.pi / 180 * final_angle)
 
         # Create readout line and finger structures
-        readout_line = gdspy.Rectangle(left_readout_line, right_readout_line)
-        circle_arc = gdspy.boolean(circle_arc, readout_line, 'or').rotate(np.pi / 180 * pad_orientation, center=(gds_pos[0], gds_pos[1]))
+        readout_line = backend.rectangle(left_readout_line, right_readout_line)
+        circle_arc = backend.rotate(backend.boolean(circle_arc, readout_line, 'or'), np.pi / 180 * pad_orientation, center=(gds_pos[0], gds_pos[1]))
         
-        inner_finger = gdspy.Rectangle(left_inner_finger, right_inner_finger)
-        inner_finger_pad = gdspy.Rectangle(left_inner_finger_pad, right_inner_finger_pad)
-        inner_finger = gdspy.boolean(inner_finger, inner_finger_pad, 'or').rotate(np.pi / 180 * finger_orientation, center=(gds_pos[0], gds_pos[1]))
+        inner_finger = backend.rectangle(left_inner_finger, right_inner_finger)
+        inner_finger_pad = backend.rectangle(left_inner_finger_pad, right_inner_finger_pad)
+        inner_finger = backend.rotate(backend.boolean(inner_finger, inner_finger_pad, 'or'), np.pi / 180 * finger_orientation, center=(gds_pos[0], gds_pos[1]))
         
-        outer_finger = gdspy.Rectangle(left_outer_finger, right_outer_finger)
-        outer_finger_pad = gdspy.Rectangle(left_outer_finger_pad, right_outer_finger_pad)
-        outer_finger = gdspy.boolean(outer_finger, outer_finger_pad, 'or').rotate(np.pi / 180 * finger_orientation, center=(gds_pos[0], gds_pos[1]))
+        outer_finger = backend.rectangle(left_outer_finger, right_outer_finger)
+        outer_finger_pad = backend.rectangle(left_outer_finger_pad, right_outer_finger_pad)
+        outer_finger = backend.rotate(backend.boolean(outer_finger, outer_finger_pad, 'or'), np.pi / 180 * finger_orientation, center=(gds_pos[0], gds_pos[1]))
 
         # Generate final shape
-        circle_in = gdspy.boolean(circle2, circle1, 'not')
-        circle_out = gdspy.boolean(circle6, circle3, 'not')
-        circle_out = gdspy.boolean(circle_out, circle_arc, 'not')
-        circle = gdspy.boolean(circle_in, circle_out, 'or')
-        circle = gdspy.boolean(circle, outer_finger, 'or')
-        circle = gdspy.boolean(circle, inner_finger, 'not')
+        circle_in = backend.boolean(circle2, circle1, 'not')
+        circle_out = backend.boolean(circle6, circle3, 'not')
+        circle_out = backend.boolean(circle_out, circle_arc, 'not')
+        circle = backend.boolean(circle_in, circle_out, 'or')
+        circle = backend.boolean(circle, outer_finger, 'or')
+        circle = backend.boolean(circle, inner_finger, 'not')
         
-        self.cell.add(circle)  # Add shape to the cell
+        backend.add(self.cell, circle)  # Add shape to the cell
 
         return
\ No newline at end of file
@@ -8,7 +8,7 @@ from addict import Dict
 from base.library_base import LibraryBase
 import copy
 import toolbox
-import gdspy
+from base import geometry_backend
 
 class CustomQubit(LibraryBase):
     default_options = Dict(
@@ -46,8 +46,8 @@ class CustomQubit(LibraryBase):
         """
         Draw the geometric shape of the custom qubit and add it to the GDS cell.
         """
-        gdspy.library.use_current_library = False
-        self.lib = gdspy.GdsLibrary()  # Create GDS library
+        backend = geometry_backend.active
+        self.lib = backend.new_library()  # Create GDS library
         self.cell = self.lib.new_cell(self.name)  # Create new cell
 
         # Interfaces
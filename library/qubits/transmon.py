@@ -5,16 +5,24 @@
 #########################################################################
 from addict import Dict
 from base.library_base import LibraryBase
-import gdspy, numpy as np
+from base import geometry_backend
+from base import geometry_cache
+import numpy as np
 import os, sys
 POJECT_ROOT =os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../")
 if POJECT_ROOT not in sys.path:
     sys.path.append(POJECT_ROOT)
-import gdsocc 
-from OCC.Core import BRepAlgoAPI 
+from base import lazy_import
+# OpenCASCADE is imported when the component is drawn
+gdsocc = lazy_import.lazy_module("gdsocc")
+BRepAlgoAPI = lazy_import.lazy_module("OCC.Core.BRepAlgoAPI")
 
 
 class Transmon(LibraryBase):
+    geometry_cache_ignore = geometry_cache.TRANSLATION_OPTIONS  # Drawn around gds_pos
+    geometry_cache_attributes = ("cell_subtract", "cell_extract", "pocket_pos")
+    calculated_options = ("readout_pins", "control_pins", "coupling_pins", "outline")  # Set by calc_general_ops
+
     default_options = Dict(
         # Framework
         name = "q0",
@@ -103,9 +111,9 @@ class Transmon(LibraryBase):
         """
         Draws the geometric shapes of the Transmon and adds them to the GDS cell.
         """
-        # gdspy variables
-        gdspy.library.use_current_library = False
-        self.lib = gdspy.GdsLibrary()
+        # Geometry backend variables
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name)
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
         
@@ -147,18 +155,18 @@ class Transmon(LibraryBase):
         lower_center = [main_body_x, main_body_y - gap/2 - height]
         
         # Create the upper rectangle shape
-        rect_upper = gdspy.Rectangle(
+        rect_upper = backend.rectangle(
             (main_body_x - width/2, main_body_y + gap/2),
             (main_body_x + width/2, main_body_y + height + gap/2)
         )
-        self.cell_subtract.add(rect_upper)
+        backend.add(self.cell_subtract, rect_upper)
         
         # Create the lower rectangle shape
-        rect_lower = gdspy.Rectangle(
+        rect_lower = backend.rectangle(
             (main_body_x - width/2, main_body_y - height - gap/2),
             (main_body_x + width/2, main_body_y - gap/2)
         )
-        self.cell_subtract.add(rect_lower)
+        backend.add(self.cell_subtract, rect_lower)
         
         # Add connection pads
         cpw_positions = [upper_left, upper_center, upper_right, lower_left, lower_center, lower_right]
@@ -169,11 +177,11 @@ class Transmon(LibraryBase):
                 pad_y = cpw_positions[i][1] + (pad_gap[i] if i < 3 else -pad_gap[i])
                 
                 # Create the pad shape (rectangle)
-                pad = gdspy.Rectangle(
+                pad = backend.rectangle(
                     (pad_x - pad_width[i]/2, pad_y),
                     (pad_x + pad_width[i]/2, pad_y + pad_height[i]) if i < 3 else (pad_x + pad_width[i]/2, pad_y - pad_height[i])
                 )
-                self.cell_subtract.add(pad)
+                backend.add(self.cell_subtract, pad)
 
                 # Calculate the direction angle (convert to radians if needed)
                 if i == 0 or i == 3:  # Left CPW, direction left
@@ -194,9 +202,9 @@ class Transmon(LibraryBase):
                 else:  # Upper right and lower right, start at the right boundary of the pad
                     cpw_start = [pad_x + pad_width[i]/2, pad_y + pad_height[i]/2] if i == 2 else [pad_x + pad_width[i]/2, pad_y - pad_height[i]/2]
 
-                cpw = gdspy.Path(cpw_width[i], cpw_start)
+                cpw = backend.path(cpw_width[i], cpw_start)
                 cpw.segment(cpw_extend[i], direction=direction_radians)
-                self.cell_subtract.add(cpw)
+                backend.add(self.cell_subtract, cpw)
 
         self.cell_extract = self.lib.new_cell(self.name + "extract")
 
@@ -205,22 +213,22 @@ class Transmon(LibraryBase):
         max_pad_gap = max(pad_gap[i] for i in indices)
         max_pad_height = max(pad_height[i] for i in indices) 
         if sum(pad_options) == 0 or max_extend_value < subtract_gap:
-            subtract_square = gdspy.Rectangle((main_body_x - width/2 - subtract_gap, main_body_y + height + gap/2 + subtract_gap),
-                                              (main_body_x + width/2 + subtract_gap, main_body_y - height - gap/2 - subtract_gap))
+            subtract_square = backend.rectangle((main_body_x - width/2 - subtract_gap, main_body_y + height + gap/2 + subtract_gap),
+                                                (main_body_x + width/2 + subtract_gap, main_body_y - height - gap/2 - subtract_gap))
             self.pocket_pos = [[main_body_x - width/2 - subtract_gap, main_body_y + height + gap/2 + subtract_gap],
                                [main_body_x + width/2 + subtract_gap, main_body_y - height - gap/2 - subtract_gap]]
         else:
-            subtract_square = gdspy.Rectangle((main_body_x - width/2 - max_extend_value, main_body_y + height + gap/2 + max_extend_value + max_pad_gap + max_pad_height),
-                                              (main_body_x + width/2 + max_extend_value, main_body_y - height - gap/2 - max_extend_value - max_pad_height - max_pad_gap))
+            subtract_square = backend.rectangle((main_body_x - width/2 - max_extend_value, main_body_y + height + gap/2 + max_extend_value + max_pad_gap + max_pad_height),
+                                                (main_body_x + width/2 + max_extend_value, main_body_y - height - gap/2 - max_extend_value - max_pad_height - max_pad_gap))
             self.pocket_pos = [[main_body_x - width/2 - max_extend_value, main_body_y + height + gap/2 + max_extend_value + max_pad_gap + max_pad_height],
                                [main_body_x + width/2 + max_extend_value, main_body_y - height - gap/2 - max_extend_value - max_pad_height - max_pad_gap]]
         
-        self.cell_extract.add(subtract_square)
+        backend.add(self.cell_extract, subtract_square)
 
-        sub_poly = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        sub_poly = backend.boolean(self.cell_extract, self.cell_subtract, "not")
 
         self.cell = self.lib.new_cell(self.name + "_cell")
-        self.cell.add(sub_poly)
+        backend.add(self.cell, sub_poly)
         return
     
     def draw_shape(self):
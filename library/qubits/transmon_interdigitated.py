@@ -5,10 +5,12 @@
 #########################################################################
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend
 import toolbox
-import copy, gdspy
+import copy
 
 class TransmonInterdigitated(LibraryBase):
+    calculated_options = ("readout_pins", "control_pins", "coupling_pins", "outline")  # Set by calc_general_ops
     default_options = Dict(
         # Framework
         name = "q0",
@@ -107,11 +109,11 @@ class TransmonInterdigitated(LibraryBase):
         width = 1.5*pad_width
         height = 5*pad_height
         # Drawing
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name)
         # Draw bounding box
-        rect = gdspy.Rectangle((gds_pos[0],gds_pos[1]),(gds_pos[0]+width,gds_pos[1]+height))
+        rect = backend.rectangle((gds_pos[0],gds_pos[1]),(gds_pos[0]+width,gds_pos[1]+height))
         all_pad_height = cc_height*2+cc_space*2+pad_height*2+finger_height*2+finger_space
         # Lower large pad coordinates
         left_pad_lower = (gds_pos[0]+(width-pad_width)/2,gds_pos[1]+(height-all_pad_height)/2+cc_height+cc_space)
@@ -194,98 +196,98 @@ class TransmonInterdigitated(LibraryBase):
         left_cpw_upper_center = (gds_pos[0]+(width-cc_width)/2+(cc_width-cpw_width)/2,gds_pos[1]+(height-all_pad_height)/2+pad_height*2+finger_height*2+finger_space+cc_height*2+cc_space*2)
         right_cpw_upper_center = (gds_pos[0]+(width-cc_width)/2+(cc_width-cpw_width)/2+cpw_width,gds_pos[1]+height)
         # Draw lower large pad
-        lower_pad = gdspy.Rectangle(left_pad_lower,
-                                    right_pad_lower)
+        lower_pad = backend.rectangle(left_pad_lower,
+                                      right_pad_lower)
 
         # Draw upper large pad
-        upper_pad = gdspy.Rectangle(left_pad_upper,
-                                    right_pad_upper)
+        upper_pad = backend.rectangle(left_pad_upper,
+                                      right_pad_upper)
 
         # Draw lower combs
-        lower_comb_1 = gdspy.Rectangle(left_comb_lower_1,
+        lower_comb_1 = backend.rectangle(left_comb_lower_1,
                                     right_comb_lower_1)
-        lower_comb_2 = gdspy.Rectangle(left_comb_lower_2,
+        lower_comb_2 = backend.rectangle(left_comb_lower_2,
                                     right_comb_lower_2)
-        lower_comb_3 = gdspy.Rectangle(left_comb_lower_3,
+        lower_comb_3 = backend.rectangle(left_comb_lower_3,
                                     right_comb_lower_3)
-        lower_comb_4 = gdspy.Rectangle(left_comb_lower_4,
+        lower_comb_4 = backend.rectangle(left_comb_lower_4,
                                     right_comb_lower_4)
         # Draw upper combs
-        upper_comb_1 = gdspy.Rectangle(left_comb_upper_1,
+        upper_comb_1 = backend.rectangle(left_comb_upper_1,
                                     right_comb_upper_1)
-        upper_comb_2 = gdspy.Rectangle(left_comb_upper_2,
+        upper_comb_2 = backend.rectangle(left_comb_upper_2,
                                     right_comb_upper_2)
-        upper_comb_3 = gdspy.Rectangle(left_comb_upper_3,
+        upper_comb_3 = backend.rectangle(left_comb_upper_3,
                                     right_comb_upper_3)
-        upper_comb_4 = gdspy.Rectangle(left_comb_upper_4,
+        upper_comb_4 = backend.rectangle(left_comb_upper_4,
                                     right_comb_upper_4)
 
         # Draw lower junction combs
-        lower_comb_j = gdspy.Rectangle(left_comb_lower_j,
+        lower_comb_j = backend.rectangle(left_comb_lower_j,
                                     right_comb_lower_j)
         # Draw upper junction combs
-        upper_comb_j = gdspy.Rectangle(left_comb_upper_j,
+        upper_comb_j = backend.rectangle(left_comb_upper_j,
                                     right_comb_upper_j)
 
         # Combine lower pad
-        lower_pad = gdspy.boolean(lower_pad,lower_comb_1,'or')
-        lower_pad = gdspy.boolean(lower_pad,lower_comb_2,'or')
-        lower_pad = gdspy.boolean(lower_pad,lower_comb_3,'or')
-        lower_pad = gdspy.boolean(lower_pad,lower_comb_4,'or')
-        lower_pad = gdspy.boolean(lower_pad,lower_comb_j,'or')
+        lower_pad = backend.boolean(lower_pad,lower_comb_1,'or')
+        lower_pad = backend.boolean(lower_pad,lower_comb_2,'or')
+        lower_pad = backend.boolean(lower_pad,lower_comb_3,'or')
+        lower_pad = backend.boolean(lower_pad,lower_comb_4,'or')
+        lower_pad = backend.boolean(lower_pad,lower_comb_j,'or')
 
         # Combine upper pad
-        upper_pad = gdspy.boolean(upper_pad,upper_comb_1,'or')
-        upper_pad = gdspy.boolean(upper_pad,upper_comb_2,'or')
-        upper_pad = gdspy.boolean(upper_pad,upper_comb_3,'or')
-        upper_pad = gdspy.boolean(upper_pad,upper_comb_4,'or')
-        upper_pad = gdspy.boolean(upper_pad,upper_comb_j,'or')
+        upper_pad = backend.boolean(upper_pad,upper_comb_1,'or')
+        upper_pad = backend.boolean(upper_pad,upper_comb_2,'or')
+        upper_pad = backend.boolean(upper_pad,upper_comb_3,'or')
+        upper_pad = backend.boolean(upper_pad,upper_comb_4,'or')
+        upper_pad = backend.boolean(upper_pad,upper_comb_j,'or')
 
         # Draw lower coupling pads
-        lower_lpad_center = gdspy.Rectangle(left_lpad_lower_center,
+        lower_lpad_center = backend.rectangle(left_lpad_lower_center,
                                     right_lpad_lower_center)
-        lower_lpad_left = gdspy.Rectangle(left_lpad_lower_left,
+        lower_lpad_left = backend.rectangle(left_lpad_lower_left,
                                     right_lpad_lower_left)
-        lower_lpad_right = gdspy.Rectangle(left_lpad_lower_right,
+        lower_lpad_right = backend.rectangle(left_lpad_lower_right,
                                     right_lpad_lower_right)
         # Draw lower coupling cpw
-        lower_cpw_center = gdspy.Rectangle(left_cpw_lower_center,
+        lower_cpw_center = backend.rectangle(left_cpw_lower_center,
                                     right_cpw_lower_center)
-        lower_cpw_left = gdspy.Rectangle(left_cpw_lower_left,
+        lower_cpw_left = backend.rectangle(left_cpw_lower_left,
                                         right_cpw_lower_left)
-        lower_cpw_right = gdspy.Rectangle(left_cpw_lower_right,
+        lower_cpw_right = backend.rectangle(left_cpw_lower_right,
                                         right_cpw_lower_right)
         # Combine lower coupling pads
-        lower_lpad_center = gdspy.boolean(lower_lpad_center,lower_cpw_center,'or')
-        lower_lpad_left = gdspy.boolean(lower_lpad_left,lower_cpw_left,'or')
-        lower_lpad_right = gdspy.boolean(lower_lpad_right,lower_cpw_right,'or')
+        lower_lpad_center = backend.boolean(lower_lpad_center,lower_cpw_center,'or')
+        lower_lpad_left = backend.boolean(lower_lpad_left,lower_cpw_left,'or')
+        lower_lpad_right = backend.boolean(lower_lpad_right,lower_cpw_right,'or')
 
         # Draw upper coupling pads
-        upper_lpad_left = gdspy.Rectangle(left_lpad_upper_left,
+        upper_lpad_left = backend.rectangle(left_lpad_upper_left,
                                         right_lpad_upper_left)
-        upper_lpad_right = gdspy.Rectangle(left_lpad_upper_right,
+        upper_lpad_right = backend.rectangle(left_lpad_upper_right,
                                         right_lpad_upper_right)
-        upper_lpad_center = gdspy.Rectangle(left_lpad_upper_center,
-                                            right_lpad_upper_center)
+        upper_lpad_center = backend.rectangle(left_lpad_upper_center,
+                                              right_lpad_upper_center)
         # Draw upper coupling cpw
-        upper_cpw_left = gdspy.Rectangle(left_cpw_upper_left,
+        upper_cpw_left = backend.rectangle(left_cpw_upper_left,
                                         right_cpw_upper_left)
-        upper_cpw_right = gdspy.Rectangle(left_cpw_upper_right,
+        upper_cpw_right = backend.rectangle(left_cpw_upper_right,
                                         right_cpw_upper_right)
-        upper_cpw_center = gdspy.Rectangle(left_cpw_upper_center,
+        upper_cpw_center = backend.rectangle(left_cpw_upper_center,
                                         right_cpw_upper_center)
         # Combine upper coupling pads
-        upper_lpad_left = gdspy.boolean(upper_lpad_left,upper_cpw_left,'or')
-        upper_lpad_right = gdspy.boolean(upper_lpad_right,upper_cpw_right,'or')
-        upper_lpad_center = gdspy.boolean(upper_lpad_center,upper_cpw_center,'or')
+        upper_lpad_left = backend.boolean(upper_lpad_left,upper_cpw_left,'or')
+        upper_lpad_right = backend.boolean(upper_lpad_right,upper_cpw_right,'or')
+        upper_lpad_center = backend.boolean(upper_lpad_center,upper_cpw_center,'or')
 
-        rect = gdspy.boolean(rect,lower_pad,'not')
-        rect = gdspy.boolean(rect,upper_pad,'not')
-        rect = gdspy.boolean(rect,lower_lpad_center,'not')
-        rect = gdspy.boolean(rect,lower_lpad_left,'not')
-        rect = gdspy.boolean(rect,lower_lpad_right,'not')
-        rect = gdspy.boolean(rect,upper_lpad_left,'not')
-        rect = gdspy.boolean(rect,upper_lpad_right,'not')
-        rect = gdspy.boolean(rect,upper_lpad_center,'not')
-        self.cell.add(rect)
+        rect = backend.boolean(rect,lower_pad,'not')
+        rect = backend.boolean(rect,upper_pad,'not')
+        rect = backend.boolean(rect,lower_lpad_center,'not')
+        rect = backend.boolean(rect,lower_lpad_left,'not')
+        rect = backend.boolean(rect,lower_lpad_right,'not')
+        rect = backend.boolean(rect,upper_lpad_left,'not')
+        rect = backend.boolean(rect,upper_lpad_right,'not')
+        rect = backend.boolean(rect,upper_lpad_center,'not')
+        backend.add(self.cell, rect)
         return
\ No newline at end of file
@@ -5,10 +5,15 @@
 #########################################################################
 from addict import Dict
 from base.library_base import LibraryBase
-import gdspy, numpy as np
+from base import geometry_backend, geometry_cache
+import numpy as np
 import math
 
 class TransmonRotate(LibraryBase):
+    geometry_cache_ignore = geometry_cache.TRANSLATION_OPTIONS  # Drawn around gds_pos
+    geometry_cache_attributes = ("cell_subtract", "cell_extract", "pocket_pos")
+    calculated_options = ("readout_pins", "control_pins", "coupling_pins", "outline")  # Set by calc_general_ops
+
     default_options = Dict(
         # Framework
         name = "q0",
@@ -116,9 +121,9 @@ class TransmonRotate(LibraryBase):
         """
         Draws the geometric shapes of the Transmon and adds them to the GDS cell.
         """
-        # gdspy variables
-        gdspy.library.use_current_library = False
-        self.lib = gdspy.GdsLibrary()
+        # Geometry backend variables
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name)
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
         
@@ -161,18 +166,18 @@ class TransmonRotate(LibraryBase):
         lower_center = [main_body_x, main_body_y - gap/2 - height]
         
         # Create the upper rectangle shape
-        rect_upper = gdspy.Rectangle(
+        rect_upper = backend.rectangle(
             (main_body_x - width/2, main_body_y + gap/2),
             (main_body_x + width/2, main_body_y + height + gap/2)
         )
-        self.cell_subtract.add(rect_upper)
+        backend.add(self.cell_subtract, rect_upper)
         
         # Create the lower rectangle shape
-        rect_lower = gdspy.Rectangle(
+        rect_lower = backend.rectangle(
             (main_body_x - width/2, main_body_y - height - gap/2),
             (main_body_x + width/2, main_body_y - gap/2)
         )
-        self.cell_subtract.add(rect_lower)
+        backend.add(self.cell_subtract, rect_lower)
         
         # Add connection pads
         cpw_positions = [upper_left, upper_center, upper_right, lower_left, lower_center, lower_right]
@@ -183,11 +188,11 @@ class TransmonRotate(LibraryBase):
                 pad_y = cpw_positions[i][1] + (pad_gap[i] if i < 3 else -pad_gap[i])
                 
                 # Create the pad shape (rectangle)
-                pad = gdspy.Rectangle(
+                pad = backend.rectangle(
                     (pad_x - pad_width[i]/2, pad_y),
                     (pad_x + pad_width[i]/2, pad_y + pad_height[i]) if i < 3 else (pad_x + pad_width[i]/2, pad_y - pad_height[i])
                 )
-                self.cell_subtract.add(pad)
+                backend.add(self.cell_subtract, pad)
 
                 # Calculate the direction angle (convert to radians if needed)
                 if i == 0 or i == 3:  # Left CPW, direction left
@@ -208,9 +213,9 @@ class TransmonRotate(LibraryBase):
                 else:  # Upper right and lower right, start at the right boundary of the pad
                     cpw_start = [pad_x + pad_width[i]/2, pad_y + pad_height[i]/2] if i == 2 else [pad_x + pad_width[i]/2, pad_y - pad_height[i]/2]
 
-                cpw = gdspy.Path(cpw_width[i], cpw_start)
+                cpw = backend.path(cpw_width[i], cpw_start)
                 cpw.segment(cpw_extend[i], direction=direction_radians)
-                self.cell_subtract.add(cpw)
+                backend.add(self.cell_subtract, cpw)
 
         self.cell_extract = self.lib.new_cell(self.name + "extract")
 
@@ -219,21 +224,21 @@ class TransmonRotate(LibraryBase):
         max_pad_gap = max(pad_gap[i] for i in indices)
         max_pad_height = max(pad_height[i] for i in indices) 
         if sum(pad_options) == 0 or max_extend_value < subtract_gap:
-            subtract_square = gdspy.Rectangle((main_body_x - width/2 - subtract_gap, main_body_y + height + gap/2 + subtract_gap),
-                                              (main_body_x + width/2 + subtract_gap, main_body_y - height - gap/2 - subtract_gap))
+            subtract_square = backend.rectangle((main_body_x - width/2 - subtract_gap, main_body_y + height + gap/2 + subtract_gap),
+                                                (main_body_x + width/2 + subtract_gap, main_body_y - height - gap/2 - subtract_gap))
             self.pocket_pos = [[main_body_x - width/2 - subtract_gap, main_body_y + height + gap/2 + subtract_gap],
                                [main_body_x + width/2 + subtract_gap, main_body_y - height - gap/2 - subtract_gap]]
         else:
-            subtract_square = gdspy.Rectangle((main_body_x - width/2 - max_extend_value, main_body_y + height + gap/2 + max_extend_value + max_pad_gap + max_pad_height),
-                                              (main_body_x + width/2 + max_extend_value, main_body_y - height - gap/2 - max_extend_value - max_pad_height - max_pad_gap))
+            subtract_square = backend.rectangle((main_body_x - width/2 - max_extend_value, main_body_y + height + gap/2 + max_extend_value + max_pad_gap + max_pad_height),
+                                                (main_body_x + width/2 + max_extend_value, main_body_y - height - gap/2 - max_extend_value - max_pad_height - max_pad_gap))
             self.pocket_pos = [[main_body_x - width/2 - max_extend_value, main_body_y + height + gap/2 + max_extend_value + max_pad_gap + max_pad_height],
                                [main_body_x + width/2 + max_extend_value, main_body_y - height - gap/2 - max_extend_value - max_pad_height - max_pad_gap]]
         
-        self.cell_extract.add(subtract_square)
+        backend.add(self.cell_extract, subtract_square)
 
-        sub_poly = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
-        sub_poly.rotate(rotate, center=gds_pos)
+        sub_poly = backend.boolean(self.cell_extract, self.cell_subtract, "not")
+        backend.rotate(sub_poly, rotate, center=gds_pos)
 
         self.cell = self.lib.new_cell(self.name + "_cell")
-        self.cell.add(sub_poly)
+        backend.add(self.cell, sub_poly)
         return
\ No newline at end of file
@@ -6,9 +6,11 @@
 from addict import Dict
 from base.library_base import LibraryBase
 import toolbox
-import copy, gdspy
+import copy
+from base import geometry_backend
 
 class TransmonTeeth(LibraryBase):
+    calculated_options = ("readout_pins", "control_pins", "coupling_pins", "outline")  # Set by calc_general_ops
     default_options = Dict(
         # Framework
         name = "q0",
@@ -102,7 +104,8 @@ class TransmonTeeth(LibraryBase):
         pad_options = self.pad_options
         gds_pos = self.gds_pos
 
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name)
 
         """
@@ -189,118 +192,118 @@ class TransmonTeeth(LibraryBase):
         right_cpw_lower_right = (gds_pos[0]+pocket_width,gds_pos[1]+(pocket_height - pad_height*2-pad_gap)/2-connect_pad_gap-cpw_width)
         
         # Create the geometry (a single rectangle) and add it to the cell.
-        rect = gdspy.Rectangle((gds_pos[0], gds_pos[1]), (gds_pos[0]+pocket_width, gds_pos[1]+pocket_height))
+        rect = backend.rectangle((gds_pos[0], gds_pos[1]), (gds_pos[0]+pocket_width, gds_pos[1]+pocket_height))
         # Create the lower rectangle shape
-        rect_lower = gdspy.Rectangle(
+        rect_lower = backend.rectangle(
             lower_rect_left,
             lower_rect_right
         )
         # Create the left circle in the lower rectangle
-        circle_left_lower = gdspy.Round(lower_circle_left,
-                                        pad_height/2,tolerance=0.01)
+        circle_left_lower = backend.round(lower_circle_left,
+                                          pad_height/2)
 
         # Create the right circle in the lower rectangle
-        circle_right_lower = gdspy.Round(lower_circle_right,
-                                        pad_height/2,tolerance=0.01)
+        circle_right_lower = backend.round(lower_circle_right,
+                                        pad_height/2)
 
         # Combine the lower pad
-        lower_comb = gdspy.boolean(rect_lower,circle_left_lower,'or')
-        lower_comb = gdspy.boolean(lower_comb,circle_right_lower,'or')
+        lower_comb = backend.boolean(rect_lower,circle_left_lower,'or')
+        lower_comb = backend.boolean(lower_comb,circle_right_lower,'or')
                 
         # Create the upper rectangle shape
-        rect_upper = gdspy.Rectangle(
+        rect_upper = backend.rectangle(
             upper_rect_left,
             upper_rect_right
         )
         # Create the left circle in the upper rectangle
-        circle_left_upper = gdspy.Round(upper_circle_left,
-                                        pad_height/2,tolerance=0.01)
+        circle_left_upper = backend.round(upper_circle_left,
+                                          pad_height/2)
         # Create the right circle in the upper rectangle
-        circle_right_upper = gdspy.Round(upper_circle_right,
-                                        pad_height/2,tolerance=0.01)
+        circle_right_upper = backend.round(upper_circle_right,
+                                        pad_height/2)
         # Create the left tooth in the upper part
-        rect_tooth_left = gdspy.Rectangle(left_tooth_left,
+        rect_tooth_left = backend.rectangle(left_tooth_left,
                                         left_tooth_right)
         # Create the left tooth circle
-        circle_tooth_left = gdspy.Round(left_tooth_circle,
-                                        coupled_pad_width/2,tolerance=0.01)
+        circle_tooth_left = backend.round(left_tooth_circle,
+                                          coupled_pad_width/2)
         # Combine the left tooth
-        tooth_left = gdspy.boolean(rect_tooth_left,circle_tooth_left,'or')
+        tooth_left = backend.boolean(rect_tooth_left,circle_tooth_left,'or')
 
         # Create the right tooth in the upper part
-        rect_tooth_right = gdspy.Rectangle(right_tooth_left,
+        rect_tooth_right = backend.rectangle(right_tooth_left,
                                         right_tooth_right)
         # Create the right tooth circle
-        circle_tooth_right = gdspy.Round(right_tooth_circle,
-                                        coupled_pad_width/2,tolerance=0.01)
+        circle_tooth_right = backend.round(right_tooth_circle,
+                                        coupled_pad_width/2)
         # Combine the right tooth
-        tooth_right = gdspy.boolean(rect_tooth_right,circle_tooth_right,'or')
+        tooth_right = backend.boolean(rect_tooth_right,circle_tooth_right,'or')
 
         # Combine the upper pad
-        upper_comb = gdspy.boolean(rect_upper,circle_left_upper,'or')
-        upper_comb = gdspy.boolean(upper_comb,circle_right_upper,'or')
-        upper_comb = gdspy.boolean(upper_comb,tooth_left,'or')
-        upper_comb = gdspy.boolean(upper_comb,tooth_right,'or')
+        upper_comb = backend.boolean(rect_upper,circle_left_upper,'or')
+        upper_comb = backend.boolean(upper_comb,circle_right_upper,'or')
+        upper_comb = backend.boolean(upper_comb,tooth_left,'or')
+        upper_comb = backend.boolean(upper_comb,tooth_right,'or')
 
         # Create the small pad in the center of the upper part
-        upper_pad_loc_center = gdspy.Rectangle(left_pad_upper_center,
+        upper_pad_loc_center = backend.rectangle(left_pad_upper_center,
                                         right_pad_upper_center)
         # Create the upper center cpw
-        upper_cpw_in_center = gdspy.Rectangle(left_cpw_upper_center,
+        upper_cpw_in_center = backend.rectangle(left_cpw_upper_center,
                                     right_cpw_upper_center)
         # Combine the upper center small pad and cpw 
-        upper_pad_loc_center = gdspy.boolean(upper_pad_loc_center,upper_cpw_in_center,'or')
+        upper_pad_loc_center = backend.boolean(upper_pad_loc_center,upper_cpw_in_center,'or')
 
         # Create the small pad on the left of the upper part
-        upper_pad_loc_left = gdspy.Rectangle(left_pad_upper_left,
+        upper_pad_loc_left = backend.rectangle(left_pad_upper_left,
                                         right_pad_upper_left)
         # Create the upper left cpw
-        upper_cpw_in_left = gdspy.Rectangle(left_cpw_upper_left,
+        upper_cpw_in_left = backend.rectangle(left_cpw_upper_left,
                                     right_cpw_upper_left)
         # Combine the upper left small pad and cpw 
-        upper_pad_loc_left = gdspy.boolean(upper_pad_loc_left,upper_cpw_in_left,'or')
+        upper_pad_loc_left = backend.boolean(upper_pad_loc_left,upper_cpw_in_left,'or')
 
         # Create the small pad on the right of the upper part
-        upper_pad_loc_right = gdspy.Rectangle(left_pad_upper_right,
+        upper_pad_loc_right = backend.rectangle(left_pad_upper_right,
                                         right_pad_upper_right)
         # Create the upper right cpw
-        upper_cpw_in_right = gdspy.Rectangle(left_cpw_upper_right,
+        upper_cpw_in_right = backend.rectangle(left_cpw_upper_right,
                                     right_cpw_upper_right)
         # Combine the upper right small pad and cpw 
-        upper_pad_loc_right = gdspy.boolean(upper_pad_loc_right,upper_cpw_in_right,'or')
+        upper_pad_loc_right = backend.boolean(upper_pad_loc_right,upper_cpw_in_right,'or')
 
         # Create the small pad in the center of the lower part
-        lower_pad_loc_center = gdspy.Rectangle(left_pad_lower_center,
+        lower_pad_loc_center = backend.rectangle(left_pad_lower_center,
                                         right_pad_lower_center)
         # Create the lower center cpw
-        lower_cpw_in_center = gdspy.Rectangle(left_cpw_lower_center,
+        lower_cpw_in_center = backend.rectangle(left_cpw_lower_center,
                                     right_cpw_lower_center)
         # Combine the lower center small pad and cpw 
-        lower_pad_loc_center = gdspy.boolean(lower_pad_loc_center,lower_cpw_in_center,'or')
+        lower_pad_loc_center = backend.boolean(lower_pad_loc_center,lower_cpw_in_center,'or')
 
         # Create the small pad on the left of the lower part
-        lower_pad_loc_left = gdspy.Rectangle(left_pad_lower_left,
+        lower_pad_loc_left = backend.rectangle(left_pad_lower_left,
                                         right_pad_lower_left)
         # Create the lower left cpw
-        lower_cpw_in_left = gdspy.Rectangle(left_cpw_lower_left,
+        lower_cpw_in_left = backend.rectangle(left_cpw_lower_left,
                                         right_cpw_lower_left)
         # Combine the lower left small pad and cpw 
-        lower_pad_loc_left = gdspy.boolean(lower_pad_loc_left,lower_cpw_in_left,'or')
+        lower_pad_loc_left = backend.boolean(lower_pad_loc_left,lower_cpw_in_left,'or')
 
         # Create the small pad on the right of the lower part
-        lower_pad_loc_right = gdspy.Rectangle(left_pad_lower_right,
+        lower_pad_loc_right = backend.rectangle(left_pad_lower_right,
                                         right_pad_lower_right)
         # Create the lower right cpw
-        lower_cpw_in_right = gdspy.Rectangle(left_cpw_lower_right,
+        lower_cpw_in_right = backend.rectangle(left_cpw_lower_right,
                                         right_cpw_lower_right)
         # Combine the lower right small pad and cpw 
-        lower_pad_loc_right = gdspy.boolean(lower_pad_loc_right,lower_cpw_in_right,'or')
+        lower_pad_loc_right = backend.boolean(lower_pad_loc_right,lower_cpw_in_right,'or')
 
         pad_loc = [upper_pad_loc_center,upper_pad_loc_left,upper_pad_loc_right,lower_pad_loc_center,lower_pad_loc_left,lower_pad_loc_right]
-        rect = gdspy.boolean(rect,lower_comb,'not')
-        rect = gdspy.boolean(rect,upper_comb,'not')
+        rect = backend.boolean(rect,lower_comb,'not')
+        rect = backend.boolean(rect,upper_comb,'not')
         for i in range(6):
             if pad_options[i] == 1:
-                rect = gdspy.boolean(rect,pad_loc[i],'not')
-        self.cell.add(rect)
+                rect = backend.boolean(rect,pad_loc[i],'not')
+        backend.add(self.cell, rect)
         return
\ No newline at end of file
@@ -6,10 +6,14 @@
 #########################################################################
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend, geometry_cache
 import toolbox
-import copy, gdspy, numpy as np
+import copy, numpy as np
 
 class Xmon(LibraryBase):
+    geometry_cache_ignore = geometry_cache.TRANSLATION_OPTIONS  # Drawn around gds_pos
+    calculated_options = ("readout_pins", "control_pins", "coupling_pins", "outline")  # Set by calc_general_ops
+
     default_options = Dict(
         # Framework
         name = "q0",
@@ -96,9 +100,8 @@ class Xmon(LibraryBase):
         """
         Draws the geometric shapes of the qubit and adds them to the GDS cell.
         """
-        # gdspy variables
-        gdspy.library.use_current_library = False
-        self.lib = gdspy.GdsLibrary()
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name)
         
         ################################ Drawing ##################################
@@ -127,7 +130,7 @@ class Xmon(LibraryBase):
         x4 = height + gap + width + in_s
         y4 = -height - gap - gs
 
-        qubit = gdspy.Curve(x, y).l(height, 0, height, -height, height + width, -height, height + width, 0, height * 2 + width, 0, height * 2 + width, width, height + width, width, height + width, height + width, height, height + width, height, width, 0, width,
+        offsets = (height, 0, height, -height, height + width, -height, height + width, 0, height * 2 + width, 0, height * 2 + width, width, height + width, width, height + width, height + width, height, height + width, height, width, 0, width,
                                   -gap, width + gap,
                                   -gap + height, width + gap, -gap + height, width + gap + height,
                                   width + gap + height, width + gap + height,
@@ -176,7 +179,8 @@ class Xmon(LibraryBase):
                                   (width + gap + height * 2) * d, (width + gap) * d, (width + gap + height) * d, (width + gap) * d, (width + gap + height) * d, (width + gap + height) * d,
                                   (-gap + height) * d, (width + gap + height) * d, (-gap + height) * d, (width + gap) * d, (-gap) * d, (width + gap) * d, 0, (width) * d,
                                   )
-        self.cell.add([gdspy.Polygon(qubit.get_points())])
+        points = [(x, y)] + [(x + dx, y + dy) for dx, dy in zip(offsets[0::2], offsets[1::2])]  # Relative to (x, y)
+        backend.add(self.cell, backend.polygon(points))
         ########################################################################
         return
     
@@ -5,13 +5,7 @@
 #              Includes functionality to retrieve the module dictionary and dynamically load module classes.
 #########################################################################
 
-from library.readout_lines.readout_arrow_plus import ReadoutArrowPlus
-from library.readout_lines.readout_arrow import ReadoutArrow
-from library.readout_lines.readout_cavity_flipchip import ReadoutCavityFlipchip
-from library.readout_lines.readout_cavity_plus import ReadoutCavityPlus
-from library.readout_lines.readout_cavity import ReadoutCavity
-from library.readout_lines.readout_line_finger_plus import ReadoutLineFingerPlus
-from library.readout_lines.readout_line_finger import ReadoutLineFinger
+from base import lazy_import
 
 module_name_list = ["readout_arrow_plus",
                     "readout_arrow",
@@ -21,4 +15,7 @@ module_name_list = ["readout_arrow_plus",
                     "readout_line_finger_plus",
                     "readout_line_finger",
                     "readout_cavity_flipchip_no_pad"
-                    ]
\ No newline at end of file
+                    ]
+
+# Classes are imported from their module on first access
+__getattr__ = lazy_import.class_getter(__name__, module_name_list)
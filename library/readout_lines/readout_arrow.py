@@ -4,7 +4,6 @@
 #              Defines the ReadoutArrow class for drawing the geometric shapes of the readout line and arrow.
 ############################################################################################
 
-import gdspy
 import copy
 import math
 import numpy as np
@@ -13,6 +12,7 @@ import toolbox
 from library.readout_lines.readout_line_finger import ReadoutLineFinger
 from library.others.arrow import Arrow
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 class ReadoutArrow(LibraryBase):
     default_options = Dict(
@@ -57,8 +57,8 @@ class ReadoutArrow(LibraryBase):
         """
         Draws the geometric shapes of the ReadoutLine and adds them to the GDS cell.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         # Retrieve parameters
@@ -107,8 +107,8 @@ class ReadoutArrow(LibraryBase):
         self.end_pos = options.end_pos  # Update the ending position
 
         # Merge the arrow and finger shapes
-        all_pattern = gdspy.boolean(arrow.cell, finger.cell, operation="or")  # Perform OR operation
-        all_pattern.rotate(orientation, start_pos)  # Rotate the shape
-        self.cell.add(all_pattern)  # Add to the cell
+        all_pattern = backend.boolean(arrow.cell, finger.cell, operation="or")  # Perform OR operation
+        backend.rotate(all_pattern, orientation, start_pos)  # Rotate the shape
+        backend.add(self.cell, all_pattern)  # Add to the cell
 
         return
\ No newline at end of file
@@ -4,7 +4,6 @@
 #              Defines the ReadoutArrowPlus and ArrowFinger classes for drawing the geometric shapes of the readout line.
 ############################################################################################
 
-import gdspy
 import copy
 import math
 import numpy as np
@@ -12,6 +11,7 @@ from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
 from library.readout_lines.readout_cavity_plus import ReadoutCavityPlus
+from base import geometry_backend
 
 class ReadoutArrowPlus(LibraryBase):
     default_options = Dict(
@@ -59,8 +59,8 @@ class ReadoutArrowPlus(LibraryBase):
         """
         Draws the geometric shapes of the ReadoutLine and adds them to the GDS cell.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         # Retrieve parameters
@@ -132,9 +132,9 @@ class ReadoutArrowPlus(LibraryBase):
 
         # Merge and translate
         start_pos = self.start_pos
-        pattern = gdspy.boolean(arrow_finger.cell, rd.cell, "or")  # Merge shapes
-        pattern.translate(start_pos[0], start_pos[1])  # Translate to the starting position
-        self.cell.add(pattern)  # Add to the cell
+        pattern = backend.boolean(arrow_finger.cell, rd.cell, "or")  # Merge shapes
+        backend.translate(pattern, start_pos[0], start_pos[1])  # Translate to the starting position
+        backend.add(self.cell, pattern)  # Add to the cell
 
         return
     
@@ -175,8 +175,8 @@ class ArrowFinger(LibraryBase):
         """
         Draws the geometric shapes of the ReadoutLine and adds them to the GDS cell.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         # Retrieve parameters
@@ -201,12 +201,12 @@ class ArrowFinger(LibraryBase):
         pos.append(now_p)
 
         # Draw finger
-        finger = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        sub_finger = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
+        finger = backend.flexpath(pos, width + gap * 2, corners="circular bend", bend_radius=corner_radius)
+        sub_finger = backend.flexpath(pos, width, corners="circular bend", bend_radius=corner_radius)
 
         # Rotate finger
-        finger.rotate(math.radians(finger_orientation), (0, 0))
-        sub_finger.rotate(math.radians(finger_orientation), (0, 0))
+        backend.rotate(finger, math.radians(finger_orientation), (0, 0))
+        backend.rotate(sub_finger, math.radians(finger_orientation), (0, 0))
 
         # Arrow base position, starting at (0, 0)
         angle1 = arrow_orientation + 135
@@ -232,19 +232,19 @@ class ArrowFinger(LibraryBase):
         sub_arrow_pos.append(now_p)
 
         # Draw arrow
-        arrow = gdspy.FlexPath(arrow_pos, width + gap * 2, corners="natural").to_polygonset()
-        sub_arrow = gdspy.FlexPath(sub_arrow_pos, width, corners="natural").to_polygonset()
+        arrow = backend.flexpath(arrow_pos, width + gap * 2, corners="natural")
+        sub_arrow = backend.flexpath(sub_arrow_pos, width, corners="natural")
 
         # Get the total shape
-        arrow_finger = gdspy.boolean(finger, arrow, "or")  # Merge finger and arrow
-        sub_arrow_finger = gdspy.boolean(sub_finger, sub_arrow, "or")  # Merge sub-finger and sub-arrow
-        arrow_finger = gdspy.boolean(arrow_finger, sub_arrow_finger, "not")  # Subtract sub-arrow_finger
+        arrow_finger = backend.boolean(finger, arrow, "or")  # Merge finger and arrow
+        sub_arrow_finger = backend.boolean(sub_finger, sub_arrow, "or")  # Merge sub-finger and sub-arrow
+        arrow_finger = backend.boolean(arrow_finger, sub_arrow_finger, "not")  # Subtract sub-arrow_finger
         
         # Translate
-        arrow_finger.translate(start_pos[0], start_pos[1])  # Translate to the starting position
+        backend.translate(arrow_finger, start_pos[0], start_pos[1])  # Translate to the starting position
 
         # Add to cell
-        self.cell.add(arrow_finger)
+        backend.add(self.cell, arrow_finger)
 
         return
     
@@ -4,11 +4,11 @@
 #              Defines the ReadoutCavity class for drawing the geometric shapes of the readout cavity.
 ############################################################################################
 
-import gdspy
 import math
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 class ReadoutCavity(LibraryBase):
     default_options = Dict(
@@ -52,8 +52,8 @@ class ReadoutCavity(LibraryBase):
         """
         Draws the geometric shapes of the ReadoutLine and adds them to the GDS cell.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")
 
         # Calculate the distance and angle between the start_pos and end_pos
@@ -65,8 +65,8 @@ class ReadoutCavity(LibraryBase):
         if self.length <= distance:
             raise ValueError("Parameter error: The length of the readout line is less than or equal to the distance between the qubit and the transmission line.")
         
-        # Create a gdspy path with a width of cpw_width
-        readout_l = gdspy.Path(self.cpw_width, (self.start_pos[0], self.start_pos[1]), number_of_paths=1)
+        # Create a path with a width of cpw_width
+        readout_l = backend.path(self.cpw_width, (self.start_pos[0], self.start_pos[1]))
         readout_l.segment(self.start_straight, '+x')  # Draw the starting straight segment
 
         # Calculate the number of segments and their lengths
@@ -99,12 +99,12 @@ class ReadoutCavity(LibraryBase):
         # Rotate the entire shape based on the calculated angle
         readout_l.rotate(angle, self.start_pos)
 
-        self.cell_subtract.add(readout_l)  # Add the path to the subtract cell
+        backend.add(self.cell_subtract, readout_l)  # Add the path to the subtract cell
 
 
         # Create the extract cell
         self.cell_extract = self.lib.new_cell(self.name + "_extract")
-        readout_l = gdspy.Path(self.cpw_width + self.gap * 2, (self.start_pos[0], self.start_pos[1]), number_of_paths=1)
+        readout_l = backend.path(self.cpw_width + self.gap * 2, (self.start_pos[0], self.start_pos[1]))
         readout_l.segment(self.start_straight, '+x')  # Draw the starting straight segment
 
         num = round((distance - self.start_r * 2 - self.space) // (self.r * 2))
@@ -132,11 +132,11 @@ class ReadoutCavity(LibraryBase):
 
         readout_l.rotate(angle, self.start_pos)
 
-        self.cell_extract.add(readout_l)  # Add the path to the extract cell
+        backend.add(self.cell_extract, readout_l)  # Add the path to the extract cell
 
         # Use boolean operations to generate the final shape
-        sub_poly = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        sub_poly = backend.boolean(self.cell_extract, self.cell_subtract, "not")
         self.cell = self.lib.new_cell(self.name + "_cell")  # Create the final cell
-        self.cell.add(sub_poly)  # Add the final shape
+        backend.add(self.cell, sub_poly)  # Add the final shape
 
         return
\ No newline at end of file
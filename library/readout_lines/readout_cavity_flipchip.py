@@ -4,13 +4,13 @@
 #              Defines the ReadoutCavityFlipchip class for drawing the geometric shapes of the flip-chip readout cavity.
 ############################################################################################
 
-import gdspy
 import copy
 import math
 import numpy as np
 from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 class ReadoutCavityFlipchip(LibraryBase):
     default_options = Dict(
@@ -60,8 +60,8 @@ class ReadoutCavityFlipchip(LibraryBase):
         """
         Draws the geometric shapes of the ReadoutLine and adds them to the GDS cell.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         # Draw the initial shape of the cavity, starting at (0, 0), direction right
@@ -104,27 +104,27 @@ class ReadoutCavityFlipchip(LibraryBase):
         pos = flip_pos + pos  # Merge the flip path and other paths
 
         # Draw the cavity
-        path = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend", bend_radius=radius).to_polygonset()
-        sub_path = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=radius).to_polygonset()
+        path = backend.flexpath(pos, width + gap * 2, corners="circular bend", bend_radius=radius)
+        sub_path = backend.flexpath(pos, width, corners="circular bend", bend_radius=radius)
 
         # Draw the small pad
-        sub_small_pad = gdspy.Rectangle((flip_inner[0] - smallpad_height / 2, flip_inner[1]),
+        sub_small_pad = backend.rectangle((flip_inner[0] - smallpad_height / 2, flip_inner[1]),
                                          (flip_inner[0] + smallpad_height / 2, flip_inner[1] - smallpad_width))
-        small_pad = gdspy.Rectangle((flip_inner[0] - smallpad_height / 2 - gap, flip_inner[1] + gap),
+        small_pad = backend.rectangle((flip_inner[0] - smallpad_height / 2 - gap, flip_inner[1] + gap),
                                      (flip_inner[0] + smallpad_height / 2 + gap, flip_inner[1] - smallpad_width - gap))
 
         # Perform boolean operations to generate the cavity
-        cavity = gdspy.boolean(path, sub_path, 'not')  # Subtract operation
-        small_pad = gdspy.boolean(small_pad, sub_small_pad, 'not')  # Subtract operation
-        connect = gdspy.boolean(sub_path, small_pad, 'and')  # Intersection operation
+        cavity = backend.boolean(path, sub_path, 'not')  # Subtract operation
+        small_pad = backend.boolean(small_pad, sub_small_pad, 'not')  # Subtract operation
+        connect = backend.boolean(sub_path, small_pad, 'and')  # Intersection operation
 
-        cavity = gdspy.boolean(cavity, small_pad, 'or')  # Union operation
-        cavity = gdspy.boolean(cavity, connect, 'not')  # Subtract operation
+        cavity = backend.boolean(cavity, small_pad, 'or')  # Union operation
+        cavity = backend.boolean(cavity, connect, 'not')  # Subtract operation
         # Rotate and translate
-        cavity.rotate(math.radians(orientation), (0, 0))  # Rotate the cavity
-        cavity.translate(dx=start_pos[0], dy=start_pos[1])  # Translate the cavity
+        backend.rotate(cavity, math.radians(orientation), (0, 0))  # Rotate the cavity
+        backend.translate(cavity, dx=start_pos[0], dy=start_pos[1])  # Translate the cavity
 
-        self.cell.add(cavity)  # Add to the cell
+        backend.add(self.cell, cavity)  # Add to the cell
         return
     
     def calc_space_num(self, deltax, dist):
@@ -4,13 +4,13 @@
 #              Defines the ReadoutCavityFlipchipNoPad class for drawing flip-chip readout cavity geometry.
 ############################################################################################
 
-import gdspy
 import copy
 import math
 import numpy as np
 from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 
 class ReadoutCavityFlipchipNoPad(LibraryBase):
@@ -60,8 +60,8 @@ class ReadoutCavityFlipchipNoPad(LibraryBase):
         """
         Draws the geometric shapes of the ReadoutLine without pads.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         # Retrieve parameters without pad-related options
@@ -155,34 +155,34 @@ class ReadoutCavityFlipchipNoPad(LibraryBase):
         end_point = pos[-1]
 
         # Draw main cavity path
-        path = gdspy.FlexPath(pos, width + gap * 2,
+        path = backend.flexpath(pos, width + gap * 2,
                               corners="circular bend",
-                              bend_radius=radius).to_polygonset()
+                              bend_radius=radius)
 
-        sub_path = gdspy.FlexPath(pos, width,
+        sub_path = backend.flexpath(pos, width,
                                   corners="circular bend",
-                                  bend_radius=radius).to_polygonset()
+                                  bend_radius=radius)
 
         # Create cavity body
-        cavity = gdspy.boolean(path, sub_path, 'not')
+        cavity = backend.boolean(path, sub_path, 'not')
 
         # ==================== Add end seal ====================
         # Create seal rectangle
         seal_width = width + 2 * gap  # Seal width
-        seal_rect = gdspy.Rectangle(
+        seal_rect = backend.rectangle(
             (end_point[0] - seal_width / 2, end_point[1]),  # Bottom-left
             (end_point[0] + seal_width / 2, end_point[1] - end_seal_height)  # Top-right
         )
 
         # Merge seal into cavity
-        cavity = gdspy.boolean(cavity, seal_rect, 'or')
+        cavity = backend.boolean(cavity, seal_rect, 'or')
 
         # Apply rotation and translation
-        cavity.rotate(math.radians(orientation), (0, 0))
-        cavity.translate(dx=start_pos[0], dy=start_pos[1])
+        backend.rotate(cavity, math.radians(orientation), (0, 0))
+        backend.translate(cavity, dx=start_pos[0], dy=start_pos[1])
 
         # Add to cell
-        self.cell.add(cavity)
+        backend.add(self.cell, cavity)
         return
 
     def calc_space_num(self, deltax, dist):
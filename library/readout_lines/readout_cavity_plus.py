@@ -4,13 +4,13 @@
 #              Defines the ReadoutCavityPlus class for drawing the geometric shapes of the readout cavity.
 ############################################################################################
 
-import gdspy
 import copy
 import math
 import numpy as np
 from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 class ReadoutCavityPlus(LibraryBase):
     default_options = Dict(
@@ -54,8 +54,8 @@ class ReadoutCavityPlus(LibraryBase):
         """
         Draws the geometric shapes of the ReadoutLine and adds them to the GDS cell.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         # Retrieve parameters
@@ -83,15 +83,15 @@ class ReadoutCavityPlus(LibraryBase):
         pos = self.get_pos(start_dir, start_length, space_num, space_dist, one_mid_straight, end_length, coupling_length)
         
         # Draw the cavity
-        path = gdspy.FlexPath(pos, width + gap*2, corners="circular bend", bend_radius=radius).to_polygonset()
-        sub_path = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=radius).to_polygonset()
-        cavity = gdspy.boolean(path, sub_path, 'not')  # Perform boolean operation to generate the cavity
+        path = backend.flexpath(pos, width + gap*2, corners="circular bend", bend_radius=radius)
+        sub_path = backend.flexpath(pos, width, corners="circular bend", bend_radius=radius)
+        cavity = backend.boolean(path, sub_path, 'not')  # Perform boolean operation to generate the cavity
 
         # Rotate and translate
-        cavity.rotate(math.radians(orientation), (0, 0))  # Rotate the cavity
-        cavity.translate(dx=start_pos[0], dy=start_pos[1])  # Translate the cavity
+        backend.rotate(cavity, math.radians(orientation), (0, 0))  # Rotate the cavity
+        backend.translate(cavity, dx=start_pos[0], dy=start_pos[1])  # Translate the cavity
 
-        self.cell.add(cavity)  # Add to the cell
+        backend.add(self.cell, cavity)  # Add to the cell
         return
     
     def calc_space_num(self, deltax, dist):
@@ -4,13 +4,13 @@
 #              The ReadoutLineFinger class is defined to draw the geometric shape of the readout line.
 ############################################################################################
 
-import gdspy
 import copy
 import math
 import numpy as np
 from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 class ReadoutLineFinger(LibraryBase):
     default_options = Dict(
@@ -74,23 +74,23 @@ class ReadoutLineFinger(LibraryBase):
         dist = math.sqrt(dx**2 + dy**2)
         end_pos = [start_pos[0] + dist, start_pos[1]]
 
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(name + "_cell")
-        self.cell_subtract = self.lib.new_cell(name, "_sub_cell")
+        self.cell_subtract = self.lib.new_cell(name + "_sub_cell")
 
         # Draw the finger structure
-        finger = gdspy.Path(initial_point=start_pos, width=cpw_width + 2 * gap)  # External path
+        finger = backend.path(initial_point=start_pos, width=cpw_width + 2 * gap)  # External path
         finger.segment(0, "+x")  # Draw horizontal segment
         finger.turn(start_r, "l")  # Turn
         finger.segment(0, "+y")  # Draw vertical segment
 
-        finger_sub = gdspy.Path(initial_point=start_pos, width=cpw_width)  # Internal path
+        finger_sub = backend.path(initial_point=start_pos, width=cpw_width)  # Internal path
         finger_sub.segment(0, "+x")  # Draw horizontal segment
         finger_sub.turn(start_r, "l")  # Turn
         finger_sub.segment(0, "+y")  # Draw vertical segment
 
-        finger = gdspy.boolean(finger, finger_sub, "not")  # Calculate the difference
+        finger = backend.boolean(finger, finger_sub, "not")  # Calculate the difference
 
         # Draw the CPW
         options = Dict(
@@ -121,8 +121,8 @@ class ReadoutLineFinger(LibraryBase):
         if options.length <= distance:
             raise ValueError("Parameter setting error, the length of the readout line is less than or equal to the distance between the qubit and the transmission line.")
         
-        # Create a gdspy path with width cpw_width
-        readout_l = gdspy.Path(options.cpw_width, (options.start_pos[0], options.start_pos[1]), number_of_paths=1)
+        # Create a path with width cpw_width
+        readout_l = backend.path(options.cpw_width, (options.start_pos[0], options.start_pos[1]))
         readout_l.segment(options.start_straight, '+x')  # Draw starting segment
 
         # Calculate the number of segments and their lengths
@@ -153,9 +153,9 @@ class ReadoutLineFinger(LibraryBase):
         readout_l.segment(options.couple_length, '+x' if (num - 1) % 2 == 0 else '-x')  # Draw coupling segment
 
         # Rotate the entire shape based on the calculated angle
-        readout_l.rotate(0.5 * math.pi, options.start_pos)
+        backend.rotate(readout_l, 0.5 * math.pi, options.start_pos)
 
-        self.cell_subtract.add(readout_l)  # Add to subtract cell
+        backend.add(self.cell_subtract, readout_l)  # Add to subtract cell
 
         # Create extract cell
         self.cell_extract = self.lib.new_cell(options.name + "_extract")
@@ -167,7 +167,7 @@ class ReadoutLineFinger(LibraryBase):
         angle = math.atan2(dy, dx) + math.pi / 2  
 
         # Create another path
-        readout_l = gdspy.Path(options.cpw_width + options.gap * 2, (options.start_pos[0], options.start_pos[1]), number_of_paths=1)
+        readout_l = backend.path(options.cpw_width + options.gap * 2, (options.start_pos[0], options.start_pos[1]))
         readout_l.segment(options.start_straight, '+x')  # Draw starting segment
 
         num = round((distance - options.start_r * 2 - options.space) // (options.r * 2))  # Calculate number of segments
@@ -193,15 +193,15 @@ class ReadoutLineFinger(LibraryBase):
         readout_l.turn(options.r, 'l' if (num - 1) % 2 == 0 else 'r');  # Determine final turn direction
 
         readout_l.segment(options.couple_length, '+x' if (num - 1) % 2 == 0 else '-x')  # Draw coupling segment
-        readout_l.rotate(0.5 * math.pi, options.start_pos)  # Rotate shape based on calculated angle
+        backend.rotate(readout_l, 0.5 * math.pi, options.start_pos)  # Rotate shape based on calculated angle
 
-        self.cell_extract.add(readout_l)  # Add to extract cell
+        backend.add(self.cell_extract, readout_l)  # Add to extract cell
 
         # Generate the final shape using boolean operations
-        sub_poly = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
-        all_shape = gdspy.boolean(sub_poly, finger, "or")  # Merge paths
+        sub_poly = backend.boolean(self.cell_extract, self.cell_subtract, "not")
+        all_shape = backend.boolean(sub_poly, finger, "or")  # Merge paths
 
-        all_shape.rotate(orientation, start_pos)  # Rotate final shape
-        self.cell.add(all_shape)  # Add to main cell
+        backend.rotate(all_shape, orientation, start_pos)  # Rotate final shape
+        backend.add(self.cell, all_shape)  # Add to main cell
 
         return
\ No newline at end of file
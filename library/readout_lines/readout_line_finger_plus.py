@@ -5,7 +5,6 @@
 #              of the readout line and finger structures.
 ############################################################################################
 
-import gdspy
 import copy
 import math
 import numpy as np
@@ -13,6 +12,7 @@ from addict import Dict
 import toolbox
 from base.library_base import LibraryBase
 from library.readout_lines.readout_cavity_plus import ReadoutCavityPlus
+from base import geometry_backend
 
 class ReadoutLineFingerPlus(LibraryBase):
     default_options = Dict(
@@ -58,8 +58,8 @@ class ReadoutLineFingerPlus(LibraryBase):
         """
         Draw the geometric shape of the ReadoutLine and add it to the GDS cell.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         # Get parameters
@@ -128,9 +128,9 @@ class ReadoutLineFingerPlus(LibraryBase):
 
         # Merge the finger structure and the cavity, and translate to the start position
         start_pos = self.start_pos
-        pattern = gdspy.boolean(finger.cell, rd.cell, "or")
-        pattern.translate(start_pos[0], start_pos[1])
-        self.cell.add(pattern)  # Add to the cell
+        pattern = backend.boolean(finger.cell, rd.cell, "or")
+        backend.translate(pattern, start_pos[0], start_pos[1])
+        backend.add(self.cell, pattern)  # Add to the cell
 
         return
     
@@ -169,8 +169,8 @@ class Finger(LibraryBase):
         """
         Draw the geometric shape of the finger structure and add it to the GDS cell.
         """
-        self.lib = gdspy.GdsLibrary()
-        gdspy.library.use_current_library = False
+        backend = geometry_backend.active
+        self.lib = backend.new_library()
         self.cell = self.lib.new_cell(self.name + "_cell")
 
         # Get parameters
@@ -193,16 +193,16 @@ class Finger(LibraryBase):
         pos.append(now_p)
 
         # Draw the finger structure
-        finger = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        sub_finger = gdspy.FlexPath(pos, width, corners="circular bend", bend_radius=corner_radius).to_polygonset()
-        finger = gdspy.boolean(finger, sub_finger, "not")  # Calculate the difference
+        finger = backend.flexpath(pos, width + gap * 2, corners="circular bend", bend_radius=corner_radius)
+        sub_finger = backend.flexpath(pos, width, corners="circular bend", bend_radius=corner_radius)
+        finger = backend.boolean(finger, sub_finger, "not")  # Calculate the difference
         
         # Translate and rotate
-        finger.rotate(math.radians(orientation), (0, 0))
-        finger.translate(start_pos[0], start_pos[1])
+        backend.rotate(finger, math.radians(orientation), (0, 0))
+        backend.translate(finger, start_pos[0], start_pos[1])
 
         # Add to the cell
-        self.cell.add(finger)
+        backend.add(self.cell, finger)
 
         return
     
@@ -5,10 +5,11 @@
 #              and dynamically loading it into the global namespace.
 #########################################################################
 
-from library.transmission_lines.transmission_path import TransmissionPath
-from library.transmission_lines.transmission_path1 import TransmissionPath1
-from library.transmission_lines.transmission_single_pad import TransmissionSinglePad
+from base import lazy_import
 
 module_name_list = ["transmission_path",
                     "transmission_path1",
-                    "transmission_single_pad"]
\ No newline at end of file
+                    "transmission_single_pad"]
+
+# Classes are imported from their module on first access
+__getattr__ = lazy_import.class_getter(__name__, module_name_list)
@@ -5,11 +5,11 @@
 #              of transmission lines and setting basic parameters.
 ############################################################################################
 
-import gdspy
 import math, copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 
 class TransmissionPath(LibraryBase):
@@ -57,23 +57,23 @@ class TransmissionPath(LibraryBase):
         gap = self.gap  # Transmission line gap
         corner_radius = self.corner_radius  # Corner radius
 
-        self.lib = gdspy.GdsLibrary()  # Create a GDS library
-        gdspy.library.use_current_library = False  # Do not use the current library
+        backend = geometry_backend.active
+        self.lib = backend.new_library()  # Create a GDS library
         self.cell_subtract = self.lib.new_cell(self.name + "_subtract")  # Create a subtraction cell
 
         # Create the inner transmission line
-        transmission_L_inner = gdspy.FlexPath(pos, width, corners="circular bend",
-                                              bend_radius=corner_radius).to_polygonset()
-        self.cell_subtract.add(transmission_L_inner)  # Add the inner transmission line to the subtraction cell
+        transmission_L_inner = backend.flexpath(pos, width, corners="circular bend",
+                                                bend_radius=corner_radius)
+        backend.add(self.cell_subtract, transmission_L_inner)  # Add the inner transmission line to the subtraction cell
 
         # Create the outer control line
         self.cell_extract = self.lib.new_cell(name + "_extract")
-        control_L_out = gdspy.FlexPath(pos, width + gap * 2, corners="circular bend",
-                                       bend_radius=corner_radius).to_polygonset()
-        self.cell_extract.add(control_L_out)  # Add the outer control line to the extraction cell
+        control_L_out = backend.flexpath(pos, width + gap * 2, corners="circular bend",
+                                         bend_radius=corner_radius)
+        backend.add(self.cell_extract, control_L_out)  # Add the outer control line to the extraction cell
 
         # Calculate the final pattern
-        pad = gdspy.boolean(self.cell_extract, self.cell_subtract, "not")
+        pad = backend.boolean(self.cell_extract, self.cell_subtract, "not")
         self.cell = self.lib.new_cell(name + "_cell")  # Create the final cell
-        self.cell.add(pad)  # Add the final pattern to the final cell
+        backend.add(self.cell, pad)  # Add the final pattern to the final cell
         return
\ No newline at end of file
@@ -5,11 +5,11 @@
 #              of transmission lines and setting basic parameters.
 ############################################################################################
 
-import gdspy
 import math, copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 
 class TransmissionPath1(LibraryBase):
@@ -52,10 +52,10 @@ class TransmissionPath1(LibraryBase):
         """
         Draws the geometric shape of the quantum bit and adds it to the GDS cell.
         """
-        ################################ gdspy Variables ################################
+        ########################## Geometry backend variables ##########################
         # Do not modify this part of the code
-        gdspy.library.use_current_library = False  # Do not use the current library
-        self.lib = gdspy.GdsLibrary()  # Create a GDS library
+        backend = geometry_backend.active  # The backend the shapes are drawn with
+        self.lib = backend.new_library()  # Create a GDS library
         self.cell = self.lib.new_cell(self.name)  # Create a new cell
         ################################ Interface ################################
         # The purpose of the interface is to facilitate subsequent user parameter updates.
@@ -72,10 +72,10 @@ class TransmissionPath1(LibraryBase):
         ################################ Drawing ################################
         # Add your code here
         # Example drawing logic:
-        # pattern = gdspy.Rectangle((x1, y1), (x2, y2))  # Create a rectangle
-        # gdspy.rotate(pattern, orientation)               # Rotate the shape
-        # gdspy.translate(pattern, (gds_pos[0], gds_pos[1]))  # Translate the shape
-        # self.cell.add(pattern)                           # Add the shape to the cell
+        # pattern = backend.rectangle((x1, y1), (x2, y2))  # Create a rectangle
+        # backend.rotate(pattern, orientation)           # Rotate the shape
+        # backend.translate(pattern, gds_pos[0], gds_pos[1])  # Translate the shape
+        # backend.add(self.cell, pattern)                # Add the shape to the cell
 
         ########################################################################
         return
\ No newline at end of file
@@ -5,11 +5,11 @@
 #              of transmission lines and setting basic parameters.
 ############################################################################################
 
-import gdspy
 import math, copy
 import numpy as np
 from addict import Dict
 from base.library_base import LibraryBase
+from base import geometry_backend
 
 
 class TransmissionSinglePad(LibraryBase):
@@ -50,8 +50,8 @@ class TransmissionSinglePad(LibraryBase):
         """
         Draws the geometric shape of the TransmissionLine and adds it to the GDS cell.
         """
-        self.lib = gdspy.GdsLibrary()  # Create a GDS library
-        gdspy.library.use_current_library = False  # Do not use the current library
+        backend = geometry_backend.active  # The backend the shapes are drawn with
+        self.lib = backend.new_library()  # Create a GDS library
         self.cell = self.lib.new_cell(self.name + "_cell")  # Create a new cell
 
         # Add drawing code
@@ -59,9 +59,9 @@ class TransmissionSinglePad(LibraryBase):
         # If you need to draw a rectangular pad, you can use the following code
         if self.pos:  # Ensure the position is defined
             x, y = self.pos[0]  # Take the first position
-            pad = gdspy.Rectangle((x, y), (x + self.pad_width, y + self.pad_height))  # Create a rectangle
-            self.cell.add(pad)  # Add the rectangle to the cell
+            pad = backend.rectangle((x, y), (x + self.pad_width, y + self.pad_height))  # Create a rectangle
+            backend.add(self.cell, pad)  # Add the rectangle to the cell
 
         # Assign the pattern to the cell
-        # self.cell.add(pattern)  # Example: Add the drawn pattern to the cell
+        # backend.add(self.cell, pattern)  # Example: Add the drawn pattern to the cell
         return
\ No newline at end of file
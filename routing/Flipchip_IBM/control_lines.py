@@ -7,12 +7,13 @@
 from addict import Dict
 import numpy as np
 import math
-from scipy.spatial import KDTree
-import matplotlib.pyplot as plt
-import networkx as nx
 import re
 import copy
 import func_modules
+from base import lazy_import
+
+# Only needed when routing control lines
+nx = lazy_import.lazy_module("networkx")
 
 
 def convert_topo(topo_poss):
@@ -0,0 +1,112 @@
+##################################################################
+# Bulk move benchmark of component collections (CmpntsBase.move and
+# set_positions) on grids of Transmon qubits.
+#
+# Usage: python test/benchmark_column_store.py [--sizes 256 1024] [--repeat 3] [--min-speedup 2]
+#
+# Each grid is moved three ways, then its positions are read back: the
+# per-component path which move used before (set gds_pos, then
+# recalculate the pins with calc_general_ops, kept below as
+# reference_move), move on built qubits (pins, outlines and the cached
+# columns translated), and move on qubits which are not built yet (only
+# the positions change). Each way runs --repeat times, the fastest run
+# is kept. The positions, the pins and the outlines must agree
+# with the reference, and move must leave unbuilt qubits unbuilt.
+# Exits with status 1 on a mismatch or when move on built qubits is less
+# than --min-speedup times faster than the reference.
+##################################################################
+
+import argparse, os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from addict import Dict
+import layouts
+
+DELTA = (123.5, -77)
+PIN_NAMES = ("coupling_pins", "readout_pins", "control_pins", "outline")
+
+
+def reference_move(qubits, dx, dy):
+    for name in qubits.cmpnt_name_list:
+        cmpnt = getattr(qubits, name)
+        cmpnt.gds_pos = (cmpnt.gds_pos[0] + dx, cmpnt.gds_pos[1] + dy)
+        qubits.recalc_component(name)
+    return
+
+
+def build_all(qubits):
+    for name in qubits.cmpnt_name_list:
+        getattr(qubits, name)
+    return
+
+
+def timed(func, repeat):
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def compare(qubits, reference):
+    """
+    Output:
+        errors: list, the parameters of the qubits which differ from the reference qubits.
+    """
+    errors = []
+    if not np.array_equal(qubits.get_positions("gds_pos"), reference.get_positions("gds_pos")):
+        errors.append("gds_pos")
+    for op_name in PIN_NAMES:
+        column, reference_column = qubits.get_column(op_name), reference.get_column(op_name)
+        if not np.array_equal(column.offsets, reference_column.offsets) or not np.allclose(column.values, reference_column.values):
+            errors.append(op_name)
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk move benchmark of component collections.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 1024], help="qubit counts")
+    parser.add_argument("--repeat", type=int, default=3, help="number of moves of each grid")
+    parser.add_argument("--min-speedup", type=float, default=2, help="minimum speedup of move on built qubits")
+    args = parser.parse_args()
+
+    errors = []
+    print("{:>7} {:>14} {:>12} {:>12} {:>9}".format("qubits", "reference (s)", "built (s)", "unbuilt (s)", "speedup"))
+    for qubits_num in args.sizes:
+        reference = layouts.grid_design(qubits_num=qubits_num).gds.qubits
+        built = layouts.grid_design(qubits_num=qubits_num).gds.qubits
+        unbuilt = layouts.grid_design(qubits_num=qubits_num).gds.qubits
+        build_all(reference)
+        build_all(built)
+        unbuilt.inject_options(Dict(unbuilt.options.to_dict()))
+        for qubits in (reference, built, unbuilt):
+            qubits.get_positions("gds_pos")  # The column tables are built before the move
+
+        # Each move is followed by a read of the new positions
+        reference_time = timed(lambda: (reference_move(reference, *DELTA), reference.get_positions("gds_pos")), args.repeat)
+        built_time = timed(lambda: (built.move("gds_pos", *DELTA), built.get_positions("gds_pos")), args.repeat)
+        unbuilt_time = timed(lambda: (unbuilt.move("gds_pos", *DELTA), unbuilt.get_positions("gds_pos")), args.repeat)
+        speedup = reference_time / built_time
+        print("{:>7} {:>14.4f} {:>12.4f} {:>12.4f} {:>9.1f}".format(qubits_num, reference_time, built_time, unbuilt_time, speedup))
+
+        if len(unbuilt.__dict__.get("lazy_cmpnts", {})) != qubits_num:
+            errors.append("{} qubits: move built unbuilt qubits".format(qubits_num))
+        for label, qubits in (("built", built), ("unbuilt", unbuilt)):
+            for op_name in compare(qubits, reference):
+                errors.append("{} qubits, {}: {} differs from the recalculated one".format(qubits_num, label, op_name))
+        if speedup < args.min_speedup:
+            errors.append("{} qubits: move is {:.1f} times faster than the reference, expected {}".format(qubits_num, speedup, args.min_speedup))
+
+    for message in errors:
+        print("MISMATCH: " + message)
+    if errors:
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+##################################################################
+# Scaling benchmark of the end-to-end chip flow of 0_demo/0_1024_layout:
+# topology -> qubits -> coupling lines -> chip -> readout lines ->
+# Flipchip routing -> draw_gds -> save_gds, at several qubit counts.
+#
+# Usage:
+#   python test/benchmark_flow.py --output results.json
+#   python test/benchmark_flow.py --sizes 16 64 256 --baseline baseline.json
+#   python test/benchmark_flow.py --sizes 16 64 --save-baseline baseline.json
+#
+# Each size runs in a fresh interpreter (headless, matplotlib Agg backend),
+# once for the times and, unless --no-memory, once more with tracemalloc
+# for the peak memory of each stage. Exits with status 1 when a stage is
+# slower or uses more memory than the baseline by more than the thresholds.
+##################################################################
+
+import argparse, json, os, platform, random, subprocess, sys, tempfile, time, tracemalloc
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_SIZES = [16, 64, 256, 1024, 4096]
+# Marks the stage results in the output of a child run, the flow prints its own progress messages
+RESULT_PREFIX = "BENCHMARK_STAGE "
+
+
+def stage_topology(design, qubits_num, tmp_dir):
+    side = int(round(qubits_num ** 0.5))
+    design.generate_topology(topo_col=side, topo_row=side)
+    design.topology.generate_random_edges(edges_num=int(qubits_num * 1500 / 1024))  # Edge density of the demo
+
+
+def stage_qubits(design, qubits_num, tmp_dir):
+    design.generate_qubits(topology=True, qubits_type="Transmon", chip_name="chip0", dist=3000)
+
+
+def stage_coupling_lines(design, qubits_num, tmp_dir):
+    design.generate_coupling_lines(topology=True, qubits=True, cpls_type="CouplingLineStraight", chip="chip0")
+
+
+def stage_chip(design, qubits_num, tmp_dir):
+    design.generate_chip(qubits=True, dist=4000)
+
+
+def stage_readout_lines(design, qubits_num, tmp_dir):
+    design.generate_readout_lines(qubits=True, rdls_type="ReadoutCavity", chip_name="chip0")
+
+
+def stage_routing(design, qubits_num, tmp_dir):
+    design.gds.chips.copy_chip(old_chip_name="chip0", new_chip_name="chip1")
+    design.routing(method="Flipchip_routing", chip_name="chip1")
+
+
+def stage_draw_gds(design, qubits_num, tmp_dir):
+    design.draw_gds()
+
+
+def stage_save_gds(design, qubits_num, tmp_dir):
+    design.gds.save_gds(os.path.join(tmp_dir, "{}.gds".format(qubits_num)))
+
+
+STAGES = [("topology", stage_topology),
+          ("qubits", stage_qubits),
+          ("coupling_lines", stage_coupling_lines),
+          ("chip", stage_chip),
+          ("readout_lines", stage_readout_lines),
+          ("routing", stage_routing),
+          ("draw_gds", stage_draw_gds),
+          ("save_gds", stage_save_gds)]
+
+
+def run_flow(qubits_num, memory: bool = False, seed: int = 0):
+    """
+    Runs the flow in the current process, printing one JSON line per stage.
+
+    Input:
+        qubits_num: int, the number of qubits (a square topology).
+        memory: bool, whether to record the peak memory of each stage with tracemalloc.
+        seed: int, the seed of the random topology edges.
+
+    Output:
+        None
+    """
+    import numpy as np
+    from api.design import Design
+    random.seed(seed)
+    np.random.seed(seed)
+    design = Design()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, stage in STAGES:
+            if memory:
+                tracemalloc.start()
+            t = time.perf_counter()
+            stage(design, qubits_num, tmp_dir)
+            seconds = time.perf_counter() - t
+            result = {"stage": name, "seconds": seconds}
+            if memory:
+                result["peak_memory_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+                tracemalloc.stop()
+            print(RESULT_PREFIX + json.dumps(result), flush=True)
+    return
+
+
+def run_child(qubits_num, memory, seed, timeout):
+    """
+    Runs the flow in a new interpreter.
+
+    Input:
+        qubits_num: int, the number of qubits.
+        memory: bool, see run_flow.
+        seed: int, see run_flow.
+        timeout: float, seconds after which the run is stopped, None for no limit.
+
+    Output:
+        stages: dict, {stage: result} for the stages which finished.
+        error: str, None when every stage finished.
+    """
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", str(qubits_num), "--seed", str(seed)]
+    if memory:
+        cmd.append("--memory")
+    env = dict(os.environ, MPLBACKEND="Agg")
+    try:
+        completed = subprocess.run(cmd, cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=timeout)
+        stdout, error = completed.stdout, None
+        if completed.returncode != 0:
+            error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "exit status {}".format(completed.returncode)
+    except subprocess.TimeoutExpired as e:
+        stdout = e.stdout.decode() if isinstance(e.stdout, bytes) else (e.stdout or "")
+        error = "timeout after {} s".format(timeout)
+    stages = {}
+    for line in stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            result = json.loads(line[len(RESULT_PREFIX):])
+            stages[result.pop("stage")] = result
+    return stages, error
+
+
+def run_benchmark(sizes, memory: bool = True, seed: int = 0, timeout: float = None):
+    """
+    Runs the flow at each size.
+
+    Input:
+        sizes: list, the qubit counts.
+        memory: bool, whether to run a second pass recording peak memory.
+        seed: int, see run_flow.
+        timeout: float, see run_child.
+
+    Output:
+        results: dict, the JSON results.
+    """
+    results = {"python": platform.python_version(), "platform": platform.platform(), "seed": seed, "sizes": {}}
+    for qubits_num in sizes:
+        stages, error = run_child(qubits_num, False, seed, timeout)
+        if memory and error is None:
+            memory_stages, error = run_child(qubits_num, True, seed, timeout)
+            for name, result in memory_stages.items():
+                stages[name]["peak_memory_mb"] = result["peak_memory_mb"]
+        size_result = {"stages": stages}
+        if error is not None:
+            size_result["error"] = error
+        results["sizes"][str(qubits_num)] = size_result
+        print(format_size(qubits_num, size_result), flush=True)
+    return results
+
+
+def format_size(qubits_num, size_result):
+    lines = ["{} qubits".format(qubits_num)]
+    for name, result in size_result["stages"].items():
+        memory = result.get("peak_memory_mb")
+        lines.append("  {:<16} {:>10.3f} s  {}".format(name, result["seconds"],
+                                                      "" if memory is None else "{:>9.1f} MB".format(memory)))
+    if "error" in size_result:
+        lines.append("  error: {}".format(size_result["error"]))
+    return "\n".join(lines)
+
+
+def compare(results, baseline, time_threshold: float, memory_threshold: float, min_seconds: float):
+    """
+    Compares results against a baseline.
+
+    Input:
+        results: dict, see run_benchmark.
+        baseline: dict, results of an earlier run.
+        time_threshold: float, the allowed ratio of stage time to the baseline, e.g. 1.25.
+        memory_threshold: float, the allowed ratio of stage peak memory to the baseline.
+        min_seconds: float, stages faster than this in both runs are not compared (timer noise).
+
+    Output:
+        regressions: list, the messages of the stages over the thresholds.
+    """
+    regressions = []
+    for size, size_result in results["sizes"].items():
+        base_size = baseline["sizes"].get(size)
+        if base_size is None:
+            continue
+        if "error" in size_result and "error" not in base_size:
+            regressions.append("{} qubits: {}".format(size, size_result["error"]))
+        for name, base in base_size["stages"].items():
+            result = size_result["stages"].get(name)
+            if result is None:
+                continue
+            if max(result["seconds"], base["seconds"]) >= min_seconds and result["seconds"] > base["seconds"] * time_threshold:
+                regressions.append("{} qubits, {}: {:.3f} s, baseline {:.3f} s".format(size, name, result["seconds"], base["seconds"]))
+            memory, base_memory = result.get("peak_memory_mb"), base.get("peak_memory_mb")
+            if memory is not None and base_memory is not None and memory > max(base_memory, 1.0) * memory_threshold:
+                regressions.append("{} qubits, {}: {:.1f} MB, baseline {:.1f} MB".format(size, name, memory, base_memory))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark of the end-to-end chip flow.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="qubit counts (square topologies)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random topology edges")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory pass")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds allowed per size and pass")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file")
+    parser.add_argument("--save-baseline", help="write the results to this JSON file as the new baseline")
+    parser.add_argument("--time-threshold", type=float, default=1.25, help="allowed time ratio to the baseline")
+    parser.add_argument("--memory-threshold", type=float, default=1.25, help="allowed peak memory ratio to the baseline")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="stages faster than this are not compared")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--memory", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        sys.path.insert(0, PROJECT_ROOT)
+        run_flow(args.child, memory=args.memory, seed=args.seed)
+        return 0
+
+    results = run_benchmark(args.sizes, memory=not args.no_memory, seed=args.seed, timeout=args.timeout)
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.time_threshold, args.memory_threshold, args.min_seconds)
+        for message in regressions:
+            print("REGRESSION: " + message)
+        if regressions:
+            return 1
+        print("No regression against {}".format(args.baseline))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
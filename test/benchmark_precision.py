@@ -0,0 +1,80 @@
+##################################################################
+# Vertex counts and drawing times of the geometry precisions on the
+# flip-chip demo design (0_demo/0_1024_layout).
+#
+# Usage: python test/benchmark_precision.py [--qubits 64] [--backend gdspy]
+#
+# The design is drawn and saved as SVG at each precision of
+# base.geometry_backend.PRECISIONS. The vertices per component type
+# (Gds.vertex_counts) and the times are printed. Exits with status 1
+# when a coarser precision does not reduce the vertices, or when the
+# bounding box of a chip moves by more than the arc tolerance.
+##################################################################
+
+import argparse, os, random, sys, tempfile, time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+from base import geometry_backend
+from layouts import design_1024_layout
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vertex counts and drawing times of the geometry precisions.")
+    parser.add_argument("--qubits", type=int, default=64, help="qubits of the 0_1024_layout design")
+    parser.add_argument("--backend", default="gdspy", help="geometry backend, gdspy or gdstk")
+    args = parser.parse_args()
+
+    random.seed(0)
+    np.random.seed(0)
+    design = design_1024_layout(args.qubits)
+    design.set_geometry_backend(args.backend)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for precision in ("tapeout", "default", "preview"):
+            design.set_geometry_precision(precision)
+            start = time.perf_counter()
+            design.draw_gds()
+            draw_time = time.perf_counter() - start
+            start = time.perf_counter()
+            design.gds.save_svg(path=os.path.join(tmp_dir, precision + ".svg"))
+            svg_time = time.perf_counter() - start
+            counts = design.gds.vertex_counts()
+            bboxes = {chip_name: design.gds.get_bounding_box(chip_name) for chip_name in design.gds.cell_Dict.keys()}
+            results[precision] = (counts, bboxes)
+
+            print("{} (arc tolerance {} um): draw_gds {:.2f} s, save_svg {:.2f} s".format(
+                precision, geometry_backend.get_tolerance(precision), draw_time, svg_time))
+            for type_name, type_counts in sorted(counts.items()):
+                print("  {:<24} {:>6} components {:>9} polygons {:>11} vertices".format(
+                    type_name, type_counts.components, type_counts.get("polygons", 0), type_counts.get("vertices", 0)))
+            print("  {:<24} {:>50}".format("total", sum(c.get("vertices", 0) for c in counts.values())))
+
+    errors = []
+    precisions = list(results.keys())
+    for fine, coarse in zip(precisions[:-1], precisions[1:]):
+        fine_vertices = sum(c.get("vertices", 0) for c in results[fine][0].values())
+        coarse_vertices = sum(c.get("vertices", 0) for c in results[coarse][0].values())
+        if coarse_vertices >= fine_vertices:
+            errors.append("{} has {} vertices, not fewer than the {} vertices of {}".format(coarse, coarse_vertices, fine_vertices, fine))
+    reference = results["tapeout"][1]
+    for precision, (counts, bboxes) in results.items():
+        tolerance = geometry_backend.get_tolerance(precision)
+        for chip_name, bbox in bboxes.items():
+            error = float(np.max(np.abs(np.array(bbox) - np.array(reference[chip_name]))))
+            if error > tolerance + geometry_backend.get_tolerance("tapeout"):
+                errors.append("the bounding box of {} moves by {:.4f} um at {}".format(chip_name, error, precision))
+
+    for message in errors:
+        print("MISMATCH: " + message)
+    if errors:
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+##################################################################
+# Startup benchmark: time `import api.design` in a fresh interpreter
+# and check that heavy optional modules are not imported eagerly.
+#
+# Usage: python test/benchmark_startup.py [--runs 5] [--budget 1.0]
+# Exits with status 1 when the median import time exceeds the budget
+# or when one of HEAVY_MODULES is imported at startup.
+##################################################################
+
+import argparse, json, os, statistics, subprocess, sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Modules which must only be imported on first use (see base.lazy_import)
+HEAVY_MODULES = ["qiskit",
+                 "seaborn",
+                 "pandas",
+                 "scipy.optimize",
+                 "sympy",
+                 "matplotlib.pyplot",
+                 "networkx",
+                 "IPython",
+                 "win32com",
+                 "OCC.Core.BRepAlgoAPI",
+                 "simulation",
+                 "equ_circ.primitives",
+                 "func_modules.topo.gene_topo_ops.qasm",
+                 "library.qubits.transmon"]
+
+CHILD_CODE = """
+import json, sys, time
+t = time.perf_counter()
+import api.design
+t = time.perf_counter() - t
+print(json.dumps({"seconds": t, "modules": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+
+def measure_startup():
+    """
+    Imports api.design in a new interpreter.
+
+    Input:
+        None
+
+    Output:
+        result: dict, "seconds" the import time, "modules" the heavy modules which were imported.
+    """
+    output = subprocess.run([sys.executable, "-c", CHILD_CODE], cwd=PROJECT_ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup-time benchmark of `import api.design`.")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreters")
+    parser.add_argument("--budget", type=float, default=1.0, help="maximum median import time in seconds")
+    args = parser.parse_args()
+
+    result_list = [measure_startup() for _ in range(args.runs)]
+    seconds = [result["seconds"] for result in result_list]
+    median = statistics.median(seconds)
+    imported = sorted(set(m for result in result_list for m in result["modules"]))
+    print(f"import api.design: median {median:.3f} s, min {min(seconds):.3f} s, max {max(seconds):.3f} s over {args.runs} runs")
+
+    failed = False
+    if imported:
+        print(f"FAIL: heavy modules imported at startup: {imported}")
+        failed = True
+    if median > args.budget:
+        print(f"FAIL: median import time exceeds the budget of {args.budget:.3f} s")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
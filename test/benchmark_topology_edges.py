@@ -0,0 +1,191 @@
+##################################################################
+# Scaling benchmark of the nearest-neighbour edge generators of
+# func_modules.topo.primitives on square grids and hexagonal
+# (honeycomb) lattices, up to 10k qubits.
+#
+# Usage: python test/benchmark_topology_edges.py [--sizes 16 256 1024 4096 10000] [--reference-max 1024]
+#
+# generate_full_edges runs on a side x side grid, generate_hex_full_edges
+# on a honeycomb lattice with unit bonds. Up to --reference-max qubits,
+# the edges must be the same list, in the same order, as the pairwise
+# generators they replace (kept below as reference_*).
+# generate_connected_edges runs on the grids with the spanning tree
+# size and with 1.5 times that number of edges: the edges must connect all
+# qubits, be nearest-neighbour edges, and repeat for the same seed or the
+# same state of an explicit random.Random, without using the global random
+# generator. Fewer edges than the spanning tree, more than the
+# nearest-neighbour edges, and qubits which can not be connected must
+# raise a ValueError.
+# generate_hex_lattice builds hex and heavy-hex lattices of about the same
+# sizes: the edges must have length 1, the qubits at most 3 neighbours,
+# and the lattice must be connected.
+# Exits with status 1 on a mismatch.
+##################################################################
+
+import argparse, collections, math, os, random, sys, time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from addict import Dict
+from func_modules.topo import primitives
+
+
+def reference_full_edges(positions):
+    edges = []
+    qubits = list(positions.keys())
+    for i in range(0, len(qubits)):
+        for j in range(i + 1, len(qubits)):
+            topo_pos_i = positions[qubits[i]]
+            topo_pos_j = positions[qubits[j]]
+            if (abs(topo_pos_i[0] - topo_pos_j[0]) + abs(topo_pos_i[1] - topo_pos_j[1])) == 1:
+                edges.append([qubits[i], qubits[j]])
+    return edges
+
+
+def reference_hex_full_edges(positions):
+    edges = []
+    for q in positions.keys():
+        for qq in positions.keys():
+            if q == qq:
+                continue
+            dist = primitives.calculate_distance(positions[q], positions[qq])
+            if not primitives.are_floats_equal(1, dist):
+                continue
+            if primitives.panduan_shifou_you_zhege_bian(edges, [q, qq]):
+                continue
+            edges.append([q, qq])
+    return edges
+
+
+def grid_positions(qubits_num):
+    side = int(math.ceil(math.sqrt(qubits_num)))
+    return primitives.generate_topo_positions(qubits_num, topo_col=side, topo_row=int(math.ceil(qubits_num / side)))
+
+
+def honeycomb_positions(qubits_num):
+    """
+    Output:
+        positions: Dict, qubits_num sites of a honeycomb lattice with bonds of length 1, row by row.
+    """
+    positions = Dict()
+    side = int(math.ceil(math.sqrt(qubits_num / 2)))
+    for j in range(side):
+        for i in range(side):
+            x, y = i * math.sqrt(3) + j * math.sqrt(3) / 2, j * 1.5
+            for pos in ((x, y), (x, y + 1)):
+                if len(positions) < qubits_num:
+                    positions["q{}".format(len(positions))] = pos
+    return positions
+
+
+def components(positions, edges):
+    """
+    Output:
+        count: int, the connected components of the graph (breadth-first search).
+    """
+    neighbours = collections.defaultdict(list)
+    for q0, q1 in edges:
+        neighbours[q0].append(q1)
+        neighbours[q1].append(q0)
+    seen = set()
+    count = 0
+    for q in positions.keys():
+        if q in seen:
+            continue
+        count += 1
+        seen.add(q)
+        queue = collections.deque([q])
+        while queue:
+            for qq in neighbours[queue.popleft()]:
+                if qq not in seen:
+                    seen.add(qq)
+                    queue.append(qq)
+    return count
+
+
+def timed(func, positions):
+    start = time.perf_counter()
+    edges = func(positions)
+    return edges, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark of the topology edge generators.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 256, 1024, 4096, 10000], help="qubit counts")
+    parser.add_argument("--reference-max", type=int, default=1024, help="largest size compared with the pairwise generators")
+    args = parser.parse_args()
+
+    errors = []
+    generators = [("grid", grid_positions, primitives.generate_full_edges, reference_full_edges),
+                  ("hex", honeycomb_positions, primitives.generate_hex_full_edges, reference_hex_full_edges)]
+    print("{:<6} {:>7} {:>8} {:>12} {:>14}".format("lattice", "qubits", "edges", "time (s)", "pairwise (s)"))
+    for lattice, build, generate, reference in generators:
+        for qubits_num in args.sizes:
+            positions = build(qubits_num)
+            edges, seconds = timed(generate, positions)
+            reference_seconds = ""
+            if qubits_num <= args.reference_max:
+                reference_edges, reference_time = timed(reference, positions)
+                reference_seconds = "{:.3f}".format(reference_time)
+                if edges != reference_edges:
+                    errors.append("{} lattice of {} qubits: {} edges instead of {}".format(lattice, qubits_num, len(edges), len(reference_edges)))
+            print("{:<6} {:>7} {:>8} {:>12.4f} {:>14}".format(lattice, qubits_num, len(edges), seconds, reference_seconds))
+
+    print("{:<9} {:>7} {:>8} {:>12}".format("connected", "qubits", "edges", "time (s)"))
+    for qubits_num in args.sizes:
+        positions = grid_positions(qubits_num)
+        full_edges = set(map(tuple, primitives.generate_full_edges(positions)))
+        for edges_num in (qubits_num - 1, 3 * (qubits_num - 1) // 2):
+            edges, seconds = timed(lambda p: primitives.generate_connected_edges(p, edges_num, seed=qubits_num), positions)
+            print("{:<9} {:>7} {:>8} {:>12.4f}".format("grid", qubits_num, len(edges), seconds))
+            if len(edges) != edges_num or not set(map(tuple, edges)) <= full_edges:
+                errors.append("connected edges of {} qubits: {} edges, not {} nearest-neighbour edges".format(qubits_num, len(edges), edges_num))
+            if components(positions, edges) != 1:
+                errors.append("connected edges of {} qubits: {} components".format(qubits_num, components(positions, edges)))
+            if edges != primitives.generate_connected_edges(positions, edges_num, seed=qubits_num):
+                errors.append("connected edges of {} qubits change with the same seed".format(qubits_num))
+            state = random.getstate()
+            edges = primitives.generate_connected_edges(positions, edges_num, rng=random.Random(qubits_num))
+            if random.getstate() != state:
+                errors.append("connected edges of {} qubits use the global random generator with an explicit one".format(qubits_num))
+            if edges != primitives.generate_connected_edges(positions, edges_num, rng=random.Random(qubits_num)):
+                errors.append("connected edges of {} qubits change with the same random generator state".format(qubits_num))
+        for edges_num in (qubits_num - 2, len(full_edges) + 1):
+            try:
+                primitives.generate_connected_edges(positions, edges_num, seed=qubits_num)
+                errors.append("connected edges of {} qubits: {} edges do not raise a ValueError".format(qubits_num, edges_num))
+            except ValueError:
+                pass
+    try:
+        primitives.generate_connected_edges(Dict(q0=(0, 0), q1=(1, 0), q2=(3, 0)), 2, seed=0)
+        errors.append("connected edges of qubits which can not be connected do not raise a ValueError")
+    except ValueError:
+        pass
+
+    print("{:<9} {:>7} {:>8} {:>12}".format("lattice", "qubits", "edges", "time (s)"))
+    for qubits_num in args.sizes:
+        for shape in ("hex", "heavy_hex"):
+            topo_row = max(1, int(math.sqrt(qubits_num / 2)))
+            topo_col = max(2, qubits_num // topo_row)
+            start = time.perf_counter()
+            positions, edges = primitives.generate_hex_lattice(topo_row, topo_col, heavy=(shape == "heavy_hex"))
+            seconds = time.perf_counter() - start
+            print("{:<9} {:>7} {:>8} {:>12.4f}".format(shape, len(positions), len(edges), seconds))
+            degrees = collections.Counter(q for edge in edges for q in edge)
+            if any(primitives.calculate_distance(positions[q0], positions[q1]) != 1 for q0, q1 in edges):
+                errors.append("{} lattice of {} qubits has edges longer than 1".format(shape, len(positions)))
+            if max(degrees.values()) > 3 or components(positions, edges) != 1:
+                errors.append("{} lattice of {} qubits: up to {} neighbours, {} components".format(
+                    shape, len(positions), max(degrees.values()), components(positions, edges)))
+
+    for message in errors:
+        print("MISMATCH: " + message)
+    if errors:
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
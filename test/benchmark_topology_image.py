@@ -0,0 +1,88 @@
+##################################################################
+# Drawing times of Topology.save_image on grid topologies with
+# random edges, as in the 0_demo/0_1024_layout demo (1024 qubits,
+# 1500 edges), against the networkx drawing it replaces.
+#
+# Usage: python test/benchmark_topology_image.py [--sizes 1024 4096] [--reference-max 1024]
+#
+# Up to --reference-max qubits, the image is also drawn with
+# networkx (one artist per label, as before) and must match the
+# labelled image (less than 0.1% of the pixels differ). Exits with
+# status 1 on a mismatch, when an image is not written or when
+# pyplot figures are left open.
+##################################################################
+
+import argparse, os, random, sys, tempfile, time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+from api import topology
+
+
+def reference_save_image(topo, path):
+    import networkx as nx
+    G = nx.Graph()
+    G.add_nodes_from(topo.positions.keys())
+    G.add_edges_from(topo.edges)
+    plt.figure(figsize=(0.8 * topo.col_num, 0.8 * topo.row_num))
+    pos = {node: (p[0], p[1]) for node, p in topo.positions.items()}
+    nx.draw_networkx_nodes(G, pos, node_size=500, node_color="#ccebc5")
+    nx.draw_networkx_edges(G, pos, width=5, edge_color="#80b1d3")
+    nx.draw_networkx_labels(G, pos, {node: node for node in G.nodes}, font_size=10, font_color='black')
+    plt.axis('off')
+    plt.savefig(path)
+    plt.close()
+    return
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drawing times of Topology.save_image.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1024, 4096], help="qubit counts")
+    parser.add_argument("--reference-max", type=int, default=1024, help="largest size drawn with networkx")
+    args = parser.parse_args()
+
+    random.seed(0)
+    errors = []
+    print("{:>7} {:>7} {:>14} {:>14} {:>14}".format("qubits", "edges", "labels (s)", "culled (s)", "networkx (s)"))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for qubits_num in args.sizes:
+            topo = topology.Topology(qubits_num=qubits_num)
+            topo.generate_random_edges(int(qubits_num * 1.5))
+            times = []
+            for labels in (True, None):
+                path = os.path.join(tmp_dir, "{}_{}.png".format(qubits_num, labels))
+                start = time.perf_counter()
+                topo.save_image(path, labels=labels)
+                times.append("{:.2f}".format(time.perf_counter() - start))
+                if not os.path.getsize(path):
+                    errors.append("{} is empty".format(path))
+            if plt.get_fignums():
+                errors.append("save_image left {} pyplot figures open".format(len(plt.get_fignums())))
+            if qubits_num <= args.reference_max:
+                start = time.perf_counter()
+                reference_save_image(topo, os.path.join(tmp_dir, "{}_networkx.png".format(qubits_num)))
+                times.append("{:.2f}".format(time.perf_counter() - start))
+                image = plt.imread(os.path.join(tmp_dir, "{}_True.png".format(qubits_num)))
+                reference = plt.imread(os.path.join(tmp_dir, "{}_networkx.png".format(qubits_num)))
+                differing = np.mean(np.abs(image - reference).max(axis=2) > 0.1) if image.shape == reference.shape else 1
+                if differing > 1e-3:
+                    errors.append("the image of {} qubits differs from networkx on {:.2%} of the pixels".format(qubits_num, differing))
+            else:
+                times.append("")
+            print("{:>7} {:>7} {:>14} {:>14} {:>14}".format(qubits_num, len(topo.edges), *times))
+
+    for message in errors:
+        print("MISMATCH: " + message)
+    if errors:
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+##################################################################
+# Shared fixture of the tests: python -m pytest test
+##################################################################
+
+import random
+
+import numpy as np
+import pytest
+
+import layouts  # Puts the project root on sys.path
+
+
+@pytest.fixture(scope="session")
+def make_design():
+    """
+    Builds a design of test/layouts.py with the random generators seeded, e.g. make_design("grid", qubits_num=4).
+
+    Output:
+        build: callable, build(layout_name, **options) returns a new Design.
+    """
+    def build(layout_name: str = "grid", **options):
+        random.seed(0)
+        np.random.seed(0)
+        return layouts.LAYOUTS[layout_name](**options)
+    return build
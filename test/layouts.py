@@ -0,0 +1,159 @@
+##################################################################
+# Designs and layout comparisons shared by the tests (test_*.py,
+# through the make_design fixture of conftest.py) and the benchmark
+# scripts.
+##################################################################
+
+import math, os, sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import numpy as np
+from api.design import Design
+
+
+def grid_design(qubits_num: int = 16, dist: float = 2000, coupling_lines: bool = False, chip: bool = False):
+    """
+    Builds Transmon qubits on a square grid, on chip0.
+
+    Input:
+        qubits_num: int, the number of qubits.
+        dist: float, the distance between neighbouring qubits.
+        coupling_lines: bool, whether straight coupling lines are generated along the edges.
+        chip: bool, whether the chip is generated around the qubits.
+
+    Output:
+        design: Design
+    """
+    side = int(math.ceil(math.sqrt(qubits_num)))
+    design = Design()
+    design.generate_topology(qubits_num=qubits_num, topo_col=side)
+    design.topology.generate_full_edges()
+    design.generate_qubits(topology=True, qubits_type="Transmon", chip_name="chip0", dist=dist)
+    if coupling_lines:
+        design.generate_coupling_lines(topology=True, qubits=True, cpls_type="CouplingLineStraight", chip="chip0")
+    if chip:
+        design.generate_chip(qubits=True, dist=4000)
+    return design
+
+
+def design_1024_layout(qubits_num: int = 16, air_bridges: bool = False):
+    """
+    Builds the flip-chip demo design (0_demo/0_1024_layout) with fewer qubits.
+
+    Input:
+        qubits_num: int, the number of qubits, a square of at least 16.
+        air_bridges: bool, whether air bridges are placed along the transmission lines of chip1.
+
+    Output:
+        design: Design
+    """
+    side = int(round(qubits_num ** 0.5))
+    design = Design()
+    design.generate_topology(topo_col=side, topo_row=side)
+    design.topology.generate_random_edges(edges_num=int(qubits_num * 1500 / 1024))
+    design.generate_qubits(topology=True, qubits_type="Transmon", chip_name="chip0", dist=3000)
+    design.generate_coupling_lines(topology=True, qubits=True, cpls_type="CouplingLineStraight", chip="chip0")
+    design.generate_chip(qubits=True, dist=4000)
+    design.generate_readout_lines(qubits=True, rdls_type="ReadoutCavity", chip_name="chip0")
+    design.gds.chips.copy_chip(old_chip_name="chip0", new_chip_name="chip1")
+    design.routing(method="Flipchip_routing", chip_name="chip1")
+    if air_bridges:
+        for line_name in list(design.gds.transmission_lines.options.keys()):
+            design.gds.auto_generate_air_bridge("transmission_lines", line_name, spacing=120, chip_name="chip1")
+    return design
+
+
+def design_hexagonal():
+    """
+    Builds the hexagonal demo design (0_demo/5_Hexagonal topology).
+
+    Output:
+        design: Design
+    """
+    design = Design()
+    design.generate_topology(shape="hex", num=7)
+    design.topology.generate_hex_full_edges()
+    design.generate_qubits_from_topo()
+    design.generate_readout_lines_from_qubits()  # Coupling lines are generated for square lattices only
+    return design
+
+
+LAYOUTS = {"grid": grid_design, "0_1024_layout": design_1024_layout, "5_Hexagonal topology": design_hexagonal}
+
+
+def library_classes():
+    """
+    Lists the component classes of the library.
+
+    Output:
+        cmpnt_class_list: list, the classes of every module in the module_name_list of the library packages.
+    """
+    import library
+    import toolbox
+    cmpnt_class_list = []
+    for package_name in list(library.__dict__.keys()):
+        package = getattr(library, package_name)
+        for module_name in getattr(package, "module_name_list", ()):
+            cmpnt_class_list.append(getattr(package, toolbox.convert_to_camel_case(module_name)))
+    return cmpnt_class_list
+
+
+def read_chips(path):
+    """
+    Output:
+        chips: dict, {cell name: flattened gdstk polygons} of a GDSII or OASIS file.
+    """
+    import gdstk
+    library = gdstk.read_oas(path) if path.endswith(".oas") else gdstk.read_gds(path)
+    return {cell.name: cell.get_polygons() for cell in library.cells}
+
+
+def compare(reference, chips, tolerance, label):
+    """
+    Compares chips by the XOR area of their polygons and their bounding boxes.
+
+    Input:
+        reference: dict, {chip_name: list of gdstk.Polygon}.
+        chips: dict, {chip_name: list of gdstk.Polygon}, the chips compared with the reference.
+        tolerance: float, the allowed XOR area relative to the chip area.
+        label: str, prefix of the messages.
+
+    Output:
+        errors: list, the messages of the chips which differ.
+    """
+    import gdstk
+    errors = []
+    for chip_name, polygon_list in reference.items():
+        other = chips.get(chip_name)
+        if other is None:
+            errors.append("{}: chip {} is missing".format(label, chip_name))
+            continue
+        area = sum(p.area() for p in gdstk.boolean(polygon_list, [], "or"))
+        xor = sum(p.area() for p in gdstk.boolean(polygon_list, other, "xor"))
+        box, other_box = bounding_box(polygon_list), bounding_box(other)
+        box_error = 0.0 if box is None and other_box is None else float(np.max(np.abs(np.array(box) - np.array(other_box))))
+        print("  {:<28} {:<6} area {:>14.1f}  xor {:>10.3f} ({:.2e})  bbox error {:.3f}".format(
+            label, chip_name, area, xor, xor / area if area else 0.0, box_error))
+        if xor > tolerance * max(area, 1.0) or box_error > 0.1:
+            errors.append("{}: chip {} differs, xor area {:.3f} of {:.1f}, bbox error {:.3f}".format(label, chip_name, xor, area, box_error))
+    return errors
+
+
+def bounding_box(polygon_list):
+    if len(polygon_list) == 0:
+        return None
+    points = np.concatenate([p.points for p in polygon_list])
+    return (points.min(axis=0), points.max(axis=0))
+
+
+def polygons(cell):
+    """
+    Output:
+        polygons: list, sorted (layer, datatype, points) of a cell of the active geometry backend, rounded to 1e-6.
+    """
+    from base import geometry_backend
+    return sorted((spec[0], spec[1], tuple(map(tuple, np.round(np.asarray(p, dtype=float), 6))))
+                  for spec, polygon_list in geometry_backend.active.get_polygons(cell).items() for p in polygon_list)
@@ -0,0 +1,121 @@
+##################################################################
+# Column tables of component collections (base.column_store) with
+# get_positions, set_positions and move.
+#
+# Every column must hold the parameters of the components, pins and
+# outlines as ragged columns. Positions are set from an array and moved,
+# for all qubits, a list of names and a condition: the components, the
+# position arrays and the columns must agree, and the pins must follow
+# the qubits.
+##################################################################
+
+import copy
+
+import numpy as np
+import pytest
+from addict import Dict
+from base import column_store
+import layouts
+
+
+@pytest.fixture
+def qubits(make_design):
+    return make_design("grid", qubits_num=16).gds.qubits
+
+
+def check_columns(qubits):
+    table = qubits.column_table()
+    assert table.name_list == qubits.cmpnt_name_list
+    for op_name in ("gds_pos", "coupling_pins", "readout_pins", "outline", "pad_height", "type"):
+        column = table[op_name]
+        values = [getattr(getattr(qubits, name), op_name) for name in table.name_list]
+        if op_name.endswith("pins") or op_name == "outline":
+            assert isinstance(column, column_store.RaggedColumn), op_name
+            assert column.tolist() == [[list(point) for point in value] for value in values], op_name
+        else:
+            assert column.tolist() == [list(v) if isinstance(v, (list, tuple)) else v for v in values], op_name
+    return
+
+
+def test_columns(qubits):
+    check_columns(qubits)
+    with pytest.raises(TypeError):
+        qubits.column_table().row("q0").gds_pos = (0, 0)
+
+
+def test_set_positions(qubits):
+    rng = np.random.default_rng(0)
+    names = list(qubits.cmpnt_name_list)
+    pins = qubits.get_column("coupling_pins")
+    old_pins = [pins[i].copy() for i in range(len(pins))]
+    old_positions = qubits.get_positions("gds_pos")
+    positions = old_positions + rng.integers(-500, 500, size=old_positions.shape)
+    qubits.set_positions("gds_pos", positions)
+    assert np.array_equal(qubits.get_positions("gds_pos"), positions)
+    assert np.array_equal(qubits.get_column("gds_pos"), positions)
+    assert [tuple(getattr(qubits, name).gds_pos) for name in names] == [tuple(pos) for pos in positions.tolist()]
+    pins = qubits.get_column("coupling_pins")
+    for i in range(len(names)):
+        assert np.allclose(pins[i], old_pins[i] + (positions[i] - old_positions[i]))
+    check_columns(qubits)
+
+    qubits.set_positions("gds_pos", old_positions)
+    pins = qubits.get_column("coupling_pins")
+    assert all(np.allclose(pins[i], old_pins[i]) for i in range(len(names)))
+    with pytest.raises(ValueError):
+        qubits.set_positions("gds_pos", old_positions[:-1])
+
+
+def test_move_by_name(qubits):
+    names = list(qubits.cmpnt_name_list)
+    moved = names[::3]
+    before = qubits.get_positions("gds_pos")
+    qubits.move("gds_pos", 100, -50, name_list=moved)
+    expected = before + np.array([(100, -50) if name in moved else (0, 0) for name in names])
+    assert np.array_equal(qubits.get_positions("gds_pos"), expected)
+    assert np.array_equal(qubits.get_positions("gds_pos", moved), expected[::3])
+    check_columns(qubits)
+
+
+def test_move_with_condition(qubits):
+    before = qubits.get_positions("gds_pos")
+    qubits.move("gds_pos", dx=-7.5, condition=lambda cmpnt: cmpnt.gds_pos[0] > 0)
+    expected = before + np.array([(-7.5, 0) if pos[0] > 0 else (0, 0) for pos in before])
+    assert np.array_equal(qubits.get_positions("gds_pos"), expected)
+    check_columns(qubits)
+
+
+def test_move_leaves_components_unbuilt(qubits):
+    qubits.inject_options(Dict(qubits.options.to_dict()))
+    before = qubits.get_positions("gds_pos")
+    qubits.move("gds_pos", 100, -50)
+    qubits.set_positions("gds_pos", before[:2] + 10, ["q0", "q1"])
+    assert len(qubits.lazy_cmpnts) == len(qubits.cmpnt_name_list)
+    expected = before + (100, -50)
+    expected[:2] = before[:2] + 10
+    assert np.array_equal(qubits.get_positions("gds_pos"), expected)
+    check_columns(qubits)
+
+
+# Classes whose pins are translated instead of recalculated when they move
+TRANSLATED_CLASSES = [cmpnt_class for cmpnt_class in layouts.library_classes()
+                      if cmpnt_class.calculated_options and cmpnt_class.geometry_cache_ignore is not None]
+
+
+@pytest.mark.parametrize("cmpnt_class", TRANSLATED_CLASSES, ids=lambda cmpnt_class: cmpnt_class.__name__)
+def test_translation_matches_recalculation(cmpnt_class):
+    cmpnt = cmpnt_class(options=Dict(name="c0", gds_pos=(1000, -2000)))
+    pos_name = cmpnt.geometry_cache_position
+    assert cmpnt.can_translate(pos_name)
+    pos = tuple(np.add(getattr(cmpnt, pos_name), (123.5, -77)).tolist())
+    cmpnt.translate(pos_name, pos, (123.5, -77))
+    assert cmpnt.frozen_options() == cmpnt.extract_options()
+    options = copy.deepcopy(cmpnt.options)
+    recalculated = cmpnt_class(options=options)
+    for op_name in cmpnt.op_name_list:
+        translated, expected = getattr(cmpnt, op_name), getattr(recalculated, op_name)
+        if op_name in cmpnt_class.calculated_options:
+            assert np.allclose(np.array(list(translated.values()) if isinstance(translated, dict) else translated, dtype=float),
+                               np.array(list(expected.values()) if isinstance(expected, dict) else expected, dtype=float)), op_name
+        else:
+            assert translated == expected, op_name
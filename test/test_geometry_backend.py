@@ -0,0 +1,121 @@
+##################################################################
+# Parity of the gdstk geometry backend against gdspy on the demo
+# designs (0_demo/0_1024_layout and 0_demo/5_Hexagonal topology).
+#
+# Each design is drawn with both backends. For every chip, the XOR of
+# the two layouts must be below TOLERANCE times the chip's metal area
+# (arcs are discretized differently within the same tolerance), and the
+# bounding boxes must agree within 0.1 um. The GDSII files written by
+# both backends and the OASIS file written by gdstk are read back and
+# compared the same way.
+#
+# Each component class of the library is drawn from its default options
+# with both backends and compared the same way: it must draw with the
+# gdstk backend directly, without its cells being converted from gdspy.
+##################################################################
+
+import os
+
+import pytest
+from addict import Dict
+from base import geometry_backend
+from base.library_base import LibraryBase
+import layouts
+from layouts import compare, read_chips
+
+TOLERANCE = 1e-3
+
+
+def chip_polygons(design, backend_name):
+    """
+    Draws a design with a backend.
+
+    Output:
+        chips: dict, {chip_name: list of gdstk.Polygon}.
+    """
+    import gdstk
+    design.gds.set_geometry_backend(backend_name)
+    design.draw_gds()
+    backend = geometry_backend.get_backend(backend_name)
+    return {chip_name: [gdstk.Polygon(points, layer=layer, datatype=datatype)
+                        for (layer, datatype), polygon_list in backend.get_polygons(cell).items() for points in polygon_list]
+            for chip_name, cell in design.gds.cell_Dict.items()}
+
+
+@pytest.mark.parametrize("layout_name", ["0_1024_layout", "5_Hexagonal topology"])
+def test_gdstk_matches_gdspy(make_design, tmp_path, layout_name):
+    pytest.importorskip("gdstk")
+    design = make_design(layout_name)
+    reference = chip_polygons(design, "gdspy")
+    design.gds.save_gds(os.path.join(tmp_path, "gdspy.gds"))
+    errors = compare(reference, chip_polygons(design, "gdstk"), TOLERANCE, "gdstk")
+
+    design.gds.save_gds(os.path.join(tmp_path, "gdstk.gds"))
+    geometry_backend.get_backend("gdstk").write_oas(design.gds.lib, os.path.join(tmp_path, "gdstk.oas"))
+    written = read_chips(os.path.join(tmp_path, "gdspy.gds"))
+    for file_name in ("gdstk.gds", "gdstk.oas"):
+        errors += compare(written, read_chips(os.path.join(tmp_path, file_name)), TOLERANCE, file_name)
+    assert errors == []
+
+
+def cmpnt_polygons(cmpnt, backend_name):
+    """
+    Draws a component with a backend.
+
+    Output:
+        polygons: list of gdstk.Polygon, the polygons of the component cell.
+    """
+    import gdstk
+    with geometry_backend.use(backend_name):
+        cmpnt.draw_native_gds()
+    backend = geometry_backend.get_backend(backend_name)
+    return [gdstk.Polygon(points, layer=layer, datatype=datatype)
+            for (layer, datatype), polygon_list in backend.get_polygons(cmpnt.cell).items() for points in polygon_list]
+
+
+def default_cmpnt(cmpnt_class):
+    options = Dict(cmpnt_class.default_options)
+    # Some qubits default their coupling pins to a list but set them by side
+    if isinstance(options.get("coupling_pins"), list):
+        options.coupling_pins = Dict()
+    return cmpnt_class(options=options)
+
+
+@pytest.mark.parametrize("cmpnt_class", layouts.library_classes(), ids=lambda cmpnt_class: cmpnt_class.__name__)
+def test_components_draw_with_gdstk(cmpnt_class):
+    pytest.importorskip("gdstk")
+    # Some components change their options while drawing, each backend draws a new one
+    try:
+        reference = cmpnt_polygons(default_cmpnt(cmpnt_class), "gdspy")
+    except (AttributeError, TypeError, ZeroDivisionError):
+        pytest.skip("can not be drawn from its default options")
+    geometry_backend.converted_classes.discard(cmpnt_class)
+    polygons = cmpnt_polygons(default_cmpnt(cmpnt_class), "gdstk")
+    assert cmpnt_class not in geometry_backend.converted_classes
+    name = cmpnt_class.default_options.name
+    assert compare({name: reference}, {name: polygons}, TOLERANCE, cmpnt_class.__name__) == []
+
+
+class GdspyRectangle(LibraryBase):
+    default_options = Dict(name="rectangle0", type="GdspyRectangle", chip="chip0", outline=[])
+
+    def calc_general_ops(self):
+        return
+
+    def draw_gds(self):
+        import gdspy
+        self.lib = gdspy.GdsLibrary()
+        self.cell = self.lib.new_cell(self.name + "_cell")
+        self.cell.add(gdspy.Rectangle((0, 0), (10, 20)))
+        return
+
+
+def test_gdspy_components_are_converted_and_reported(capsys):
+    pytest.importorskip("gdstk")
+    area_list = []
+    for name in ("rectangle0", "rectangle1"):
+        cmpnt = GdspyRectangle(options=Dict(GdspyRectangle.default_options, name=name))
+        area_list.append(sum(polygon.area() for polygon in cmpnt_polygons(cmpnt, "gdstk")))
+    assert area_list == [200, 200]
+    assert GdspyRectangle in geometry_backend.converted_classes
+    assert capsys.readouterr().out.count("GdspyRectangle draws with gdspy") == 1
@@ -0,0 +1,74 @@
+##################################################################
+# Cached drawing of components (base.geometry_cache) against
+# uncached drawing.
+#
+# Each component class sharing its geometry is drawn at a first position,
+# which fills the geometry cache, then at other positions where it is
+# built from the cache. The same components are drawn again with the cache
+# disabled: the cells must hold the same polygons, and the attributes set
+# while drawing (geometry_cache_attributes) the same cells or points.
+##################################################################
+
+import numpy as np
+import pytest
+from addict import Dict
+from base import geometry_backend, geometry_cache
+from library.qubits.transmon import Transmon
+from library.qubits.transmon_rotate import TransmonRotate
+from library.qubits.xmon import Xmon
+from library.qubits.xmon_rotate import XmonRotate
+from library.qubits.circlemon import Circlemon
+from library.pins.launch_pad import LaunchPad
+from library.air_bridges.airbridge_nb import AirbridgeNb
+from layouts import polygons
+
+# (class, shape parameters), drawn at each position of POSITIONS
+CASES = [(Transmon, Dict()),
+         (TransmonRotate, Dict(rotation=30)),
+         (Xmon, Dict()),
+         (XmonRotate, Dict()),
+         (Circlemon, Dict()),
+         (LaunchPad, Dict(orientation=0)),
+         (LaunchPad, Dict(orientation=90)),
+         (AirbridgeNb, Dict(rotation=0)),
+         (AirbridgeNb, Dict(rotation=45))]
+POSITIONS = [(0, 0), (1250.5, -730.25), (-4000, 2500)]
+
+
+def contents(cmpnt):
+    """
+    Output:
+        contents: dict, the polygons of the cell and of the cached attributes, and the points of the others.
+    """
+    result = {"cell": (cmpnt.cell.name, polygons(cmpnt.cell))}
+    for attr_name, value in cmpnt.geometry_attributes().items():
+        if hasattr(value, "get_polygons"):
+            result[attr_name] = (value.name, polygons(value))
+        else:
+            result[attr_name] = np.round(np.asarray(value, dtype=float), 6).tolist()
+    return result
+
+
+def build(cmpnt_class, shape, index, pos, cached):
+    options = Dict(shape)
+    options.name = "{}{}".format(cmpnt_class.__name__.lower(), index)
+    options[cmpnt_class.geometry_cache_position] = pos
+    cmpnt = cmpnt_class(options=options)
+    if not cached:
+        cmpnt.geometry_cache_ignore = None
+    cmpnt.redraw_gds()
+    return cmpnt
+
+
+@pytest.mark.parametrize("backend_name", ["gdspy", "gdstk"])
+@pytest.mark.parametrize("cmpnt_class, shape", CASES, ids=["{}-{}".format(c.__name__, dict(s)) for c, s in CASES])
+def test_cached_drawing_matches_uncached(backend_name, cmpnt_class, shape):
+    with geometry_backend.use(backend_name):
+        geometry_cache.cache.clear()
+        hits = geometry_cache.cache.hits
+        for index, pos in enumerate(POSITIONS):
+            cached = build(cmpnt_class, shape, index, pos, cached=True)
+            uncached = build(cmpnt_class, shape, index, pos, cached=False)
+            assert contents(cached) == contents(uncached), "the cached drawing at {} differs".format(pos)
+            assert sorted(cached.geometry_attributes()) == sorted(cmpnt_class.geometry_cache_attributes)
+        assert geometry_cache.cache.hits - hits >= len(POSITIONS) - 1
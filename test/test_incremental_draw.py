@@ -0,0 +1,153 @@
+##################################################################
+# Incremental drawing: only the components changed since the last
+# draw_gds are redrawn (LibraryBase.redraw_gds, gds_dirty), only their
+# chips are flattened again, and the bounding boxes follow.
+##################################################################
+
+import copy
+
+import numpy as np
+import pytest
+from addict import Dict
+from api.design import Design
+from base.library_base import LibraryBase
+
+CHIPS = ("chip0", "chip1")
+
+
+@pytest.fixture
+def design(make_design):
+    """
+    A grid of 16 drawn qubits, q8 to q15 on chip1.
+    """
+    design = make_design("grid", qubits_num=16)
+    qubits = design.gds.qubits
+    qubits.change_option("chip", "chip1", name_list=qubits.cmpnt_name_list[8:])
+    design.gds.draw_gds()
+    design.gds.get_bounding_box()
+    return design
+
+
+@pytest.fixture
+def drawn(monkeypatch):
+    """
+    The names of the components drawn, recorded by wrapping LibraryBase.draw_cached_gds.
+    """
+    names = []
+    original = LibraryBase.draw_cached_gds
+
+    def draw_cached_gds(cmpnt):
+        names.append(cmpnt.name)
+        return original(cmpnt)
+    monkeypatch.setattr(LibraryBase, "draw_cached_gds", draw_cached_gds)
+    return names
+
+
+def cells(qubits):
+    return {name: getattr(qubits, name).__dict__.get("cell") for name in qubits.cmpnt_name_list}
+
+
+def fresh_bounding_boxes(design):
+    """
+    Output:
+        bboxes: dict, the bounding boxes of each qubit and chip of a copy of the design built from its options.
+    """
+    fresh = Design()
+    fresh.gds.inject_options(copy.deepcopy(design.gds.options))
+    fresh.gds.draw_gds()
+    bboxes = {name: getattr(fresh.gds.qubits, name).get_bounding_box() for name in fresh.gds.qubits.cmpnt_name_list}
+    for chip_name in CHIPS:
+        bboxes[chip_name] = fresh.gds.get_bounding_box(chip_name)
+    return bboxes
+
+
+def redraw(design, drawn, name, chip_name):
+    """
+    Redraws the design after a change of the qubit name on chip_name, and checks that nothing else was drawn.
+    """
+    gds, qubits = design.gds, design.gds.qubits
+    before = cells(qubits)
+    chip_cells = {chip: (qubits.cell_Dict[chip], gds.cell_Dict[chip]) for chip in CHIPS}
+    dirty = [n for n in qubits.cmpnt_name_list if n in qubits.__dict__ and not getattr(qubits, n).is_drawn()]
+    assert dirty == [name]
+    drawn.clear()
+    gds.draw_gds()
+    assert drawn == [name]
+    after = cells(qubits)
+    assert all(after[n] is cell for n, cell in before.items() if n != name and n in after)
+    other_chip = "chip1" if chip_name == "chip0" else "chip0"
+    assert (qubits.cell_Dict[other_chip], gds.cell_Dict[other_chip]) == chip_cells[other_chip]
+    assert qubits.cell_Dict[chip_name] is not chip_cells[chip_name][0]
+    assert gds.cell_Dict[chip_name] is not chip_cells[chip_name][1]
+    fresh = fresh_bounding_boxes(design)
+    assert all(np.allclose(getattr(qubits, n).get_bounding_box(), fresh[n]) for n in qubits.cmpnt_name_list)
+    assert all(np.allclose(gds.get_bounding_box(chip), fresh[chip]) for chip in CHIPS)
+    return
+
+
+def test_no_change_draws_nothing(design, drawn):
+    gds = design.gds
+    before = cells(gds.qubits)
+    chip_cells = dict(gds.cell_Dict)
+    gds.draw_gds()
+    assert drawn == []
+    assert cells(gds.qubits) == before and all(gds.cell_Dict[c] is chip_cells[c] for c in chip_cells)
+
+
+def test_assignment(design, drawn):
+    q5 = design.gds.qubits.q5
+    box = q5.get_bounding_box()
+    q5.gds_pos = (q5.gds_pos[0] + 300, q5.gds_pos[1])
+    assert q5.__dict__["gds_dirty"] and not q5.is_drawn()
+    redraw(design, drawn, "q5", "chip0")
+    assert np.allclose(np.array(q5.get_bounding_box()) - np.array(box), [[300, 0], [300, 0]])
+
+
+def test_set_component(design, drawn):
+    qubits = design.gds.qubits
+    options = Dict(copy.deepcopy(qubits.q2.options))
+    options.width = options.width + 200
+    width = np.diff(np.array(qubits.q2.get_bounding_box())[:, 0])[0]
+    qubits.set_component("q2", options)
+    redraw(design, drawn, "q2", "chip0")
+    assert np.isclose(np.diff(np.array(qubits.q2.get_bounding_box())[:, 0])[0], width + 200)
+
+
+def test_replace_and_remove_component(design, drawn):
+    gds, qubits = design.gds, design.gds.qubits
+    options = Dict(copy.deepcopy(qubits.q15.options))
+    options.gds_pos = (options.gds_pos[0] + 5000, options.gds_pos[1] + 5000)
+    chip_box = gds.get_bounding_box("chip1")
+    qubits.replace_component("q15", options)
+    redraw(design, drawn, "q15", "chip1")
+    assert np.allclose(np.array(gds.get_bounding_box("chip1")) - np.array(chip_box), [[0, 0], [5000, 5000]])
+
+    qubits.remove_component("q15")
+    before = cells(qubits)
+    chip_cells = dict(gds.cell_Dict)
+    drawn.clear()
+    gds.draw_gds()
+    assert drawn == []
+    assert all(cells(qubits)[n] is before[n] for n in qubits.cmpnt_name_list)
+    assert gds.cell_Dict["chip0"] is chip_cells["chip0"] and gds.cell_Dict["chip1"] is not chip_cells["chip1"]
+    fresh = fresh_bounding_boxes(design)
+    assert np.allclose(gds.get_bounding_box("chip1"), fresh["chip1"])
+    assert np.allclose(gds.get_bounding_box("chip1"), chip_box)
+
+
+def test_moves_translate_bounding_boxes(design, drawn):
+    gds, qubits = design.gds, design.gds.qubits
+    boxes = {name: np.array(getattr(qubits, name).get_bounding_box()) for name in ("q14", "q15")}
+    chip_box = np.array(gds.get_bounding_box("chip1"))
+    qubits.move("gds_pos", 5000, 5000, name_list=["q15"])
+    qubits.q14.gds_pos = (qubits.q14.gds_pos[0] - 300, qubits.q14.gds_pos[1])
+    assert np.allclose(np.array(gds.get_bounding_box("chip1")) - chip_box, [[0, 0], [5000, 5000]])
+    assert np.allclose(np.array(qubits.q15.get_bounding_box()) - boxes["q15"], [[5000, 5000], [5000, 5000]])
+    assert np.allclose(np.array(qubits.q14.get_bounding_box()) - boxes["q14"], [[-300, 0], [-300, 0]])
+    assert drawn == [] and not qubits.q14.is_drawn() and not qubits.q15.is_drawn()
+
+    gds.draw_gds()
+    assert sorted(drawn) == ["q14", "q15"]
+    fresh = fresh_bounding_boxes(design)
+    assert all(np.allclose(getattr(qubits, n).get_bounding_box(), fresh[n]) for n in qubits.cmpnt_name_list)
+    assert all(np.allclose(gds.get_bounding_box(chip), fresh[chip]) for chip in CHIPS)
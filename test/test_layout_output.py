@@ -0,0 +1,101 @@
+##################################################################
+# Layout files against the flat GDSII output, on the flip-chip demo
+# design (0_demo/0_1024_layout) with air bridges along the
+# transmission lines: hierarchical GDSII (save_gds(hierarchical=True)),
+# OASIS (save_oas, flat and with repetitions, with and without
+# compression) and streaming GDSII (save_gds(streaming=True)).
+#
+# Every file is read back with gdstk and flattened: each chip must hold
+# the same polygons as in the flat GDSII file (XOR area below 1e-9 of
+# the chip area) and the same bounding box, which must also be the cached
+# one of Gds.get_bounding_box.
+##################################################################
+
+import os, warnings
+
+import numpy as np
+import pytest
+from layouts import bounding_box, compare, read_chips
+
+gdstk = pytest.importorskip("gdstk")
+
+FILES = {"flat.gds": lambda design, path: design.gds.save_gds(path),
+         "hierarchical.gds": lambda design, path: design.gds.save_gds(path, hierarchical=True),
+         "flat.oas": lambda design, path: design.save_oas(path, hierarchical=False),
+         "hierarchical.oas": lambda design, path: design.save_oas(path),
+         "uncompressed.oas": lambda design, path: design.save_oas(path, compression_level=0),
+         "streaming.gds": lambda design, path: design.gds.save_gds(path, streaming=True)}
+
+
+@pytest.fixture(scope="module")
+def saved(make_design, tmp_path_factory):
+    """
+    Output:
+        design: Design, the drawn design.
+        paths: dict, {file name: path} of the files of FILES.
+    """
+    design = make_design("0_1024_layout", air_bridges=True)
+    design.gds.draw_gds()  # Warnings of the component drawing are not checked
+    tmp_path = tmp_path_factory.mktemp("layout_output")
+    paths = {}
+    for file_name, save in FILES.items():
+        paths[file_name] = os.path.join(tmp_path, file_name)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            save(design, paths[file_name])
+    return design, paths
+
+
+def placements(path):
+    """
+    Output:
+        count: int, the cells placed by the references of the file, counting each repetition.
+        repeated: int, the references written with a repetition.
+    """
+    library = gdstk.read_oas(path) if path.endswith(".oas") else gdstk.read_gds(path)
+    reference_list = [reference for cell in library.cells for reference in cell.references]
+    return (sum(max(1, reference.repetition.size) for reference in reference_list),
+            sum(1 for reference in reference_list if reference.repetition.size > 1))
+
+
+def flat_chips(design, paths):
+    chips = read_chips(paths["flat.gds"])
+    return {chip_name: polygon_list for chip_name, polygon_list in chips.items() if chip_name in design.gds.cell_Dict.keys()}
+
+
+def test_cached_chip_bounding_boxes(saved):
+    design, paths = saved
+    for chip_name, polygon_list in flat_chips(design, paths).items():
+        assert np.allclose(bounding_box(polygon_list), design.gds.get_bounding_box(chip_name), atol=1e-3), chip_name
+
+
+@pytest.mark.parametrize("file_name", ["hierarchical.gds", "flat.oas", "hierarchical.oas", "uncompressed.oas", "streaming.gds"])
+def test_file_matches_flat_gds(saved, file_name):
+    design, paths = saved
+    assert compare(flat_chips(design, paths), read_chips(paths[file_name]), 1e-9, file_name) == []
+
+
+@pytest.mark.parametrize("file_name", ["hierarchical.gds", "hierarchical.oas"])
+def test_hierarchical_file_places_shared_cells(saved, file_name):
+    design, paths = saved
+    count, repeated = placements(paths[file_name])
+    assert count > len(design.gds.cell_Dict)
+    assert os.path.getsize(paths[file_name]) < os.path.getsize(paths["flat.gds"])
+    if file_name.endswith(".oas"):
+        assert repeated > 0
+
+
+def test_oasis_sizes(saved):
+    design, paths = saved
+    size = {file_name: os.path.getsize(path) for file_name, path in paths.items()}
+    assert size["hierarchical.oas"] < size["uncompressed.oas"]
+    assert size["flat.oas"] < size["flat.gds"]
+
+
+def test_streaming_gds_holds_the_same_cells(saved):
+    design, paths = saved
+
+    def cell_contents(path):
+        return {cell.name: sorted((p.layer, p.datatype, tuple(map(tuple, np.round(p.points, 3)))) for p in cell.get_polygons())
+                for cell in gdstk.read_gds(path).cells}
+    assert cell_contents(paths["streaming.gds"]) == cell_contents(paths["flat.gds"])
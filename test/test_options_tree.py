@@ -0,0 +1,217 @@
+##################################################################
+# Frozen options and copy-on-write views (base.options_tree), and
+# in-place edits of component parameters against the cached options,
+# columns, bounding boxes and drawn cells.
+##################################################################
+
+import copy, pickle
+
+import numpy as np
+import pytest
+import layouts
+from addict import Dict
+from base import options_tree
+from base.options_tree import CowDict, FrozenDict, freeze, thaw
+
+
+def sample_tree():
+    tree = Dict()
+    tree.qubits.q0 = Dict(name="q0", gds_pos=(0, 0), pins=[[1.0, 2.0], [3.0, 4.0]], pad=[10, 20], flag=True)
+    tree.qubits.q1 = Dict(name="q1", gds_pos=(100, 0), pins=[], pad=[10, 20], flag=False)
+    tree.chip.chip0 = Dict(name="chip0", size=(5000, 5000), nested=Dict(a=Dict(b=[1, (2, [3])])))
+    tree.edges = [["q0", "q1"]]
+    return tree
+
+
+@pytest.fixture
+def frozen():
+    return freeze(sample_tree())
+
+
+REFERENCE = sample_tree().to_dict()
+
+
+def test_round_trips(frozen):
+    assert type(frozen) is FrozenDict and type(dict.__getitem__(frozen, "qubits")) is FrozenDict
+    assert thaw(frozen).to_dict() == REFERENCE
+    assert frozen.to_dict() == REFERENCE and type(frozen.to_dict()) is dict
+    assert freeze(thaw(frozen)) is frozen
+    assert freeze(frozen) is frozen
+    assert pickle.loads(pickle.dumps(frozen)).to_dict() == REFERENCE
+    assert type(copy.deepcopy(frozen)) is CowDict and copy.copy(frozen).to_dict() == REFERENCE
+
+
+def test_source_tree_is_copied():
+    tree = sample_tree()
+    frozen = freeze(tree)
+    tree.qubits.q0.pins[0][0] = -1.0
+    tree.chip.chip0.nested.a.b.append(4)
+    assert frozen.to_dict() == REFERENCE
+
+
+def test_frozen_nodes_refuse_writes(frozen):
+    for write in (lambda: frozen.__setitem__("x", 1), lambda: setattr(frozen, "x", 1), lambda: frozen.__delitem__("edges"),
+                  lambda: frozen.update(x=1), lambda: frozen.pop("edges"), frozen.clear):
+        with pytest.raises(TypeError):
+            write()
+    child = frozen.qubits
+    child.q0.name = "renamed"
+    frozen.qubits.q0.pins[0].append(5.0)
+    frozen.chip.chip0.nested.a.b[1][1].append(9)
+    assert frozen.to_dict() == REFERENCE and type(child) is CowDict
+    assert type(frozen.missing) is Dict and "missing" not in frozen
+
+
+def test_view_writes_leave_the_source():
+    tree = sample_tree()
+    frozen = freeze(tree)
+    view = thaw(frozen)
+    other = thaw(frozen)
+    view.qubits.q0.gds_pos = (5, 5)
+    view.qubits.q0.pins[1][0] = 30.0
+    view.qubits.q1.pins.append([7.0, 8.0])
+    view.chip.chip0.nested.a.b[1][1].append(4)
+    view.chip.chip0.nested.c = "new"
+    view.new.node = 1
+    del view.edges
+    view.qubits.pop("q1")
+    assert (view.qubits.q0.gds_pos == (5, 5) and view.qubits.q0.pins[1][0] == 30.0 and
+            view.chip.chip0.nested.a.b == [1, (2, [3, 4])] and view.new.node == 1 and "edges" not in view and "q1" not in view.qubits)
+    assert frozen.to_dict() == REFERENCE
+    assert other.to_dict() == REFERENCE
+    assert tree.qubits.q1.pins == [] and "new" not in tree and "edges" in tree and tree.qubits.q0.gds_pos == (0, 0)
+
+    refrozen = freeze(view)
+    assert thaw(refrozen).to_dict() == view.to_dict()
+    view.qubits.q0.pad.append(30)
+    assert thaw(refrozen).qubits.q0.pad == [10, 20]
+
+
+def test_freezing_a_view_shares_untouched_nodes(frozen):
+    partial = thaw(frozen)
+    partial.qubits.q0.pad[0] = 15
+    partial_frozen = freeze(partial)
+    frozen_qubits, partial_qubits = dict.__getitem__(frozen, "qubits"), dict.__getitem__(partial_frozen, "qubits")
+    assert dict.__getitem__(partial_frozen, "chip") is dict.__getitem__(frozen, "chip")
+    assert dict.__getitem__(partial_qubits, "q1") is dict.__getitem__(frozen_qubits, "q1")
+    assert dict.__getitem__(partial_qubits, "q0") is not dict.__getitem__(frozen_qubits, "q0")
+    assert partial_frozen.qubits.q0.pad == [15, 20]
+
+
+def test_copies_of_views_are_independent(frozen):
+    view = thaw(frozen)
+    view.qubits.q0.pad[0] = 11
+    copies = [copy.deepcopy(view), copy.copy(view), view.copy(), pickle.loads(pickle.dumps(view))]
+    view.qubits.q0.pad[0] = 12
+    assert all(c.qubits.q0.pad == [11, 20] for c in copies)
+    for c in copies[:3]:
+        c.qubits.q0.pad[1] = 21
+    assert view.qubits.q0.pad == [12, 20] and frozen.to_dict() == REFERENCE
+
+    view = thaw(frozen)
+    key, value = view.popitem()
+    assert value is not dict.__getitem__(frozen, key)
+    view.clear()
+    assert len(view) == 0 and frozen.to_dict() == REFERENCE
+
+
+def test_untrack_gives_plain_containers():
+    assert options_tree.untrack(options_tree.track([[1, 2], {"a": [3]}], None)) == [[1, 2], {"a": [3]}]
+
+
+def test_deferred_values_are_computed_once():
+    calls = []
+    frozen = options_tree.new_frozen({"a": 1, "pins": options_tree.Deferred(lambda: calls.append(1) or ((0, 1), (2, 3)))})
+    view = thaw(frozen)
+    assert view == {"a": 1, "pins": ((0, 1), (2, 3))} and options_tree.unchanged_source(view) is frozen
+    assert frozen["pins"] == ((0, 1), (2, 3)) and options_tree.raw_get(frozen, "pins") == ((0, 1), (2, 3))
+    assert view.pins == ((0, 1), (2, 3)) and pickle.loads(pickle.dumps(frozen)).to_dict() == {"a": 1, "pins": ((0, 1), (2, 3))}
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("cmpnt_class", layouts.library_classes(), ids=lambda cmpnt_class: cmpnt_class.__name__)
+def test_lazy_options_match_the_built_component(cmpnt_class):
+    # Only the parameters of calculated_options may be changed by calc_general_ops
+    options = Dict(name="c0", gds_pos=(1000, -2000))
+    try:
+        built = cmpnt_class(options=copy.deepcopy(options)).frozen_options()
+    except AttributeError:
+        pytest.skip("can not be built from its default options")
+    lazy = cmpnt_class.lazy_frozen_options(options, lambda: built)
+    assert list(lazy.keys()) == list(built.keys())
+    for op_name in built.keys():
+        assert lazy[op_name] == built[op_name], op_name
+
+
+@pytest.fixture
+def small_design(make_design):
+    return make_design("grid", qubits_num=4, dist=3000, coupling_lines=True, chip=True)
+
+
+def fill_caches(design):
+    design.gds.draw_gds()
+    design.gds.options
+    design.gds.qubits.get_column("coupling_pins")
+    design.gds.get_bounding_box()
+    return
+
+
+def test_inplace_list_edits(small_design):
+    design = small_design
+    qubits = design.gds.qubits
+    q0 = qubits.q0
+
+    fill_caches(design)
+    q0.coupling_pins[0] = (1.5, 2.5)
+    assert tuple(q0.options.coupling_pins[0]) == (1.5, 2.5)
+    assert tuple(design.gds.options.qubits.q0.coupling_pins[0]) == (1.5, 2.5)
+    assert tuple(np.asarray(qubits.get_column("coupling_pins")[0])[0]) == (1.5, 2.5)
+
+    # Nested list item changing the geometry
+    fill_caches(design)
+    box = q0.get_bounding_box()
+    q0.pad_height[1] = q0.pad_height[1] + 500
+    assert not q0.is_drawn()
+    new_box = q0.get_bounding_box()
+    assert new_box[1][1] > box[1][1] + 400
+    assert qubits.get_bounding_box("chip0")[1][1] >= new_box[1][1]
+    assert q0.options.pad_height[1] == design.gds.options.qubits.q0.pad_height[1]
+    fill_caches(design)
+    q0.outline[0][0] = -12345.0
+    assert q0.options.outline[0][0] == -12345.0
+
+    # Appended item
+    fill_caches(design)
+    cpl = getattr(design.gds.coupling_lines, design.gds.coupling_lines.cmpnt_name_list[0])
+    cpl.outline.append([0, 0])
+    assert list(design.gds.options.coupling_lines[cpl.name].outline[-1]) == [0, 0]
+    cpl.outline.pop()
+    assert len(cpl.options.outline) == len(cpl.outline)
+
+
+def test_inplace_dict_edits(small_design):
+    design = small_design
+    q0 = design.gds.qubits.q0
+    fill_caches(design)
+    q0.cpw_pos = Dict()
+    q0.cpw_pos.a.b = 3  # A missing child created on first assignment
+    assert q0.options.cpw_pos.a.b == 3
+    q0.cpw_pos.a.b = 4
+    assert design.gds.options.qubits.q0.cpw_pos.a.b == 4
+    del q0.cpw_pos.a
+    assert "a" not in q0.options.cpw_pos
+
+
+def test_snapshots_and_copies_are_independent(small_design):
+    design = small_design
+    q0 = design.gds.qubits.q0
+    fill_caches(design)
+    pad_width = q0.pad_width[0]
+    options = design.gds.options
+    options.qubits.q0.pad_width[0] = 1
+    copied = copy.deepcopy(q0.pad_width)
+    copied[0] = 2
+    unpickled = pickle.loads(pickle.dumps(q0.pad_width))
+    unpickled[0] = 3
+    assert q0.pad_width[0] == pad_width and q0.is_drawn()
+    assert type(copied) is list and type(unpickled) is list and type(copy.copy(q0.pad_width)) is list
@@ -0,0 +1,54 @@
+##################################################################
+# Parity of the parallel drawing (base.parallel_draw) with the
+# serial drawing, on the flip-chip demo design (0_demo/0_1024_layout).
+#
+# The same design is drawn with workers=None (serial, the default),
+# with worker processes, and with worker processes which can not start:
+# every cell of every component must hold the same polygons and the
+# same attributes set while drawing.
+##################################################################
+
+import numpy as np
+import pytest
+from base import geometry_cache, parallel_draw
+from layouts import polygons
+
+WORKERS = 2
+
+
+class FailingExecutor:
+    """
+    Stands for a process pool whose workers can not start.
+    """
+
+    def __init__(self, *args, **kwargs):
+        raise OSError("no worker processes in this test")
+
+
+def draw_cells(design, workers):
+    """
+    Output:
+        cells: dict, {(component name, cell attribute): polygons} of the drawn design, attributes set while drawing
+            included.
+    """
+    geometry_cache.cache.clear()
+    design.gds.draw_gds(workers=workers)
+    cells = {}
+    for chip_name, cmpnt, cell_name in design.gds.draw_placements():
+        cells[(cmpnt.name, cell_name)] = polygons(getattr(cmpnt, cell_name))
+        for attr_name, value in cmpnt.geometry_attributes().items():
+            if hasattr(value, "get_polygons"):
+                cells[(cmpnt.name, attr_name)] = polygons(value)
+            else:
+                cells[(cmpnt.name, attr_name)] = np.round(np.asarray(value, dtype=float), 6).tolist()
+    return cells
+
+
+@pytest.mark.parametrize("failing", [False, True], ids=["workers", "workers not starting"])
+def test_parallel_matches_serial(make_design, monkeypatch, failing):
+    reference = draw_cells(make_design("0_1024_layout"), None)
+    if failing:
+        monkeypatch.setattr(parallel_draw, "ProcessPoolExecutor", FailingExecutor)
+    cells = draw_cells(make_design("0_1024_layout"), WORKERS)
+    assert sorted(cells.keys()) == sorted(reference.keys())
+    assert [key for key, value in reference.items() if cells[key] != value] == []
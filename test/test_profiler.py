@@ -0,0 +1,87 @@
+##################################################################
+# Spans and clean-up of the opt-in profiler (base.profiler).
+#
+# Methods returning a context manager (transaction()) must be recorded
+# as one span around the with block, with the calls of the block nested
+# in it, also when the block raises. After the profiler is disabled, by
+# the end of its with block, an exception in it, or an error while it is
+# enabled, the original methods and copy.deepcopy must be restored.
+##################################################################
+
+import copy, time
+
+import pytest
+from addict import Dict
+from api.design import Design
+from base import profiler
+
+BLOCK_SECONDS = 0.05
+
+
+@pytest.fixture
+def design(make_design):
+    return make_design("grid", qubits_num=4)
+
+
+@pytest.fixture
+def originals():
+    """
+    Output:
+        methods: dict, {(class, name): function} of every instrumented method, as defined in the classes.
+        deepcopy: function, copy.deepcopy.
+    """
+    methods = {}
+    for cls, name_list in profiler.instrumented_methods():
+        for name, attr in cls.__dict__.items():
+            if name_list is None or name in name_list:
+                methods[(cls, name)] = attr
+    return methods, copy.deepcopy
+
+
+def restored(originals):
+    """
+    Output:
+        bool, whether no profiler is enabled and the methods and copy.deepcopy are the original ones.
+    """
+    methods, deepcopy = originals
+    return (profiler.active is None and copy.deepcopy is deepcopy and
+            all(cls.__dict__.get(name) is func for (cls, name), func in methods.items()))
+
+
+def test_transaction_is_one_span(design, originals):
+    qubit_ops = Dict(design.gds.qubits.q0.options)
+    with profiler.Profiler() as prof:
+        with design.gds.transaction():
+            time.sleep(BLOCK_SECONDS)
+            qubit_ops.name = "q_new"
+            design.gds.qubits.insert_component(qubit_ops)
+    spans = [s for s in prof.span_list if s.name == "Gds.transaction"]
+    assert len(spans) == 1
+    span = spans[0]
+    assert span.end - span.start >= BLOCK_SECONDS
+    inner = [s for s in prof.span_list if s.name.endswith(".insert_component")]
+    assert len(inner) == 1 and inner[0].depth > span.depth and span.start <= inner[0].start <= inner[0].end <= span.end
+    assert design.gds.qubits.has_built_component("q_new")
+    assert restored(originals)
+
+
+def test_raising_blocks(design, originals):
+    with pytest.raises(ValueError):
+        with profiler.Profiler() as prof:
+            with pytest.raises(KeyError):
+                with design.gds.qubits.transaction():
+                    time.sleep(BLOCK_SECONDS)
+                    raise KeyError("inside the transaction")
+            assert prof.stack() == []
+            raise ValueError("inside the profiler")
+    spans = [s for s in prof.span_list if s.name.endswith(".transaction")]
+    assert len(spans) == 1 and spans[0].end - spans[0].start >= BLOCK_SECONDS
+    assert restored(originals)
+
+
+def test_failed_enable_restores(originals, monkeypatch):
+    instrumented_methods = profiler.instrumented_methods
+    monkeypatch.setattr(profiler, "instrumented_methods", lambda: instrumented_methods() + [(Design, ["no_such_method"])])
+    with pytest.raises(KeyError):
+        profiler.Profiler().enable()
+    assert restored(originals)
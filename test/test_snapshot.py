@@ -0,0 +1,118 @@
+##################################################################
+# Round trip of the binary design snapshots (base.snapshot) against
+# the parameters of the flip-chip demo design (0_demo/0_1024_layout).
+#
+# The parameters are exported as text, .edaq and .edaqz. Both snapshots
+# must load the same parameters, with the same types (lists and tuples,
+# ints and floats), and Snapshot.get must load single families. The
+# .edaq file must be smaller than the text export and the .edaqz file
+# smaller than the .edaq file. A tree of unusual values (mixed types,
+# big ints, NaN, -0.0, unicode, nested dicts, families with different
+# parameters per component) must round trip as well. Imported designs
+# only decode and build their components on first access.
+##################################################################
+
+import math, os
+
+import pytest
+from api.design import Design
+from base import options_tree, snapshot
+
+EXTENSIONS = (snapshot.SNAPSHOT_EXTENSION, snapshot.COMPRESSED_SNAPSHOT_EXTENSION)
+
+
+def same(a, b):
+    """
+    Output:
+        bool, whether two plain trees are equal with the same types, NaN being equal to NaN.
+    """
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return list(a.keys()) == list(b.keys()) and all(same(a[k], b[k]) for k in a.keys())
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, float):
+        return (math.isnan(a) and math.isnan(b)) or (a == b and math.copysign(1, a) == math.copysign(1, b))
+    return a == b
+
+
+def unusual_tree():
+    family = {}
+    for i in range(40):
+        ops = {"name": "c{}".format(i), "type": "Unusual", "chip": "chip0",
+               "pos": (i * 0.1, -i),  # Floats not exact in float32, ints
+               "mixed": [1, 2.5, "a"][i % 3],
+               "big": 2 ** 70 + i,
+               "flag": i % 2 == 0,
+               "small": i - 20,
+               "special": [float("nan"), -0.0, float("inf"), 1e300][i % 4],
+               "pins": [[i, i + 0.5]] * (i % 3),
+               "nested": {"a": [i, (i, 1.5)], "b": None},
+               "label": "量子比特{}".format(i),
+               "same_list": [1, (2, 3)],
+               "same_float": 0.1,
+               "same_inf": float("inf")}
+        if i % 5 == 0:
+            ops["extra"] = (i,)
+        family["c{}".format(i)] = ops
+    return {"gds": {"unusual": family, "empty": {}}, "topology": {"edges": [["c0", "c1"]], "positions": {"c0": (0, 0)}},
+            "single": {"s0": {"name": "s0", "type": "Single", "value": 1.25}}}
+
+
+def save_and_check(options, tmp_path, family_path):
+    """
+    Saves a tree in both snapshot formats and checks that they load the same tree and family.
+
+    Output:
+        sizes: dict, {extension: file size}.
+    """
+    reference = snapshot.to_plain(options)
+    family = reference
+    for key in family_path:
+        family = family[key]
+    sizes = {}
+    for extension in EXTENSIONS:
+        path = os.path.join(tmp_path, "snapshot" + extension)
+        snapshot.save(options, path)
+        sizes[extension] = os.path.getsize(path)
+        assert same(snapshot.to_plain(snapshot.load(path)), reference), extension
+        with snapshot.Snapshot(path) as opened:
+            assert same(snapshot.to_plain(opened.get(*family_path)), family), extension
+    assert sizes[snapshot.COMPRESSED_SNAPSHOT_EXTENSION] < sizes[snapshot.SNAPSHOT_EXTENSION]
+    return sizes
+
+
+def test_unusual_values(tmp_path):
+    save_and_check(unusual_tree(), tmp_path, ("gds", "unusual"))
+
+
+@pytest.mark.parametrize("qubits_num", [16, 64])
+def test_design_snapshot(make_design, tmp_path, qubits_num):
+    design = make_design("0_1024_layout", qubits_num=qubits_num)
+    text_path = os.path.join(tmp_path, "design.txt")
+    design.export_options(text_path)
+    sizes = save_and_check(design.extract_options(), tmp_path, ("gds", "qubits"))
+    assert sizes[snapshot.SNAPSHOT_EXTENSION] < os.path.getsize(text_path)
+
+
+@pytest.mark.parametrize("extension", EXTENSIONS)
+def test_import_decodes_components_on_access(make_design, tmp_path, extension):
+    design = make_design("grid", qubits_num=16, coupling_lines=True)
+    reference = design.extract_options().to_dict()
+    path = os.path.join(tmp_path, "design" + extension)
+    design.export_options(path)
+
+    imported = Design()
+    imported.import_options(path)
+    qubits = imported.gds.qubits
+    assert len(qubits.lazy_cmpnts) == 16
+    cmpnt_class, options = qubits.lazy_cmpnts["q3"]
+    assert any(type(dict.__getitem__(options, k)) is options_tree.Deferred for k in dict.keys(options))
+
+    assert qubits.q3.gds_pos == design.gds.qubits.q3.gds_pos
+    assert len(qubits.lazy_cmpnts) == 15
+    # Overwriting the file does not change the components which are not decoded yet
+    design.gds.qubits.q4.gds_pos = (-1, -1)
+    design.export_options(path)
+    assert imported.extract_options().to_dict() == reference
@@ -0,0 +1,42 @@
+##################################################################
+# Lookup tables of the topology (api.topology): find_qname and
+# if_edge must follow the positions and the edges however they are
+# modified.
+##################################################################
+
+import pytest
+from api.topology import Topology
+
+
+@pytest.fixture
+def topology():
+    topology = Topology(qubits_num=4, topo_col=2)
+    topology.generate_full_edges()
+    return topology
+
+
+def test_lookups_follow_in_place_edits(topology):
+    assert topology.find_qname((0, 0)) == "q0"
+    assert not topology.if_edge(["q0", "q3"])
+
+    topology.positions.q0 = (5, 5)
+    topology.edges[0][1] = "q3"
+
+    assert topology.find_qname((5, 5)) == "q0"
+    assert topology.find_qname((0, 0)) is None
+    assert topology.if_edge(["q3", "q0"])
+    assert not topology.if_edge(["q0", "q1"])
+
+
+def test_lookups_follow_the_topology_methods(topology):
+    topology.add_edge("q0", "q3")
+    assert topology.if_edge(["q3", "q0"])
+    topology.remove_edge(["q0", "q3"])
+    assert not topology.if_edge(["q0", "q3"])
+
+    topology.positions = {"q0": (2, 2)}
+    topology.edges = [["q0", "q0"]]
+    assert topology.find_qname((2, 2)) == "q0"
+    assert topology.find_qname((0, 0)) is None
+    assert topology.if_edge(["q0", "q0"])
+    assert not topology.if_edge(["q0", "q1"])
@@ -0,0 +1,155 @@
+##################################################################
+# Batched component changes with transaction() (base.cmpnts_base
+# and api.gds) and the lazy building of the components.
+##################################################################
+
+import copy
+
+import pytest
+from addict import Dict
+from base.library_base import LibraryBase
+
+
+@pytest.fixture
+def gds(make_design):
+    return make_design("grid", qubits_num=16, coupling_lines=True).gds
+
+
+def state(gds):
+    """
+    Output:
+        state: tuple, the component names and options of the collections, and the ids of the built instances.
+    """
+    # Instances first, reading the options must not change them
+    instances = {cmpnts_name: {name: id(value) for name, value in getattr(gds, cmpnts_name).__dict__.items()
+                               if isinstance(value, LibraryBase)}
+                 for cmpnts_name in ("qubits", "coupling_lines")}
+    names = {cmpnts_name: list(getattr(gds, cmpnts_name).cmpnt_name_list) for cmpnts_name in ("qubits", "coupling_lines")}
+    return names, gds.options.to_dict(), instances
+
+
+def build_all(gds):
+    for cmpnts_name in ("qubits", "coupling_lines"):
+        cmpnts = getattr(gds, cmpnts_name)
+        for name in cmpnts.cmpnt_name_list:
+            getattr(cmpnts, name)
+    return
+
+
+def new_qubit(gds, name, x):
+    options = Dict(copy.deepcopy(gds.qubits.q0.options))
+    options.name = name
+    options.gds_pos = (x, -5000)
+    return options
+
+
+def test_transaction_applies_on_exit(gds):
+    qubits = gds.qubits
+    for name in qubits.cmpnt_name_list:
+        getattr(qubits, name)  # Build every qubit
+    names_before = list(qubits.cmpnt_name_list)
+    untouched = {name: getattr(qubits, name) for name in names_before if name not in ("q1", "q2", "q3")}
+    q3_options = new_qubit(gds, "q3", 12345)
+
+    with qubits.transaction() as transaction:
+        qubits.insert_component(new_qubit(gds, "q_new0", 0))
+        qubits.insert_component(new_qubit(gds, "q_new1", 1000))
+        qubits.remove_component("q1")
+        qubits.remove_component("q2")
+        qubits.replace_component("q3", q3_options)
+        assert transaction is qubits
+        assert qubits.has_component("q_new0") and not qubits.has_component("q1") and qubits.has_component("q3")
+        assert not qubits.has_built_component("q_new0") and qubits.has_built_component("q1")
+        assert qubits.cmpnt_name_list == names_before
+        with pytest.raises(ValueError):
+            qubits.insert_component(new_qubit(gds, "q_new0", 0))
+    expected = [name for name in names_before if name not in ("q1", "q2")] + ["q_new0", "q_new1"]
+    assert qubits.cmpnt_name_list == expected
+    assert all(getattr(qubits, name) is cmpnt for name, cmpnt in untouched.items())
+    assert "q1" not in qubits.__dict__ and not qubits.has_component("q2")
+
+    # Lazy building
+    lazy = qubits.__dict__.get("lazy_cmpnts", {})
+    assert all(name in lazy and name not in qubits.__dict__ for name in ("q_new0", "q_new1", "q3"))
+    q_new0 = qubits.q_new0
+    assert type(q_new0).__name__ == "Transmon" and qubits.__dict__.get("q_new0") is q_new0
+    assert "q_new0" not in lazy and "q_new1" in lazy
+    assert tuple(q_new0.gds_pos) == (0, -5000) and len(q_new0.coupling_pins) == len(untouched["q0"].coupling_pins)
+    assert tuple(qubits.q3.gds_pos) == (12345, -5000)
+    assert set(gds.options.qubits.keys()) == set(expected) and tuple(gds.options.qubits.q_new1.gds_pos) == (1000, -5000)
+    q_new0.gds_pos = (1, -5000)
+    assert tuple(gds.options.qubits.q_new0.gds_pos) == (1, -5000)
+
+
+def test_reading_options_leaves_components_unbuilt(gds):
+    gds.inject_options(Dict(gds.options.to_dict()))
+    qubits = gds.qubits
+    lazy = qubits.__dict__.get("lazy_cmpnts", {})
+    lazy_names = set(lazy.keys())
+    assert lazy_names == set(qubits.cmpnt_name_list)
+    options = gds.options
+    assert tuple(options.qubits.q0.gds_pos) == (0, 0) and options.qubits.q0.type == "Transmon"
+    assert qubits.get_positions("gds_pos").shape == (16, 2) and len(qubits.get_column("chip")) == 16
+    gds.inject_options(options)
+    assert set(lazy.keys()) == lazy_names and gds.options.qubits is not None
+
+    # Reading the pins builds that component only, the options read before stay valid
+    pins = options.qubits.q3.coupling_pins
+    assert set(lazy.keys()) == lazy_names - {"q3"}
+    assert pins == qubits.q3.coupling_pins and gds.options.qubits.q3.coupling_pins == pins
+    qubits.set_positions("gds_pos", [(1, 2)], ["q3"])
+    assert tuple(gds.options.qubits.q3.gds_pos) == (1, 2) and gds.options.qubits.q3.coupling_pins != pins
+    assert tuple(options.qubits.q3.gds_pos) == (6000, 0) and options.qubits.q3.coupling_pins == pins
+
+
+def test_raising_block_rolls_back(gds):
+    qubits = gds.qubits
+    build_all(gds)
+    before = state(gds)
+    with pytest.raises(RuntimeError):
+        with gds.transaction():
+            qubits.insert_component(new_qubit(gds, "q_rollback", 0))
+            qubits.remove_component("q0")
+            gds.coupling_lines.remove_component(gds.coupling_lines.cmpnt_name_list[0])
+            raise RuntimeError("rollback")
+    assert state(gds) == before
+    assert qubits.__dict__.get("transaction_depth", 0) == 0 and gds.coupling_lines.__dict__.get("transaction_depth", 0) == 0
+    assert not qubits.__dict__.get("pending_cmpnts_ops")
+
+
+def test_invalid_type_rolls_back_every_collection(gds):
+    build_all(gds)
+    before = state(gds)
+    bad = new_qubit(gds, "q_bad", 0)
+    bad.type = "NoSuchQubit"
+    with pytest.raises(ValueError):
+        with gds.transaction():
+            gds.coupling_lines.remove_component(gds.coupling_lines.cmpnt_name_list[0])
+            gds.qubits.insert_component(bad)
+    assert state(gds) == before
+
+
+def test_nested_transaction_joins_the_outer_one(gds):
+    qubits = gds.qubits
+    with gds.transaction():
+        with qubits.transaction():
+            qubits.insert_component(new_qubit(gds, "q_nested", 0))
+        assert not qubits.has_built_component("q_nested")
+    assert qubits.has_built_component("q_nested") and qubits.cmpnt_name_list[-1] == "q_nested"
+
+
+def test_update_components_leaves_components_unbuilt(gds):
+    qubits = gds.qubits
+    reference = [getattr(qubits, name) for name in qubits.cmpnt_name_list]
+    qubits.inject_options(Dict(qubits.options.to_dict()))
+    names = qubits.cmpnt_name_list[::2]
+    qubits.update_components({"pad_height": [40] * 6, "height": 240, "no_such_option": 1}, names)
+    qubits.change_option("chip", "chip1", name_list=names[:2])
+    assert len(qubits.lazy_cmpnts) == len(qubits.cmpnt_name_list)
+    for cmpnt in reference:
+        if cmpnt.name in names:
+            cmpnt.inject_options({"pad_height": [40] * 6, "height": 240, "chip": "chip1" if cmpnt.name in names[:2] else cmpnt.chip})
+            cmpnt.calc_general_ops()
+            cmpnt.touch_options()
+        assert gds.options.qubits[cmpnt.name] == cmpnt.options
+        assert "no_such_option" not in gds.options.qubits[cmpnt.name]
@@ -161,8 +161,8 @@ def save_svg(cell, width: float = 500, path: str = "./svg/temp/svg"):
     return True
 
 def get_width(cell):
-    # Get the bounding box of the Cell
-    box = cell.get_bounding_box()
+    # Get the bounding box of the Cell (gdstk cells name it bounding_box)
+    box = cell.get_bounding_box() if hasattr(cell, "get_bounding_box") else cell.bounding_box()
     if box is None:
         return 0
     min_point, max_point = box
@@ -356,8 +356,8 @@ def export_options(data, path):
     # Define the supported data types
     supported_types = (Dict, str, int, float, bool, type(None), list, dict, tuple)
 
-    # Check if the data type is supported
-    if type(data) not in supported_types:
+    # Check if the data type is supported (Dict subclasses such as copy-on-write options included)
+    if not isinstance(data, supported_types):
         raise ValueError(f"Unsupported data type: {type(data)}")
 
     # Export the data to the specified path
@@ -740,6 +740,36 @@ def get_cell_bounding_box(cell):
 
     return (min_x, min_y), (max_x, max_y)
 
+def merge_bounding_boxes(bbox_list):
+    """
+    Combines bounding boxes.
+
+    Input:
+        bbox_list: list, ((x_min, y_min), (x_max, y_max)) boxes, None entries are skipped.
+
+    Output:
+        bbox: tuple, ((x_min, y_min), (x_max, y_max)) containing every box, or None when there is no box.
+    """
+    bbox_list = [bbox for bbox in bbox_list if bbox is not None]
+    if not bbox_list:
+        return None
+    return ((min(b[0][0] for b in bbox_list), min(b[0][1] for b in bbox_list)),
+            (max(b[1][0] for b in bbox_list), max(b[1][1] for b in bbox_list)))
+
+def bounding_box_on_edge(bbox, outer):
+    """
+    Checks whether a box touches the edge of a box containing it, i.e. whether removing it may shrink the outer box.
+
+    Input:
+        bbox: tuple, ((x_min, y_min), (x_max, y_max)), a box inside outer.
+        outer: tuple, ((x_min, y_min), (x_max, y_max)).
+
+    Output:
+        bool
+    """
+    return (bbox[0][0] <= outer[0][0] or bbox[0][1] <= outer[0][1] or
+            bbox[1][0] >= outer[1][0] or bbox[1][1] >= outer[1][1])
+
 def custom_calculation(options1, options2):
     
     return